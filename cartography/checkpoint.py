@@ -0,0 +1,122 @@
+"""
+Checkpoints let a failed sync resume where it stopped.
+
+With `--checkpoint-file PATH`, cartography.sync.Sync.run() records the units of work that completed in a JSON state
+file, together with the update tag of the sync. A unit is a path such as `('aws',)` for a whole sync stage,
+`('aws', '1234')` for an AWS account, or `('gcp', 'my-project', 'Compute')` for one module of one GCP project. Intel
+modules check and record their units with `is_unit_complete()` and `mark_unit_complete()`.
+
+A sync started with `--resume` reuses the update tag from the file and skips the units that are already complete.
+Because the skipped units were written with the same update tag, the cleanup jobs of the resumed sync do not remove
+their data, and every unit that did not complete is synced again, including its own cleanup jobs. The file is removed
+once a sync completes, so `--resume` on the next scheduled run starts a new sync unless the previous one failed.
+"""
+import json
+import logging
+import os
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+Unit = Tuple[str, ...]
+
+
+class Checkpoint:
+    """
+    The units of work completed by a sync with a given update tag, persisted to a JSON file.
+    """
+
+    def __init__(self, path: str, update_tag: int, completed: Optional[List[Unit]] = None):
+        """
+        :param path: The JSON file to persist the checkpoint to.
+        :param update_tag: The update tag of the sync that the checkpoint belongs to.
+        :param completed: The units of work that are already complete.
+        """
+        self.path = path
+        self.update_tag = update_tag
+        self.completed: List[Unit] = list(completed or [])
+        self._completed_set: Set[Unit] = set(self.completed)
+
+    @classmethod
+    def load(cls, path: str) -> 'Checkpoint':
+        with open(path) as f:
+            data = json.load(f)
+        return cls(path, data['update_tag'], [tuple(unit) for unit in data['completed']])
+
+    def is_complete(self, *unit: str) -> bool:
+        return unit in self._completed_set
+
+    def mark_complete(self, *unit: str) -> None:
+        """
+        Records the unit as complete and writes the checkpoint to its file.
+        """
+        if unit in self._completed_set:
+            return
+        self.completed.append(unit)
+        self._completed_set.add(unit)
+        self.save()
+
+    def save(self) -> None:
+        # Write to a temporary file first so that a crash never leaves a truncated checkpoint behind.
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'update_tag': self.update_tag, 'completed': self.completed}, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def start_checkpoint(path: str, update_tag: int, resume: bool) -> Checkpoint:
+    """
+    :param path: The checkpoint file.
+    :param update_tag: The update tag of a new sync.
+    :param resume: If True and the file exists, continue the sync recorded in it instead of starting a new one.
+    :return: The checkpoint of the resumed sync, or a new, empty checkpoint for `update_tag`.
+    """
+    if resume and os.path.exists(path):
+        checkpoint = Checkpoint.load(path)
+        logger.info(
+            "Resuming sync with update tag '%d' from checkpoint '%s', skipping %d completed units of work.",
+            checkpoint.update_tag,
+            path,
+            len(checkpoint.completed),
+        )
+        return checkpoint
+    if resume:
+        logger.info("No checkpoint found at '%s', starting a new sync.", path)
+    checkpoint = Checkpoint(path, update_tag)
+    checkpoint.save()
+    return checkpoint
+
+
+# Set by cartography.sync.Sync.run() when `--checkpoint-file` is given
+_checkpoint: Optional[Checkpoint] = None
+
+
+def get_checkpoint() -> Optional[Checkpoint]:
+    return _checkpoint
+
+
+def set_checkpoint(checkpoint: Optional[Checkpoint]) -> None:
+    global _checkpoint
+    _checkpoint = checkpoint
+
+
+def is_unit_complete(*unit: str) -> bool:
+    """
+    :return: True if a checkpoint is active and the given unit of work completed in an earlier attempt of this sync.
+    """
+    return bool(_checkpoint and _checkpoint.is_complete(*unit))
+
+
+def mark_unit_complete(*unit: str) -> None:
+    """
+    Records the given unit of work as complete if a checkpoint is active.
+    """
+    if _checkpoint:
+        _checkpoint.mark_complete(*unit)
@@ -8,8 +8,6 @@ from typing import Optional
 import cartography.config
 import cartography.sync
 import cartography.util
-from cartography.intel.aws.util.common import parse_and_validate_aws_requested_syncs
-from cartography.intel.semgrep.dependencies import parse_and_validate_semgrep_ecosystems
 
 
 logger = logging.getLogger(__name__)
@@ -102,6 +100,44 @@ class CLI:
                 '.'
             ),
         )
+        parser.add_argument(
+            '--neo4j-max-connection-pool-size',
+            type=int,
+            default=None,
+            help=(
+                'Maximum number of connections per Neo4j host that the driver keeps in its pool. Raise this when '
+                'running many concurrent jobs, e.g. with --analysis-job-concurrency. Defaults to the driver default '
+                'of 100.'
+            ),
+        )
+        parser.add_argument(
+            '--neo4j-connection-acquisition-timeout',
+            type=int,
+            default=None,
+            help=(
+                'Time in seconds to wait for a free connection from the Neo4j driver\'s pool before failing. Defaults '
+                'to the driver default of 60.'
+            ),
+        )
+        parser.add_argument(
+            '--neo4j-fetch-size',
+            type=int,
+            default=None,
+            help=(
+                'Number of records to fetch from Neo4j per batch when reading query results. Defaults to the driver '
+                'default of 1000.'
+            ),
+        )
+        parser.add_argument(
+            '--neo4j-routing',
+            action='store_true',
+            help=(
+                'If set, connect to --neo4j-uri with its routing scheme, e.g. neo4j:// instead of bolt://, so that the '
+                'driver sends writes to the leader of a Neo4j cluster and read-only queries, such as reading back '
+                'AWS principals for permission relationships, to followers. URIs that already use neo4j:// route '
+                'without this flag.'
+            ),
+        )
         parser.add_argument(
             '--neo4j-database',
             type=str,
@@ -138,6 +174,102 @@ class CLI:
                 'removed from the graph. By default, cartography will use a UNIX timestamp as the update tag.'
             ),
         )
+        parser.add_argument(
+            '--extract-to',
+            type=str,
+            default=None,
+            help=(
+                'Extract mode. Run the intel modules without connecting to Neo4j and record every write to this '
+                'directory as compressed JSON-lines files instead: the records that intel modules load through the '
+                'schema-based `load()` API, all cleanup and analysis jobs, and any hand-written Cypher. Modules that '
+                'read the graph, such as the EC2 image sync, are not supported and fail the sync. Replay the '
+                'directory into a database later with --load-from.'
+            ),
+        )
+        parser.add_argument(
+            '--load-from',
+            type=str,
+            default=None,
+            help=(
+                'Load-from-snapshot mode. Instead of running intel modules, replay a directory written with '
+                '--extract-to into Neo4j, including its cleanup and analysis jobs. Cannot be combined with '
+                '--extract-to or --selected-modules.'
+            ),
+        )
+        parser.add_argument(
+            '--skip-unchanged-writes',
+            action='store_true',
+            help=(
+                'If set, schema-based loads store a hash of each node\'s properties on the node and only update '
+                '`lastupdated` on nodes whose properties have not changed since the previous sync, which greatly '
+                'reduces write volume on steady-state runs. The first sync with this flag still rewrites every node.'
+            ),
+        )
+        parser.add_argument(
+            '--indexed-cleanup',
+            action='store_true',
+            help=(
+                'If set, cleanup jobs built from node schemas seek the stale nodes and relationships of the synced '
+                'account, project or tenant in range indexes on `_cleanup_scope` and `lastupdated`, so that cleanup '
+                'cost follows the amount of stale data of that account instead of the total size of the graph. Loads '
+                'set `_cleanup_scope` only while this is enabled. The indexes are created when missing, and '
+                '`_cleanup_scope` is backfilled once, when the index of a node type is created.'
+            ),
+        )
+        parser.add_argument(
+            '--checkpoint-file',
+            type=str,
+            default=None,
+            help=(
+                'Record the sync stages, AWS accounts and modules, and GCP projects and modules that complete during '
+                'the sync in this JSON file, together with the update tag. The file is removed when the sync '
+                'completes. Use with --resume to continue a sync that failed.'
+            ),
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help=(
+                'If set and the --checkpoint-file exists, resume the sync recorded in it: reuse its update tag, which '
+                'overrides --update-tag, and skip the units of work that already completed. If the file does not '
+                'exist, a new sync starts. Requires --checkpoint-file.'
+            ),
+        )
+        parser.add_argument(
+            '--metrics-report-dir',
+            type=str,
+            default=None,
+            help=(
+                'If set, record wall time, API calls, rows loaded and Neo4j write counters per sync stage, intel '
+                'module, node schema and sub resource during the sync, and write them to metrics.json and metrics.md '
+                'in this directory at the end of the sync. Does not need a statsd server.'
+            ),
+        )
+        parser.add_argument(
+            '--metrics-report-openmetrics',
+            action='store_true',
+            help=(
+                'If set together with --metrics-report-dir, also write the metrics in the OpenMetrics text format to '
+                'metrics.prom, e.g. for the Prometheus node exporter textfile collector.'
+            ),
+        )
+        parser.add_argument(
+            '--create-indexes-dry-run',
+            action='store_true',
+            help=(
+                'If set, the `create-indexes` module only logs the index statements that are missing from the database '
+                'instead of executing them.'
+            ),
+        )
+        parser.add_argument(
+            '--create-indexes-await-timeout',
+            type=int,
+            default=None,
+            help=(
+                'If set, the `create-indexes` module waits up to this many seconds (using `db.awaitIndexes`) for newly '
+                'created indexes to come online before the sync continues. By default cartography does not wait.'
+            ),
+        )
         parser.add_argument(
             '--aws-sync-all-profiles',
             action='store_true',
@@ -161,6 +293,25 @@ class CLI:
                 'syncing other accounts and delay raising an exception until the very end.'
             ),
         )
+        parser.add_argument(
+            '--aws-iam-authorization-details',
+            action='store_true',
+            help=(
+                'Fetch IAM users, groups, roles, their inline and managed policies and group memberships with the '
+                'paginated GetAccountAuthorizationDetails API instead of several API calls per principal and policy. '
+                'Requires the iam:GetAccountAuthorizationDetails permission, which is part of SecurityAudit.'
+            ),
+        )
+        parser.add_argument(
+            '--aws-managed-policy-cache-file',
+            type=str,
+            default=None,
+            help=(
+                'Path to a JSON file that keeps the documents of AWS managed IAM policies between syncs. The documents '
+                'of managed policies are always shared by all accounts of a sync; with this option, a sync only calls '
+                'GetPolicyVersion for AWS managed policy versions that no earlier sync has seen.'
+            ),
+        )
         parser.add_argument(
             '--oci-sync-all-profiles',
             action='store_true',
@@ -211,6 +362,16 @@ class CLI:
                 'The name of environment variable containing Azure Client Secret for Service Principal Authentication.'
             ),
         )
+        parser.add_argument(
+            '--azure-subscription-concurrency',
+            type=int,
+            default=4,
+            help=(
+                'The maximum number of Azure subscriptions to sync at the same time when syncing more than one '
+                'subscription, e.g. with --azure-sync-all-subscriptions. Each subscription is synced on its own Neo4j '
+                'session. Set to 1 to sync subscriptions one by one. Defaults to 4.'
+            ),
+        )
         parser.add_argument(
             '--aws-requested-syncs',
             type=str,
@@ -233,6 +394,16 @@ class CLI:
                 'jobs are executed.'
             ),
         )
+        parser.add_argument(
+            '--analysis-job-concurrency',
+            type=int,
+            default=4,
+            help=(
+                'The maximum number of analysis jobs to run at the same time, each on its own Neo4j session. Only jobs '
+                'that declare "reads" and "writes" node labels that do not conflict with each other run concurrently; '
+                'all other jobs run one at a time. Set to 1 to run all analysis jobs serially. Defaults to 4.'
+            ),
+        )
         parser.add_argument(
             '--okta-org-id',
             type=str,
@@ -596,12 +767,22 @@ class CLI:
         else:
             config.neo4j_password = None
 
+        if config.resume and not config.checkpoint_file:
+            raise ValueError('--resume requires --checkpoint-file.')
+
         # Selected modules
-        if config.selected_modules:
+        if config.load_from:
+            if config.extract_to or config.selected_modules:
+                raise ValueError('--load-from cannot be combined with --extract-to or --selected-modules.')
+            self.sync = cartography.sync.build_load_from_snapshot_sync()
+        elif config.selected_modules:
             self.sync = cartography.sync.build_sync(config.selected_modules)
 
         # AWS config
         if config.aws_requested_syncs:
+            # Imported here so that the AWS intel modules are only loaded when they are used, see
+            # cartography.sync.LazyStage.
+            from cartography.intel.aws.util.common import parse_and_validate_aws_requested_syncs
             # No need to store the returned value; we're using this for input validation.
             parse_and_validate_aws_requested_syncs(config.aws_requested_syncs)
 
@@ -748,6 +929,7 @@ class CLI:
         else:
             config.semgrep_app_token = None
         if config.semgrep_dependency_ecosystems:
+            from cartography.intel.semgrep.dependencies import parse_and_validate_semgrep_ecosystems
             # No need to store the returned value; we're using this for input validation.
             parse_and_validate_semgrep_ecosystems(config.semgrep_dependency_ecosystems)
 
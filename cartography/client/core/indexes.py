@@ -0,0 +1,206 @@
+import logging
+import re
+import threading
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import neo4j
+
+from cartography.stats import get_stats_client
+
+logger = logging.getLogger(__name__)
+stat_handler = get_stats_client(__name__)
+
+# Matches the index statements produced by cartography.graph.querybuilder.build_create_index_queries() and found in
+# cartography/data/indexes.cypher, e.g. `CREATE INDEX IF NOT EXISTS FOR (n:AWSAccount) ON (n.id);`
+_CREATE_INDEX_PATTERN = re.compile(
+    r'^CREATE INDEX IF NOT EXISTS FOR \(n:(?P<label>\w+)\) ON \(n\.(?P<property>\w+)\);?$',
+)
+# Matches the text index statements produced by build_create_index_queries() for the shadow properties of fuzzy
+# matchers, e.g. `CREATE TEXT INDEX IF NOT EXISTS FOR (n:AWSRole) ON (n._lc_arn);`
+_CREATE_TEXT_INDEX_PATTERN = re.compile(
+    r'^CREATE TEXT INDEX IF NOT EXISTS FOR \(n:(?P<label>\w+)\) ON \(n\.(?P<property>\w+)\);?$',
+)
+# Matches the composite node and relationship index statements produced by
+# cartography.graph.cleanupbuilder.build_cleanup_index_queries(), e.g.
+# `CREATE INDEX IF NOT EXISTS FOR (n:EC2Instance) ON (n._cleanup_scope, n.lastupdated);` and
+# `CREATE INDEX IF NOT EXISTS FOR ()-[r:RESOURCE]-() ON (r._cleanup_scope, r.lastupdated);`
+_CREATE_COMPOSITE_INDEX_PATTERN = re.compile(
+    r'^CREATE INDEX IF NOT EXISTS FOR \(n:(?P<label>\w+)\) ON \((?P<properties>n\.\w+(?:, n\.\w+)+)\);?$',
+)
+_CREATE_REL_INDEX_PATTERN = re.compile(
+    r'^CREATE INDEX IF NOT EXISTS FOR \(\)-\[r:(?P<type>\w+)\]-\(\) ON \((?P<properties>r\.\w+(?:, r\.\w+)*)\);?$',
+)
+
+# (label, property) for node indexes. Relationship indexes use the relationship type in square brackets as label, e.g.
+# ('[RESOURCE]', 'lastupdated'), and text indexes prefix the node label with 'TEXT:', e.g. ('TEXT:AWSRole', '_lc_arn'),
+# so that they never clash with a range index on a node label. Composite indexes join their properties with commas,
+# e.g. ('EC2Instance', '_cleanup_scope,lastupdated').
+IndexKey = Tuple[str, str]
+
+
+def _parse_properties(properties: str) -> str:
+    """
+    :return: The comma-joined property names of an index statement's `ON (...)` clause, e.g.
+    `_cleanup_scope,lastupdated` for `n._cleanup_scope, n.lastupdated`.
+    """
+    return ','.join(prop.strip().split('.', 1)[1] for prop in properties.split(','))
+
+
+def _rel_index_label(rel_type: str) -> str:
+    return f'[{rel_type}]'
+
+
+def _text_index_label(label: str) -> str:
+    return f'TEXT:{label}'
+
+
+def parse_create_index_query(query: str) -> Optional[IndexKey]:
+    """
+    :param query: A `CREATE INDEX IF NOT EXISTS FOR (n:$Label) ON (n.$property)`,
+    `CREATE INDEX IF NOT EXISTS FOR ()-[r:$TYPE]-() ON (r.$property)` or
+    `CREATE TEXT INDEX IF NOT EXISTS FOR (n:$Label) ON (n.$property)` statement, or a node or relationship statement
+    of the same shape on several properties.
+    :return: The (label, property) pair that the statement indexes, or None if the statement does not have the single
+    label shape that cartography generates.
+    """
+    query = query.strip()
+    match = _CREATE_INDEX_PATTERN.match(query)
+    if match:
+        return match.group('label'), match.group('property')
+    match = _CREATE_COMPOSITE_INDEX_PATTERN.match(query)
+    if match:
+        return match.group('label'), _parse_properties(match.group('properties'))
+    match = _CREATE_REL_INDEX_PATTERN.match(query)
+    if match:
+        return _rel_index_label(match.group('type')), _parse_properties(match.group('properties'))
+    match = _CREATE_TEXT_INDEX_PATTERN.match(query)
+    if match:
+        return _text_index_label(match.group('label')), match.group('property')
+    return None
+
+
+def get_existing_indexes(neo4j_session: neo4j.Session) -> Set[IndexKey]:
+    """
+    :return: The (label, property) pairs of all single label node, relationship and text indexes present in the
+    database.
+    """
+    result = neo4j_session.run(
+        """
+        SHOW INDEXES YIELD type, entityType, labelsOrTypes, properties
+        WHERE entityType IN ['NODE', 'RELATIONSHIP'] AND type <> 'FULLTEXT'
+        RETURN type, entityType, labelsOrTypes, properties
+        """,
+    )
+    existing = set()
+    for record in result:
+        labels, properties = record['labelsOrTypes'], record['properties']
+        if labels and properties and len(labels) == 1:
+            if record['entityType'] == 'RELATIONSHIP':
+                label = _rel_index_label(labels[0])
+            elif record['type'] == 'TEXT':
+                label = _text_index_label(labels[0])
+            else:
+                label = labels[0]
+            existing.add((label, ','.join(properties)))
+    return existing
+
+
+class IndexRegistry:
+    """
+    Remembers which (label, property) node indexes are known to exist so that `CREATE INDEX IF NOT EXISTS` statements
+    are only sent to Neo4j once per process instead of on every call to `cartography.client.core.tx.load()`.
+
+    The registry is seeded from `SHOW INDEXES` the first time it is used (or explicitly via `refresh()` at the start of
+    a sync) and is shared by all threads in the process.
+    """
+
+    def __init__(self) -> None:
+        self._known: Set[IndexKey] = set()
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.created = 0
+        self.skipped = 0
+
+    def refresh(self, neo4j_session: neo4j.Session) -> None:
+        """
+        Replaces the registry contents with the indexes currently present in the database.
+        """
+        try:
+            existing = get_existing_indexes(neo4j_session)
+        except neo4j.exceptions.ClientError:
+            # Older Neo4j versions do not support SHOW INDEXES; fall back to issuing every statement once.
+            logger.warning("Unable to list existing indexes with SHOW INDEXES.", exc_info=True)
+            existing = set()
+        with self._lock:
+            self._known = existing
+            self._loaded = True
+        logger.debug(f"Index registry loaded {len(existing)} existing indexes.")
+
+    def get_missing(self, queries: Iterable[str]) -> List[str]:
+        """
+        :return: The subset of the given `CREATE INDEX` statements whose indexes are not known to exist, without
+        duplicates. Statements that cannot be parsed are always returned.
+        """
+        missing = []
+        seen: Set[IndexKey] = set()
+        with self._lock:
+            for query in queries:
+                key = parse_create_index_query(query)
+                if key is None:
+                    missing.append(query)
+                elif key not in self._known and key not in seen:
+                    seen.add(key)
+                    missing.append(query)
+        return missing
+
+    def ensure(self, neo4j_session: neo4j.Session, queries: List[str]) -> int:
+        """
+        Runs only the `CREATE INDEX IF NOT EXISTS` statements in `queries` that this process has not already ensured,
+        all in a single transaction.
+        :return: The number of statements that were sent to Neo4j.
+        """
+        if not self._loaded:
+            self.refresh(neo4j_session)
+
+        missing = self.get_missing(queries)
+        skipped = len(queries) - len(missing)
+        if missing:
+            neo4j_session.write_transaction(_create_indexes_tx, missing)
+
+        with self._lock:
+            for query in missing:
+                key = parse_create_index_query(query)
+                if key:
+                    self._known.add(key)
+            self.created += len(missing)
+            self.skipped += skipped
+        stat_handler.incr('index_statements_created', len(missing))
+        stat_handler.incr('index_statements_skipped', skipped)
+        return len(missing)
+
+    def reset(self) -> None:
+        """
+        Forgets all known indexes and counters. The next call to `ensure()` re-reads `SHOW INDEXES`.
+        """
+        with self._lock:
+            self._known = set()
+            self._loaded = False
+            self.created = 0
+            self.skipped = 0
+
+
+def _create_indexes_tx(tx: neo4j.Transaction, queries: List[str]) -> None:
+    for query in queries:
+        tx.run(query).consume()
+
+
+# Process-wide registry used by cartography.client.core.tx.ensure_indexes()
+_index_registry = IndexRegistry()
+
+
+def get_index_registry() -> IndexRegistry:
+    return _index_registry
@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+from typing import Iterator
+from typing import Optional
+
+import neo4j
+
+from cartography.client.core.snapshot import get_snapshot_writer
+from cartography.client.core.snapshot import RecordingSession
+
+# Direct connection URI schemes and their routing equivalents, see
+# https://neo4j.com/docs/api/python-driver/4.4/api.html#uri
+_ROUTING_SCHEMES = {
+    'bolt': 'neo4j',
+    'bolt+s': 'neo4j+s',
+    'bolt+ssc': 'neo4j+ssc',
+}
+
+
+def get_routing_uri(uri: str) -> str:
+    """
+    :return: The given Neo4j URI with a routing scheme, so that the driver discovers the members of a cluster and sends
+    write sessions to the leader and read sessions to followers and read replicas. URIs that already use a routing
+    scheme are returned unchanged.
+    """
+    scheme, separator, rest = uri.partition('://')
+    if not separator or scheme not in _ROUTING_SCHEMES:
+        return uri
+    return f'{_ROUTING_SCHEMES[scheme]}://{rest}'
+
+
+class SessionFactory:
+    """
+    Opens new Neo4j sessions for the database that a sync runs against. Sync stages receive a single session; code that
+    wants to run work on several sessions at once, such as cartography.graph.jobscheduler, or that wants to send reads
+    to cluster followers, gets new ones from here. While a snapshot writer is active, the sync has no database and every
+    session handed out is a RecordingSession.
+    """
+
+    def __init__(
+        self,
+        driver: Optional[neo4j.Driver],
+        database: Optional[str] = None,
+        fetch_size: Optional[int] = None,
+    ):
+        """
+        :param driver: The Neo4j driver to open sessions with. Pool size and acquisition timeout are set on the driver.
+        None in extract mode.
+        :param database: The Neo4j database to open sessions on. If None, the driver's default database is used.
+        :param fetch_size: The number of records to fetch per batch when reading results. If None, the driver's
+        default is used.
+        """
+        self.driver = driver
+        self.database = database
+        self.fetch_size = fetch_size
+
+    def _session(self, **kwargs) -> neo4j.Session:
+        snapshot_writer = get_snapshot_writer()
+        if snapshot_writer:
+            return RecordingSession(snapshot_writer)
+        if not self.driver:
+            raise ValueError("SessionFactory needs a Neo4j driver outside of extract mode.")
+        if self.fetch_size:
+            kwargs['fetch_size'] = self.fetch_size
+        return self.driver.session(database=self.database, **kwargs)
+
+    def __call__(self) -> neo4j.Session:
+        """
+        :return: A new session for reads and writes. With a routing driver, it is served by the cluster leader.
+        """
+        return self._session(default_access_mode=neo4j.WRITE_ACCESS)
+
+    def read_session(self, after: Optional[neo4j.Session] = None) -> neo4j.Session:
+        """
+        :param after: If given, the new session sees every transaction committed by this session, even when it is
+        served by a follower that has not caught up yet.
+        :return: A new read-only session. With a routing driver, it is served by followers and read replicas, which
+        takes load off the leader that the sync writes to.
+        """
+        bookmark = after.last_bookmark() if after else None
+        return self._session(default_access_mode=neo4j.READ_ACCESS, bookmarks=[bookmark] if bookmark else None)
+
+
+# Set by cartography.sync.Sync.run() for the duration of a sync
+_session_factory: Optional[SessionFactory] = None
+
+
+def get_session_factory() -> Optional[SessionFactory]:
+    return _session_factory
+
+
+def set_session_factory(session_factory: Optional[SessionFactory]) -> None:
+    global _session_factory
+    _session_factory = session_factory
+
+
+@contextmanager
+def read_session(neo4j_session: neo4j.Session) -> Iterator[neo4j.Session]:
+    """
+    Use for large read-only queries, such as reading back the data of earlier sync steps. Yields a new read session
+    from the session factory that sees everything written on `neo4j_session`, or `neo4j_session` itself if no session
+    factory is set.
+    """
+    session_factory = get_session_factory()
+    if not session_factory:
+        yield neo4j_session
+        return
+    with session_factory.read_session(after=neo4j_session) as new_session:
+        yield new_session
@@ -0,0 +1,244 @@
+"""
+Snapshots split API fetching from graph writes.
+
+When a snapshot writer is active (`--extract-to DIR`), the sync runs without a database and records every write under
+DIR instead:
+
+- each call to `cartography.client.core.tx.load()` is recorded as a gzip-compressed JSON-lines file of its records;
+- each `GraphJob` (cleanup or analysis) is recorded as its statements;
+- any other Cypher run through a session, such as hand-written queries in older intel modules, is recorded by
+  RecordingSession as the query and its parameters. SessionFactory hands out RecordingSessions as well, so Cypher run
+  on new sessions is recorded too.
+
+Intel modules that read the graph, e.g. to find the AMIs in use, raise ExtractModeReadError and are not supported in
+extract mode.
+
+DIR/manifest.jsonl keeps the order of these entries so that `cartography.intel.snapshot` can later replay them against
+another database with `--load-from DIR`.
+"""
+import datetime
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from cartography.models.core.nodes import CartographyNodeSchema
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'manifest.jsonl'
+
+# kwargs that are the same for every load in a run and so are not useful in a snapshot file name
+_IGNORED_NAME_KWARGS = {'lastupdated', 'UPDATE_TAG', 'update_tag'}
+
+
+class SnapshotJSONEncoder(json.JSONEncoder):
+    """
+    Support JSON serialization for the non-JSON types found in intel module records, so that they are restored with
+    the same type when a snapshot is replayed.
+    """
+
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, datetime.datetime):
+            return {'__datetime__': obj.isoformat()}
+        if isinstance(obj, datetime.date):
+            return {'__date__': obj.isoformat()}
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        # Let the default encoder roll up the exception.
+        return json.JSONEncoder.default(self, obj)
+
+
+def snapshot_object_hook(obj: Dict[str, Any]) -> Any:
+    """
+    `object_hook` for json.loads() that reverses SnapshotJSONEncoder.
+    """
+    if len(obj) == 1:
+        if '__datetime__' in obj:
+            return datetime.datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return datetime.date.fromisoformat(obj['__date__'])
+    return obj
+
+
+def _describe_kwargs(kwargs: Dict[str, Any]) -> str:
+    """
+    Builds a file-name-safe description of the sub resource a load belongs to, e.g. `AWS_ID-1234_Region-us-east-1`.
+    """
+    parts = [
+        f'{key}-{value}' for key, value in sorted(kwargs.items())
+        if key not in _IGNORED_NAME_KWARGS and isinstance(value, (str, int))
+    ]
+    return re.sub(r'[^A-Za-z0-9_.=-]', '_', '_'.join(parts))[:120]
+
+
+class SnapshotWriter:
+    """
+    Writes schema-based loads and graph jobs to a snapshot directory.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._manifest = open(os.path.join(directory, MANIFEST_FILENAME), 'w')
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def _append_manifest(self, entry: Dict[str, Any]) -> None:
+        self._manifest.write(json.dumps(entry, cls=SnapshotJSONEncoder) + '\n')
+        self._manifest.flush()
+
+    def write_load(self, node_schema: CartographyNodeSchema, dict_list: List[Dict[str, Any]], **kwargs: Any) -> None:
+        with self._lock:
+            self._sequence += 1
+            description = _describe_kwargs(kwargs)
+            file_stem = f'{self._sequence:06d}-{description}' if description else f'{self._sequence:06d}'
+            file_name = f'{file_stem}.jsonl.gz'
+            relative_path = os.path.join(node_schema.label, file_name)
+            os.makedirs(os.path.join(self.directory, node_schema.label), exist_ok=True)
+            with gzip.open(os.path.join(self.directory, relative_path), 'wt') as f:
+                for record in dict_list:
+                    f.write(json.dumps(record, cls=SnapshotJSONEncoder) + '\n')
+            schema_class = type(node_schema)
+            self._append_manifest({
+                'type': 'load',
+                'schema': f'{schema_class.__module__}.{schema_class.__qualname__}',
+                'kwargs': kwargs,
+                'file': relative_path,
+                'count': len(dict_list),
+            })
+
+    def write_job(self, job_dict: Dict[str, Any]) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._append_manifest({'type': 'job', 'job': job_dict})
+
+    def write_query(self, query: str, parameters: Dict[str, Any]) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._append_manifest({'type': 'query', 'query': query, 'parameters': parameters})
+
+    def close(self) -> None:
+        with self._lock:
+            self._manifest.close()
+
+
+class ExtractModeReadError(Exception):
+    """
+    Raised when an intel module reads the graph during an extract run, which has no database to read from. Modules
+    that read back what earlier modules wrote, such as the EC2 image sync, are not supported with `--extract-to`.
+    """
+
+
+class _RecordedResult:
+    """
+    The result of a query run in extract mode. It can be consumed like the result of a write, but reading its records
+    raises ExtractModeReadError since the query never ran.
+    """
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+
+    def _read(self, *args: Any, **kwargs: Any) -> Any:
+        raise ExtractModeReadError(f'Cannot read the results of a query in extract mode: {self.query.strip()}')
+
+    __iter__ = single = data = value = values = peek = graph = keys = _read
+
+    def consume(self) -> None:
+        return None
+
+
+class _RecordingTransaction:
+    """
+    Stands in for the transaction of RecordingSession.write_transaction() and keeps the queries run in it, so that they
+    are only recorded if the transaction function returns.
+    """
+
+    def __init__(self) -> None:
+        self.queries: List[Dict[str, Any]] = []
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> _RecordedResult:
+        self.queries.append({'query': query, 'parameters': {**(parameters or {}), **kwargs}})
+        return _RecordedResult(query)
+
+
+class RecordingSession:
+    """
+    The session that intel modules get while a snapshot writer is active. Extract mode runs without a database, so
+    Cypher run outside `load()` and `GraphJob`, such as hand-written queries in older intel modules, is recorded to the
+    snapshot instead of being run. Reading the graph raises ExtractModeReadError.
+    """
+
+    def __init__(self, writer: SnapshotWriter) -> None:
+        self._writer = writer
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> _RecordedResult:
+        self._writer.write_query(query, {**(parameters or {}), **kwargs})
+        return _RecordedResult(query)
+
+    def write_transaction(self, transaction_function: Callable, *args: Any, **kwargs: Any) -> Any:
+        tx = _RecordingTransaction()
+        result = transaction_function(tx, *args, **kwargs)
+        for entry in tx.queries:
+            self._writer.write_query(entry['query'], entry['parameters'])
+        return result
+
+    def read_transaction(self, transaction_function: Callable, *args: Any, **kwargs: Any) -> Any:
+        raise ExtractModeReadError(
+            f'Cannot run read transaction {getattr(transaction_function, "__name__", transaction_function)} in '
+            'extract mode.',
+        )
+
+    def last_bookmark(self) -> None:
+        return None
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'RecordingSession':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_manifest(directory: str) -> Iterator[Dict[str, Any]]:
+    with open(os.path.join(directory, MANIFEST_FILENAME)) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line, object_hook=snapshot_object_hook)
+
+
+def read_records(directory: str, relative_path: str) -> List[Dict[str, Any]]:
+    with gzip.open(os.path.join(directory, relative_path), 'rt') as f:
+        return [json.loads(line, object_hook=snapshot_object_hook) for line in f if line.strip()]
+
+
+# Set while a sync runs with `--extract-to`
+_snapshot_writer: Optional[SnapshotWriter] = None
+
+
+def get_snapshot_writer() -> Optional[SnapshotWriter]:
+    return _snapshot_writer
+
+
+def start_extract(directory: str) -> SnapshotWriter:
+    global _snapshot_writer
+    logger.info(f"Extract mode: recording graph writes to '{directory}'.")
+    _snapshot_writer = SnapshotWriter(directory)
+    return _snapshot_writer
+
+
+def stop_extract() -> None:
+    global _snapshot_writer
+    if _snapshot_writer:
+        _snapshot_writer.close()
+    _snapshot_writer = None
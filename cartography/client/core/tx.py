@@ -1,3 +1,6 @@
+import hashlib
+import json
+from dataclasses import asdict
 from typing import Any
 from typing import Dict
 from typing import List
@@ -7,11 +10,25 @@ from typing import Union
 
 import neo4j
 
+from cartography.client.core.indexes import get_index_registry
+from cartography.client.core.snapshot import get_snapshot_writer
+from cartography.graph.job import get_indexed_cleanup
 from cartography.graph.querybuilder import build_create_index_queries
 from cartography.graph.querybuilder import build_ingestion_query
+from cartography.graph.querybuilder import CONTENT_HASH_FIELD
+from cartography.metrics import get_metrics_collector
+from cartography.metrics import metrics_scope
 from cartography.models.core.nodes import CartographyNodeSchema
 from cartography.util import batch
 
+# Set by `--skip-unchanged-writes`, see load().
+_skip_unchanged_writes = False
+
+
+def set_skip_unchanged_writes(enabled: bool) -> None:
+    global _skip_unchanged_writes
+    _skip_unchanged_writes = enabled
+
 
 def read_list_of_values_tx(tx: neo4j.Transaction, query: str, **kwargs) -> List[Union[str, int]]:
     """
@@ -157,7 +174,7 @@ def write_list_of_dicts_tx(
         tx: neo4j.Transaction,
         query: str,
         **kwargs,
-) -> None:
+) -> neo4j.ResultSummary:
     """
     Writes a list of dicts to Neo4j.
 
@@ -186,9 +203,9 @@ def write_list_of_dicts_tx(
     :param tx: The neo4j write transaction.
     :param query: The Neo4j write query to run.
     :param kwargs: Keyword args to be supplied to the Neo4j query.
-    :return: None
+    :return: The summary of the query, which holds counters of the changes made to the graph.
     """
-    tx.run(query, kwargs)
+    return tx.run(query, kwargs).consume()
 
 
 def load_graph_data(
@@ -206,13 +223,17 @@ def load_graph_data(
     :param kwargs: Allows additional keyword args to be supplied to the Neo4j query.
     :return: None
     """
+    metrics_collector = get_metrics_collector()
     for data_batch in batch(dict_list, size=10000):
-        neo4j_session.write_transaction(
+        summary = neo4j_session.write_transaction(
             write_list_of_dicts_tx,
             query,
             DictList=data_batch,
             **kwargs,
         )
+        if metrics_collector:
+            metrics_collector.incr('rows_loaded', len(data_batch))
+            metrics_collector.add_neo4j_counters(summary.counters)
 
 
 def ensure_indexes(neo4j_session: neo4j.Session, node_schema: CartographyNodeSchema) -> None:
@@ -223,15 +244,71 @@ def ensure_indexes(neo4j_session: neo4j.Session, node_schema: CartographyNodeSch
 
     This ensures that every time we need to MATCH on a node to draw a relationship to it, the field used for the MATCH
     will be indexed, making the operation fast.
+
+    Indexes already present in the database or already ensured by this process are skipped, see
+    cartography.client.core.indexes.IndexRegistry.
     :param neo4j_session: The neo4j session
     :param node_schema: The node_schema object to create indexes for.
     """
     queries = build_create_index_queries(node_schema)
 
     for query in queries:
-        if not query.startswith('CREATE INDEX IF NOT EXISTS'):
-            raise ValueError('Query provided to `ensure_indexes()` does not start with "CREATE INDEX IF NOT EXISTS".')
-        neo4j_session.run(query)
+        if not query.startswith(('CREATE INDEX IF NOT EXISTS', 'CREATE TEXT INDEX IF NOT EXISTS')):
+            raise ValueError(
+                'Query provided to `ensure_indexes()` does not start with "CREATE INDEX IF NOT EXISTS" or '
+                '"CREATE TEXT INDEX IF NOT EXISTS".',
+            )
+    get_index_registry().ensure(neo4j_session, queries)
+
+
+def add_content_hashes(
+        node_schema: CartographyNodeSchema,
+        dict_list: List[Dict[str, Any]],
+        **kwargs,
+) -> List[Dict[str, Any]]:
+    """
+    Returns copies of the given dicts with a `_content_hash` field: a stable hash of the values that node_schema's
+    properties take for that dict, not counting `lastupdated`, and of a fingerprint of node_schema, its labels and
+    property names. A change to the schema, such as a new property or extra label, therefore changes every hash, so
+    that the next load rewrites all nodes instead of skipping them. These are the dicts expected by the query from
+    `build_ingestion_query(node_schema, skip_unchanged=True)`.
+    :param node_schema: The CartographyNodeSchema that the dicts will be loaded with.
+    :param dict_list: The data to load to the graph represented as a list of dicts.
+    :param kwargs: The keyword args that will be supplied to the Neo4j query.
+    :return: The dicts with a `_content_hash` field added.
+    """
+    property_refs = [
+        (name, ref) for name, ref in asdict(node_schema.properties).items() if name != 'lastupdated'
+    ]
+    labels = [node_schema.label]
+    if node_schema.extra_node_labels:
+        labels.extend(node_schema.extra_node_labels.labels)
+    schema_fingerprint = {'labels': labels, 'properties': sorted(name for name, _ in property_refs)}
+    result = []
+    for item in dict_list:
+        values = {
+            name: kwargs.get(ref.name) if ref.set_in_kwargs else item.get(ref.name)
+            for name, ref in property_refs
+        }
+        serialized = json.dumps({'schema': schema_fingerprint, 'values': values}, sort_keys=True, default=str)
+        result.append({**item, CONTENT_HASH_FIELD: hashlib.sha256(serialized.encode('utf-8')).hexdigest()})
+    return result
+
+
+def get_sub_resource_id(node_schema: CartographyNodeSchema, **kwargs) -> Optional[str]:
+    """
+    :return: The sub resource that a load of node_schema with the given kwargs belongs to, e.g. `AWSAccount:1234`, or
+    None if node_schema has no sub resource relationship or its matcher does not come from kwargs.
+    """
+    sub_resource = node_schema.sub_resource_relationship
+    if not sub_resource:
+        return None
+    values = [
+        str(kwargs.get(ref.name)) for ref in asdict(sub_resource.target_node_matcher).values() if ref.set_in_kwargs
+    ]
+    if not values:
+        return None
+    return f"{sub_resource.target_node_label}:{'/'.join(values)}"
 
 
 def load(
@@ -243,6 +320,8 @@ def load(
     """
     Main entrypoint for intel modules to write data to the graph. Ensures that indexes exist for the datatypes loaded
     to the graph and then performs the load operation.
+    With `--skip-unchanged-writes`, nodes whose properties have not changed since the last load only get their
+    `lastupdated` property updated.
     :param neo4j_session: The Neo4j session
     :param node_schema: The CartographyNodeSchema object to create indexes for and generate a query.
     :param dict_list: The data to load to the graph represented as a list of dicts.
@@ -252,6 +331,18 @@ def load(
     if len(dict_list) == 0:
         # If there is no data to load, save some time.
         return
+    snapshot_writer = get_snapshot_writer()
+    if snapshot_writer:
+        # Extract mode: record the data for a later `--load-from` run instead of writing it to the graph.
+        snapshot_writer.write_load(node_schema, dict_list, **kwargs)
+        return
     ensure_indexes(neo4j_session, node_schema)
-    ingestion_query = build_ingestion_query(node_schema)
-    load_graph_data(neo4j_session, ingestion_query, dict_list, **kwargs)
+    if _skip_unchanged_writes:
+        ingestion_query = build_ingestion_query(
+            node_schema, skip_unchanged=True, indexed_cleanup=get_indexed_cleanup(),
+        )
+        dict_list = add_content_hashes(node_schema, dict_list, **kwargs)
+    else:
+        ingestion_query = build_ingestion_query(node_schema, indexed_cleanup=get_indexed_cleanup())
+    with metrics_scope(schema=node_schema.label, sub_resource=get_sub_resource_id(node_schema, **kwargs)):
+        load_graph_data(neo4j_session, ingestion_query, dict_list, **kwargs)
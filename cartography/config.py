@@ -15,6 +15,17 @@ class Config:
     :type neo4j_max_connection_lifetime: int
     :param neo4j_max_connection_lifetime: Time in seconds for Neo4j driver to consider a TCP connection alive.
         See https://neo4j.com/docs/driver-manual/1.7/client-applications/. Optional.
+    :type neo4j_max_connection_pool_size: int
+    :param neo4j_max_connection_pool_size: Maximum number of connections per Neo4j host that the driver keeps open.
+        Optional.
+    :type neo4j_connection_acquisition_timeout: int
+    :param neo4j_connection_acquisition_timeout: Time in seconds to wait for a free connection from the driver's pool.
+        Optional.
+    :type neo4j_fetch_size: int
+    :param neo4j_fetch_size: Number of records to fetch from Neo4j per batch when reading query results. Optional.
+    :type neo4j_routing: bool
+    :param neo4j_routing: If True, connect with the routing variant of the neo4j_uri scheme (e.g. neo4j:// instead of
+        bolt://) so that writes go to the cluster leader and read sessions to followers. Optional.
     :type neo4j_database: string
     :param neo4j_database: The name of the database in Neo4j to connect to. If not specified, uses your Neo4j database
     settings to infer which database is set to default.
@@ -23,12 +34,49 @@ class Config:
     :param selected_modules: Comma-separated list of cartography top-level modules to sync. Optional.
     :type update_tag: int
     :param update_tag: Update tag for a cartography sync run. Optional.
+    :type extract_to: str
+    :param extract_to: Directory to record schema-based loads, graph jobs and other Cypher writes to, instead of
+        writing them to Neo4j. The sync then runs without a database. Optional.
+    :type load_from: str
+    :param load_from: Directory of a snapshot written with extract_to to replay into Neo4j instead of running the
+        intel modules. Optional.
+    :type skip_unchanged_writes: bool
+    :param skip_unchanged_writes: If True, schema-based loads store a hash of each node's properties and only update
+        `lastupdated` on nodes whose hash has not changed. Optional.
+    :type indexed_cleanup: bool
+    :param indexed_cleanup: If True, cleanup jobs built from node schemas find stale nodes and relationships through
+        range indexes on their cleanup scope and `lastupdated` instead of reading every node of the sub resource.
+        Optional.
+    :type checkpoint_file: str
+    :param checkpoint_file: JSON file to record the completed sync stages, AWS accounts and GCP projects of the sync
+        in, so that a failed sync can be resumed. Removed when the sync completes. Optional.
+    :type resume: bool
+    :param resume: If True and checkpoint_file exists, continue the sync recorded in it: reuse its update tag and skip
+        the units of work that already completed. Optional.
+    :type metrics_report_dir: str
+    :param metrics_report_dir: Directory to write a JSON and Markdown report of per-stage, per-module and per-schema
+        timings, API calls and Neo4j write counters to at the end of the sync. Optional.
+    :type metrics_report_openmetrics: bool
+    :param metrics_report_openmetrics: If True, the metrics report is also written in the OpenMetrics text format.
+        Optional.
+    :type create_indexes_dry_run: bool
+    :param create_indexes_dry_run: If True, the create-indexes module only logs the missing index statements instead
+        of executing them. Optional.
+    :type create_indexes_await_timeout: int
+    :param create_indexes_await_timeout: Seconds the create-indexes module waits for new indexes to come online.
+        Optional.
     :type aws_sync_all_profiles: bool
     :param aws_sync_all_profiles: If True, AWS sync will run for all non-default profiles in the AWS_CONFIG_FILE. If
         False (default), AWS sync will run using the default credentials only. Optional.
     :type aws_best_effort_mode: bool
     :param aws_best_effort_mode: If True, AWS sync will not raise any exceptions, just log. If False (default),
         exceptions will be raised.
+    :type aws_iam_authorization_details: bool
+    :param aws_iam_authorization_details: If True, the IAM sync fetches users, groups, roles and their policies with
+        GetAccountAuthorizationDetails instead of several API calls per principal. Optional.
+    :type aws_managed_policy_cache_file: str
+    :param aws_managed_policy_cache_file: Path to a JSON file that keeps the documents of AWS managed IAM policies
+        between syncs. Optional.
     :type azure_sync_all_subscriptions: bool
     :param azure_sync_all_subscriptions: If True, Azure sync will run for all profiles in azureProfile.json. If
         False (default), Azure sync will run using current user session via CLI credentials. Optional.
@@ -41,10 +89,16 @@ class Config:
     :param azure_client_id: Client Id for connecting in a Service Principal Authentication approach. Optional.
     :type azure_client_secret: str
     :param azure_client_secret: Client Secret for connecting in a Service Principal Authentication approach. Optional.
+    :type azure_subscription_concurrency: int
+    :param azure_subscription_concurrency: Maximum number of Azure subscriptions to sync at the same time, each on its
+        own Neo4j session. Set to 1 to sync subscriptions one by one. Optional.
     :type aws_requested_syncs: str
     :param aws_requested_syncs: Comma-separated list of AWS resources to sync. Optional.
     :type analysis_job_directory: str
     :param analysis_job_directory: Path to a directory tree containing analysis jobs to run. Optional.
+    :type analysis_job_concurrency: int
+    :param analysis_job_concurrency: Maximum number of analysis jobs with non-conflicting "reads" and "writes" labels
+        to run at the same time. Optional.
     :type oci_sync_all_profiles: bool
     :param oci_sync_all_profiles: whether OCI will sync non-default profiles in OCI_CONFIG_FILE. Optional.
     :type okta_org_id: str
@@ -123,18 +177,36 @@ class Config:
         neo4j_user=None,
         neo4j_password=None,
         neo4j_max_connection_lifetime=None,
+        neo4j_max_connection_pool_size=None,
+        neo4j_connection_acquisition_timeout=None,
+        neo4j_fetch_size=None,
+        neo4j_routing=False,
         neo4j_database=None,
         selected_modules=None,
         update_tag=None,
+        extract_to=None,
+        load_from=None,
+        skip_unchanged_writes=False,
+        indexed_cleanup=False,
+        checkpoint_file=None,
+        resume=False,
+        metrics_report_dir=None,
+        metrics_report_openmetrics=False,
+        create_indexes_dry_run=False,
+        create_indexes_await_timeout=None,
         aws_sync_all_profiles=False,
         aws_best_effort_mode=False,
+        aws_iam_authorization_details=False,
+        aws_managed_policy_cache_file=None,
         azure_sync_all_subscriptions=False,
         azure_sp_auth=None,
         azure_tenant_id=None,
         azure_client_id=None,
         azure_client_secret=None,
+        azure_subscription_concurrency=4,
         aws_requested_syncs=None,
         analysis_job_directory=None,
+        analysis_job_concurrency=4,
         oci_sync_all_profiles=None,
         okta_org_id=None,
         okta_api_key=None,
@@ -181,18 +253,36 @@ class Config:
         self.neo4j_user = neo4j_user
         self.neo4j_password = neo4j_password
         self.neo4j_max_connection_lifetime = neo4j_max_connection_lifetime
+        self.neo4j_max_connection_pool_size = neo4j_max_connection_pool_size
+        self.neo4j_connection_acquisition_timeout = neo4j_connection_acquisition_timeout
+        self.neo4j_fetch_size = neo4j_fetch_size
+        self.neo4j_routing = neo4j_routing
         self.neo4j_database = neo4j_database
         self.selected_modules = selected_modules
         self.update_tag = update_tag
+        self.extract_to = extract_to
+        self.load_from = load_from
+        self.skip_unchanged_writes = skip_unchanged_writes
+        self.indexed_cleanup = indexed_cleanup
+        self.checkpoint_file = checkpoint_file
+        self.resume = resume
+        self.metrics_report_dir = metrics_report_dir
+        self.metrics_report_openmetrics = metrics_report_openmetrics
+        self.create_indexes_dry_run = create_indexes_dry_run
+        self.create_indexes_await_timeout = create_indexes_await_timeout
         self.aws_sync_all_profiles = aws_sync_all_profiles
         self.aws_best_effort_mode = aws_best_effort_mode
+        self.aws_iam_authorization_details = aws_iam_authorization_details
+        self.aws_managed_policy_cache_file = aws_managed_policy_cache_file
         self.azure_sync_all_subscriptions = azure_sync_all_subscriptions
         self.azure_sp_auth = azure_sp_auth
         self.azure_tenant_id = azure_tenant_id
         self.azure_client_id = azure_client_id
         self.azure_client_secret = azure_client_secret
+        self.azure_subscription_concurrency = azure_subscription_concurrency
         self.aws_requested_syncs = aws_requested_syncs
         self.analysis_job_directory = analysis_job_directory
+        self.analysis_job_concurrency = analysis_job_concurrency
         self.oci_sync_all_profiles = oci_sync_all_profiles
         self.okta_org_id = okta_org_id
         self.okta_api_key = okta_api_key
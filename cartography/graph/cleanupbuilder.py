@@ -4,6 +4,8 @@ from typing import Dict
 from typing import List
 
 from cartography.graph.querybuilder import _build_match_clause
+from cartography.graph.querybuilder import CLEANUP_SCOPE_FIELD
+from cartography.graph.querybuilder import get_cleanup_scope
 from cartography.graph.querybuilder import rel_present_on_node_schema
 from cartography.models.core.common import PropertyRef
 from cartography.models.core.nodes import CartographyNodeSchema
@@ -56,6 +58,195 @@ def build_cleanup_queries(node_schema: CartographyNodeSchema) -> List[str]:
     return result
 
 
+def build_indexed_cleanup_queries(node_schema: CartographyNodeSchema) -> List[str]:
+    """
+    Generates the same cleanups as build_cleanup_queries(), in the same order, but with queries that start from range
+    indexes on (`_cleanup_scope`, `lastupdated`) instead of from the sub resource node.
+
+    Queries built by build_cleanup_queries() expand from the sub resource to every node of the label attached to it and
+    then filter on `n.lastupdated <> $UPDATE_TAG`, so every cleanup reads all nodes and relationships of the sub
+    resource, even when nothing is stale. Schema-based loads record the node label and sub resource of each node and
+    relationship that they write in its cleanup scope, see cartography.graph.querybuilder.get_cleanup_scope(). The
+    queries generated here seek the entries of this node label and sub resource with `lastupdated < $UPDATE_TAG` in the
+    index, and only then check that their node is still attached to the sub resource. The cost of a cleanup is then
+    proportional to the amount of stale data of the synced sub resource, no matter how many other sub resources the
+    graph holds or how many of them have not been synced yet in this run.
+
+    Notes:
+    - The queries carry `USING INDEX` hints, so the indexes returned by build_cleanup_index_queries() must exist and be
+      online when they run. GraphJob.from_node_schema(..., indexed=True) takes care of this.
+    - Nodes and relationships written before the cleanup scope existed are only found once it has been backfilled,
+      see build_cleanup_scope_backfill_queries().
+    - Nodes and relationships with a `lastupdated` greater than $UPDATE_TAG, which can only have been written by a
+      newer sync, are left alone.
+    - Without a sub resource, the stale relationships are not bounded by a cleanup scope, so the queries of
+      build_cleanup_queries() are returned unchanged.
+    :param node_schema: The given CartographyNodeSchema
+    :return: A list of Neo4j queries to clean up nodes and relationships.
+    """
+    if not node_schema.sub_resource_relationship:
+        return build_cleanup_queries(node_schema)
+
+    sub_resource_rel = node_schema.sub_resource_relationship
+    _validate_target_node_matcher_for_cleanup_job(sub_resource_rel.target_node_matcher)
+    sub_resource_clause = Template("MATCH (n)$sub_resource_link(:$sub_resource_label{$match_sub_res_clause})")
+    sub_resource_clause_str = sub_resource_clause.safe_substitute(
+        sub_resource_link=_build_rel_link('s', sub_resource_rel),
+        sub_resource_label=sub_resource_rel.target_node_label,
+        match_sub_res_clause=_build_match_clause(sub_resource_rel.target_node_matcher),
+    )
+    cleanup_scope = get_cleanup_scope(node_schema.label, sub_resource_rel)
+
+    # The cleanup node query must always be before the cleanup rel queries
+    node_query_template = Template(
+        """
+        MATCH (n:$node_label)
+        USING INDEX n:$node_label($cleanup_scope_field, lastupdated)
+        WHERE n.$cleanup_scope_field = $cleanup_scope AND n.lastupdated < $UPDATE_TAG
+        $sub_resource_clause
+        WITH n LIMIT $LIMIT_SIZE
+        DETACH DELETE n;
+        """,
+    )
+    result = [
+        node_query_template.safe_substitute(
+            node_label=node_schema.label,
+            cleanup_scope_field=CLEANUP_SCOPE_FIELD,
+            cleanup_scope=cleanup_scope,
+            sub_resource_clause=sub_resource_clause_str,
+        ),
+    ]
+    other_rels = node_schema.other_relationships.rels if node_schema.other_relationships else []
+    for rel in [sub_resource_rel] + other_rels:
+        result.append(_build_indexed_cleanup_rel_query(node_schema, rel, sub_resource_clause_str))
+    return result
+
+
+def build_cleanup_index_queries(node_schema: CartographyNodeSchema) -> List[str]:
+    """
+    :return: The `CREATE INDEX IF NOT EXISTS` queries for the (`_cleanup_scope`, `lastupdated`) indexes that the
+    queries of build_indexed_cleanup_queries() seek on: one on the node schema's label and one on each of its
+    relationship types. Empty if the node schema has no sub resource, as its cleanups then do not seek on an index.
+    """
+    if not node_schema.sub_resource_relationship:
+        return []
+
+    result = [
+        f'CREATE INDEX IF NOT EXISTS FOR (n:{node_schema.label}) ON (n.{CLEANUP_SCOPE_FIELD}, n.lastupdated);',
+    ]
+    rels = [node_schema.sub_resource_relationship]
+    rels.extend(node_schema.other_relationships.rels if node_schema.other_relationships else [])
+    for rel in rels:
+        query = f'CREATE INDEX IF NOT EXISTS FOR ()-[r:{rel.rel_label}]-() ON (r.{CLEANUP_SCOPE_FIELD}, r.lastupdated);'
+        if query not in result:
+            result.append(query)
+    return result
+
+
+def build_cleanup_scope_backfill_queries(node_schema: CartographyNodeSchema) -> List[str]:
+    """
+    :return: Queries that set the cleanup scope on the nodes of the node schema that are attached to a sub resource but
+    do not have one yet, e.g. because they were written before it existed, followed by queries that copy the cleanup
+    scope of these nodes to their relationships that do not have one yet. The queries are meant to be run as iterative
+    GraphStatements. Empty if the node schema has no sub resource.
+    """
+    sub_resource_rel = node_schema.sub_resource_relationship
+    if not sub_resource_rel:
+        return []
+    cleanup_scope = get_cleanup_scope(node_schema.label, sub_resource_rel, node_var='j')
+    if not cleanup_scope:
+        return []
+
+    node_query_template = Template(
+        """
+        MATCH (n:$node_label)$sub_resource_link(j:$sub_resource_label)
+        WHERE n.$cleanup_scope_field IS NULL
+        WITH n, j LIMIT $LIMIT_SIZE
+        SET n.$cleanup_scope_field = $cleanup_scope;
+        """,
+    )
+    rel_query_template = Template(
+        """
+        MATCH (n:$node_label)$selected_rel_link(:$other_node_label)
+        WHERE r.$cleanup_scope_field IS NULL AND n.$cleanup_scope_field IS NOT NULL
+        WITH n, r LIMIT $LIMIT_SIZE
+        SET r.$cleanup_scope_field = n.$cleanup_scope_field;
+        """,
+    )
+    result = [
+        node_query_template.safe_substitute(
+            node_label=node_schema.label,
+            sub_resource_link=_build_rel_link('s', sub_resource_rel),
+            sub_resource_label=sub_resource_rel.target_node_label,
+            cleanup_scope_field=CLEANUP_SCOPE_FIELD,
+            cleanup_scope=cleanup_scope,
+        ),
+    ]
+    other_rels = node_schema.other_relationships.rels if node_schema.other_relationships else []
+    for rel in [sub_resource_rel] + other_rels:
+        result.append(
+            rel_query_template.safe_substitute(
+                node_label=node_schema.label,
+                selected_rel_link=_build_rel_link('r', rel),
+                other_node_label=rel.target_node_label,
+                cleanup_scope_field=CLEANUP_SCOPE_FIELD,
+            ),
+        )
+    return result
+
+
+def _build_indexed_cleanup_rel_query(
+        node_schema: CartographyNodeSchema,
+        selected_relationship: CartographyRelSchema,
+        sub_resource_clause: str,
+) -> str:
+    """
+    Helper function for build_indexed_cleanup_queries(). Builds a query that seeks the stale relationships of the
+    given type in the cleanup scope of the node schema's sub resource, keeps those between a node of the node schema
+    and the relationship's target label, and those whose node is attached to the sub resource matched by
+    `sub_resource_clause`.
+    """
+    rel_var = 's' if selected_relationship == node_schema.sub_resource_relationship else 'r'
+    query_template = Template(
+        """
+        MATCH (n:$node_label)$selected_rel_link(:$other_node_label)
+        USING INDEX $rel_var:$rel_label($cleanup_scope_field, lastupdated)
+        WHERE $rel_var.$cleanup_scope_field = $cleanup_scope AND $rel_var.lastupdated < $UPDATE_TAG
+        $sub_resource_clause
+        WITH $rel_var LIMIT $LIMIT_SIZE
+        DELETE $rel_var;
+        """,
+    )
+    if rel_var == 's':
+        # The sub resource relationship is already matched by the seek, so only its target node is left to check.
+        sub_resource_clause = ''
+        other_node_label = Template("$label{$match_clause}").safe_substitute(
+            label=selected_relationship.target_node_label,
+            match_clause=_build_match_clause(selected_relationship.target_node_matcher),
+        )
+    else:
+        other_node_label = selected_relationship.target_node_label
+    return query_template.safe_substitute(
+        node_label=node_schema.label,
+        selected_rel_link=_build_rel_link(rel_var, selected_relationship),
+        other_node_label=other_node_label,
+        rel_var=rel_var,
+        rel_label=selected_relationship.rel_label,
+        cleanup_scope_field=CLEANUP_SCOPE_FIELD,
+        cleanup_scope=get_cleanup_scope(node_schema.label, node_schema.sub_resource_relationship),
+        sub_resource_clause=sub_resource_clause,
+    )
+
+
+def _build_rel_link(rel_var: str, rel: CartographyRelSchema) -> str:
+    """
+    :return: The given relationship drawn with the correct direction, e.g. `<-[r:RESOURCE]-` or `-[r:RESOURCE]->`.
+    """
+    if rel.direction == LinkDirection.INWARD:
+        return f"<-[{rel_var}:{rel.rel_label}]-"
+    return f"-[{rel_var}:{rel.rel_label}]->"
+
+
 def _build_cleanup_rel_query_no_sub_resource(
         node_schema: CartographyNodeSchema,
         selected_relationship: CartographyRelSchema,
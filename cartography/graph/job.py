@@ -8,17 +8,37 @@ from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Set
+from typing import Tuple
 from typing import Union
 
 import neo4j
 
+from cartography.client.core.indexes import get_index_registry
+from cartography.client.core.snapshot import get_snapshot_writer
+from cartography.graph.cleanupbuilder import build_cleanup_index_queries
 from cartography.graph.cleanupbuilder import build_cleanup_queries
+from cartography.graph.cleanupbuilder import build_indexed_cleanup_queries
 from cartography.graph.statement import get_job_shortname
 from cartography.graph.statement import GraphStatement
 from cartography.models.core.nodes import CartographyNodeSchema
 
 logger = logging.getLogger(__name__)
 
+# How long a job waits for the indexes it just created to come online
+INDEX_AWAIT_TIMEOUT_SECONDS = 300
+
+# Set by `--indexed-cleanup`, see GraphJob.from_node_schema() and cartography.client.core.tx.load().
+_indexed_cleanup = False
+
+
+def get_indexed_cleanup() -> bool:
+    return _indexed_cleanup
+
+
+def set_indexed_cleanup(enabled: bool) -> None:
+    global _indexed_cleanup
+    _indexed_cleanup = enabled
+
 
 def _get_identifiers(template: string.Template) -> List[str]:
     """
@@ -69,14 +89,34 @@ class GraphJobJSONEncoder(json.JSONEncoder):
 class GraphJob:
     """
     A job that will run against the cartography graph. A job is a sequence of statements which execute sequentially.
+
+    A job may declare the node labels that its statements read and write, see cartography.graph.jobscheduler. Jobs
+    whose labels are not declared are assumed to read and write the whole graph.
+
+    A job may also declare `CREATE INDEX IF NOT EXISTS` statements for indexes that its statements rely on. They are
+    ensured, and awaited if they had to be created, before the statements run.
     """
 
-    def __init__(self, name: str, statements: List[GraphStatement], short_name: Optional[str] = None):
+    def __init__(
+        self,
+        name: str,
+        statements: List[GraphStatement],
+        short_name: Optional[str] = None,
+        reads: Optional[Set[str]] = None,
+        writes: Optional[Set[str]] = None,
+        indexes: Optional[List[str]] = None,
+    ):
         # E.g. "Okta intel module cleanup"
         self.name = name
         self.statements: List[GraphStatement] = statements
         # E.g. "okta_import_cleanup"
         self.short_name = short_name
+        # E.g. {"AWSAccount", "IpRange"}: labels of nodes that the job only matches on.
+        self.reads = reads
+        # E.g. {"EC2Instance"}: labels of nodes that the job sets properties on, deletes, or draws relationships to.
+        self.writes = writes
+        # E.g. ["CREATE INDEX IF NOT EXISTS FOR (n:EC2Instance) ON (n.lastupdated);"]
+        self.indexes = indexes
 
     def merge_parameters(self, parameters: Dict) -> None:
         """
@@ -89,7 +129,16 @@ class GraphJob:
         """
         Run the job. This will execute all statements sequentially.
         """
+        snapshot_writer = get_snapshot_writer()
+        if snapshot_writer:
+            # Extract mode: record the job for a later `--load-from` run instead of running it.
+            snapshot_writer.write_job(self.as_dict())
+            logger.debug("Recorded job '%s' to snapshot.", self.name)
+            return
         logger.debug("Starting job '%s'.", self.name)
+        if self.indexes and get_index_registry().ensure(neo4j_session, self.indexes):
+            # Statements may carry index hints, which fail on indexes that are still being populated.
+            neo4j_session.run("CALL db.awaitIndexes($timeout)", timeout=INDEX_AWAIT_TIMEOUT_SECONDS)
         for stm in self.statements:
             try:
                 stm.run(neo4j_session)
@@ -107,11 +156,18 @@ class GraphJob:
         """
         Convert job to a dictionary.
         """
-        return {
+        job_dict = {
             "name": self.name,
             "statements": [s.as_dict() for s in self.statements],
             "short_name": self.short_name,
         }
+        if self.reads is not None:
+            job_dict["reads"] = sorted(self.reads)
+        if self.writes is not None:
+            job_dict["writes"] = sorted(self.writes)
+        if self.indexes:
+            job_dict["indexes"] = self.indexes
+        return job_dict
 
     @classmethod
     def from_json(cls, blob: str, short_name: Optional[str] = None) -> 'GraphJob':
@@ -121,20 +177,32 @@ class GraphJob:
         data: Dict = json.loads(blob)
         statements = _get_statements_from_json(data, short_name)
         name = data["name"]
-        return cls(name, statements, short_name)
+        return cls(name, statements, short_name, *_get_labels_from_json(data), data.get("indexes"))
 
     @classmethod
     def from_node_schema(
             cls,
             node_schema: CartographyNodeSchema,
             parameters: Dict[str, Any],
+            indexed: Optional[bool] = None,
     ) -> 'GraphJob':
         """
         Create a cleanup job from a CartographyNodeSchema object.
         For a given node, the fields used in the node_schema.sub_resource_relationship.target_node_node_matcher.keys()
         must be provided as keys and values in the params dict.
+        :param indexed: If True, the job finds stale nodes and relationships through their cleanup scope indexes, see
+        cartography.graph.cleanupbuilder.build_indexed_cleanup_queries(), and ensures those indexes before it runs.
+        Defaults to the `--indexed-cleanup` setting of the sync.
         """
-        queries: List[str] = build_cleanup_queries(node_schema)
+        if indexed is None:
+            indexed = _indexed_cleanup
+        queries: List[str]
+        indexes: Optional[List[str]] = None
+        if indexed:
+            queries = build_indexed_cleanup_queries(node_schema)
+            indexes = build_cleanup_index_queries(node_schema)
+        else:
+            queries = build_cleanup_queries(node_schema)
 
         expected_param_keys: Set[str] = get_parameters(queries)
         actual_param_keys: Set[str] = set(parameters.keys())
@@ -164,6 +232,7 @@ class GraphJob:
             f"Cleanup {node_schema.label}",
             statements,
             node_schema.label,
+            indexes=indexes,
         )
 
     @classmethod
@@ -177,7 +246,7 @@ class GraphJob:
         job_shortname: str = get_job_shortname(file_path)
         statements: List[GraphStatement] = _get_statements_from_json(data, job_shortname)
         name: str = data["name"]
-        return cls(name, statements, job_shortname)
+        return cls(name, statements, job_shortname, *_get_labels_from_json(data), data.get("indexes"))
 
     @classmethod
     def run_from_json(
@@ -218,3 +287,12 @@ def _get_statements_from_json(blob: Dict, short_job_name: Optional[str] = None)
         statements.append(statement)
 
     return statements
+
+
+def _get_labels_from_json(blob: Dict) -> Tuple[Optional[Set[str]], Optional[Set[str]]]:
+    """
+    :return: The node labels that the job declares in its optional "reads" and "writes" fields.
+    """
+    reads = set(blob["reads"]) if "reads" in blob else None
+    writes = set(blob["writes"]) if "writes" in blob else None
+    return reads, writes
@@ -0,0 +1,118 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from typing import Optional
+
+import neo4j
+
+from cartography.client.core.session import get_session_factory
+from cartography.graph.job import GraphJob
+
+logger = logging.getLogger(__name__)
+
+# Default maximum number of graph jobs that run at the same time.
+MAX_CONCURRENT_JOBS = 4
+
+# Set from `--analysis-job-concurrency` by cartography.sync.Sync.run()
+_max_concurrent_jobs = MAX_CONCURRENT_JOBS
+
+
+def set_max_concurrent_jobs(max_concurrent_jobs: int) -> None:
+    global _max_concurrent_jobs
+    _max_concurrent_jobs = max_concurrent_jobs
+
+
+def jobs_conflict(job_a: GraphJob, job_b: GraphJob) -> bool:
+    """
+    :return: True if the two jobs cannot safely run at the same time, i.e. if either job writes a label that the other
+    job reads or writes. Jobs that do not declare their labels conflict with every other job.
+    """
+    if job_a.writes is None or job_b.writes is None:
+        return True
+    a_reads = job_a.reads or set()
+    b_reads = job_b.reads or set()
+    return bool(job_a.writes & (job_b.writes | b_reads)) or bool(job_b.writes & a_reads)
+
+
+def plan_job_batches(jobs: List[GraphJob]) -> List[List[GraphJob]]:
+    """
+    Groups jobs into batches that run one after another. The jobs in a batch do not conflict with each other and so
+    can run concurrently. If two jobs conflict, the one that comes first in `jobs` is placed in an earlier batch, so the
+    relative order of conflicting jobs is preserved.
+    :param jobs: The jobs to run, in the order they would run serially.
+    :return: The list of batches.
+    """
+    batch_indexes: List[int] = []
+    for i, job in enumerate(jobs):
+        index = 0
+        for j in range(i):
+            if jobs_conflict(jobs[j], job):
+                index = max(index, batch_indexes[j] + 1)
+        batch_indexes.append(index)
+
+    batches: List[List[GraphJob]] = [[] for _ in range(max(batch_indexes, default=-1) + 1)]
+    for job, index in zip(jobs, batch_indexes):
+        batches[index].append(job)
+    return batches
+
+
+def _run_job(job: GraphJob, neo4j_session: Optional[neo4j.Session], continue_on_error: bool) -> Optional[Exception]:
+    """
+    Runs the job on the given session, or on a new session from the session factory if `neo4j_session` is None.
+    :return: The exception that the job raised, if any.
+    """
+    try:
+        if neo4j_session:
+            job.run(neo4j_session)
+        else:
+            session_factory = get_session_factory()
+            assert session_factory
+            with session_factory() as new_session:
+                job.run(new_session)
+    except Exception as e:
+        if continue_on_error:
+            logger.exception("An exception occurred while executing job '%s'.", job.short_name or job.name)
+        return e
+    return None
+
+
+def run_graph_jobs(
+    jobs: List[GraphJob],
+    neo4j_session: neo4j.Session,
+    max_workers: Optional[int] = None,
+    continue_on_error: bool = False,
+) -> None:
+    """
+    Runs the given jobs. Jobs that do not conflict with each other (see `jobs_conflict()`) run concurrently, each on its
+    own session from cartography.client.core.session. If no session factory is set or max_workers is 1, all jobs run
+    serially on `neo4j_session`.
+    :param jobs: The jobs to run, in the order they would run serially.
+    :param neo4j_session: The Neo4j session to use when jobs run serially.
+    :param max_workers: The maximum number of jobs to run at the same time. Defaults to the value set with
+    `set_max_concurrent_jobs()`.
+    :param continue_on_error: If True, a failing job is logged and the remaining jobs still run. If False, the first
+    exception is raised once the batch that it happened in has finished.
+    """
+    if max_workers is None:
+        max_workers = _max_concurrent_jobs
+    concurrent = max_workers > 1 and get_session_factory() is not None
+    batches = plan_job_batches(jobs) if concurrent else [[job] for job in jobs]
+    for batch in batches:
+        if len(batch) == 1:
+            errors = [_run_job(batch[0], neo4j_session, continue_on_error)]
+        else:
+            logger.info("Running %d graph jobs concurrently.", len(batch))
+            # Run each job in a copy of this thread's context so that it keeps the cartography.metrics labels.
+            contexts = [contextvars.copy_context() for _ in batch]
+            with ThreadPoolExecutor(max_workers=min(len(batch), max_workers)) as executor:
+                errors = list(
+                    executor.map(
+                        lambda job, context: context.run(_run_job, job, None, continue_on_error),
+                        batch,
+                        contexts,
+                    ),
+                )
+        for error in errors:
+            if error and not continue_on_error:
+                raise error
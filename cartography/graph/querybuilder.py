@@ -11,6 +11,7 @@ from cartography.models.core.common import PropertyRef
 from cartography.models.core.nodes import CartographyNodeProperties
 from cartography.models.core.nodes import CartographyNodeSchema
 from cartography.models.core.nodes import ExtraNodeLabels
+from cartography.models.core.nodes import get_node_schema_classes
 from cartography.models.core.relationships import CartographyRelSchema
 from cartography.models.core.relationships import LinkDirection
 from cartography.models.core.relationships import OtherRelationships
@@ -18,10 +19,108 @@ from cartography.models.core.relationships import TargetNodeMatcher
 
 logger = logging.getLogger(__name__)
 
+# Node property that holds the hash of the node's properties as of the last write, see
+# `build_ingestion_query(..., skip_unchanged=True)`.
+CONTENT_HASH_FIELD = '_content_hash'
+
+# Node and relationship property that records the node label and sub resource that a schema-based write belongs to,
+# e.g. `EC2Instance/123456789012`, see get_cleanup_scope(). The cleanup jobs of `--indexed-cleanup` seek on it.
+CLEANUP_SCOPE_FIELD = '_cleanup_scope'
+
+# Prefix of the lowercase copies of node properties that relationships match with `ignore_case` or
+# `fuzzy_and_ignore_case`, e.g. `_lc_username` for `username`, see get_lowercase_shadow_keys().
+LOWERCASE_SHADOW_PREFIX = '_lc_'
+
+# label -> keys, computed on the first call to get_lowercase_shadow_keys()
+_lowercase_shadow_keys_cache: Optional[Dict[str, Set[str]]] = None
+
+
+def get_cleanup_scope(
+        node_label: str,
+        sub_resource_link: Optional[CartographyRelSchema],
+        node_var: Optional[str] = None,
+) -> Optional[str]:
+    """
+    :param node_label: The label of the node schema.
+    :param sub_resource_link: The sub resource relationship of the node schema.
+    :param node_var: If given, build the value from the properties of the sub resource node bound to this variable
+    instead of from the query parameters.
+    :return: A Cypher expression for the cleanup scope of the nodes of `node_label` that are attached to a sub resource,
+    e.g. `'EC2Instance/' + toString($AWS_ID)`, or `'EC2Instance/' + toString(j.id)` with node_var 'j'. None if there is
+    no sub resource relationship or if its target node matcher does not only use kwargs, as then there is no cleanup
+    job to seek on it.
+    """
+    if not sub_resource_link:
+        return None
+    matcher: Dict[str, PropertyRef] = asdict(sub_resource_link.target_node_matcher)
+    if not all(prop_ref.set_in_kwargs for prop_ref in matcher.values()):
+        return None
+    values = [
+        f'toString({node_var}.{key})' if node_var else f'toString({prop_ref})' for key, prop_ref in matcher.items()
+    ]
+    return f"'{node_label}/' + " + " + '/' + ".join(values)
+
+
+def get_lowercase_shadow_property(key: str) -> str:
+    return f'{LOWERCASE_SHADOW_PREFIX}{key}'
+
+
+def get_lowercase_shadow_keys() -> Dict[str, Set[str]]:
+    """
+    Case-insensitive and fuzzy TargetNodeMatchers compare against a lowercase copy of the target node's property, a
+    "shadow" property, so that the lookup can use an index instead of calling toLower() on every node of the target
+    label. Schema-based loads maintain these shadow properties on every node that they write, see
+    build_ingestion_query(), and the create-indexes sync stage backfills them, see
+    build_lowercase_shadow_backfill_queries().
+    :return: For each node label, the properties that some node schema under cartography.models matches with
+    `ignore_case` or `fuzzy_and_ignore_case`. Node schemas defined elsewhere, such as test models, are left out so that
+    the result does not depend on what has been imported; their matchers fall back to toLower() on the target property.
+    """
+    global _lowercase_shadow_keys_cache
+    if _lowercase_shadow_keys_cache is not None:
+        return _lowercase_shadow_keys_cache
+
+    result: Dict[str, Set[str]] = {}
+    for schema_class in get_node_schema_classes():
+        if not schema_class.__module__.startswith('cartography.models.'):
+            continue
+        node_schema = schema_class()
+        rels = node_schema.other_relationships.rels if node_schema.other_relationships else []
+        for rel in rels:
+            for key, prop_ref in asdict(rel.target_node_matcher).items():
+                if prop_ref.ignore_case or prop_ref.fuzzy_and_ignore_case:
+                    result.setdefault(rel.target_node_label, set()).add(key)
+    _lowercase_shadow_keys_cache = result
+    return result
+
+
+def _has_lowercase_shadow(label: str, key: str) -> bool:
+    return key in get_lowercase_shadow_keys().get(label, set())
+
+
+def _get_lowercase_shadow_property_map(node_schema: CartographyNodeSchema) -> Dict[str, PropertyRef]:
+    """
+    :return: The shadow properties that loads of the given node schema maintain, mapped to the PropertyRef of the
+    property that they are a lowercase copy of.
+    """
+    shadow_keys = get_lowercase_shadow_keys()
+    labels = [node_schema.label]
+    if node_schema.extra_node_labels:
+        labels.extend(node_schema.extra_node_labels.labels)
+    node_props_as_dict: Dict[str, PropertyRef] = asdict(node_schema.properties)
+    return {
+        get_lowercase_shadow_property(key): node_props_as_dict[key]
+        for label in labels
+        for key in sorted(shadow_keys.get(label, set()))
+        if key in node_props_as_dict
+    }
+
 
 def _build_node_properties_statement(
         node_property_map: Dict[str, PropertyRef],
         extra_node_labels: Optional[ExtraNodeLabels] = None,
+        lowercase_shadow_property_map: Optional[Dict[str, PropertyRef]] = None,
+        cleanup_scope: Optional[str] = None,
 ) -> str:
     """
     Generate a Neo4j clause that sets node properties using the given mapping of attribute names to PropertyRefs.
@@ -44,15 +143,22 @@ def _build_node_properties_statement(
     where `i` is a reference to the Neo4j node.
     :param node_property_map: Mapping of node attribute names as str to PropertyRef objects
     :param extra_node_labels: Optional ExtraNodeLabels object to set on the node as string
+    :param lowercase_shadow_property_map: Optional mapping of shadow property names to the PropertyRefs that they are
+    lowercase copies of, e.g. {'_lc_username': PropertyRef("login")} becomes `i._lc_username = toLower(item.login)`
+    :param cleanup_scope: Optional Cypher expression from get_cleanup_scope() to set as the node's cleanup scope
     :return: The resulting Neo4j SET clause to set the given attributes on the node
     """
     ingest_fields_template = Template('i.$node_property = $property_ref')
+    shadow_fields_template = Template('i.$node_property = toLower($property_ref)')
 
     set_clause = ',\n'.join([
         ingest_fields_template.safe_substitute(node_property=node_property, property_ref=property_ref)
         for node_property, property_ref in node_property_map.items()
         if node_property != 'id'  # The `MERGE` clause will have already set `id`; let's not set it again.
-    ])
+    ] + [
+        shadow_fields_template.safe_substitute(node_property=node_property, property_ref=property_ref)
+        for node_property, property_ref in (lowercase_shadow_property_map or {}).items()
+    ] + ([f'i.{CLEANUP_SCOPE_FIELD} = {cleanup_scope}'] if cleanup_scope else []))
 
     # Set extra labels on the node if specified
     if extra_node_labels:
@@ -61,7 +167,11 @@ def _build_node_properties_statement(
     return set_clause
 
 
-def _build_rel_properties_statement(rel_var: str, rel_property_map: Optional[Dict[str, PropertyRef]] = None) -> str:
+def _build_rel_properties_statement(
+        rel_var: str,
+        rel_property_map: Optional[Dict[str, PropertyRef]] = None,
+        cleanup_scope: Optional[str] = None,
+) -> str:
     """
     Generate a Neo4j clause that sets relationship properties using the given mapping of attribute names to
     PropertyRefs.
@@ -81,21 +191,22 @@ def _build_rel_properties_statement(rel_var: str, rel_property_map: Optional[Dic
 
     :param rel_var: The variable name to use for the relationship in the Neo4j query
     :param rel_property_map: Mapping of relationship attribute names as str to PropertyRef objects
+    :param cleanup_scope: Optional Cypher expression from get_cleanup_scope() to set as the relationship's cleanup scope
     :return: The resulting Neo4j SET clause to set the given attributes on the relationship
     """
-    set_clause = ''
     ingest_fields_template = Template('$rel_var.$rel_property = $property_ref')
 
-    if rel_property_map:
-        set_clause += ',\n'.join([
-            ingest_fields_template.safe_substitute(
-                rel_var=rel_var,
-                rel_property=rel_property,
-                property_ref=property_ref,
-            )
-            for rel_property, property_ref in rel_property_map.items()
-        ])
-    return set_clause
+    set_fields = [
+        ingest_fields_template.safe_substitute(
+            rel_var=rel_var,
+            rel_property=rel_property,
+            property_ref=property_ref,
+        )
+        for rel_property, property_ref in (rel_property_map or {}).items()
+    ]
+    if cleanup_scope:
+        set_fields.append(f'{rel_var}.{CLEANUP_SCOPE_FIELD} = {cleanup_scope}')
+    return ',\n'.join(set_fields)
 
 
 def _build_match_clause(matcher: TargetNodeMatcher) -> str:
@@ -109,25 +220,33 @@ def _build_match_clause(matcher: TargetNodeMatcher) -> str:
     return ', '.join(match.safe_substitute(Key=key, PropRef=prop_ref) for key, prop_ref in matcher_asdict.items())
 
 
-def _build_where_clause_for_rel_match(node_var: str, matcher: TargetNodeMatcher) -> str:
+def _build_where_clause_for_rel_match(node_var: str, matcher: TargetNodeMatcher, target_node_label: str) -> str:
     """
     Same as _build_match_clause, but puts the matching logic in a WHERE clause.
     This is intended specifically to use for joining with relationships where we need a case-insensitive match.
+    Case-insensitive and fuzzy matches compare against the lowercase shadow property of the key, see
+    get_lowercase_shadow_keys(), so that they are served by the range or text index on it. Keys without a shadow
+    property are compared with toLower().
     :param matcher: A TargetNodeMatcher object
+    :param target_node_label: The label of the node that the matcher matches
     :return: a Neo4j where clause
     """
     match = Template("$node_var.$key = $prop_ref")
-    case_insensitive_match = Template("toLower($node_var.$key) = toLower($prop_ref)")
-    fuzzy_and_ignorecase_match = Template("toLower($node_var.$key) CONTAINS toLower($prop_ref)")
+    case_insensitive_match = Template("$lowercase_value = toLower($prop_ref)")
+    fuzzy_and_ignorecase_match = Template("$lowercase_value CONTAINS toLower($prop_ref)")
 
     matcher_asdict = asdict(matcher)
 
     result = []
     for key, prop_ref in matcher_asdict.items():
+        if _has_lowercase_shadow(target_node_label, key):
+            lowercase_value = f'{node_var}.{get_lowercase_shadow_property(key)}'
+        else:
+            lowercase_value = f'toLower({node_var}.{key})'
         if prop_ref.ignore_case:
-            prop_line = case_insensitive_match.safe_substitute(node_var=node_var, key=key, prop_ref=prop_ref)
+            prop_line = case_insensitive_match.safe_substitute(lowercase_value=lowercase_value, prop_ref=prop_ref)
         elif prop_ref.fuzzy_and_ignore_case:
-            prop_line = fuzzy_and_ignorecase_match.safe_substitute(node_var=node_var, key=key, prop_ref=prop_ref)
+            prop_line = fuzzy_and_ignorecase_match.safe_substitute(lowercase_value=lowercase_value, prop_ref=prop_ref)
         else:
             # Exact match (default; most efficient)
             prop_line = match.safe_substitute(node_var=node_var, key=key, prop_ref=prop_ref)
@@ -154,7 +273,10 @@ def _asdict_with_validate_relprops(link: CartographyRelSchema) -> Dict[str, Prop
     return rel_props_as_dict
 
 
-def _build_attach_sub_resource_statement(sub_resource_link: Optional[CartographyRelSchema] = None) -> str:
+def _build_attach_sub_resource_statement(
+        sub_resource_link: Optional[CartographyRelSchema] = None,
+        cleanup_scope: Optional[str] = None,
+) -> str:
     """
     Generates a Neo4j statement to attach a sub resource to a node. A 'sub resource' is a term we made up to describe
     billing units of a given resource. For example,
@@ -164,6 +286,7 @@ def _build_attach_sub_resource_statement(sub_resource_link: Optional[Cartography
     - etc.
     This is a private function not meant to be called outside of build_ingest_query().
     :param sub_resource_link: Optional: The CartographyRelSchema object connecting previous node(s) to the sub resource.
+    :param cleanup_scope: Optional: The cleanup scope expression to set on the relationship, see get_cleanup_scope().
     :return: a Neo4j clause that connects previous node(s) to a sub resource, taking into account the labels, attribute
     keys, and directionality. If sub_resource_link is None, return an empty string.
     """
@@ -196,13 +319,14 @@ def _build_attach_sub_resource_statement(sub_resource_link: Optional[Cartography
         MatchClause=_build_match_clause(sub_resource_link.target_node_matcher),
         RelMergeClause=rel_merge_clause,
         SubResourceRelLabel=sub_resource_link.rel_label,
-        set_rel_properties_statement=_build_rel_properties_statement('r', rel_props_as_dict),
+        set_rel_properties_statement=_build_rel_properties_statement('r', rel_props_as_dict, cleanup_scope),
     )
     return attach_sub_resource_statement
 
 
 def _build_attach_additional_links_statement(
         additional_relationships: Optional[OtherRelationships] = None,
+        cleanup_scope: Optional[str] = None,
 ) -> str:
     """
     Generates a Neo4j statement to attach one or more CartographyRelSchemas to node(s) previously mentioned in the
@@ -210,6 +334,7 @@ def _build_attach_additional_links_statement(
     This is a private function not meant to be called outside of build_ingestion_query().
     :param additional_relationships: Optional list of CartographyRelSchema describing what other relationships should
     be created from the previous node(s) in this query.
+    :param cleanup_scope: Optional cleanup scope expression to set on the relationships, see get_cleanup_scope().
     :return: A Neo4j clause that connects previous node(s) to the given additional_links., taking into account the
     labels, attribute keys, and directionality. If additional_relationships is None, return an empty string.
     """
@@ -249,11 +374,13 @@ def _build_attach_additional_links_statement(
 
         additional_ref = additional_links_template.safe_substitute(
             AddlLabel=link.target_node_label,
-            WhereClause=_build_where_clause_for_rel_match(node_var, link.target_node_matcher),
+            WhereClause=_build_where_clause_for_rel_match(
+                node_var, link.target_node_matcher, link.target_node_label,
+            ),
             node_var=node_var,
             rel_var=rel_var,
             RelMerge=rel_merge,
-            set_rel_properties_statement=_build_rel_properties_statement(rel_var, rel_props_as_dict),
+            set_rel_properties_statement=_build_rel_properties_statement(rel_var, rel_props_as_dict, cleanup_scope),
         )
         links.append(additional_ref)
 
@@ -263,6 +390,7 @@ def _build_attach_additional_links_statement(
 def _build_attach_relationships_statement(
         sub_resource_relationship: Optional[CartographyRelSchema],
         other_relationships: Optional[OtherRelationships],
+        cleanup_scope: Optional[str] = None,
 ) -> str:
     """
     Use Neo4j subqueries to attach sub resource and/or other relationships.
@@ -271,12 +399,13 @@ def _build_attach_relationships_statement(
     For example, if an EC2Instance has attachments to NetworkInterfaces and AWSAccounts, but our data only includes
     EC2Instance to AWSAccount information, structuring the ingestion query with subqueries allows us to build a query
     that will ignore the null relationships and continue to MERGE the ones that exist.
+    If cleanup_scope is given, it is set on every attached relationship, see get_cleanup_scope().
     """
     if not sub_resource_relationship and not other_relationships:
         return ""
 
-    attach_sub_resource_statement = _build_attach_sub_resource_statement(sub_resource_relationship)
-    attach_additional_links_statement = _build_attach_additional_links_statement(other_relationships)
+    attach_sub_resource_statement = _build_attach_sub_resource_statement(sub_resource_relationship, cleanup_scope)
+    attach_additional_links_statement = _build_attach_additional_links_statement(other_relationships, cleanup_scope)
 
     statements = []
     statements += [attach_sub_resource_statement] if attach_sub_resource_statement else []
@@ -353,6 +482,8 @@ def filter_selected_relationships(
 def build_ingestion_query(
         node_schema: CartographyNodeSchema,
         selected_relationships: Optional[Set[CartographyRelSchema]] = None,
+        skip_unchanged: bool = False,
+        indexed_cleanup: bool = False,
 ) -> str:
     """
     Generates a Neo4j query from the given CartographyNodeSchema to ingest the specified nodes and relationships so that
@@ -364,6 +495,12 @@ def build_ingestion_query(
     If selected_relationships is None (default), then we create a query using all RelSchema specified in
     node_schema.sub_resource_relationship + node_schema.other_relationships.
     If selected_relationships is the empty set, we create a query with no relationship attachments at all.
+    :param skip_unchanged: If True, generates a query that only sets `lastupdated` on nodes whose stored
+    `_content_hash` property equals the `_content_hash` field of the dict being processed, and sets all other properties
+    (and the new hash) on the rest. The dicts must then be prepared with
+    cartography.client.core.tx.add_content_hashes(). Relationships are merged as usual.
+    :param indexed_cleanup: If True, the query sets the cleanup scope that the cleanup jobs of `--indexed-cleanup` seek
+    on, see get_cleanup_scope().
     :return: An optimized Neo4j query that can be used to ingest nodes and relationships.
     Important notes:
     - The resulting query uses the UNWIND + MERGE pattern (see
@@ -371,6 +508,12 @@ def build_ingestion_query(
       load the data for speed.
     - The query assumes that a list of dicts will be passed to it through parameter $DictList.
     - The query sets `firstseen` attributes on all the nodes and relationships that it creates.
+    - Unless skip_unchanged is set, the query removes the `_content_hash` property so that a later skip_unchanged load
+      never trusts a hash written before the node's properties were last changed.
+    - The query sets the lowercase shadow properties that other schemas' case-insensitive and fuzzy matchers look up,
+      see get_lowercase_shadow_keys().
+    - With indexed_cleanup, if the query attaches the sub resource, it sets the cleanup scope on the nodes and on all
+      the relationships that it merges.
     - The query is intended to be supplied as input to cartography.core.client.tx.load_graph_data().
     """
     query_template = Template(
@@ -380,12 +523,30 @@ def build_ingestion_query(
             ON CREATE SET i.firstseen = timestamp()
             SET
                 $set_node_properties_statement
+            REMOVE i.$content_hash_field
             $attach_relationships_statement
         """,
     )
 
     node_props: CartographyNodeProperties = node_schema.properties
     node_props_as_dict: Dict[str, PropertyRef] = asdict(node_props)
+    if skip_unchanged:
+        # Bump `lastupdated` on every node but only rewrite the remaining properties if the record has changed.
+        query_template = Template(
+            """
+            UNWIND $DictList AS item
+                MERGE (i:$node_label{id: $dict_id_field})
+                ON CREATE SET i.firstseen = timestamp()
+                SET $set_unconditional_node_properties_statement
+                FOREACH (_ IN CASE WHEN i.$content_hash_field = item.$content_hash_field THEN [] ELSE [1] END |
+                    SET
+                        $set_node_properties_statement
+                )
+                $attach_relationships_statement
+            """,
+        )
+        del node_props_as_dict['lastupdated']
+        node_props_as_dict[CONTENT_HASH_FIELD] = PropertyRef(CONTENT_HASH_FIELD)
 
     # Handle selected relationships
     sub_resource_rel: Optional[CartographyRelSchema] = node_schema.sub_resource_relationship
@@ -393,14 +554,29 @@ def build_ingestion_query(
     if selected_relationships or selected_relationships == set():
         sub_resource_rel, other_rels = filter_selected_relationships(node_schema, selected_relationships)
 
+    # The cleanup scope is only known, from the kwargs, if the query attaches the sub resource.
+    cleanup_scope = get_cleanup_scope(node_schema.label, sub_resource_rel) if indexed_cleanup else None
+    unconditional_node_properties = [f'i.lastupdated = {node_props.lastupdated}']
+    if skip_unchanged and cleanup_scope:
+        # Nodes written before the cleanup scope existed must get it even if their properties have not changed.
+        unconditional_node_properties.append(f'i.{CLEANUP_SCOPE_FIELD} = {cleanup_scope}')
+
     ingest_query = query_template.safe_substitute(
         node_label=node_schema.label,
         dict_id_field=node_props.id,
         set_node_properties_statement=_build_node_properties_statement(
             node_props_as_dict,
             node_schema.extra_node_labels,
+            _get_lowercase_shadow_property_map(node_schema),
+            None if skip_unchanged else cleanup_scope,
+        ),
+        set_unconditional_node_properties_statement=',\n'.join(unconditional_node_properties),
+        attach_relationships_statement=_build_attach_relationships_statement(
+            sub_resource_rel,
+            other_rels,
+            cleanup_scope,
         ),
-        attach_relationships_statement=_build_attach_relationships_statement(sub_resource_rel, other_rels),
+        content_hash_field=CONTENT_HASH_FIELD,
     )
     return ingest_query
 
@@ -411,8 +587,12 @@ def build_create_index_queries(node_schema: CartographyNodeSchema) -> List[str]:
     relationships.
     :param node_schema: The Cartography node_schema object
     :return: A list of queries of the form `CREATE INDEX IF NOT EXISTS FOR (n:$TargetNodeLabel) ON (n.$TargetAttribute)`
+    , or `CREATE TEXT INDEX IF NOT EXISTS [...]` for the shadow properties of fuzzy matchers.
     """
     index_template = Template('CREATE INDEX IF NOT EXISTS FOR (n:$TargetNodeLabel) ON (n.$TargetAttribute);')
+    text_index_template = Template(
+        'CREATE TEXT INDEX IF NOT EXISTS FOR (n:$TargetNodeLabel) ON (n.$TargetAttribute);',
+    )
 
     # First ensure an index exists for the node_schema and all extra labels on the `id` and `lastupdated` fields
     result = [
@@ -441,10 +621,28 @@ def build_create_index_queries(node_schema: CartographyNodeSchema) -> List[str]:
     if node_schema.other_relationships:
         rel_schemas.extend(node_schema.other_relationships.rels)
     for rs in rel_schemas:
-        for target_key in asdict(rs.target_node_matcher).keys():
+        for target_key, prop_ref in asdict(rs.target_node_matcher).items():
             result.append(
                 index_template.safe_substitute(TargetNodeLabel=rs.target_node_label, TargetAttribute=target_key),
             )
+            # Case-insensitive matches are equality lookups on the lowercase shadow property, which a range index
+            # serves. Fuzzy matches are CONTAINS lookups on it, which only a text index serves.
+            if not _has_lowercase_shadow(rs.target_node_label, target_key):
+                continue
+            if prop_ref.ignore_case:
+                result.append(
+                    index_template.safe_substitute(
+                        TargetNodeLabel=rs.target_node_label,
+                        TargetAttribute=get_lowercase_shadow_property(target_key),
+                    ),
+                )
+            elif prop_ref.fuzzy_and_ignore_case:
+                result.append(
+                    text_index_template.safe_substitute(
+                        TargetNodeLabel=rs.target_node_label,
+                        TargetAttribute=get_lowercase_shadow_property(target_key),
+                    ),
+                )
 
     # Now, include extra indexes defined by the module author on the node schema's property refs.
     node_props_as_dict: Dict[str, PropertyRef] = asdict(node_schema.properties)
@@ -455,3 +653,26 @@ def build_create_index_queries(node_schema: CartographyNodeSchema) -> List[str]:
         ) for prop_name, prop_ref in node_props_as_dict.items() if prop_ref.extra_index
     ])
     return result
+
+
+def build_lowercase_shadow_backfill_queries(shadow_properties: Optional[Set[Tuple[str, str]]] = None) -> List[str]:
+    """
+    :param shadow_properties: If given, only build the queries of these (label, key) pairs.
+    :return: One query per shadow property returned by get_lowercase_shadow_keys() that sets it on the nodes where it
+    is missing or out of date, e.g. on nodes written before the shadow property existed, or by hand-written Cypher. The
+    queries are meant to be run as iterative GraphStatements.
+    """
+    query_template = Template(
+        """
+        MATCH (n:$label)
+        WHERE n.$key IS NOT NULL AND (n.$shadow_key IS NULL OR n.$shadow_key <> toLower(n.$key))
+        WITH n LIMIT $$LIMIT_SIZE
+        SET n.$shadow_key = toLower(n.$key);
+        """,
+    )
+    return [
+        query_template.substitute(label=label, key=key, shadow_key=get_lowercase_shadow_property(key))
+        for label, keys in sorted(get_lowercase_shadow_keys().items())
+        for key in sorted(keys)
+        if shadow_properties is None or (label, key) in shadow_properties
+    ]
@@ -9,6 +9,8 @@ from typing import Union
 
 import neo4j
 
+from cartography.metrics import get_metrics_collector
+from cartography.metrics import metrics_scope
 from cartography.stats import get_stats_client
 
 
@@ -106,6 +108,10 @@ class GraphStatement:
         stat_handler.incr('properties_set', summary.counters.properties_set)
         stat_handler.incr('relationships_created', summary.counters.relationships_created)
         stat_handler.incr('relationships_deleted', summary.counters.relationships_deleted)
+        metrics_collector = get_metrics_collector()
+        if metrics_collector:
+            with metrics_scope(job=self.parent_job_name):
+                metrics_collector.add_neo4j_counters(summary.counters)
 
         return result
 
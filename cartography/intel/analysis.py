@@ -1,10 +1,12 @@
 import logging
 import pathlib
+from typing import List
 
 import neo4j
 
 from cartography.config import Config
 from cartography.graph.job import GraphJob
+from cartography.graph.jobscheduler import run_graph_jobs
 
 logger = logging.getLogger(__name__)
 
@@ -28,15 +30,15 @@ def run(neo4j_session: neo4j.Session, config: Config) -> None:
         )
         return
     logger.info("Loading analysis jobs from directory: %s", analysis_job_directory)
+    jobs: List[GraphJob] = []
     for path in analysis_job_directory.glob("**/*.json"):
-        logger.info("Running discovered analysis job: %s", path)
+        logger.info("Discovered analysis job: %s", path)
         try:
-            GraphJob.run_from_json_file(
-                path,
-                neo4j_session,
-                {"UPDATE_TAG": config.update_tag},
-            )
-        except (KeyboardInterrupt, SystemExit):
-            raise
+            job = GraphJob.from_json_file(path)
         except Exception:
-            logger.exception("An exception occurred while executing discovered analysis job: %s", path)
+            logger.exception("An exception occurred while loading discovered analysis job: %s", path)
+            continue
+        job.merge_parameters({"UPDATE_TAG": config.update_tag})
+        jobs.append(job)
+    # Jobs that declare non-conflicting "reads" and "writes" labels run concurrently.
+    run_graph_jobs(jobs, neo4j_session, continue_on_error=True)
@@ -5,20 +5,29 @@ from typing import Any
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Set
 
 import boto3
 import botocore.exceptions
+import botocore.model
 import neo4j
 
 from . import ec2
 from . import organizations
 from .resources import RESOURCE_FUNCTIONS
+from cartography.checkpoint import is_unit_complete
+from cartography.checkpoint import mark_unit_complete
 from cartography.config import Config
+from cartography.intel.aws.ec2.images import clear_public_image_cache
 from cartography.intel.aws.util.common import parse_and_validate_aws_requested_syncs
+from cartography.intel.aws.util.policy_cache import ManagedPolicyCache
+from cartography.intel.aws.util.policy_cache import set_managed_policy_cache
+from cartography.metrics import get_metrics_collector
+from cartography.metrics import metrics_scope
 from cartography.stats import get_stats_client
+from cartography.util import analysis_dependencies_met
 from cartography.util import merge_module_sync_metadata
-from cartography.util import run_analysis_and_ensure_deps
-from cartography.util import run_analysis_job
+from cartography.util import run_analysis_jobs
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
@@ -26,6 +35,32 @@ from cartography.util import timeit
 stat_handler = get_stats_client(__name__)
 logger = logging.getLogger(__name__)
 
+EC2_ASSET_EXPOSURE_REQUIREMENTS = {
+    'ec2:instance',
+    'ec2:security_group',
+    'ec2:load_balancer',
+    'ec2:load_balancer_v2',
+}
+
+
+def _record_api_call(model: botocore.model.OperationModel, **kwargs: Any) -> None:
+    metrics_collector = get_metrics_collector()
+    if metrics_collector:
+        request_signer = kwargs.get('request_signer')
+        metrics_collector.incr(
+            'api_calls',
+            service=model.service_model.service_name,
+            operation=model.name,
+            region=getattr(request_signer, 'region_name', None),
+        )
+
+
+def _record_api_calls(boto3_session: boto3.session.Session) -> None:
+    """
+    Counts every API call made with clients of the given session in the cartography.metrics report, if enabled.
+    """
+    boto3_session.events.register('before-call', _record_api_call)
+
 
 def _build_aws_sync_kwargs(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
@@ -41,6 +76,22 @@ def _build_aws_sync_kwargs(
     }
 
 
+def _sync_resource(func_name: str, current_aws_account_id: str, sync_args: Dict[str, Any]) -> None:
+    """
+    Runs the RESOURCE_FUNCTIONS entry `func_name` for the account, unless it already completed in an earlier attempt
+    of a resumed sync.
+    """
+    if is_unit_complete('aws', current_aws_account_id, func_name):
+        logger.info(
+            "Skipping '%s' for AWS account %s, it completed before the sync was resumed.",
+            func_name,
+            current_aws_account_id,
+        )
+        return
+    RESOURCE_FUNCTIONS[func_name](**sync_args)
+    mark_unit_complete('aws', current_aws_account_id, func_name)
+
+
 def _sync_one_account(
     neo4j_session: neo4j.Session,
     boto3_session: boto3.session.Session,
@@ -61,7 +112,7 @@ def _sync_one_account(
         if func_name in RESOURCE_FUNCTIONS:
             # Skip permission relationships and tags for now because they rely on data already being in the graph
             if func_name not in ['permission_relationships', 'resourcegroupstaggingapi']:
-                RESOURCE_FUNCTIONS[func_name](**sync_args)
+                _sync_resource(func_name, current_aws_account_id, sync_args)
             else:
                 continue
         else:
@@ -69,22 +120,25 @@ def _sync_one_account(
 
     # MAP IAM permissions
     if 'permission_relationships' in aws_requested_syncs:
-        RESOURCE_FUNCTIONS['permission_relationships'](**sync_args)
+        _sync_resource('permission_relationships', current_aws_account_id, sync_args)
 
     # AWS Tags - Must always be last.
     if 'resourcegroupstaggingapi' in aws_requested_syncs:
-        RESOURCE_FUNCTIONS['resourcegroupstaggingapi'](**sync_args)
+        _sync_resource('resourcegroupstaggingapi', current_aws_account_id, sync_args)
 
-    run_analysis_job(
-        'aws_ec2_iaminstanceprofile.json',
-        neo4j_session,
-        common_job_parameters,
-    )
-
-    run_analysis_job(
-        'aws_lambda_ecr.json',
+    # These jobs only recompute the data of the account that was just synced.
+    scoped_analysis_jobs = ['aws_ec2_iaminstanceprofile.json', 'aws_lambda_ecr.json']
+    if analysis_dependencies_met(
+        'aws_ec2_asset_exposure.json',
+        EC2_ASSET_EXPOSURE_REQUIREMENTS,
+        set(aws_requested_syncs),
+    ):
+        scoped_analysis_jobs.append('aws_ec2_asset_exposure.json')
+    run_analysis_jobs(
+        scoped_analysis_jobs,
         neo4j_session,
         common_job_parameters,
+        package='cartography.data.jobs.scoped_analysis',
     )
 
     merge_module_sync_metadata(
@@ -95,6 +149,7 @@ def _sync_one_account(
         update_tag=update_tag,
         stat_handler=stat_handler,
     )
+    mark_unit_complete('aws', current_aws_account_id)
 
 
 def _autodiscover_account_regions(boto3_session: boto3.session.Session, account_id: str) -> List[str]:
@@ -155,6 +210,9 @@ def _sync_multiple_accounts(
     num_accounts = len(accounts)
 
     for profile_name, account_id in accounts.items():
+        if is_unit_complete('aws', account_id):
+            logger.info("Skipping AWS account with ID '%s', it completed before the sync was resumed.", account_id)
+            continue
         logger.info("Syncing AWS account with ID '%s' using configured profile '%s'.", account_id, profile_name)
         common_job_parameters["AWS_ID"] = account_id
         if num_accounts == 1:
@@ -162,18 +220,20 @@ def _sync_multiple_accounts(
             boto3_session = boto3.Session()
         else:
             boto3_session = boto3.Session(profile_name=profile_name)
+        _record_api_calls(boto3_session)
 
         _autodiscover_accounts(neo4j_session, boto3_session, account_id, sync_tag, common_job_parameters)
 
         try:
-            _sync_one_account(
-                neo4j_session,
-                boto3_session,
-                account_id,
-                sync_tag,
-                common_job_parameters,
-                aws_requested_syncs=aws_requested_syncs,  # Could be replaced later with per-account requested syncs
-            )
+            with metrics_scope(account=account_id):
+                _sync_one_account(
+                    neo4j_session,
+                    boto3_session,
+                    account_id,
+                    sync_tag,
+                    common_job_parameters,
+                    aws_requested_syncs=aws_requested_syncs,  # Could be replaced later with per-account requested syncs
+                )
         except Exception as e:
             if aws_best_effort_mode:
                 timestamp = datetime.datetime.now()
@@ -195,7 +255,8 @@ def _sync_multiple_accounts(
         logger.error(f'AWS sync failed for accounts {failed_account_ids}')
         raise Exception('\n'.join(exception_tracebacks))
 
-    del common_job_parameters["AWS_ID"]
+    # AWS_ID is not set if all accounts were skipped by a resumed sync.
+    common_job_parameters.pop("AWS_ID", None)
 
     # There may be orphan Principals which point outside of known AWS accounts. This job cleans
     # up those nodes after all AWS accounts have been synced.
@@ -213,42 +274,19 @@ def _perform_aws_analysis(
 ) -> None:
     requested_syncs_as_set = set(requested_syncs)
 
-    ec2_asset_exposure_requirements = {
-        'ec2:instance',
-        'ec2:security_group',
-        'ec2:load_balancer',
-        'ec2:load_balancer_v2',
+    # aws_ec2_asset_exposure.json runs per account in _sync_one_account().
+    analysis_job_requirements: Dict[str, Set[str]] = {
+        'aws_ec2_keypair_analysis.json': {'ec2:keypair'},
+        'aws_eks_asset_exposure.json': {'eks'},
+        'aws_foreign_accounts.json': set(),  # This job has no requirements
     }
-    run_analysis_and_ensure_deps(
-        'aws_ec2_asset_exposure.json',
-        ec2_asset_exposure_requirements,
-        requested_syncs_as_set,
-        common_job_parameters,
+    run_analysis_jobs(
+        [
+            job_name for job_name, requirements in analysis_job_requirements.items()
+            if analysis_dependencies_met(job_name, requirements, requested_syncs_as_set)
+        ],
         neo4j_session,
-    )
-
-    run_analysis_and_ensure_deps(
-        'aws_ec2_keypair_analysis.json',
-        {'ec2:keypair'},
-        requested_syncs_as_set,
-        common_job_parameters,
-        neo4j_session,
-    )
-
-    run_analysis_and_ensure_deps(
-        'aws_eks_asset_exposure.json',
-        {'eks'},
-        requested_syncs_as_set,
-        common_job_parameters,
-        neo4j_session,
-    )
-
-    run_analysis_and_ensure_deps(
-        'aws_foreign_accounts.json',
-        set(),  # This job has no requirements
-        requested_syncs_as_set,
         common_job_parameters,
-        neo4j_session,
     )
 
 
@@ -257,7 +295,12 @@ def start_aws_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     common_job_parameters = {
         "UPDATE_TAG": config.update_tag,
         "permission_relationships_file": config.permission_relationships_file,
+        "aws_iam_authorization_details": config.aws_iam_authorization_details,
     }
+    # Caches shared by the accounts of this sync
+    clear_public_image_cache()
+    managed_policy_cache = ManagedPolicyCache(config.aws_managed_policy_cache_file)
+    set_managed_policy_cache(managed_policy_cache)
     try:
         boto3_session = boto3.Session()
     except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as e:
@@ -295,14 +338,22 @@ def start_aws_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     if config.aws_requested_syncs:
         requested_syncs = parse_and_validate_aws_requested_syncs(config.aws_requested_syncs)
 
-    sync_successful = _sync_multiple_accounts(
-        neo4j_session,
-        aws_accounts,
-        config.update_tag,
-        common_job_parameters,
-        config.aws_best_effort_mode,
-        requested_syncs,
-    )
+    try:
+        sync_successful = _sync_multiple_accounts(
+            neo4j_session,
+            aws_accounts,
+            config.update_tag,
+            common_job_parameters,
+            config.aws_best_effort_mode,
+            requested_syncs,
+        )
+    finally:
+        managed_policy_cache.log_stats()
+        try:
+            managed_policy_cache.save()
+        except OSError:
+            logger.exception("Could not write the managed policy cache to '%s'.", managed_policy_cache.path)
+        set_managed_policy_cache(None)
 
     if sync_successful:
         _perform_aws_analysis(requested_syncs, neo4j_session, common_job_parameters)
@@ -2,8 +2,10 @@ import logging
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
 
 import boto3
+import botocore.client
 import neo4j
 from botocore.exceptions import ClientError
 
@@ -13,10 +15,17 @@ from cartography.graph.job import GraphJob
 from cartography.intel.aws.ec2.util import get_botocore_config
 from cartography.models.aws.ec2.images import EC2ImageSchema
 from cartography.util import aws_handle_regions
+from cartography.util import batch
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of image IDs described per describe_images call
+DESCRIBE_IMAGES_BATCH_SIZE = 200
+
+# Descriptions of public images by region and image ID, shared by all accounts in an AWS sync
+_public_image_cache: Dict[Tuple[str, str], Dict] = {}
+
 
 @timeit
 def get_images_in_use(neo4j_session: neo4j.Session, region: str, current_aws_account_id: str) -> List[str]:
@@ -44,6 +53,31 @@ def get_images_in_use(neo4j_session: neo4j.Session, region: str, current_aws_acc
     return images
 
 
+def clear_public_image_cache() -> None:
+    """
+    Forgets the public images described so far. Called at the start of every AWS sync.
+    """
+    _public_image_cache.clear()
+
+
+def _describe_images_by_id(client: botocore.client.BaseClient, image_ids: List[str], region: str) -> List[Dict]:
+    """
+    Describes the given images in one call. If the call fails, e.g. because one of the images was deleted or its ID is
+    malformed, the IDs are split in halves that are described separately, so that only the failing images are lost.
+    """
+    try:
+        return client.describe_images(ImageIds=image_ids)['Images']
+    except ClientError as e:
+        if len(image_ids) == 1:
+            logger.warning(f"Failed retrieve image id {image_ids[0]} for region - {region}. Error - {e}")
+            return []
+    middle = len(image_ids) // 2
+    return (
+        _describe_images_by_id(client, image_ids[:middle], region)
+        + _describe_images_by_id(client, image_ids[middle:], region)
+    )
+
+
 @timeit
 @aws_handle_regions
 def get_images(boto3_session: boto3.session.Session, region: str, image_ids: List[str]) -> List[Dict]:
@@ -57,15 +91,21 @@ def get_images(boto3_session: boto3.session.Session, region: str, image_ids: Lis
     images.extend(self_images)
     if image_ids:
         self_image_ids = {image['ImageId'] for image in images}
-        # Go one by one to avoid losing all images if one fails
-        for image in image_ids:
-            if image in self_image_ids:
+        other_image_ids = []
+        for image_id in image_ids:
+            if image_id in self_image_ids:
                 continue
-            try:
-                public_images = client.describe_images(ImageIds=[image])['Images']
-                images.extend(public_images)
-            except ClientError as e:
-                logger.warning(f"Failed retrieve image id {image} for region - {region}. Error - {e}")
+            # Public images, e.g. from the marketplace, are used by many accounts and are the same in all of them
+            cached_image = _public_image_cache.get((region, image_id))
+            if cached_image:
+                images.append(dict(cached_image))
+            else:
+                other_image_ids.append(image_id)
+        for image_ids_batch in batch(other_image_ids, DESCRIBE_IMAGES_BATCH_SIZE):
+            for image in _describe_images_by_id(client, image_ids_batch, region):
+                if image.get('Public'):
+                    _public_image_cache[(region, image['ImageId'])] = dict(image)
+                images.append(image)
     return images
 
 
@@ -1,16 +1,20 @@
+import copy
 import enum
 import json
 import logging
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Tuple
 
 import boto3
+import botocore.client
 import neo4j
 
 from cartography.intel.aws.permission_relationships import parse_statement_node
 from cartography.intel.aws.permission_relationships import principal_allowed_on_resource
+from cartography.intel.aws.util.policy_cache import get_managed_policy_cache
 from cartography.stats import get_stats_client
 from cartography.util import merge_module_sync_metadata
 from cartography.util import run_cleanup_job
@@ -75,7 +79,37 @@ def get_group_policy_data(boto3_session: boto3.session.Session, group_list: List
 
 
 @timeit
-def get_group_managed_policy_data(boto3_session: boto3.session.Session, group_list: List[Dict]) -> Dict:
+def get_attached_policy_versions(boto3_session: boto3.session.Session) -> Dict[str, str]:
+    """
+    :return: The default version ID of every managed policy that is attached to a principal, by policy ARN.
+    """
+    client = boto3_session.client('iam')
+    paginator = client.get_paginator('list_policies')
+    versions: Dict[str, str] = {}
+    for page in paginator.paginate(Scope='All', OnlyAttached=True):
+        for policy in page['Policies']:
+            versions[policy['Arn']] = policy['DefaultVersionId']
+    return versions
+
+
+def get_managed_policy_statements(
+    client: botocore.client.BaseClient, policy: Any, policy_versions: Dict[str, str],
+) -> Any:
+    """
+    :param client: An IAM client.
+    :param policy: An iam.Policy resource.
+    :param policy_versions: The output of get_attached_policy_versions().
+    :return: The statements of the default version of the policy, from the sync's ManagedPolicyCache.
+    """
+    # Policies attached after get_attached_policy_versions() ran need a GetPolicy call to find their version
+    version_id = policy_versions.get(policy.arn) or policy.default_version_id
+    return get_managed_policy_cache().get_statements(client, policy.arn, version_id)
+
+
+@timeit
+def get_group_managed_policy_data(
+    boto3_session: boto3.session.Session, group_list: List[Dict], policy_versions: Dict[str, str],
+) -> Dict:
     resource_client = boto3_session.resource('iam')
     policies = {}
     for group in group_list:
@@ -83,7 +117,7 @@ def get_group_managed_policy_data(boto3_session: boto3.session.Session, group_li
         group_arn = group["Arn"]
         resource_group = resource_client.Group(name)
         policies[group_arn] = {
-            p.arn: p.default_version.document["Statement"]
+            p.arn: get_managed_policy_statements(resource_client.meta.client, p, policy_versions)
             for p in resource_group.attached_policies.all()
         }
     return policies
@@ -107,7 +141,9 @@ def get_user_policy_data(boto3_session: boto3.session.Session, user_list: List[D
 
 
 @timeit
-def get_user_managed_policy_data(boto3_session: boto3.session.Session, user_list: List[Dict]) -> Dict:
+def get_user_managed_policy_data(
+    boto3_session: boto3.session.Session, user_list: List[Dict], policy_versions: Dict[str, str],
+) -> Dict:
     resource_client = boto3_session.resource('iam')
     policies = {}
     for user in user_list:
@@ -116,7 +152,7 @@ def get_user_managed_policy_data(boto3_session: boto3.session.Session, user_list
         resource_user = resource_client.User(name)
         try:
             policies[user_arn] = {
-                p.arn: p.default_version.document["Statement"]
+                p.arn: get_managed_policy_statements(resource_client.meta.client, p, policy_versions)
                 for p in resource_user.attached_policies.all()
             }
         except resource_client.meta.client.exceptions.NoSuchEntityException:
@@ -144,7 +180,9 @@ def get_role_policy_data(boto3_session: boto3.session.Session, role_list: List[D
 
 
 @timeit
-def get_role_managed_policy_data(boto3_session: boto3.session.Session, role_list: List[Dict]) -> Dict:
+def get_role_managed_policy_data(
+    boto3_session: boto3.session.Session, role_list: List[Dict], policy_versions: Dict[str, str],
+) -> Dict:
     resource_client = boto3_session.resource('iam')
     policies = {}
     for role in role_list:
@@ -153,7 +191,7 @@ def get_role_managed_policy_data(boto3_session: boto3.session.Session, role_list
         resource_role = resource_client.Role(name)
         try:
             policies[role_arn] = {
-                p.arn: p.default_version.document["Statement"]
+                p.arn: get_managed_policy_statements(resource_client.meta.client, p, policy_versions)
                 for p in resource_role.attached_policies.all()
             }
         except resource_client.meta.client.exceptions.NoSuchEntityException:
@@ -241,6 +279,89 @@ def get_account_access_key_data(boto3_session: boto3.session.Session, username:
     return access_keys
 
 
+@timeit
+def get_account_authorization_details(boto3_session: boto3.session.Session) -> Dict[str, List[Dict]]:
+    """
+    Gets the users, groups and roles of the account with their inline policies, attached managed policies and group
+    memberships, and the customer managed policies with their versions, in a few pages of
+    GetAccountAuthorizationDetails.
+    AWS managed policies are left out: they are the same in every account and are read through the sync's
+    ManagedPolicyCache instead.
+    """
+    client = boto3_session.client('iam')
+    paginator = client.get_paginator('get_account_authorization_details')
+    details: Dict[str, List[Dict]] = {
+        'UserDetailList': [],
+        'GroupDetailList': [],
+        'RoleDetailList': [],
+        'Policies': [],
+    }
+    for page in paginator.paginate(Filter=['User', 'Group', 'Role', 'LocalManagedPolicy']):
+        for key in details:
+            details[key].extend(page.get(key, []))
+    return details
+
+
+def transform_inline_policies_from_details(principal_details: List[Dict], policy_list_key: str) -> Dict:
+    """
+    :param principal_details: The UserDetailList, GroupDetailList or RoleDetailList of GetAccountAuthorizationDetails.
+    :param policy_list_key: The key of the inline policies of a principal, e.g. 'UserPolicyList'.
+    :return: The inline policies in the format of get_user_policy_data().
+    """
+    return {
+        principal['Arn']: {
+            policy['PolicyName']: policy['PolicyDocument']['Statement']
+            for policy in principal.get(policy_list_key, [])
+        }
+        for principal in principal_details
+    }
+
+
+def transform_managed_policies_from_details(
+    principal_details: List[Dict], get_policy_statements: Callable[[str], Any],
+) -> Dict:
+    """
+    :param principal_details: The UserDetailList, GroupDetailList or RoleDetailList of GetAccountAuthorizationDetails.
+    :param get_policy_statements: Returns the statements of the default version of the managed policy with the given
+    ARN.
+    :return: The managed policies in the format of get_user_managed_policy_data().
+    """
+    return {
+        principal['Arn']: {
+            policy['PolicyArn']: get_policy_statements(policy['PolicyArn'])
+            for policy in principal.get('AttachedManagedPolicies', [])
+        }
+        for principal in principal_details
+    }
+
+
+def transform_group_memberships_from_details(user_details: List[Dict], group_details: List[Dict]) -> Dict:
+    """
+    :return: The members of every group in the format of sync_group_memberships(), i.e. group ARNs mapped to the
+    output of get_group_membership_data().
+    """
+    group_arns = {group['GroupName']: group['Arn'] for group in group_details}
+    memberships: Dict[str, Dict] = {group['Arn']: {'Users': []} for group in group_details}
+    for user in user_details:
+        for group_name in user.get('GroupList', []):
+            if group_name in group_arns:
+                memberships[group_arns[group_name]]['Users'].append({'Arn': user['Arn']})
+    return memberships
+
+
+def _get_local_policy_statements(policies: List[Dict]) -> Dict[str, Any]:
+    """
+    :param policies: The Policies of GetAccountAuthorizationDetails.
+    :return: The statements of the default version of each customer managed policy, by policy ARN.
+    """
+    statements = {}
+    for policy in policies:
+        for version in policy.get('PolicyVersionList', []):
+            if version['IsDefaultVersion']:
+                statements[policy['Arn']] = version['Document']['Statement']
+    return statements
+
+
 @timeit
 def load_users(
     neo4j_session: neo4j.Session, users: List[Dict], current_aws_account_id: str, aws_update_tag: int,
@@ -328,6 +449,7 @@ def load_roles(
         rnode.createdate = $CreateDate,
         rnode.name = $RoleName,
         rnode.path = $Path,
+        rnode._lc_arn = toLower($Arn),
         rnode.lastupdated = $aws_update_tag
     WITH rnode
     MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
@@ -664,7 +786,7 @@ def load_policy_data(
 @timeit
 def sync_users(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, current_aws_account_id: str,
-    aws_update_tag: int, common_job_parameters: Dict,
+    aws_update_tag: int, common_job_parameters: Dict, policy_versions: Dict[str, str],
 ) -> None:
     logger.info("Syncing IAM users for account '%s'.", current_aws_account_id)
     data = get_user_list_data(boto3_session)
@@ -672,7 +794,7 @@ def sync_users(
 
     sync_user_inline_policies(boto3_session, data, neo4j_session, aws_update_tag)
 
-    sync_user_managed_policies(boto3_session, data, neo4j_session, aws_update_tag)
+    sync_user_managed_policies(boto3_session, data, neo4j_session, aws_update_tag, policy_versions)
 
     run_cleanup_job('aws_import_users_cleanup.json', neo4j_session, common_job_parameters)
 
@@ -680,9 +802,9 @@ def sync_users(
 @timeit
 def sync_user_managed_policies(
     boto3_session: boto3.session.Session, data: Dict, neo4j_session: neo4j.Session,
-    aws_update_tag: int,
+    aws_update_tag: int, policy_versions: Dict[str, str],
 ) -> None:
-    managed_policy_data = get_user_managed_policy_data(boto3_session, data['Users'])
+    managed_policy_data = get_user_managed_policy_data(boto3_session, data['Users'], policy_versions)
     transform_policy_data(managed_policy_data, PolicyType.managed.value)
     load_policy_data(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
 
@@ -700,7 +822,7 @@ def sync_user_inline_policies(
 @timeit
 def sync_groups(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, current_aws_account_id: str,
-    aws_update_tag: int, common_job_parameters: Dict,
+    aws_update_tag: int, common_job_parameters: Dict, policy_versions: Dict[str, str],
 ) -> None:
     logger.info("Syncing IAM groups for account '%s'.", current_aws_account_id)
     data = get_group_list_data(boto3_session)
@@ -708,16 +830,16 @@ def sync_groups(
 
     sync_groups_inline_policies(boto3_session, data, neo4j_session, aws_update_tag)
 
-    sync_group_managed_policies(boto3_session, data, neo4j_session, aws_update_tag)
+    sync_group_managed_policies(boto3_session, data, neo4j_session, aws_update_tag, policy_versions)
 
     run_cleanup_job('aws_import_groups_cleanup.json', neo4j_session, common_job_parameters)
 
 
 def sync_group_managed_policies(
     boto3_session: boto3.session.Session, data: Dict, neo4j_session: neo4j.Session,
-    aws_update_tag: int,
+    aws_update_tag: int, policy_versions: Dict[str, str],
 ) -> None:
-    managed_policy_data = get_group_managed_policy_data(boto3_session, data["Groups"])
+    managed_policy_data = get_group_managed_policy_data(boto3_session, data["Groups"], policy_versions)
     transform_policy_data(managed_policy_data, PolicyType.managed.value)
     load_policy_data(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
 
@@ -734,7 +856,7 @@ def sync_groups_inline_policies(
 @timeit
 def sync_roles(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, current_aws_account_id: str,
-    aws_update_tag: int, common_job_parameters: Dict,
+    aws_update_tag: int, common_job_parameters: Dict, policy_versions: Dict[str, str],
 ) -> None:
     logger.info("Syncing IAM roles for account '%s'.", current_aws_account_id)
     data = get_role_list_data(boto3_session)
@@ -742,17 +864,19 @@ def sync_roles(
 
     sync_role_inline_policies(current_aws_account_id, boto3_session, data, neo4j_session, aws_update_tag)
 
-    sync_role_managed_policies(current_aws_account_id, boto3_session, data, neo4j_session, aws_update_tag)
+    sync_role_managed_policies(
+        current_aws_account_id, boto3_session, data, neo4j_session, aws_update_tag, policy_versions,
+    )
 
     run_cleanup_job('aws_import_roles_cleanup.json', neo4j_session, common_job_parameters)
 
 
 def sync_role_managed_policies(
     current_aws_account_id: str, boto3_session: boto3.session.Session, data: Dict,
-    neo4j_session: neo4j.Session, aws_update_tag: int,
+    neo4j_session: neo4j.Session, aws_update_tag: int, policy_versions: Dict[str, str],
 ) -> None:
     logger.info("Syncing IAM role managed policies for account '%s'.", current_aws_account_id)
-    managed_policy_data = get_role_managed_policy_data(boto3_session, data["Roles"])
+    managed_policy_data = get_role_managed_policy_data(boto3_session, data["Roles"], policy_versions)
     transform_policy_data(managed_policy_data, PolicyType.managed.value)
     load_policy_data(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
 
@@ -805,6 +929,69 @@ def sync_user_access_keys(
     )
 
 
+def _load_policies_from_details(
+    neo4j_session: neo4j.Session, principal_details: List[Dict], policy_list_key: str,
+    get_policy_statements: Callable[[str], Any], aws_update_tag: int,
+) -> None:
+    inline_policy_data = transform_inline_policies_from_details(principal_details, policy_list_key)
+    transform_policy_data(inline_policy_data, PolicyType.inline.value)
+    load_policy_data(neo4j_session, inline_policy_data, PolicyType.inline.value, aws_update_tag)
+
+    managed_policy_data = transform_managed_policies_from_details(principal_details, get_policy_statements)
+    transform_policy_data(managed_policy_data, PolicyType.managed.value)
+    load_policy_data(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
+
+
+@timeit
+def sync_principals_from_authorization_details(
+    neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, current_aws_account_id: str,
+    aws_update_tag: int, common_job_parameters: Dict, policy_versions: Dict[str, str],
+) -> None:
+    """
+    Syncs the same users, groups, roles, policies and group memberships as sync_users(), sync_groups(), sync_roles()
+    and sync_group_memberships(), with the same loaders, but fetches them with GetAccountAuthorizationDetails instead
+    of several calls per principal and policy.
+    """
+    logger.info("Syncing IAM principals with account authorization details for account '%s'.", current_aws_account_id)
+    details = get_account_authorization_details(boto3_session)
+    client = boto3_session.client('iam')
+    local_policy_statements = _get_local_policy_statements(details['Policies'])
+
+    def get_policy_statements(policy_arn: str) -> Any:
+        if policy_arn in local_policy_statements:
+            return copy.deepcopy(local_policy_statements[policy_arn])
+        version_id = policy_versions.get(policy_arn) or client.get_policy(PolicyArn=policy_arn)['Policy'][
+            'DefaultVersionId'
+        ]
+        return get_managed_policy_cache().get_statements(client, policy_arn, version_id)
+
+    # ListUsers is still used for the users, because GetAccountAuthorizationDetails does not return PasswordLastUsed.
+    user_data = get_user_list_data(boto3_session)
+    load_users(neo4j_session, user_data['Users'], current_aws_account_id, aws_update_tag)
+    _load_policies_from_details(
+        neo4j_session, details['UserDetailList'], 'UserPolicyList', get_policy_statements, aws_update_tag,
+    )
+    run_cleanup_job('aws_import_users_cleanup.json', neo4j_session, common_job_parameters)
+
+    load_groups(neo4j_session, details['GroupDetailList'], current_aws_account_id, aws_update_tag)
+    _load_policies_from_details(
+        neo4j_session, details['GroupDetailList'], 'GroupPolicyList', get_policy_statements, aws_update_tag,
+    )
+    run_cleanup_job('aws_import_groups_cleanup.json', neo4j_session, common_job_parameters)
+
+    load_roles(neo4j_session, details['RoleDetailList'], current_aws_account_id, aws_update_tag)
+    _load_policies_from_details(
+        neo4j_session, details['RoleDetailList'], 'RolePolicyList', get_policy_statements, aws_update_tag,
+    )
+    run_cleanup_job('aws_import_roles_cleanup.json', neo4j_session, common_job_parameters)
+
+    groups_membership = transform_group_memberships_from_details(
+        details['UserDetailList'], details['GroupDetailList'],
+    )
+    load_group_memberships(neo4j_session, groups_membership, aws_update_tag)
+    run_cleanup_job('aws_import_groups_membership_cleanup.json', neo4j_session, common_job_parameters)
+
+
 @timeit
 def sync(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
@@ -813,10 +1000,24 @@ def sync(
     logger.info("Syncing IAM for account '%s'.", current_aws_account_id)
     # This module only syncs IAM information that is in use.
     # As such only policies that are attached to a user, role or group are synced
-    sync_users(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_groups(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_roles(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_group_memberships(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
+    policy_versions = get_attached_policy_versions(boto3_session)
+    if common_job_parameters.get('aws_iam_authorization_details'):
+        sync_principals_from_authorization_details(
+            neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters, policy_versions,
+        )
+    else:
+        sync_users(
+            neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters, policy_versions,
+        )
+        sync_groups(
+            neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters, policy_versions,
+        )
+        sync_roles(
+            neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters, policy_versions,
+        )
+        sync_group_memberships(
+            neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters,
+        )
     sync_assumerole_relationships(neo4j_session, current_aws_account_id, update_tag, common_job_parameters)
     sync_user_access_keys(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
     run_cleanup_job('aws_import_principals_cleanup.json', neo4j_session, common_job_parameters)
@@ -1,13 +1,18 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import Any
 from typing import Dict
 from typing import List
 
 import boto3
+import botocore.client
 import neo4j
 
 from cartography.client.core.tx import load
+from cartography.client.core.tx import load_graph_data
 from cartography.graph.job import GraphJob
+from cartography.intel.aws.util.botocore_config import get_concurrent_botocore_config
 from cartography.models.aws.identitycenter.awsidentitycenter import AWSIdentityCenterInstanceSchema
 from cartography.models.aws.identitycenter.awspermissionset import AWSPermissionSetSchema
 from cartography.models.aws.identitycenter.awsssouser import AWSSSOUserSchema
@@ -16,6 +21,10 @@ from cartography.util import run_cleanup_job
 from cartography.util import timeit
 logger = logging.getLogger(__name__)
 
+# Identity Center rate limits its APIs per account, so calls are spread over a few threads that share one client. Its
+# adaptive retry mode slows all of them down once requests are throttled.
+MAX_CONCURRENT_REQUESTS = 4
+
 
 @timeit
 @aws_handle_regions
@@ -55,31 +64,41 @@ def load_identity_center_instances(
     )
 
 
+@timeit
+@aws_handle_regions
+def describe_permission_set(client: botocore.client.BaseClient, instance_arn: str, arn: str) -> Dict:
+    details = client.describe_permission_set(
+        InstanceArn=instance_arn,
+        PermissionSetArn=arn,
+    )
+    permission_set = details.get('PermissionSet', {})
+    if permission_set:
+        permission_set['RoleHint'] = (
+            f":role/aws-reserved/sso.amazonaws.com/AWSReservedSSO_{permission_set.get('Name')}"
+        )
+    return permission_set
+
+
 @timeit
 @aws_handle_regions
 def get_permission_sets(boto3_session: boto3.session.Session, instance_arn: str, region: str) -> List[Dict]:
     """
-    Get all permission sets for a given Identity Center instance
+    Get all permission sets for a given Identity Center instance. The permission sets are described for up to
+    MAX_CONCURRENT_REQUESTS at a time.
     """
-    client = boto3_session.client('sso-admin', region_name=region)
-    permission_sets = []
+    client = boto3_session.client(
+        'sso-admin', region_name=region, config=get_concurrent_botocore_config(MAX_CONCURRENT_REQUESTS),
+    )
+    arns = []
 
     paginator = client.get_paginator('list_permission_sets')
     for page in paginator.paginate(InstanceArn=instance_arn):
-        # Get detailed info for each permission set
-        for arn in page.get('PermissionSets', []):
-            details = client.describe_permission_set(
-                InstanceArn=instance_arn,
-                PermissionSetArn=arn,
-            )
-            permission_set = details.get('PermissionSet', {})
-            if permission_set:
-                permission_set['RoleHint'] = (
-                    f":role/aws-reserved/sso.amazonaws.com/AWSReservedSSO_{permission_set.get('Name')}"
-                )
-                permission_sets.append(permission_set)
+        arns.extend(page.get('PermissionSets', []))
 
-    return permission_sets
+    # Get detailed info for each permission set
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        permission_sets = executor.map(describe_permission_set, repeat(client), repeat(instance_arn), arns)
+        return [permission_set for permission_set in permission_sets if permission_set]
 
 
 @timeit
@@ -156,6 +175,25 @@ def load_sso_users(
     )
 
 
+@timeit
+@aws_handle_regions
+def get_role_assignments_for_user(
+    client: botocore.client.BaseClient,
+    user_id: str,
+    instance_arn: str,
+) -> List[Dict]:
+    role_assignments = []
+    paginator = client.get_paginator('list_account_assignments_for_principal')
+    for page in paginator.paginate(InstanceArn=instance_arn, PrincipalId=user_id, PrincipalType='USER'):
+        for assignment in page.get('AccountAssignments', []):
+            role_assignments.append({
+                'UserId': user_id,
+                'PermissionSetArn': assignment.get('PermissionSetArn'),
+                'AccountId': assignment.get('AccountId'),
+            })
+    return role_assignments
+
+
 @timeit
 @aws_handle_regions
 def get_role_assignments(
@@ -165,23 +203,21 @@ def get_role_assignments(
     region: str,
 ) -> List[Dict]:
     """
-    Get role assignments for SSO users
+    Get role assignments for SSO users, for up to MAX_CONCURRENT_REQUESTS users at a time
     """
 
     logger.info(f"Getting role assignments for {len(users)} users")
-    client = boto3_session.client('sso-admin', region_name=region)
+    client = boto3_session.client(
+        'sso-admin', region_name=region, config=get_concurrent_botocore_config(MAX_CONCURRENT_REQUESTS),
+    )
     role_assignments = []
 
-    for user in users:
-        user_id = user['UserId']
-        paginator = client.get_paginator('list_account_assignments_for_principal')
-        for page in paginator.paginate(InstanceArn=instance_arn, PrincipalId=user_id, PrincipalType='USER'):
-            for assignment in page.get('AccountAssignments', []):
-                role_assignments.append({
-                    'UserId': user_id,
-                    'PermissionSetArn': assignment.get('PermissionSetArn'),
-                    'AccountId': assignment.get('AccountId'),
-                })
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        user_ids = [user['UserId'] for user in users]
+        for user_role_assignments in executor.map(
+            get_role_assignments_for_user, repeat(client), user_ids, repeat(instance_arn),
+        ):
+            role_assignments.extend(user_role_assignments)
 
     return role_assignments
 
@@ -196,21 +232,21 @@ def load_role_assignments(
     Load role assignments into the graph
     """
     logger.info(f"Loading {len(role_assignments)} role assignments")
-    if role_assignments:
-        neo4j_session.run(
-            """
-            UNWIND $role_assignments AS ra
-            MATCH (acc:AWSAccount{id:ra.AccountId}) -[:RESOURCE]->
-            (role:AWSRole)<-[:ASSIGNED_TO_ROLE]-
-            (permset:AWSPermissionSet {id: ra.PermissionSetArn})
-            MATCH (sso:AWSSSOUser {id: ra.UserId})
-            MERGE (role)-[r:ALLOWED_BY]->(sso)
-            SET r.lastupdated = $aws_update_tag,
-            r.permission_set_arn = ra.PermissionSetArn
-            """,
-            role_assignments=role_assignments,
-            aws_update_tag=aws_update_tag,
-        )
+    load_graph_data(
+        neo4j_session,
+        """
+        UNWIND $DictList AS ra
+        MATCH (acc:AWSAccount{id:ra.AccountId}) -[:RESOURCE]->
+        (role:AWSRole)<-[:ASSIGNED_TO_ROLE]-
+        (permset:AWSPermissionSet {id: ra.PermissionSetArn})
+        MATCH (sso:AWSSSOUser {id: ra.UserId})
+        MERGE (role)-[r:ALLOWED_BY]->(sso)
+        SET r.lastupdated = $aws_update_tag,
+        r.permission_set_arn = ra.PermissionSetArn
+        """,
+        role_assignments,
+        aws_update_tag=aws_update_tag,
+    )
 
 
 @timeit
@@ -1,18 +1,28 @@
 import logging
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Any
+from typing import Deque
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Set
 from typing import Tuple
 
 import boto3
+import botocore.client
 import neo4j
 
 from cartography.client.core.tx import load
 from cartography.graph.job import GraphJob
+from cartography.intel.aws.util.botocore_config import get_concurrent_botocore_config
 from cartography.models.aws.inspector.findings import AWSInspectorFindingSchema
 from cartography.models.aws.inspector.packages import AWSInspectorPackageSchema
 from cartography.util import aws_handle_regions
 from cartography.util import aws_paginate
+from cartography.util import batch
 from cartography.util import timeit
 
 
@@ -27,49 +37,79 @@ AWS_INSPECTOR_REGIONS = {
     "sa-east-1",
 }
 
+MAX_CONCURRENT_ACCOUNTS = 8
+# Findings are transformed and loaded in batches of this size
+FINDING_LOAD_BATCH_SIZE = 1000
+
 
 @timeit
 @aws_handle_regions
-def get_inspector_findings(
-        session: boto3.session.Session,
-        region: str,
-        current_aws_account_id: str,
-) -> List[Dict[str, Any]]:
+def get_inspector_member_accounts(client: botocore.client.BaseClient) -> List[str]:
+    """
+    list_members will get us all the accounts that have delegated access to the account of the client.
+    """
+    members = aws_paginate(client, 'list_members', 'members')
+    return [m['accountId'] for m in members]
+
+
+@timeit
+@aws_handle_regions
+def get_inspector_findings_for_account(client: botocore.client.BaseClient, account: str) -> List[Dict[str, Any]]:
     """
     We must list_findings by filtering the request, otherwise the request could tiemout.
     First, we filter by account_id. And since there may be millions of CLOSED findings that may never go away,
     we will only fetch those in ACTIVE or SUPPRESSED statuses.
-    list_members will get us all the accounts that
-    have delegated access to the account specified by current_aws_account_id.
     """
-    client = session.client('inspector2', region_name=region)
+    logger.info(f'Getting findings for member account {account}')
+    return list(
+        aws_paginate(
+            client, 'list_findings', 'findings', filterCriteria={
+                'awsAccountId': [
+                    {
+                        'comparison': 'EQUALS',
+                        'value': account,
+                    },
+                ],
+                'findingStatus': [
+                    {
+                        'comparison': 'NOT_EQUALS',
+                        'value': 'CLOSED',
+                    },
+                ],
+            },
+        ),
+    )
 
-    members = aws_paginate(client, 'list_members', 'members')
+
+def get_inspector_findings(
+        session: boto3.session.Session,
+        region: str,
+        current_aws_account_id: str,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields the findings of the account specified by current_aws_account_id and of its member accounts, one account at a
+    time. Up to MAX_CONCURRENT_ACCOUNTS accounts are fetched concurrently on one client; boto3 sessions are not
+    thread-safe but clients are. The next account is only submitted when a fetched one is yielded, so at most
+    MAX_CONCURRENT_ACCOUNTS accounts' findings are held in memory while the caller loads another. Accounts are yielded
+    in a fixed order, the host account first, so that the sync always loads a package shared by several accounts from
+    the same finding.
+    """
+    client = session.client(
+        'inspector2', region_name=region, config=get_concurrent_botocore_config(MAX_CONCURRENT_ACCOUNTS),
+    )
     # the current host account may not be considered a "member", but we still fetch its findings
-    accounts = [current_aws_account_id] + [m['accountId'] for m in members]
-
-    findings = []
-    for account in accounts:
-        logger.info(f'Getting findings for member account {account} in region {region}')
-        findings.extend(
-            aws_paginate(
-                client, 'list_findings', 'findings', filterCriteria={
-                    'awsAccountId': [
-                        {
-                            'comparison': 'EQUALS',
-                            'value': account,
-                        },
-                    ],
-                    'findingStatus': [
-                        {
-                            'comparison': 'NOT_EQUALS',
-                            'value': 'CLOSED',
-                        },
-                    ],
-                },
-            ),
+    accounts = iter([current_aws_account_id] + get_inspector_member_accounts(client))
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ACCOUNTS) as executor:
+        pending: Deque[Future] = deque(
+            executor.submit(get_inspector_findings_for_account, client, account)
+            for account in islice(accounts, MAX_CONCURRENT_ACCOUNTS)
         )
-    return findings
+        while pending:
+            findings = pending.popleft().result()
+            next_account = next(accounts, None)
+            if next_account:
+                pending.append(executor.submit(get_inspector_findings_for_account, client, next_account))
+            yield findings
 
 
 def transform_inspector_findings(results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
@@ -219,10 +259,15 @@ def sync(
 
     for region in inspector_regions:
         logger.info(f"Syncing AWS Inspector findings for account {current_aws_account_id} and region {region}")
-        findings = get_inspector_findings(boto3_session, region, current_aws_account_id)
-        finding_data, package_data = transform_inspector_findings(findings)
-        logger.info(f"Loading {len(finding_data)} findings")
-        load_inspector_findings(neo4j_session, finding_data, region, update_tag, current_aws_account_id)
-        logger.info(f"Loading {len(package_data)} packages")
-        load_inspector_packages(neo4j_session, package_data, region, update_tag, current_aws_account_id)
+        # A package is reported by every finding about it, so only the first occurrence in the region is loaded
+        seen_package_ids: Set[str] = set()
+        for findings in get_inspector_findings(boto3_session, region, current_aws_account_id):
+            for findings_batch in batch(findings, FINDING_LOAD_BATCH_SIZE):
+                finding_data, package_data = transform_inspector_findings(findings_batch)
+                package_data = [package for package in package_data if package['id'] not in seen_package_ids]
+                seen_package_ids.update(package['id'] for package in package_data)
+                logger.info(f"Loading {len(finding_data)} findings")
+                load_inspector_findings(neo4j_session, finding_data, region, update_tag, current_aws_account_id)
+                logger.info(f"Loading {len(package_data)} packages")
+                load_inspector_packages(neo4j_session, package_data, region, update_tag, current_aws_account_id)
         cleanup(neo4j_session, common_job_parameters)
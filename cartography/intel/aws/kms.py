@@ -1,8 +1,9 @@
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import Any
 from typing import Dict
-from typing import Generator
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -13,12 +14,15 @@ import neo4j
 from botocore.exceptions import ClientError
 from policyuniverse.policy import Policy
 
+from cartography.intel.aws.util.botocore_config import get_concurrent_botocore_config
 from cartography.util import aws_handle_regions
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_KEYS = 8
+
 
 @timeit
 @aws_handle_regions
@@ -45,17 +49,27 @@ def get_kms_key_list(boto3_session: boto3.session.Session, region: str) -> List[
 @timeit
 @aws_handle_regions
 def get_kms_key_details(
-    boto3_session: boto3.session.Session, kms_key_data: Dict, region: str,
-) -> Generator[Any, Any, Any]:
+    boto3_session: boto3.session.Session, kms_key_data: List[Dict], region: str,
+) -> List[Tuple[str, Any, List[Any], List[Any]]]:
     """
-    Iterates over all KMS Keys.
+    Gets the policy, aliases and grants of all KMS Keys. Policies and grants are fetched for up to MAX_CONCURRENT_KEYS
+    keys at a time on one client, and aliases are listed once for the whole region.
     """
-    client = boto3_session.client('kms', region_name=region)
-    for key in kms_key_data:
-        policy = get_policy(key, client)
-        aliases = get_aliases(key, client)
-        grants = get_grants(key, client)
-        yield key['KeyId'], policy, aliases, grants
+    client = boto3_session.client(
+        'kms', region_name=region, config=get_concurrent_botocore_config(MAX_CONCURRENT_KEYS),
+    )
+    aliases_by_key: Dict[str, List[Any]] = {}
+    for alias in get_aliases(client):
+        if 'TargetKeyId' in alias:
+            aliases_by_key.setdefault(alias['TargetKeyId'], []).append(alias)
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_KEYS) as executor:
+        policies = executor.map(get_policy, kms_key_data, repeat(client))
+        grants = executor.map(get_grants, kms_key_data, repeat(client))
+        return [
+            (key['KeyId'], policy, aliases_by_key.get(key['KeyId'], []), key_grants)
+            for key, policy, key_grants in zip(kms_key_data, policies, grants)
+        ]
 
 
 @timeit
@@ -79,13 +93,13 @@ def get_policy(key: Dict, client: botocore.client.BaseClient) -> Any:
 
 
 @timeit
-def get_aliases(key: Dict, client: botocore.client.BaseClient) -> List[Any]:
+def get_aliases(client: botocore.client.BaseClient) -> List[Any]:
     """
-    Gets the KMS Key Aliases.
+    Gets the KMS Key Aliases of the client's region. list_aliases without a KeyId lists the aliases of all keys.
     """
     aliases: List[Any] = []
     paginator = client.get_paginator('list_aliases')
-    for page in paginator.paginate(KeyId=key['KeyId']):
+    for page in paginator.paginate():
         aliases.extend(page['Aliases'])
 
     return aliases
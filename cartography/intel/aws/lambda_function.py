@@ -1,4 +1,6 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import Any
 from typing import Dict
 from typing import List
@@ -8,12 +10,15 @@ import boto3
 import botocore
 import neo4j
 
+from cartography.intel.aws.util.botocore_config import get_concurrent_botocore_config
 from cartography.util import aws_handle_regions
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_FUNCTIONS = 8
+
 
 @timeit
 @aws_handle_regions
@@ -111,14 +116,20 @@ def get_event_source_mappings(lambda_function: Dict, client: botocore.client.Bas
 def get_lambda_function_details(
         boto3_session: boto3.session.Session, data: List[Dict], region: str,
 ) -> List[Tuple[str, List[Any], List[Any], List[Any]]]:
-    client = boto3_session.client('lambda', region_name=region)
-    details = []
-    for lambda_function in data:
-        function_aliases = get_function_aliases(lambda_function, client)
-        event_source_mappings = get_event_source_mappings(lambda_function, client)
-        layers = lambda_function.get('Layers', [])
-        details.append((lambda_function['FunctionArn'], function_aliases, event_source_mappings, layers))
-    return details
+    """
+    Gets the aliases and event source mappings of all functions, for up to MAX_CONCURRENT_FUNCTIONS functions at a time
+    on one client. Layers are part of the function data.
+    """
+    client = boto3_session.client(
+        'lambda', region_name=region, config=get_concurrent_botocore_config(MAX_CONCURRENT_FUNCTIONS),
+    )
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FUNCTIONS) as executor:
+        function_aliases = executor.map(get_function_aliases, data, repeat(client))
+        event_source_mappings = executor.map(get_event_source_mappings, data, repeat(client))
+        return [
+            (lambda_function['FunctionArn'], aliases, mappings, lambda_function.get('Layers', []))
+            for lambda_function, aliases, mappings in zip(data, function_aliases, event_source_mappings)
+        ]
 
 
 @timeit
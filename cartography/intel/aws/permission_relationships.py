@@ -12,6 +12,7 @@ import boto3
 import neo4j
 import yaml
 
+from cartography.client.core.session import read_session
 from cartography.graph.statement import GraphStatement
 from cartography.util import timeit
 
@@ -363,7 +364,9 @@ def sync(
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
     logger.info("Syncing Permission Relationships for account '%s'.", current_aws_account_id)
-    principals = get_principals_for_account(neo4j_session, current_aws_account_id)
+    # These reads can be served by cluster followers, see --neo4j-routing.
+    with read_session(neo4j_session) as read_neo4j_session:
+        principals = get_principals_for_account(read_neo4j_session, current_aws_account_id)
     pr_file = common_job_parameters["permission_relationships_file"]
     if not pr_file:
         logger.warning(
@@ -381,7 +384,8 @@ def sync(
         permissions = rpr["permissions"]
         relationship_name = rpr["relationship_name"]
         target_label = rpr["target_label"]
-        resource_arns = get_resource_arns(neo4j_session, current_aws_account_id, target_label)
+        with read_session(neo4j_session) as read_neo4j_session:
+            resource_arns = get_resource_arns(read_neo4j_session, current_aws_account_id, target_label)
         logger.info("Syncing relationship '%s' for node label '%s'", relationship_name, target_label)
         allowed_mappings = calculate_permission_relationships(principals, resource_arns, permissions)
         load_principal_mappings(
@@ -1,9 +1,16 @@
 import logging
+import re
+from concurrent.futures import as_completed
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from string import Template
 from typing import Dict
+from typing import Iterable
 from typing import List
+from typing import Optional
 
 import boto3
+import botocore.client
 import neo4j
 
 from cartography.intel.aws.iam import get_role_tags
@@ -116,25 +123,76 @@ TAG_RESOURCE_TYPE_MAPPINGS: Dict = {
 }
 
 
+# Resource types that the Resource Groups Tagging API does not return. Their tags are fetched by other means.
+NON_TAGGING_API_RESOURCE_TYPES = {'iam:role'}
+
+# Number of resources whose tags are written per transaction.
+TAG_LOAD_BATCH_SIZE = 1000
+
+# Number of regions scanned at the same time.
+MAX_CONCURRENT_REGIONS = 8
+
+
+def get_resource_type_from_arn(
+    arn: str,
+    resource_types: Iterable[str] = TAG_RESOURCE_TYPE_MAPPINGS.keys(),
+) -> Optional[str]:
+    """
+    Returns the key of TAG_RESOURCE_TYPE_MAPPINGS that an ARN returned by the Resource Groups Tagging API belongs to,
+    e.g. 'ec2:instance' for "arn:aws:ec2:us-east-1:1234:instance/i-01", 'elasticloadbalancing:loadbalancer/app' for
+    "arn:aws:elasticloadbalancing:us-east-1:1234:loadbalancer/app/foo/ab123", and 's3' for "arn:aws:s3:::bucket_name".
+    :param arn: The ARN
+    :param resource_types: The resource types to consider.
+    :return: The resource type, or None if the ARN is not of any of the given resource types.
+    """
+    parts = arn.split(':', 5)
+    if len(parts) < 6:
+        return None
+    service, resource = parts[2], parts[5]
+    resource_parts = re.split('[:/]', resource)
+    candidates = []
+    if len(resource_parts) > 2:
+        # Load balancer v2 ARNs have the form loadbalancer/{app,net}/name/id.
+        candidates.append(f'{service}:{resource_parts[0]}/{resource_parts[1]}')
+    if len(resource_parts) > 1:
+        candidates.append(f'{service}:{resource_parts[0]}')
+    # Services with a single resource type, such as S3 and SQS, have no type in their ARNs.
+    candidates.append(service)
+    for candidate in candidates:
+        if candidate in resource_types:
+            return candidate
+    return None
+
+
 @timeit
 @aws_handle_regions
-def get_tags(boto3_session: boto3.session.Session, resource_type: str, region: str) -> List[Dict]:
+def get_tags(boto3_session: boto3.session.Session, resource_types: List[str], region: str) -> List[Dict]:
     """
-    Create boto3 client and retrieve tag data.
+    Create boto3 client and retrieve tag data of all the given resource types in one paginated scan.
     """
     # this is a temporary workaround to populate AWS tags for IAM roles.
     # resourcegroupstaggingapi does not support IAM roles and no ETA is provided
     # TODO: when resourcegroupstaggingapi supports iam:role, remove this condition block
-    if resource_type == 'iam:role':
+    if resource_types == ['iam:role']:
         return get_role_tags(boto3_session)
 
     client = boto3_session.client('resourcegroupstaggingapi', region_name=region)
+    return get_tags_with_client(client, resource_types)
+
+
+@timeit
+@aws_handle_regions
+def get_tags_with_client(client: botocore.client.BaseClient, resource_types: List[str]) -> List[Dict]:
+    """
+    Retrieve tag data of all the given resource types in one paginated scan with an existing
+    resourcegroupstaggingapi client. Clients are thread-safe, unlike the sessions that create them.
+    """
     paginator = client.get_paginator('get_resources')
     resources: List[Dict] = []
     for page in paginator.paginate(
         # Only ingest tags for resources that Cartography supports.
         # This is just a starting list; there may be others supported by this API.
-        ResourceTypeFilters=[resource_type],
+        ResourceTypeFilters=resource_types,
     ):
         resources.extend(page['ResourceTagMappingList'])
     return resources
@@ -191,7 +249,7 @@ def load_tags(
     if len(tag_data) == 0:
         # If there is no data to load, save some time.
         return
-    for tag_data_batch in batch(tag_data, size=100):
+    for tag_data_batch in batch(tag_data, size=TAG_LOAD_BATCH_SIZE):
         neo4j_session.write_transaction(
             _load_tags_tx,
             tag_data=tag_data_batch,
@@ -216,6 +274,19 @@ def compute_resource_id(tag_mapping: Dict, resource_type: str) -> str:
     return resource_id
 
 
+def group_tags_by_resource_type(tag_data: List[Dict], resource_types: Iterable[str]) -> Dict[str, List[Dict]]:
+    """
+    Routes the tag mappings of a Resource Groups Tagging API scan to their resource types by ARN.
+    Mappings of resource types that are not in `resource_types` are dropped.
+    """
+    grouped: Dict[str, List[Dict]] = {}
+    for tag_mapping in tag_data:
+        resource_type = get_resource_type_from_arn(tag_mapping['ResourceARN'], resource_types)
+        if resource_type:
+            grouped.setdefault(resource_type, []).append(tag_mapping)
+    return grouped
+
+
 @timeit
 def cleanup(neo4j_session: neo4j.Session, common_job_parameters: Dict) -> None:
     run_cleanup_job('aws_import_tags_cleanup.json', neo4j_session, common_job_parameters)
@@ -231,18 +302,47 @@ def sync(
     common_job_parameters: Dict,
     tag_resource_type_mappings: Dict = TAG_RESOURCE_TYPE_MAPPINGS,
 ) -> None:
-    for region in regions:
-        logger.info(f"Syncing AWS tags for account {current_aws_account_id} and region {region}")
-        for resource_type in tag_resource_type_mappings.keys():
-            tag_data = get_tags(boto3_session, resource_type, region)
-            transform_tags(tag_data, resource_type)  # type: ignore
-            logger.info(f"Loading {len(tag_data)} tags for resource type {resource_type}")
-            load_tags(
-                neo4j_session=neo4j_session,
-                tag_data=tag_data,  # type: ignore
-                resource_type=resource_type,
-                region=region,
-                current_aws_account_id=current_aws_account_id,
-                aws_update_tag=update_tag,
-            )
+    resource_types = [
+        resource_type for resource_type in tag_resource_type_mappings.keys()
+        if resource_type not in NON_TAGGING_API_RESOURCE_TYPES
+    ]
+    # Each region is scanned once for all resource types. The scans run concurrently; boto3 sessions and the Neo4j
+    # session are not thread-safe, so clients are created and loads happen here in the calling thread.
+    if resource_types and regions:
+        clients = {
+            region: boto3_session.client('resourcegroupstaggingapi', region_name=region) for region in regions
+        }
+        with ThreadPoolExecutor(max_workers=min(len(regions), MAX_CONCURRENT_REGIONS)) as executor:
+            futures: Dict[Future, str] = {
+                executor.submit(get_tags_with_client, client, resource_types): region
+                for region, client in clients.items()
+            }
+            for future in as_completed(futures):
+                region = futures[future]
+                logger.info(f"Syncing AWS tags for account {current_aws_account_id} and region {region}")
+                for resource_type, tag_data in group_tags_by_resource_type(future.result(), resource_types).items():
+                    transform_tags(tag_data, resource_type)  # type: ignore
+                    logger.info(f"Loading {len(tag_data)} tags for resource type {resource_type}")
+                    load_tags(
+                        neo4j_session=neo4j_session,
+                        tag_data=tag_data,  # type: ignore
+                        resource_type=resource_type,
+                        region=region,
+                        current_aws_account_id=current_aws_account_id,
+                        aws_update_tag=update_tag,
+                    )
+
+    # IAM is a global service, so IAM role tags are fetched once per account instead of once per region.
+    if 'iam:role' in tag_resource_type_mappings and regions:
+        tag_data = get_tags(boto3_session, ['iam:role'], regions[0])
+        transform_tags(tag_data, 'iam:role')  # type: ignore
+        logger.info(f"Loading {len(tag_data)} tags for resource type iam:role")
+        load_tags(
+            neo4j_session=neo4j_session,
+            tag_data=tag_data,  # type: ignore
+            resource_type='iam:role',
+            region=regions[0],
+            current_aws_account_id=current_aws_account_id,
+            aws_update_tag=update_tag,
+        )
     cleanup(neo4j_session, common_job_parameters)
@@ -1,21 +1,31 @@
 import logging
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 import boto3
+import botocore.client
 import neo4j
 
 from cartography.client.core.tx import load
 from cartography.graph.job import GraphJob
+from cartography.intel.aws.util.botocore_config import get_concurrent_botocore_config
 from cartography.models.aws.ssm.instance_information import SSMInstanceInformationSchema
 from cartography.models.aws.ssm.instance_patch import SSMInstancePatchSchema
 from cartography.util import aws_handle_regions
+from cartography.util import batch
 from cartography.util import dict_date_to_epoch
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_INSTANCES = 8
+# Patches are fetched, transformed and loaded for this many instances at a time
+INSTANCE_PATCH_BATCH_SIZE = 100
+
 
 @timeit
 def get_instance_ids(neo4j_session: neo4j.Session, region: str, current_aws_account_id: str) -> List[str]:
@@ -62,23 +72,41 @@ def transform_instance_information(data_list: List[Dict[str, Any]]) -> List[Dict
 
 @timeit
 @aws_handle_regions
+def get_patches_for_instance(client: botocore.client.BaseClient, instance_id: str) -> List[Dict[str, Any]]:
+    patches: List[Dict[str, Any]] = []
+    paginator = client.get_paginator('describe_instance_patches')
+    for page in paginator.paginate(InstanceId=instance_id):
+        patches.extend(page["Patches"])
+    # to avoid complicating the load function, inject the instance ID into the patch
+    for patch in patches:
+        patch["_instance_id"] = instance_id
+    return patches
+
+
 def get_instance_patches(
         boto3_session: boto3.session.Session,
         region: str,
         instance_ids: List[str],
-) -> List[Dict[str, Any]]:
-    client = boto3_session.client('ssm', region_name=region)
-    instance_patches: List[Dict[str, Any]] = []
-    paginator = client.get_paginator('describe_instance_patches')
-    for instance_id in instance_ids:
-        patches = []
-        for page in paginator.paginate(InstanceId=instance_id):
-            patches.extend(page["Patches"])
-        # to avoid complicating the load function, inject the instance ID into the patch
-        for patch in patches:
-            patch["_instance_id"] = instance_id
-        instance_patches.extend(patches)
-    return instance_patches
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields the patches of the given instances, for INSTANCE_PATCH_BATCH_SIZE instances at a time, so that they can be
+    transformed and loaded while the patches of the next batch are fetched. Up to MAX_CONCURRENT_INSTANCES instances
+    are fetched concurrently on one client; boto3 sessions are not thread-safe but clients are.
+    """
+    client = boto3_session.client(
+        'ssm', region_name=region, config=get_concurrent_botocore_config(MAX_CONCURRENT_INSTANCES),
+    )
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_INSTANCES) as executor:
+        pending: List[Future] = []
+        for instance_ids_batch in batch(instance_ids, INSTANCE_PATCH_BATCH_SIZE):
+            futures = [
+                executor.submit(get_patches_for_instance, client, instance_id) for instance_id in instance_ids_batch
+            ]
+            if pending:
+                yield [patch for future in pending for patch in future.result()]
+            pending = futures
+        if pending:
+            yield [patch for future in pending for patch in future.result()]
 
 
 def transform_instance_patches(data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -150,7 +178,9 @@ def sync(
         data = transform_instance_information(data)
         load_instance_information(neo4j_session, data, region, current_aws_account_id, update_tag)
 
-        data = get_instance_patches(boto3_session, region, instance_ids)
-        data = transform_instance_patches(data)
-        load_instance_patches(neo4j_session, data, region, current_aws_account_id, update_tag)
+        # Only instances managed by SSM have patch data
+        managed_instance_ids = [ii['InstanceId'] for ii in data]
+        for patches in get_instance_patches(boto3_session, region, managed_instance_ids):
+            patches = transform_instance_patches(patches)
+            load_instance_patches(neo4j_session, patches, region, current_aws_account_id, update_tag)
     cleanup_ssm(neo4j_session, common_job_parameters)
@@ -0,0 +1,18 @@
+import botocore.config
+
+
+def get_concurrent_botocore_config(max_concurrency: int) -> botocore.config.Config:
+    """
+    :param max_concurrency: The number of threads that will share the client.
+    :return: A config for a boto3 client that is shared by a pool of worker threads. The connection pool is sized to
+    the number of threads, and the adaptive retry mode rate-limits the calls of all threads on the client once AWS
+    starts throttling them, instead of letting every thread retry on its own.
+    """
+    return botocore.config.Config(
+        read_timeout=360,
+        max_pool_connections=max(max_concurrency, 10),
+        retries={
+            'max_attempts': 10,
+            'mode': 'adaptive',
+        },
+    )
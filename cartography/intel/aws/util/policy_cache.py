@@ -0,0 +1,122 @@
+"""
+Cache of IAM managed policy documents, shared by all principals and accounts of an AWS sync.
+
+A policy version never changes once it is created, so a document can be cached under its policy ARN and version ID. The
+AWS-managed policies (`arn:aws:iam::aws:policy/...`) are the same in every account, so in a multi-account sync most of
+their `GetPolicyVersion` calls become cache hits. With `--aws-managed-policy-cache-file`, the AWS-managed documents are
+also kept between syncs.
+"""
+import copy
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import botocore.client
+
+from cartography.metrics import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+_AWS_MANAGED_POLICY_ARN = re.compile(r'^arn:[^:]+:iam::aws:policy/')
+
+
+def is_aws_managed_policy(arn: str) -> bool:
+    return bool(_AWS_MANAGED_POLICY_ARN.match(arn))
+
+
+class ManagedPolicyCache:
+    """
+    The statements of managed policy versions, keyed by policy ARN and version ID. Thread-safe.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: If given, the JSON file that the AWS-managed policies are loaded from and saved to.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._statements: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for entry in json.load(f):
+                    self._statements[(entry['arn'], entry['version_id'])] = entry['statements']
+            logger.info("Loaded %d AWS managed policy versions from '%s'.", len(self._statements), path)
+
+    def get_statements(self, client: botocore.client.BaseClient, arn: str, version_id: str) -> Any:
+        """
+        :param client: An IAM client, used to call GetPolicyVersion on a cache miss.
+        :return: The `Statement` element of the given policy version. The caller may modify it.
+        """
+        key = (arn, version_id)
+        with self._lock:
+            statements = self._statements.get(key)
+        hit = statements is not None
+        if not hit:
+            document = client.get_policy_version(PolicyArn=arn, VersionId=version_id)['PolicyVersion']['Document']
+            statements = document['Statement']
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._statements[key] = statements
+        metrics_collector = get_metrics_collector()
+        if metrics_collector:
+            metrics_collector.incr('managed_policy_cache_hits' if hit else 'managed_policy_cache_misses')
+        return copy.deepcopy(statements)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def log_stats(self) -> None:
+        logger.info(
+            "Managed policy cache: %d hits, %d misses, %.0f%% hit rate.",
+            self.hits,
+            self.misses,
+            self.hit_rate * 100,
+        )
+
+    def save(self) -> None:
+        """
+        Writes the AWS-managed policy versions to the cache file, if there is one. Customer managed policies are not
+        persisted.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            entries: List[Dict[str, Any]] = [
+                {'arn': arn, 'version_id': version_id, 'statements': statements}
+                for (arn, version_id), statements in self._statements.items()
+                if is_aws_managed_policy(arn)
+            ]
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(temp_path, self.path)
+
+
+# Set by cartography.intel.aws.start_aws_ingestion() for the duration of an AWS sync
+_managed_policy_cache: Optional[ManagedPolicyCache] = None
+
+
+def get_managed_policy_cache() -> ManagedPolicyCache:
+    global _managed_policy_cache
+    if _managed_policy_cache is None:
+        _managed_policy_cache = ManagedPolicyCache()
+    return _managed_policy_cache
+
+
+def set_managed_policy_cache(managed_policy_cache: Optional[ManagedPolicyCache]) -> None:
+    global _managed_policy_cache
+    _managed_policy_cache = managed_policy_cache
@@ -1,4 +1,7 @@
+import contextvars
 import logging
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -11,13 +14,18 @@ from . import sql
 from . import storage
 from . import subscription
 from . import tenant
+from .util.clients import close_management_clients
 from .util.credentials import Authenticator
 from .util.credentials import Credentials
+from cartography.client.core.session import get_session_factory
 from cartography.config import Config
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Default maximum number of subscriptions that are synced at the same time
+MAX_CONCURRENT_SUBSCRIPTIONS = 4
+
 
 def _sync_one_subscription(
     neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, update_tag: int,
@@ -37,21 +45,64 @@ def _sync_tenant(
     tenant.sync(neo4j_session, tenant_id, current_user, update_tag, common_job_parameters)  # type: ignore
 
 
+def _sync_subscription_on_new_session(
+    credentials: Credentials, subscription_id: str, update_tag: int, common_job_parameters: Dict,
+) -> None:
+    session_factory = get_session_factory()
+    assert session_factory
+    # In extract mode, the session factory hands out a RecordingSession, so the Cypher of each subscription is
+    # recorded to the snapshot like that of the stage session.
+    with session_factory() as neo4j_session:
+        _sync_one_subscription(neo4j_session, credentials, subscription_id, update_tag, common_job_parameters)
+
+
 def _sync_multiple_subscriptions(
     neo4j_session: neo4j.Session, credentials: Credentials, tenant_id: str, subscriptions: List[Dict],
-    update_tag: int, common_job_parameters: Dict,
+    update_tag: int, common_job_parameters: Dict, max_workers: int = MAX_CONCURRENT_SUBSCRIPTIONS,
 ) -> None:
+    """
+    Syncs the given subscriptions. Each subscription gets its own copy of `common_job_parameters` with its
+    `AZURE_SUBSCRIPTION_ID`. If a session factory is set and `max_workers` is greater than 1, up to `max_workers`
+    subscriptions are synced at the same time, each on its own Neo4j session; otherwise they are synced one by one on
+    `neo4j_session`. If any subscription fails, the first exception is raised once all subscriptions have finished.
+    """
     logger.info("Syncing Azure subscriptions")
 
     subscription.sync(neo4j_session, tenant_id, subscriptions, update_tag, common_job_parameters)
 
-    for sub in subscriptions:
-        logger.info("Syncing Azure Subscription with ID '%s'", sub['subscriptionId'])
-        common_job_parameters['AZURE_SUBSCRIPTION_ID'] = sub['subscriptionId']
-
-        _sync_one_subscription(neo4j_session, credentials, sub['subscriptionId'], update_tag, common_job_parameters)
+    subscription_ids = [sub['subscriptionId'] for sub in subscriptions]
+    job_parameters = [
+        {**common_job_parameters, 'AZURE_SUBSCRIPTION_ID': subscription_id} for subscription_id in subscription_ids
+    ]
+    if max_workers <= 1 or len(subscriptions) <= 1 or get_session_factory() is None:
+        for subscription_id, parameters in zip(subscription_ids, job_parameters):
+            logger.info("Syncing Azure Subscription with ID '%s'", subscription_id)
+            _sync_one_subscription(neo4j_session, credentials, subscription_id, update_tag, parameters)
+        return
 
-    del common_job_parameters["AZURE_SUBSCRIPTION_ID"]
+    logger.info("Syncing %d Azure subscriptions, %d at a time.", len(subscriptions), max_workers)
+    errors = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(subscriptions))) as executor:
+        # Run each subscription in a copy of this thread's context so that it keeps the cartography.metrics labels.
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run,
+                _sync_subscription_on_new_session,
+                credentials,
+                subscription_id,
+                update_tag,
+                parameters,
+            ): subscription_id
+            for subscription_id, parameters in zip(subscription_ids, job_parameters)
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.exception("Failed to sync Azure Subscription with ID '%s'.", futures[future])
+                errors.append(e)
+    if errors:
+        raise errors[0]
 
 
 @timeit
@@ -96,7 +147,10 @@ def start_azure_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
         )
         return
 
-    _sync_multiple_subscriptions(
-        neo4j_session, credentials, credentials.get_tenant_id(), subscriptions, config.update_tag,
-        common_job_parameters,
-    )
+    try:
+        _sync_multiple_subscriptions(
+            neo4j_session, credentials, credentials.get_tenant_id(), subscriptions, config.update_tag,
+            common_job_parameters, config.azure_subscription_concurrency,
+        )
+    finally:
+        close_management_clients()
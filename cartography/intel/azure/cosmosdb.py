@@ -12,6 +12,7 @@ from azure.core.exceptions import HttpResponseError
 from azure.core.exceptions import ResourceNotFoundError
 from azure.mgmt.cosmosdb import CosmosDBManagementClient
 
+from .util.clients import get_management_client
 from .util.credentials import Credentials
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -24,8 +25,7 @@ def get_client(credentials: Credentials, subscription_id: str) -> CosmosDBManage
     """
     Getting the CosmosDB client
     """
-    client = CosmosDBManagementClient(credentials, subscription_id)
-    return client
+    return get_management_client(CosmosDBManagementClient, credentials, subscription_id)
 
 
 @timeit
@@ -14,6 +14,7 @@ from azure.mgmt.sql.models import SecurityAlertPolicyName
 from azure.mgmt.sql.models import TransparentDataEncryptionName
 from msrestazure.azure_exceptions import CloudError
 
+from .util.clients import get_management_client
 from .util.credentials import Credentials
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -26,8 +27,7 @@ def get_client(credentials: Credentials, subscription_id: str) -> SqlManagementC
     """
     Getting the Azure SQL client
     """
-    client = SqlManagementClient(credentials, subscription_id)
-    return client
+    return get_management_client(SqlManagementClient, credentials, subscription_id)
 
 
 @timeit
@@ -1,4 +1,6 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import Any
 from typing import Dict
 from typing import Generator
@@ -11,20 +13,23 @@ from azure.core.exceptions import HttpResponseError
 from azure.core.exceptions import ResourceNotFoundError
 from azure.mgmt.storage import StorageManagementClient
 
+from .util.clients import get_management_client
 from .util.credentials import Credentials
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of storage accounts whose queue, table, file and blob services are fetched at the same time
+MAX_CONCURRENT_STORAGE_ACCOUNTS = 8
+
 
 @timeit
 def get_client(credentials: Credentials, subscription_id: str) -> StorageManagementClient:
     """
     Getting the Azure Storage client
     """
-    client = StorageManagementClient(credentials, subscription_id)
-    return client
+    return get_management_client(StorageManagementClient, credentials, subscription_id)
 
 
 @timeit
@@ -108,16 +113,26 @@ def get_storage_account_details(
         credentials: Credentials, subscription_id: str, storage_account_list: List[Dict],
 ) -> Generator[Any, Any, Any]:
     """
-    Iterates over all Storage Accounts to get the different storage services.
+    Iterates over all Storage Accounts to get the different storage services. The services of up to
+    MAX_CONCURRENT_STORAGE_ACCOUNTS accounts are fetched at the same time; results are yielded in the order of
+    `storage_account_list`.
     """
-    for storage_account in storage_account_list:
-        queue_services = get_queue_services(credentials, subscription_id, storage_account)
-        table_services = get_table_services(credentials, subscription_id, storage_account)
-        file_services = get_file_services(credentials, subscription_id, storage_account)
-        blob_services = get_blob_services(credentials, subscription_id, storage_account)
-        yield storage_account['id'], storage_account['name'], storage_account[
-            'resourceGroup'
-        ], queue_services, table_services, file_services, blob_services
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_STORAGE_ACCOUNTS) as executor:
+        yield from executor.map(
+            _get_storage_account_services, repeat(credentials), repeat(subscription_id), storage_account_list,
+        )
+
+
+def _get_storage_account_services(
+        credentials: Credentials, subscription_id: str, storage_account: Dict,
+) -> Tuple[str, str, str, List[Dict], List[Dict], List[Dict], List[Dict]]:
+    queue_services = get_queue_services(credentials, subscription_id, storage_account)
+    table_services = get_table_services(credentials, subscription_id, storage_account)
+    file_services = get_file_services(credentials, subscription_id, storage_account)
+    blob_services = get_blob_services(credentials, subscription_id, storage_account)
+    return storage_account['id'], storage_account['name'], storage_account[
+        'resourceGroup'
+    ], queue_services, table_services, file_services, blob_services
 
 
 @timeit
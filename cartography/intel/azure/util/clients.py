@@ -0,0 +1,46 @@
+import logging
+import threading
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+ClientT = TypeVar('ClientT')
+
+# Management clients shared by all intel modules during an Azure sync, keyed by client class, credentials and
+# subscription. Each client owns an HTTP pipeline with its own connection pool, so reusing them avoids a new pool, and
+# new TLS connections, for every call.
+_clients: Dict[Tuple[type, Any, str], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_management_client(client_class: Type[ClientT], credentials: Any, subscription_id: str) -> ClientT:
+    """
+    :return: The cached `client_class` client for the given credentials and subscription, created on first use.
+    Azure management clients are thread-safe, so the same client can be used by concurrent subscription syncs and
+    fetches.
+    """
+    key = (client_class, credentials, subscription_id)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = client_class(credentials, subscription_id)  # type: ignore
+            _clients[key] = client
+    return client
+
+
+def close_management_clients() -> None:
+    """
+    Closes the connection pools of all cached clients and empties the cache. Called at the end of the Azure sync.
+    """
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            logger.debug("Failed to close Azure management client %r.", client, exc_info=True)
@@ -1,9 +1,23 @@
 import logging
 from typing import List
+from typing import Optional
 
 import neo4j
 
+import cartography.models
+from cartography.client.core.indexes import get_index_registry
+from cartography.client.core.snapshot import get_snapshot_writer
 from cartography.config import Config
+from cartography.graph.cleanupbuilder import build_cleanup_index_queries
+from cartography.graph.cleanupbuilder import build_cleanup_scope_backfill_queries
+from cartography.graph.querybuilder import build_create_index_queries
+from cartography.graph.querybuilder import build_lowercase_shadow_backfill_queries
+from cartography.graph.querybuilder import get_lowercase_shadow_keys
+from cartography.graph.querybuilder import get_lowercase_shadow_property
+from cartography.graph.statement import GraphStatement
+from cartography.intel.oci.iam import get_id_backfill_queries
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.nodes import get_node_schema_classes
 from cartography.util import load_resource_binary
 logger = logging.getLogger(__name__)
 
@@ -18,8 +32,148 @@ def get_index_statements() -> List[str]:
     return statements
 
 
-def run(neo4j_session: neo4j.Session, config: Config) -> None:
+def get_node_schemas() -> List[CartographyNodeSchema]:
+    """
+    :return: An instance of each CartographyNodeSchema defined under cartography.models.
+    """
+    return [
+        schema_class() for schema_class in get_node_schema_classes()
+        if schema_class.__module__.startswith(cartography.models.__name__)
+    ]
+
+
+def get_desired_index_statements(indexed_cleanup: bool = False) -> List[str]:
+    """
+    :param indexed_cleanup: If True, also include the (`_cleanup_scope`, `lastupdated`) indexes that the cleanup jobs of
+    `--indexed-cleanup` seek on.
+    :return: The de-duplicated union of the statements in data/indexes.cypher and the index statements needed by every
+    registered CartographyNodeSchema.
+    """
+    statements = [statement for statement in get_index_statements() if statement]
+    for node_schema in get_node_schemas():
+        statements.extend(build_create_index_queries(node_schema))
+        if indexed_cleanup:
+            statements.extend(build_cleanup_index_queries(node_schema))
+    return list(dict.fromkeys(statements))
+
+
+def run(neo4j_session: neo4j.Session, config: Optional[Config]) -> None:
+    """
+    Diffs the desired indexes against the indexes present in the database and creates only the missing ones, in a single
+    transaction.
+    """
+    if get_snapshot_writer():
+        # Extract mode has no database; `--load-from` creates the indexes before it replays the snapshot.
+        logger.info("Extract mode: skipping index creation.")
+        return
     logger.info("Creating indexes for cartography node types.")
-    for statement in get_index_statements():
+    statements = get_desired_index_statements(bool(config and config.indexed_cleanup))
+    registry = get_index_registry()
+    registry.refresh(neo4j_session)
+    missing = registry.get_missing(statements)
+    logger.info(f"{len(missing)} of {len(statements)} indexes are missing.")
+
+    if config and config.create_indexes_dry_run:
+        for statement in missing:
+            logger.info("Would execute statement: %s", statement)
+        for statement in get_lowercase_shadow_backfill_queries(missing):
+            logger.info("Would backfill shadow properties with: %s", statement.strip())
+        for statement in get_cleanup_scope_backfill_queries(missing):
+            logger.info("Would backfill cleanup scopes with: %s", statement.strip())
+        for statement in get_id_backfill_queries(missing):
+            logger.info("Would backfill ids with: %s", statement.strip())
+        return
+
+    for statement in missing:
         logger.debug("Executing statement: %s", statement)
-        neo4j_session.run(statement)
+    registry.ensure(neo4j_session, missing)
+
+    if missing and config and config.create_indexes_await_timeout:
+        logger.info(f"Waiting up to {config.create_indexes_await_timeout} seconds for indexes to come online.")
+        neo4j_session.run("CALL db.awaitIndexes($timeout)", timeout=config.create_indexes_await_timeout)
+
+    backfill_lowercase_shadow_properties(neo4j_session, missing)
+    backfill_cleanup_scopes(neo4j_session, missing)
+    backfill_ids(neo4j_session, missing)
+
+
+def get_lowercase_shadow_backfill_queries(created_statements: List[str]) -> List[str]:
+    """
+    :param created_statements: The index statements that the create-indexes stage is about to run.
+    :return: The backfill queries of the lowercase shadow properties whose indexes are among `created_statements`.
+    """
+    shadow_properties = {
+        (label, key)
+        for label, keys in get_lowercase_shadow_keys().items()
+        for key in keys
+        if any(
+            statement.endswith(f'FOR (n:{label}) ON (n.{get_lowercase_shadow_property(key)});')
+            for statement in created_statements
+        )
+    }
+    return build_lowercase_shadow_backfill_queries(shadow_properties) if shadow_properties else []
+
+
+def backfill_lowercase_shadow_properties(neo4j_session: neo4j.Session, created_statements: List[str]) -> None:
+    """
+    Sets the lowercase shadow properties that case-insensitive and fuzzy relationship matchers look up on the nodes
+    that do not have them yet, see cartography.graph.querybuilder.get_lowercase_shadow_keys(). This is a one-time
+    migration: it only runs for the shadow properties whose indexes were just created, since schema-based loads keep
+    them up to date afterwards.
+    """
+    for idx, query in enumerate(get_lowercase_shadow_backfill_queries(created_statements), start=1):
+        GraphStatement(
+            query,
+            iterative=True,
+            iterationsize=1000,
+            parent_job_name='lowercase_shadow_backfill',
+            parent_job_sequence_num=idx,
+        ).run(neo4j_session)
+
+
+def get_cleanup_scope_backfill_queries(created_statements: List[str]) -> List[str]:
+    """
+    :param created_statements: The index statements that the create-indexes stage is about to run.
+    :return: The cleanup scope backfill queries of the node schemas whose cleanup scope indexes are among
+    `created_statements`, i.e. of the node types that `--indexed-cleanup` is enabled for for the first time.
+    """
+    created = set(created_statements)
+    return [
+        query for node_schema in get_node_schemas()
+        if created.intersection(build_cleanup_index_queries(node_schema))
+        for query in build_cleanup_scope_backfill_queries(node_schema)
+    ]
+
+
+def backfill_cleanup_scopes(neo4j_session: neo4j.Session, created_statements: List[str]) -> None:
+    """
+    Sets the cleanup scope that the cleanup jobs of `--indexed-cleanup` seek on for the nodes and relationships that do
+    not have it yet, see cartography.graph.cleanupbuilder.build_cleanup_scope_backfill_queries(). This is a one-time
+    migration: it only runs for the node schemas whose cleanup scope indexes were just created, since with
+    `--indexed-cleanup` schema-based loads set the scope on everything they write afterwards.
+    """
+    queries = get_cleanup_scope_backfill_queries(created_statements)
+    for idx, query in enumerate(queries, start=1):
+        GraphStatement(
+            query,
+            iterative=True,
+            iterationsize=1000,
+            parent_job_name='cleanup_scope_backfill',
+            parent_job_sequence_num=idx,
+        ).run(neo4j_session)
+
+
+def backfill_ids(neo4j_session: neo4j.Session, created_statements: List[str]) -> None:
+    """
+    Sets `id` on the nodes that were keyed by another property before their loads moved to schema models, see
+    cartography.intel.oci.iam.get_id_backfill_queries(). This is a one-time migration: it only runs for the labels
+    whose `id` indexes were just created.
+    """
+    for idx, query in enumerate(get_id_backfill_queries(created_statements), start=1):
+        GraphStatement(
+            query,
+            iterative=True,
+            iterationsize=1000,
+            parent_job_name='id_backfill',
+            parent_job_sequence_num=idx,
+        ).run(neo4j_session)
@@ -1,15 +1,27 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import neo4j
 from falconpy.hosts import Hosts
 from falconpy.oauth2 import OAuth2
 
+from cartography.util import batch
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# The scroll endpoint returns at most 5000 host IDs per page.
+HOST_ID_PAGE_SIZE = 5000
+# Number of host IDs requested per device details call.
+HOST_DETAILS_BATCH_SIZE = 500
+# Number of device details calls in flight at once. Kept small to stay within the Falcon API rate limits.
+MAX_CONCURRENT_REQUESTS = 4
+
 
 @timeit
 def sync_hosts(
@@ -18,10 +30,12 @@ def sync_hosts(
     authorization: OAuth2,
 ) -> None:
     client = Hosts(auth_object=authorization)
-    all_ids = get_host_ids(client)
-    for ids in all_ids:
-        host_data = get_hosts(client, ids)
-        load_host_data(neo4j_session, host_data, update_tag)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        for ids in get_host_ids(client):
+            # Each page of IDs is fetched concurrently in chunks and each chunk is loaded as soon as it arrives, so we
+            # never hold more than one page of host details in memory.
+            for host_data in executor.map(lambda chunk: get_hosts(client, chunk), batch(ids, HOST_DETAILS_BATCH_SIZE)):
+                load_host_data(neo4j_session, host_data, update_tag)
 
 
 def load_host_data(
@@ -76,27 +90,40 @@ def load_host_data(
     )
 
 
-def get_host_ids(client: Hosts, crowdstrikeapi_filter: str = '', crowdstrikeapi_limit: int = 5000) -> List[List[str]]:
-    ids = []
+def get_host_ids(
+    client: Hosts,
+    crowdstrikeapi_filter: str = '',
+    crowdstrikeapi_limit: int = HOST_ID_PAGE_SIZE,
+) -> Iterator[List[str]]:
+    """
+    Yields pages of host IDs using the scroll endpoint, which, unlike offset-based pagination, is not capped at 10,000
+    results. The scroll token expires about two minutes after it is issued, so the next page is requested before the
+    current one is yielded to be loaded.
+    """
     parameters = {"filter": crowdstrikeapi_filter, "limit": crowdstrikeapi_limit}
-    response = client.QueryDevicesByFilter(parameters=parameters)
-    body = response.get("body", {})
-    resources = body.get("resources", [])
+    resources, offset = _query_host_ids(client, parameters)
     if not resources:
-        logger.warning("No host IDs in QueryDevicesByFilter.")
-        return []
-    ids.append(resources)
-    offset = body.get("meta", {}).get("pagination", {}).get("offset")
-    while offset:
-        parameters["offset"] = offset
-        response = client.QueryDevicesByFilter(parameters=parameters)
-        body = response.get("body", {})
-        resources = body.get("resources", [])
-        if not resources:
-            break
-        ids.append(resources)
-        offset = body.get("meta", {}).get("pagination", {}).get("offset")
-    return ids
+        logger.warning("No host IDs in QueryDevicesByFilterScroll.")
+        return
+    while resources:
+        next_resources: List[str] = []
+        if offset:
+            parameters["offset"] = offset
+            next_resources, offset = _query_host_ids(client, parameters)
+        yield resources
+        resources = next_resources
+
+
+def _query_host_ids(client: Hosts, parameters: Dict) -> Tuple[List[str], Optional[str]]:
+    """
+    :return: One page of host IDs and the scroll token of the next page, if any.
+    """
+    response = client.QueryDevicesByFilterScroll(parameters=parameters)
+    body = response.get("body", {})
+    if response.get("status_code", 200) >= 400:
+        # Raise rather than return no IDs, which would make the cleanup job delete every host.
+        raise RuntimeError(f"QueryDevicesByFilterScroll failed: {body.get('errors')}")
+    return body.get("resources", []), body.get("meta", {}).get("pagination", {}).get("offset")
 
 
 def get_hosts(client: Hosts, ids: List[str]) -> List[Dict]:
@@ -1,15 +1,26 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import neo4j
 from falconpy.oauth2 import OAuth2
 from falconpy.spotlight_vulnerabilities import Spotlight_Vulnerabilities
 
+from cartography.util import batch
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# queryVulnerabilities and getVulnerabilities both accept at most 400 IDs per call.
+VULNERABILITY_ID_PAGE_SIZE = 400
+VULNERABILITY_DETAILS_BATCH_SIZE = 400
+# Number of getVulnerabilities calls in flight at once. Kept small to stay within the Falcon API rate limits.
+MAX_CONCURRENT_REQUESTS = 4
+
 
 @timeit
 def sync_vulnerabilities(
@@ -18,10 +29,14 @@ def sync_vulnerabilities(
     authorization: OAuth2,
 ) -> None:
     client = Spotlight_Vulnerabilities(auth_object=authorization)
-    all_ids = get_spotlight_vulnerability_ids(client)
-    for ids in all_ids:
-        vulnerability_data = get_spotlight_vulnerabilities(client, ids)
-        load_vulnerability_data(neo4j_session, vulnerability_data, update_tag)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        for ids in get_spotlight_vulnerability_ids(client):
+            vulnerability_pages = executor.map(
+                lambda chunk: get_spotlight_vulnerabilities(client, chunk),
+                batch(ids, VULNERABILITY_DETAILS_BATCH_SIZE),
+            )
+            for vulnerability_data in vulnerability_pages:
+                load_vulnerability_data(neo4j_session, vulnerability_data, update_tag)
 
 
 def load_vulnerability_data(
@@ -111,27 +126,35 @@ def _load_cves(neo4j_session: neo4j.Session, data: List[Dict], update_tag: int)
     )
 
 
-def get_spotlight_vulnerability_ids(client: Spotlight_Vulnerabilities) -> List[List[str]]:
-    ids = []
-    parameters = {"filter": 'status:!"closed"', "limit": 400}
-    response = client.queryVulnerabilities(parameters=parameters)
-    body = response.get("body", {})
-    resources = body.get("resources", [])
+def get_spotlight_vulnerability_ids(client: Spotlight_Vulnerabilities) -> Iterator[List[str]]:
+    """
+    Yields pages of open vulnerability IDs, following the `after` token returned by the API. The token expires about
+    two minutes after it is issued, so the next page is requested before the current one is yielded to be loaded.
+    """
+    parameters = {"filter": 'status:!"closed"', "limit": VULNERABILITY_ID_PAGE_SIZE}
+    resources, after = _query_vulnerability_ids(client, parameters)
     if not resources:
         logger.warning("No vulnerability IDs in spotlight queryVulnerabilities.")
-        return []
-    ids.append(resources)
-    after = body.get("meta", {}).get("pagination", {}).get("after")
-    while after:
-        parameters["after"] = after
-        response = client.queryVulnerabilities(parameters=parameters)
-        body = response.get("body", {})
-        resources = body.get("resources", [])
-        if not resources:
-            break
-        ids.append(resources)
-        after = body.get("meta", {}).get("pagination", {}).get("after")
-    return ids
+        return
+    while resources:
+        next_resources: List[str] = []
+        if after:
+            parameters["after"] = after
+            next_resources, after = _query_vulnerability_ids(client, parameters)
+        yield resources
+        resources = next_resources
+
+
+def _query_vulnerability_ids(client: Spotlight_Vulnerabilities, parameters: Dict) -> Tuple[List[str], Optional[str]]:
+    """
+    :return: One page of vulnerability IDs and the `after` token of the next page, if any.
+    """
+    response = client.queryVulnerabilities(parameters=parameters)
+    body = response.get("body", {})
+    if response.get("status_code", 200) >= 400:
+        # Raise rather than return no IDs, which would make the cleanup job delete every vulnerability.
+        raise RuntimeError(f"Spotlight queryVulnerabilities failed: {body.get('errors')}")
+    return body.get("resources", []), body.get("meta", {}).get("pagination", {}).get("after")
 
 
 def get_spotlight_vulnerabilities(
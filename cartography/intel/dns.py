@@ -1,17 +1,181 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from string import Template
 from typing import Any
+from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 
+import dns.exception
 import dns.rdatatype
 import dns.resolver
 import neo4j
 
+from cartography.client.core.tx import load_graph_data
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+DNS_MAX_CONCURRENT_LOOKUPS = 16
+# Seconds to wait for the answer to one lookup, including retries across nameservers
+DNS_LOOKUP_TIMEOUT = 5.0
+
+
+class DNSResolver:
+    """
+    Resolves the A records of many FQDNs concurrently. Answers are memoized, including failed lookups, so that a name
+    is looked up at most once per resolver. cartography.sync.Sync.run() sets a new resolver for every sync.
+    """
+
+    def __init__(
+        self,
+        resolver: Optional[dns.resolver.Resolver] = None,
+        max_workers: int = DNS_MAX_CONCURRENT_LOOKUPS,
+        timeout: float = DNS_LOOKUP_TIMEOUT,
+    ):
+        """
+        :param resolver: The dnspython resolver to send lookups with, e.g. one configured with a local nameserver. If
+        None, a resolver configured from the system settings is used.
+        :param max_workers: The number of lookups to run at once.
+        :param timeout: Seconds to wait for the answer to one lookup.
+        """
+        self.resolver = resolver or dns.resolver.Resolver()
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._cache: Dict[str, Optional[List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, fqdn: str) -> Optional[List[str]]:
+        # Resolver.resolve() replaced Resolver.query() in dnspython 2.0
+        resolve = getattr(self.resolver, 'resolve', None) or self.resolver.query
+        try:
+            answer = resolve(fqdn, 'A', lifetime=self.timeout)
+        except dns.exception.DNSException as e:
+            logger.warning(f"DNS resolution of '{fqdn}' failed: {e}")
+            return None
+        # Sorted, so that the value of a record does not change between syncs when its answer is unchanged
+        return sorted(str(result) for result in answer)
+
+    def resolve(self, fqdn: str) -> Optional[List[str]]:
+        """
+        :return: The sorted IP addresses of the A records of the FQDN, or None if it does not resolve.
+        """
+        return self.resolve_many([fqdn])[fqdn]
+
+    def resolve_many(self, fqdns: Iterable[str]) -> Dict[str, Optional[List[str]]]:
+        """
+        :return: For each FQDN, the IP addresses of its A records, or None if it does not resolve. Names that are not
+        memoized yet are looked up concurrently.
+        """
+        fqdns = list(dict.fromkeys(fqdns))
+        with self._lock:
+            missing = [fqdn for fqdn in fqdns if fqdn not in self._cache]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(len(missing), self.max_workers)) as executor:
+                answers = dict(zip(missing, executor.map(self._lookup, missing)))
+            with self._lock:
+                self._cache.update(answers)
+        with self._lock:
+            return {fqdn: self._cache[fqdn] for fqdn in fqdns}
+
+
+_dns_resolver: Optional[DNSResolver] = None
+
+
+def get_dns_resolver() -> DNSResolver:
+    global _dns_resolver
+    if _dns_resolver is None:
+        _dns_resolver = DNSResolver()
+    return _dns_resolver
+
+
+def set_dns_resolver(dns_resolver: Optional[DNSResolver]) -> None:
+    global _dns_resolver
+    _dns_resolver = dns_resolver
+
+
+@timeit
+def ingest_dns_records_by_fqdn(
+    neo4j_session: neo4j.Session, update_tag: int, points_to_records: Dict[str, str], record_label: str,
+    dns_node_additional_label: Optional[str] = None,
+) -> List[str]:
+    """
+    Batched version of ingest_dns_record_by_fqdn(). Resolves all FQDNs concurrently with the sync's DNSResolver, then
+    writes the :DNSRecord nodes and their relationships to the pointed-to nodes and to the :Ip nodes in two batched
+    queries. FQDNs that do not resolve are skipped.
+
+    :param neo4j_session: Neo4j session object
+    :param update_tag: Update tag to set the node with and childs
+    :param points_to_records: Maps each FQDN to the id of the node of label `record_label` it points to
+    :param record_label: the label of the node to attach to a DNS record, e.g. "ESDomain"
+    :param dns_node_additional_label: The specific label of the DNSRecord, e.g. AWSDNSRecord.
+    :return: the graph node ids of the ingested records
+    """
+    answers = get_dns_resolver().resolve_many(points_to_records.keys())
+    records: List[Dict[str, Any]] = []
+    ip_links: List[Dict[str, Any]] = []
+    for fqdn, points_to_record in points_to_records.items():
+        ip_list = answers[fqdn]
+        if ip_list is None:
+            logger.warning(f"Skipping DNS record for '{fqdn}', it does not resolve.")
+            continue
+        record_id = f"{fqdn}+A"
+        records.append({
+            'id': record_id,
+            'name': fqdn,
+            'type': 'A',
+            'value': ",".join(ip_list),
+            'points_to': points_to_record,
+        })
+        ip_links.extend({'record_id': record_id, 'ip': ip} for ip in ip_list)
+
+    _load_dns_records(neo4j_session, records, update_tag, record_label, dns_node_additional_label)
+    _load_dns_record_ips(neo4j_session, ip_links, update_tag)
+    return [record['id'] for record in records]
+
+
+@timeit
+def _load_dns_records(
+    neo4j_session: neo4j.Session, records: List[Dict[str, Any]], update_tag: int, record_label: str,
+    dns_node_additional_label: Optional[str],
+) -> None:
+    template = Template("""
+    UNWIND $DictList AS record_data
+    MERGE (record:$record_labels{id: record_data.id})
+    ON CREATE SET record.firstseen = timestamp(), record.name = record_data.name, record.type = record_data.type
+    SET record.lastupdated = $update_tag, record.value = record_data.value
+    WITH record, record_data
+    MATCH (n:$record_label{id: record_data.points_to})
+    MERGE (record)-[r:DNS_POINTS_TO]->(n)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $update_tag
+    """)
+    record_labels = f'DNSRecord:{dns_node_additional_label}' if dns_node_additional_label else 'DNSRecord'
+    load_graph_data(
+        neo4j_session,
+        template.safe_substitute(record_labels=record_labels, record_label=record_label),
+        records,
+        update_tag=update_tag,
+    )
+
+
+@timeit
+def _load_dns_record_ips(neo4j_session: neo4j.Session, ip_links: List[Dict[str, Any]], update_tag: int) -> None:
+    ingest = """
+    UNWIND $DictList AS link
+    MATCH (parent:DNSRecord{id: link.record_id})
+    MERGE (ip_node:Ip{id: link.ip})
+    ON CREATE SET ip_node.firstseen = timestamp(), ip_node.ip = link.ip
+    SET ip_node.lastupdated = $update_tag
+    WITH parent, ip_node
+    MERGE (parent)-[r:DNS_POINTS_TO]->(ip_node)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $update_tag
+    """
+    load_graph_data(neo4j_session, ingest, ip_links, update_tag=update_tag)
+
 
 @timeit
 def ingest_dns_record_by_fqdn(
@@ -24,6 +188,9 @@ def ingest_dns_record_by_fqdn(
     This also connects the new :DNSRecord to the node with ID `points_to_record` of label `record_label`.
     Finally, the :DNSRecord node is also labeled with a specified `dns_node_additional_label`, e.g. `AWSDNSRecord`.
 
+    The lookup is memoized by the sync's DNSResolver. To ingest many records, use ingest_dns_records_by_fqdn(), which
+    resolves them concurrently and writes them in batches.
+
     This results the following new nodes and relationships:
     (:DNSRecord:$`dns_node_additional_label`)-[:DNS_POINTS_TO]->(:Ip)
     (:DNSRecord:$`dns_node_additional_label`)-[:DNS_POINTS_TO]->(:$`record_label`)
@@ -38,32 +205,12 @@ def ingest_dns_record_by_fqdn(
     :param points_to_record: parent record to set DNS_POINTS_TO relationship to. Can be None
     :param record_label: the label of the node to attach to a DNS record, e.g. "ESDomain"
     :param dns_node_additional_label: The specific label of the DNSRecord, e.g. AWSDNSRecord.
-    :return: the graph node id for the new/merged record
-    """
-    fqdn_data = get_dns_resolution_by_fqdn(fqdn)
-    record_type = get_dns_record_type(fqdn_data)
-
-    if record_type == 'A':
-        ip_list = []
-        for result in fqdn_data:
-            ip = str(result)
-            ip_list.append(ip)
-
-        value = ",".join(ip_list)
-        record_id = ingest_dns_record(
-            neo4j_session, fqdn, value, record_type, update_tag, points_to_record,
-            record_label, dns_node_additional_label,  # type: ignore
-        )
-        _link_ip_to_A_record(neo4j_session, update_tag, ip_list, record_id)
-
-        return record_id  # type: ignore
-    else:
-        raise NotImplementedError(
-            "Ingestion of DNS record type '{}' by FQDN has not been implemented. Failed to ingest '{}'.".format(
-                record_type,
-                fqdn,
-            ),
-        )
+    :return: the graph node id for the new/merged record, or None if the FQDN does not resolve
+    """
+    record_ids = ingest_dns_records_by_fqdn(
+        neo4j_session, update_tag, {fqdn: points_to_record}, record_label, dns_node_additional_label,
+    )
+    return record_ids[0] if record_ids else None  # type: ignore
 
 
 @timeit
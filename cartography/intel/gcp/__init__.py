@@ -12,6 +12,8 @@ from google.auth.credentials import Credentials as GoogleCredentials
 from google.auth.exceptions import DefaultCredentialsError
 from googleapiclient.discovery import Resource
 
+from cartography.checkpoint import is_unit_complete
+from cartography.checkpoint import mark_unit_complete
 from cartography.config import Config
 from cartography.intel.gcp import compute
 from cartography.intel.gcp import crm
@@ -19,7 +21,7 @@ from cartography.intel.gcp import dns
 from cartography.intel.gcp import gke
 from cartography.intel.gcp import iam
 from cartography.intel.gcp import storage
-from cartography.util import run_analysis_job
+from cartography.util import run_analysis_jobs
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -254,6 +256,23 @@ def _sync_single_project_dns(
         dns.sync(neo4j_session, dns_cred, project_id, gcp_update_tag, common_job_parameters)
 
 
+def _sync_single_project_iam(
+    neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
+    common_job_parameters: Dict,
+) -> None:
+    """
+    Handles graph sync for a single GCP project IAM resources.
+    :param neo4j_session: The Neo4j session
+    :param resources: namedtuple of the GCP resource objects
+    :param project_id: The project ID number to sync.  See  the `projectId` field in
+    https://cloud.google.com/resource-manager/reference/rest/v1/projects
+    :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
+    :param common_job_parameters: Other parameters sent to Neo4j
+    :return: Nothing
+    """
+    iam.sync(neo4j_session, resources.iam, project_id, gcp_update_tag, common_job_parameters)
+
+
 def _sync_multiple_projects(
     neo4j_session: neo4j.Session, resources: Resource, projects: List[Dict],
     gcp_update_tag: int, common_job_parameters: Dict,
@@ -272,41 +291,26 @@ def _sync_multiple_projects(
     """
     logger.info("Syncing %d GCP projects.", len(projects))
     crm.sync_gcp_projects(neo4j_session, projects, gcp_update_tag, common_job_parameters)
-    # Compute data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for Compute.", project_id)
-        _sync_single_project_compute(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # Storage data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for Storage", project_id)
-        _sync_single_project_storage(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # GKE data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for GKE", project_id)
-        _sync_single_project_gke(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # DNS data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for DNS", project_id)
-        _sync_single_project_dns(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # IAM data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for IAM", project_id)
-        iam.sync(
-            neo4j_session,
-            resources.iam,
-            project_id,
-            gcp_update_tag,
-            common_job_parameters,
-        )
+    project_sync_functions = [
+        ('Compute', _sync_single_project_compute),
+        ('Storage', _sync_single_project_storage),
+        ('GKE', _sync_single_project_gke),
+        ('DNS', _sync_single_project_dns),
+        ('IAM', _sync_single_project_iam),
+    ]
+    for module_name, sync_func in project_sync_functions:
+        for project in projects:
+            project_id = project['projectId']
+            if is_unit_complete('gcp', project_id, module_name):
+                logger.info(
+                    "Skipping GCP project %s for %s, it completed before the sync was resumed.",
+                    project_id,
+                    module_name,
+                )
+                continue
+            logger.info("Syncing GCP project %s for %s.", project_id, module_name)
+            sync_func(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
+            mark_unit_complete('gcp', project_id, module_name)
 
 
 @timeit
@@ -360,20 +364,12 @@ def start_gcp_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
 
     _sync_multiple_projects(neo4j_session, resources, projects, config.update_tag, common_job_parameters)
 
-    run_analysis_job(
-        'gcp_compute_asset_inet_exposure.json',
-        neo4j_session,
-        common_job_parameters,
-    )
-
-    run_analysis_job(
-        'gcp_gke_asset_exposure.json',
-        neo4j_session,
-        common_job_parameters,
-    )
-
-    run_analysis_job(
-        'gcp_gke_basic_auth.json',
+    run_analysis_jobs(
+        [
+            'gcp_compute_asset_inet_exposure.json',
+            'gcp_gke_asset_exposure.json',
+            'gcp_gke_basic_auth.json',
+        ],
         neo4j_session,
         common_job_parameters,
     )
@@ -1,17 +1,67 @@
 import logging
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from itertools import islice
+from typing import Any
+from typing import Dict
 
 from neo4j import Session
 
 from cartography.config import Config
-from cartography.intel.kubernetes.namespaces import sync_namespaces
+from cartography.intel.kubernetes.namespaces import get_namespaces
+from cartography.intel.kubernetes.namespaces import load_namespaces
 from cartography.intel.kubernetes.pods import sync_pods
-from cartography.intel.kubernetes.secrets import sync_secrets
-from cartography.intel.kubernetes.services import sync_services
+from cartography.intel.kubernetes.secrets import get_secrets
+from cartography.intel.kubernetes.secrets import load_secrets
+from cartography.intel.kubernetes.services import add_service_pods
+from cartography.intel.kubernetes.services import get_services
+from cartography.intel.kubernetes.services import load_services
 from cartography.intel.kubernetes.util import get_k8s_clients
+from cartography.intel.kubernetes.util import K8sClient
+from cartography.stats import get_stats_client
+from cartography.util import merge_module_sync_metadata
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
+stat_handler = get_stats_client(__name__)
+
+# Maximum number of clusters whose API objects are fetched, or fetched and waiting to be loaded, at the same time.
+MAX_CONCURRENT_CLUSTERS = 8
+
+
+def get_cluster_data(client: K8sClient) -> Dict[str, Any]:
+    """
+    Fetches and transforms the supported objects of a single cluster, except for pods, which are streamed into the
+    graph page by page by load_cluster_data(). This does not touch Neo4j so that it is safe to run for several clusters
+    at once in worker threads.
+    """
+    cluster, namespaces = get_namespaces(client)
+    return {
+        "cluster": cluster,
+        "namespaces": namespaces,
+        "services": get_services(client, cluster),
+        "secrets": get_secrets(client, cluster),
+    }
+
+
+def load_cluster_data(session: Session, client: K8sClient, cluster_data: Dict[str, Any], update_tag: int) -> None:
+    cluster = cluster_data["cluster"]
+    load_namespaces(session, cluster, cluster_data["namespaces"], update_tag)
+    merge_module_sync_metadata(
+        session,
+        group_type='KubernetesCluster',
+        group_id=cluster['uid'],
+        synced_type='KubernetesCluster',
+        update_tag=update_tag,
+        stat_handler=stat_handler,
+    )
+    pods = sync_pods(session, client, cluster, update_tag)
+    add_service_pods(cluster_data["services"], pods)
+    load_services(session, cluster_data["services"], update_tag)
+    load_secrets(session, cluster_data["secrets"], update_tag)
 
 
 @timeit
@@ -22,16 +72,32 @@ def start_k8s_ingestion(session: Session, config: Config) -> None:
         logger.error("kubeconfig not found.")
         return
 
-    for client in get_k8s_clients(config.k8s_kubeconfig):
-        logger.info(f"Syncing data for k8s cluster {client.name}...")
-        try:
-            cluster = sync_namespaces(session, client, config.update_tag)
-            pods = sync_pods(session, client, config.update_tag, cluster)
-            sync_services(session, client, config.update_tag, cluster, pods)
-            sync_secrets(session, client, config.update_tag, cluster)
-        except Exception:
-            logger.exception(f"Failed to sync data for k8s cluster {client.name}...")
-            raise
+    clients = get_k8s_clients(config.k8s_kubeconfig)
+    max_workers = min(len(clients), MAX_CONCURRENT_CLUSTERS)
+    # Cluster API calls run concurrently; the Neo4j session is not thread-safe, so loads happen here in the calling
+    # thread as soon as each cluster's data is ready. The next cluster is only submitted once a fetched one has been
+    # loaded, so at most MAX_CONCURRENT_CLUSTERS clusters' data is held in memory even if loading is slower than
+    # fetching. Pods, the largest objects, are fetched and loaded a page at a time while their cluster is loaded.
+    remaining_clients = iter(clients)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Dict[Future, K8sClient] = {
+            executor.submit(get_cluster_data, client): client for client in islice(remaining_clients, max_workers)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                client = pending.pop(future)
+                logger.info(f"Syncing data for k8s cluster {client.name}...")
+                try:
+                    load_cluster_data(session, client, future.result(), config.update_tag)
+                except Exception:
+                    logger.exception(f"Failed to sync data for k8s cluster {client.name}...")
+                    for other in pending:
+                        other.cancel()
+                    raise
+                next_client = next(remaining_clients, None)
+                if next_client:
+                    pending[executor.submit(get_cluster_data, next_client)] = next_client
 
     run_cleanup_job(
         "kubernetes_import_cleanup.json",
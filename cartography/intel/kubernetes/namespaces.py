@@ -6,45 +6,29 @@ from typing import Tuple
 from neo4j import Session
 
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import k8s_paginate
 from cartography.intel.kubernetes.util import K8sClient
-from cartography.stats import get_stats_client
-from cartography.util import merge_module_sync_metadata
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
-stat_handler = get_stats_client(__name__)
-
-
-@timeit
-def sync_namespaces(session: Session, client: K8sClient, update_tag: int) -> Dict:
-    cluster, namespaces = get_namespaces(client)
-    load_namespaces(session, cluster, namespaces, update_tag)
-    merge_module_sync_metadata(
-        session,
-        group_type='KubernetesCluster',
-        group_id=cluster['uid'],
-        synced_type='KubernetesCluster',
-        update_tag=update_tag,
-        stat_handler=stat_handler,
-    )
-    return cluster
 
 
 @timeit
 def get_namespaces(client: K8sClient) -> Tuple[Dict, List[Dict]]:
     cluster = dict()
     namespaces = list()
-    for namespace in client.core.list_namespace().items:
-        namespaces.append(
-            {
-                "uid": namespace.metadata.uid,
-                "name": namespace.metadata.name,
-                "creation_timestamp": get_epoch(namespace.metadata.creation_timestamp),
-                "deletion_timestamp": get_epoch(namespace.metadata.deletion_timestamp),
-            },
-        )
-        if namespace.metadata.name == "kube-system":
-            cluster = {"uid": namespace.metadata.uid, "name": client.name}
+    for page in k8s_paginate(client.core.list_namespace):
+        for namespace in page:
+            namespaces.append(
+                {
+                    "uid": namespace.metadata.uid,
+                    "name": namespace.metadata.name,
+                    "creation_timestamp": get_epoch(namespace.metadata.creation_timestamp),
+                    "deletion_timestamp": get_epoch(namespace.metadata.deletion_timestamp),
+                },
+            )
+            if namespace.metadata.name == "kube-system":
+                cluster = {"uid": namespace.metadata.uid, "name": client.name}
     return cluster, namespaces
 
 
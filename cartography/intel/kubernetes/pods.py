@@ -1,73 +1,90 @@
 import logging
+from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 from neo4j import Session
 
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_nested
+from cartography.intel.kubernetes.util import k8s_paginate
 from cartography.intel.kubernetes.util import K8sClient
+from cartography.util import batch
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
 
-@timeit
-def sync_pods(
-    session: Session, client: K8sClient, update_tag: int, cluster: Dict,
-) -> List[Dict]:
-    pods = get_pods(client, cluster)
-    load_pods(session, pods, update_tag)
-    return pods
+def get_pod_pages(client: K8sClient, cluster: Dict) -> Iterator[List[Dict]]:
+    """
+    Lists pods page by page using the raw JSON response so that we never hold the kubernetes client's model objects
+    for the full pod list in memory; each page is transformed as soon as it is received.
+    """
+    for page in k8s_paginate(client.core.list_pod_for_all_namespaces, raw=True):
+        yield [transform_pod(pod, cluster) for pod in page]
 
 
 @timeit
-def get_pods(client: K8sClient, cluster: Dict) -> List[Dict]:
-    pods = list()
-    for pod in client.core.list_pod_for_all_namespaces().items:
-        containers = {}
-        for container in pod.spec.containers:
-            containers[container.name] = {
-                "name": container.name,
-                "image": container.image,
-                "uid": f"{pod.metadata.uid}-{container.name}",
+def sync_pods(session: Session, client: K8sClient, cluster: Dict, update_tag: int) -> List[Dict]:
+    """
+    Loads the pods of the cluster page by page, so that only one page of pods is held in memory at a time.
+    :return: The uid and labels of each pod that has labels, which is all that services need to find their pods.
+    """
+    pod_labels = []
+    for page in get_pod_pages(client, cluster):
+        load_pods(session, page, update_tag)
+        pod_labels.extend({"uid": pod["uid"], "labels": pod["labels"]} for pod in page if pod["labels"])
+    return pod_labels
+
+
+def transform_pod(pod: Dict[str, Any], cluster: Dict) -> Dict[str, Any]:
+    """
+    Transforms a single pod from the raw (camelCase) Kubernetes API response.
+    """
+    metadata = pod.get("metadata") or {}
+    containers = {}
+    for container in get_nested(pod, "spec", "containers") or []:
+        containers[container["name"]] = {
+            "name": container["name"],
+            "image": container.get("image"),
+            "uid": f"{metadata['uid']}-{container['name']}",
+        }
+    for status in get_nested(pod, "status", "containerStatuses") or []:
+        if status["name"] in containers:
+            _state = 'waiting'
+            state = status.get("state") or {}
+            if state.get("running"):
+                _state = 'running'
+            elif state.get("terminated"):
+                _state = 'terminated'
+            image_id = status.get("imageID")
+            try:
+                image_sha = image_id.split("@")[1]
+            except (AttributeError, IndexError):
+                image_sha = None
+            containers[status["name"]]["status"] = {
+                "image_id": image_id,
+                "image_sha": image_sha,
+                "ready": status.get("ready"),
+                "started": status.get("started"),
+                "state": _state,
             }
-        if pod.status and pod.status.container_statuses:
-            for status in pod.status.container_statuses:
-                if status.name in containers:
-                    _state = 'waiting'
-                    if status.state.running:
-                        _state = 'running'
-                    elif status.state.terminated:
-                        _state = 'terminated'
-                    try:
-                        image_sha = status.image_id.split("@")[1]
-                    except IndexError:
-                        image_sha = None
-                    containers[status.name]["status"] = {
-                        "image_id": status.image_id,
-                        "image_sha": image_sha,
-                        "ready": status.ready,
-                        "started": status.started,
-                        "state": _state,
-                    }
-        pods.append(
-            {
-                "uid": pod.metadata.uid,
-                "name": pod.metadata.name,
-                "status_phase": pod.status.phase,
-                "creation_timestamp": get_epoch(pod.metadata.creation_timestamp),
-                "deletion_timestamp": get_epoch(pod.metadata.deletion_timestamp),
-                "namespace": pod.metadata.namespace,
-                "node": pod.spec.node_name,
-                "cluster_uid": cluster["uid"],
-                "labels": pod.metadata.labels,
-                "containers": list(containers.values()),
-            },
-        )
-    return pods
+    return {
+        "uid": metadata["uid"],
+        "name": metadata.get("name"),
+        "status_phase": get_nested(pod, "status", "phase"),
+        "creation_timestamp": get_epoch(metadata.get("creationTimestamp")),
+        "deletion_timestamp": get_epoch(metadata.get("deletionTimestamp")),
+        "namespace": metadata.get("namespace"),
+        "node": get_nested(pod, "spec", "nodeName"),
+        "cluster_uid": cluster["uid"],
+        "labels": metadata.get("labels"),
+        "containers": list(containers.values()),
+    }
 
 
-def load_pods(session: Session, data: List[Dict], update_tag: int) -> None:
+def load_pods(session: Session, data: List[Dict], update_tag: int, batch_size: int = 1000) -> None:
     ingestion_cypher_query = """
     UNWIND $pods as k8pod
         MERGE (pod:KubernetesPod {id: k8pod.uid})
@@ -104,4 +121,5 @@ def load_pods(session: Session, data: List[Dict], update_tag: int) -> None:
             SET rel3.lastupdated = $update_tag
     """
     logger.info(f"Loading {len(data)} kubernetes pods.")
-    session.run(ingestion_cypher_query, pods=data, update_tag=update_tag)
+    for pods_batch in batch(data, size=batch_size):
+        session.run(ingestion_cypher_query, pods=pods_batch, update_tag=update_tag)
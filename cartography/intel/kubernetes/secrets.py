@@ -5,24 +5,13 @@ from typing import List
 from neo4j import Session
 
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import k8s_paginate
 from cartography.intel.kubernetes.util import K8sClient
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
 
-@timeit
-def sync_secrets(
-    session: Session,
-    client: K8sClient,
-    update_tag: int,
-    cluster: Dict,
-) -> List[Dict]:
-    secrets = get_secrets(client, cluster)
-    load_secrets(session, secrets, update_tag)
-    return secrets
-
-
 @timeit
 def get_secrets(client: K8sClient, cluster: Dict) -> List[Dict]:
     return [
@@ -36,7 +25,8 @@ def get_secrets(client: K8sClient, cluster: Dict) -> List[Dict]:
             "labels": secret.metadata.labels,
             "type": secret.type,
         }
-        for secret in client.core.list_secret_for_all_namespaces().items
+        for page in k8s_paginate(client.core.list_secret_for_all_namespaces)
+        for secret in page
     ]
 
 
@@ -1,10 +1,13 @@
 import logging
+from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 from neo4j import Session
 
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import k8s_paginate
 from cartography.intel.kubernetes.util import K8sClient
 from cartography.util import timeit
 
@@ -12,17 +15,9 @@ logger = logging.getLogger(__name__)
 
 
 @timeit
-def sync_services(
-    session: Session, client: K8sClient, update_tag: int, cluster: Dict, pods: List[Dict],
-) -> None:
-    services = get_services(client, cluster, pods)
-    load_services(session, services, update_tag)
-
-
-@timeit
-def get_services(client: K8sClient, cluster: Dict, pods: List[Dict]) -> List[Dict]:
+def get_services(client: K8sClient, cluster: Dict) -> List[Dict]:
     services = list()
-    for service in client.core.list_service_for_all_namespaces().items:
+    for service in _list_services(client):
         item = {
             "uid": service.metadata.uid,
             "name": service.metadata.name,
@@ -38,23 +33,32 @@ def get_services(client: K8sClient, cluster: Dict, pods: List[Dict]) -> List[Dic
         ingresses = service.status.load_balancer.ingress
         for ingress in ingresses or list():
             item.update({"ingress_host": ingress.hostname, "ingress_ip": ingress.ip})
+        services.append(item)
+    return services
+
 
+def add_service_pods(services: List[Dict], pods: List[Dict]) -> None:
+    """
+    Sets the pods that each service selects on it, as matched by the service's selector against the pods' labels.
+    :param pods: The uid and labels of the pods of the cluster, see cartography.intel.kubernetes.pods.sync_pods().
+    """
+    for service in services:
+        selector = service["selector"]
         service_pods = list()
         for pod in pods:
-            is_service_pod = True if service.spec.selector else False
-            for selector in service.spec.selector or dict():
-                if (
-                    not pod.get("labels") or
-                    selector not in pod["labels"] or
-                    service.spec.selector[selector] != pod["labels"][selector]
-                ):
+            is_service_pod = True if selector else False
+            for key in selector or dict():
+                if not pod.get("labels") or key not in pod["labels"] or selector[key] != pod["labels"][key]:
                     is_service_pod = False
                     break
             if is_service_pod:
                 service_pods.append(pod)
-        item["pods"] = service_pods
-        services.append(item)
-    return services
+        service["pods"] = service_pods
+
+
+def _list_services(client: K8sClient) -> Iterator[Any]:
+    for page in k8s_paginate(client.core.list_service_for_all_namespaces):
+        yield from page
 
 
 def load_services(session: Session, data: List[Dict], update_tag: int) -> None:
@@ -1,13 +1,25 @@
+import json
 from datetime import datetime
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Union
 
+from dateutil.parser import isoparse
 from kubernetes import config
 from kubernetes.client import ApiClient
 from kubernetes.client import CoreV1Api
 from kubernetes.client import NetworkingV1Api
 
 
+# Number of objects requested per page from the Kubernetes API. Paging keeps the API server from building, and us from
+# deserializing, the full list of objects of a given kind in a single response.
+DEFAULT_PAGE_SIZE = 500
+
+
 class KubernetesContextNotFound(Exception):
     pass
 
@@ -45,7 +57,52 @@ def get_k8s_clients(kubeconfig: str) -> List[K8sClient]:
     return clients
 
 
-def get_epoch(date: datetime) -> Union[int, None]:
+def k8s_paginate(
+    list_func: Callable[..., Any],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    raw: bool = False,
+    **kwargs: Any,
+) -> Iterator[List[Any]]:
+    """
+    Yields pages of objects from a Kubernetes `list_*` API call, following the `continue` token returned by the API
+    server until the list is exhausted.
+    :param list_func: A kubernetes client list function, e.g. `client.core.list_pod_for_all_namespaces`.
+    :param page_size: The maximum number of objects to request per page.
+    :param raw: If True, skip the kubernetes client's model deserialization (`_preload_content=False`) and yield the
+    objects as plain dicts parsed from the response JSON. Keys are then in the API's camelCase form.
+    :param kwargs: Additional keyword args passed to `list_func`.
+    """
+    continue_token: Optional[str] = None
+    while True:
+        if raw:
+            response = list_func(limit=page_size, _continue=continue_token, _preload_content=False, **kwargs)
+            body = json.loads(response.data)
+            items = body.get("items") or []
+            continue_token = (body.get("metadata") or {}).get("continue")
+        else:
+            response = list_func(limit=page_size, _continue=continue_token, **kwargs)
+            items = response.items or []
+            continue_token = response.metadata._continue
+        yield items
+        if not continue_token:
+            break
+
+
+def get_epoch(date: Union[datetime, str, None]) -> Union[int, None]:
     if date:
+        if isinstance(date, str):
+            # Timestamps from the raw API response are RFC 3339 strings rather than datetime objects.
+            date = isoparse(date)
         return int(date.strftime("%s"))
     return None
+
+
+def get_nested(obj: Optional[Dict[str, Any]], *keys: str) -> Any:
+    """
+    Safely walks a raw Kubernetes API response dict, returning None if any key along the path is missing.
+    """
+    for key in keys:
+        if not obj:
+            return None
+        obj = obj.get(key)
+    return obj
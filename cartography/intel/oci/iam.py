@@ -3,6 +3,8 @@
 # https://docs.cloud.oracle.com/iaas/Content/Identity/Concepts/overview.htm
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import Any
 from typing import Dict
 from typing import List
@@ -11,10 +13,43 @@ import neo4j
 import oci
 
 from . import utils
-from cartography.util import run_cleanup_job
+from cartography.client.core.tx import load
+from cartography.client.core.tx import load_graph_data
+from cartography.graph.job import GraphJob
+from cartography.models.oci.iam import OCICompartmentSchema
+from cartography.models.oci.iam import OCIGroupSchema
+from cartography.models.oci.iam import OCIPolicySchema
+from cartography.models.oci.iam import OCIUserGroupMembershipSchema
+from cartography.models.oci.iam import OCIUserSchema
+from cartography.models.oci.iam import OCIUserToGroup
+from cartography.util import dict_value_to_str
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of groups or compartments whose memberships or policies are fetched at the same time
+MAX_CONCURRENT_REQUESTS = 4
+
+
+def get_id_backfill_queries(created_statements: List[str]) -> List[str]:
+    """
+    OCI IAM nodes written before the schema-based loads were only keyed by `ocid`. The loads key them by `id`, so the
+    nodes need an `id` to be updated instead of duplicated. This is a one-time migration, run by the create-indexes
+    stage when it creates the `id` index of the label, i.e. on the first sync after the switch to the schema models.
+    :param created_statements: The index statements that the create-indexes stage is about to run.
+    :return: The queries that set `id` from `ocid` on the nodes of the labels whose `id` index is being created.
+    """
+    created = set(created_statements)
+    return [
+        f"""
+        MATCH (n:{label})
+        WHERE n.id IS NULL AND n.ocid IS NOT NULL
+        WITH n LIMIT $LIMIT_SIZE
+        SET n.id = n.ocid;
+        """
+        for label in ['OCIUser', 'OCIGroup', 'OCICompartment', 'OCIPolicy']
+        if f'CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.id);' in created
+    ]
+
 
 def sync_compartments(
     neo4j_session: neo4j.Session,
@@ -26,32 +61,46 @@ def sync_compartments(
     logger.debug("Syncing IAM compartments for account '%s'.", current_tenancy_id)
     data = get_compartment_list_data(iam, current_tenancy_id)
     load_compartments(neo4j_session, data['Compartments'], current_tenancy_id, oci_update_tag)
-    run_cleanup_job('oci_import_compartments_cleanup.json', neo4j_session, common_job_parameters)
-
-
-def get_compartment_list_data_recurse(
-    iam: oci.identity.identity_client.IdentityClient,
-    compartment_list: Dict[str, Any],
-    compartment_id: str,
-) -> None:
-
-    response = oci.pagination.list_call_get_all_results(iam.list_compartments, compartment_id)
-    if not response.data:
-        return
-    compartment_list.update(
-        {"Compartments": list(compartment_list["Compartments"]) + utils.oci_object_to_json(response.data)},
-    )
-    for compartment in response.data:
-        get_compartment_list_data_recurse(iam, compartment_list, compartment.id)
+    GraphJob.from_node_schema(OCICompartmentSchema(), common_job_parameters).run(neo4j_session)
 
 
 def get_compartment_list_data(
     iam: oci.identity.identity_client.IdentityClient,
     current_tenancy_id: str,
 ) -> Dict[str, Any]:
-    compartment_list = {"Compartments": ""}
-    get_compartment_list_data_recurse(iam, compartment_list, current_tenancy_id)
-    return compartment_list
+    """
+    Lists all compartments and subcompartments of the tenancy with one paginated call.
+    """
+    response = oci.pagination.list_call_get_all_results(
+        iam.list_compartments, current_tenancy_id, compartment_id_in_subtree=True, access_level='ANY',
+    )
+    return {'Compartments': utils.oci_object_to_json(response.data)}
+
+
+def transform_compartments(compartments: List[Dict[str, Any]], current_tenancy_id: str) -> List[Dict[str, Any]]:
+    """
+    :return: The compartments ordered so that every compartment comes after its parent compartment, so that the
+    OCI_COMPARTMENT relationship to a new parent is found in the same load.
+    """
+    parents = {compartment['id']: compartment['compartment-id'] for compartment in compartments}
+
+    def depth(compartment_id: str) -> int:
+        seen = set()
+        while compartment_id in parents and compartment_id not in seen:
+            seen.add(compartment_id)
+            compartment_id = parents[compartment_id]
+        return len(seen)
+
+    result = [
+        {
+            'id': compartment['id'],
+            'name': compartment['name'],
+            'compartment_id': compartment['compartment-id'],
+            'time_created': dict_value_to_str(compartment, 'time-created'),
+        }
+        for compartment in compartments
+    ]
+    return sorted(result, key=lambda compartment: depth(compartment['id']))
 
 
 def load_compartments(
@@ -60,29 +109,35 @@ def load_compartments(
     current_oci_tenancy_id: str,
     oci_update_tag: int,
 ) -> None:
-    ingest_compartment = """
-    MERGE (cnode:OCICompartment{ocid: $OCID})
-    ON CREATE SET cnode:OCICompartment, cnode.firstseen = timestamp(),
-    cnode.createdate = $CREATE_DATE
-    SET cnode.name = $NAME, cnode.compartmentid = $COMPARTMENT_ID
-    WITH cnode
-    MATCH (aa) WHERE (aa:OCITenancy OR aa:OCICompartment) AND aa.ocid=$COMPARTMENT_ID
-    MERGE (aa)-[r:OCI_COMPARTMENT]->(cnode)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $oci_update_tag
-    """
+    load(
+        neo4j_session,
+        OCICompartmentSchema(),
+        transform_compartments(compartments, current_oci_tenancy_id),
+        lastupdated=oci_update_tag,
+        OCI_TENANCY_ID=current_oci_tenancy_id,
+    )
 
-    for compartment in compartments:
-        neo4j_session.run(
-            ingest_compartment,
-            OCID=compartment["id"],
-            COMPARTMENT_ID=compartment["compartment-id"],
-            DESCRIPTION=compartment["description"],
-            NAME=compartment["name"],
-            CREATE_DATE=compartment["time-created"],
-            OCI_TENANCY_ID=current_oci_tenancy_id,
-            oci_update_tag=oci_update_tag,
-        )
+
+def transform_users(users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    result = []
+    for user in users:
+        capabilities = user.get('capabilities') or {}
+        result.append({
+            'id': user['id'],
+            'name': user['name'],
+            'compartment_id': user['compartment-id'],
+            'description': user['description'],
+            'email': user['email'],
+            'lifecycle_state': user['lifecycle-state'],
+            'is_mfa_activated': user['is-mfa-activated'],
+            'can_use_api_keys': capabilities.get('can-use-api-keys'),
+            'can_use_auth_tokens': capabilities.get('can-use-auth-tokens'),
+            'can_use_console_password': capabilities.get('can-use-console-password'),
+            'can_use_customer_secret_keys': capabilities.get('can-use-customer-secret-keys'),
+            'can_use_smtp_credentials': capabilities.get('can-use-smtp-credentials'),
+            'time_created': dict_value_to_str(user, 'time-created'),
+        })
+    return result
 
 
 def load_users(
@@ -91,43 +146,13 @@ def load_users(
     current_oci_tenancy_id: str,
     oci_update_tag: int,
 ) -> None:
-    ingest_user = """
-    MERGE (unode:OCIUser{ocid: $OCID})
-    ON CREATE SET unode:OCIUser, unode.firstseen = timestamp(),
-    unode.createdate = $CREATE_DATE
-    SET unode.name = $USERNAME, unode.compartmentid = $COMPARTMENT_ID, unode.description = $DESCRIPTION,
-    unode.email = $EMAIL, unode.lifecycle_state = $LIFECYCLE_STATE, unode.is_mfa_activated = $IS_MFA_ACTIVATED,
-    unode.can_use_api_keys = $CAN_USE_API_KEYS, unode.can_use_auth_tokens = $CAN_USE_AUTH_TOKENS,
-    unode.can_use_console_password = $CAN_USE_CONSOLE_PASSWORD,
-    unode.can_use_customer_secret_keys = $CAN_USE_CUSTOMER_SECRET_KEYS,
-    unode.can_use_smtp_credentials = $CAN_USE_SMTP_CREDENTIALS,
-    unode.lastupdated = $oci_update_tag
-    WITH unode
-    MATCH (aa:OCITenancy{ocid: $OCI_TENANCY_ID})
-    MERGE (aa)-[r:RESOURCE]->(unode)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $oci_update_tag
-    """
-
-    for user in users:
-        neo4j_session.run(
-            ingest_user,
-            OCID=user["id"],
-            CREATE_DATE=str(user["time-created"]),
-            USERNAME=user["name"],
-            DESCRIPTION=user["description"],
-            EMAIL=user["email"],
-            LIFECYCLE_STATE=user["lifecycle-state"],
-            IS_MFA_ACTIVATED=user["is-mfa-activated"],
-            CAN_USE_API_KEYS=user["capabilities"]["can-use-api-keys"],
-            CAN_USE_AUTH_TOKENS=user["capabilities"]["can-use-auth-tokens"],
-            CAN_USE_CONSOLE_PASSWORD=user["capabilities"]["can-use-console-password"],
-            CAN_USE_CUSTOMER_SECRET_KEYS=user["capabilities"]["can-use-customer-secret-keys"],
-            CAN_USE_SMTP_CREDENTIALS=user["capabilities"]["can-use-smtp-credentials"],
-            COMPARTMENT_ID=user["compartment-id"],
-            OCI_TENANCY_ID=current_oci_tenancy_id,
-            oci_update_tag=oci_update_tag,
-        )
+    load(
+        neo4j_session,
+        OCIUserSchema(),
+        transform_users(users),
+        lastupdated=oci_update_tag,
+        OCI_TENANCY_ID=current_oci_tenancy_id,
+    )
 
 
 def get_user_list_data(
@@ -148,7 +173,7 @@ def sync_users(
     logger.debug("Syncing IAM users for account '%s'.", current_tenancy_id)
     data = get_user_list_data(iam, current_tenancy_id)
     load_users(neo4j_session, data['Users'], current_tenancy_id, oci_update_tag)
-    run_cleanup_job('oci_import_users_cleanup.json', neo4j_session, common_job_parameters)
+    GraphJob.from_node_schema(OCIUserSchema(), common_job_parameters).run(neo4j_session)
 
 
 def get_group_list_data(
@@ -159,35 +184,32 @@ def get_group_list_data(
     return {'Groups': utils.oci_object_to_json(response.data)}
 
 
+def transform_groups(groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': group['id'],
+            'name': group['name'],
+            'compartment_id': group['compartment-id'],
+            'description': group['description'],
+            'time_created': dict_value_to_str(group, 'time-created'),
+        }
+        for group in groups
+    ]
+
+
 def load_groups(
     neo4j_session: neo4j.Session,
     groups: List[Dict[str, Any]],
     current_tenancy_id: str,
     oci_update_tag: int,
 ) -> None:
-    ingest_group = """
-    MERGE (gnode:OCIGroup{ocid: $OCID})
-    ON CREATE SET gnode.firstseen = timestamp(), gnode.createdate = $CREATE_DATE
-    SET gnode.name = $GROUP_NAME, gnode.compartmentid = $COMPARTMENT_ID, gnode.lastupdated = $oci_update_tag,
-    gnode.description = $DESCRIPTION
-    WITH gnode
-    MATCH (aa:OCITenancy{ocid: $OCI_TENANCY_ID})
-    MERGE (aa)-[r:RESOURCE]->(gnode)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $oci_update_tag
-    """
-
-    for group in groups:
-        neo4j_session.run(
-            ingest_group,
-            OCID=group["id"],
-            CREATE_DATE=str(group["time-created"]),
-            GROUP_NAME=group["name"],
-            COMPARTMENT_ID=group["compartment-id"],
-            DESCRIPTION=group["description"],
-            OCI_TENANCY_ID=current_tenancy_id,
-            oci_update_tag=oci_update_tag,
-        )
+    load(
+        neo4j_session,
+        OCIGroupSchema(),
+        transform_groups(groups),
+        lastupdated=oci_update_tag,
+        OCI_TENANCY_ID=current_tenancy_id,
+    )
 
 
 def sync_groups(
@@ -200,7 +222,7 @@ def sync_groups(
     logger.debug("Syncing IAM groups for account '%s'.", current_tenancy_id)
     data = get_group_list_data(iam, current_tenancy_id)
     load_groups(neo4j_session, data["Groups"], current_tenancy_id, oci_update_tag)
-    run_cleanup_job('oci_import_groups_cleanup.json', neo4j_session, common_job_parameters)
+    GraphJob.from_node_schema(OCIGroupSchema(), common_job_parameters).run(neo4j_session)
 
 
 def get_group_membership_data(
@@ -224,40 +246,53 @@ def sync_group_memberships(
     logger.debug("Syncing IAM group membership for account '%s'.", current_tenancy_id)
     query = "MATCH (group:OCIGroup)<-[:RESOURCE]-(OCITenancy{ocid: $OCI_TENANCY_ID}) " \
             "return group.name as name, group.ocid as ocid;"
-    groups = neo4j_session.run(query, OCI_TENANCY_ID=current_tenancy_id)
-    groups_membership = {
-        group["ocid"]: get_group_membership_data(iam, group['ocid'], current_tenancy_id) for group in groups
-    }
-    load_group_memberships(neo4j_session, groups_membership, oci_update_tag)
-    run_cleanup_job(
-        'oci_import_groups_membership_cleanup.json',
-        neo4j_session,
-        common_job_parameters,
-    )
+    group_ids = [group['ocid'] for group in neo4j_session.run(query, OCI_TENANCY_ID=current_tenancy_id)]
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        memberships = executor.map(get_group_membership_data, repeat(iam), group_ids, repeat(current_tenancy_id))
+        groups_membership = dict(zip(group_ids, memberships))
+    load_group_memberships(neo4j_session, groups_membership, current_tenancy_id, oci_update_tag)
+    # The memberships are written on OCIUser nodes, whose stale nodes and RESOURCE relationships are already cleaned up
+    # by the OCIUserSchema job of sync_users(). Only run the cleanup of the stale MEMBER_OCID_GROUP relationships.
+    cleanup_job = GraphJob.from_node_schema(OCIUserGroupMembershipSchema(), common_job_parameters)
+    cleanup_job.statements = [
+        statement for statement in cleanup_job.statements if OCIUserToGroup.rel_label in statement.query
+    ]
+    cleanup_job.run(neo4j_session)
 
 
 def load_group_memberships(
     neo4j_session: neo4j.Session,
     group_memberships: Dict[str, Any],
+    current_tenancy_id: str,
     oci_update_tag: int,
 ) -> None:
-    ingest_membership = """
-    MATCH (group:OCIGroup{ocid: $GROUP_OCID})
-    WITH group
-    MATCH (user:OCIUser{ocid: $USER_OCID})
-    MERGE (user)-[r:MEMBER_OCID_GROUP]->(group)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $oci_update_tag
-    """
-    for group_ocid, membership_data in group_memberships.items():
-        for info in membership_data["GroupMemberships"]:
-            neo4j_session.run(
-                ingest_membership,
-                COMPARTMENT_ID=info["compartment-id"],
-                GROUP_OCID=info["group-id"],
-                USER_OCID=info["user-id"],
-                oci_update_tag=oci_update_tag,
-            )
+    memberships = [
+        {'user_id': info['user-id'], 'group_id': info['group-id']}
+        for membership_data in group_memberships.values()
+        for info in membership_data['GroupMemberships']
+    ]
+    load(
+        neo4j_session,
+        OCIUserGroupMembershipSchema(),
+        memberships,
+        lastupdated=oci_update_tag,
+        OCI_TENANCY_ID=current_tenancy_id,
+    )
+
+
+def transform_policies(policies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': policy['id'],
+            'name': policy['name'],
+            'compartment_id': policy['compartment-id'],
+            'description': policy['description'],
+            'statements': policy['statements'],
+            'time_created': dict_value_to_str(policy, 'time-created'),
+            'version_date': dict_value_to_str(policy, 'version-date'),
+        }
+        for policy in policies
+    ]
 
 
 def load_policies(
@@ -266,32 +301,13 @@ def load_policies(
     current_tenancy_id: str,
     oci_update_tag: int,
 ) -> None:
-    ingest_policy = """
-    MERGE (pnode:OCIPolicy{ocid: $OCID})
-    ON CREATE SET pnode.firstseen = timestamp(), pnode.createdate = $CREATE_DATE
-    SET pnode.name = $POLICY_NAME, pnode.compartmentid = $COMPARTMENT_ID, pnode.description = $DESCRIPTION,
-    pnode.statements = $STATEMENTS,
-    pnode.updatedate = $POLICY_UPDATE, pnode.lastupdated = $oci_update_tag
-    WITH pnode
-    MATCH (aa) WHERE (aa:OCITenancy OR aa:OCICompartment) AND aa.ocid=$COMPARTMENT_ID
-    MERGE (aa)-[r:OCI_POLICY]->(pnode)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $oci_update_tag
-    """
-
-    for policy in policies:
-        neo4j_session.run(
-            ingest_policy,
-            OCID=policy["id"],
-            POLICY_NAME=policy["name"],
-            COMPARTMENT_ID=policy["compartment-id"],
-            DESCRIPTION=policy["description"],
-            STATEMENTS=policy["statements"],
-            CREATE_DATE=str(policy["time-created"]),
-            POLICY_UPDATE=str(policy["version-date"]),
-            OCI_TENANCY_ID=current_tenancy_id,
-            oci_update_tag=oci_update_tag,
-        )
+    load(
+        neo4j_session,
+        OCIPolicySchema(),
+        transform_policies(policies),
+        lastupdated=oci_update_tag,
+        OCI_TENANCY_ID=current_tenancy_id,
+    )
 
 
 def get_policy_list_data(
@@ -310,59 +326,54 @@ def sync_policies(
     common_job_parameters: Dict[str, Any],
 ) -> None:
     logger.debug("Syncing IAM policies for account '%s'.", current_tenancy_id)
-    compartments = utils.get_compartments_in_tenancy(neo4j_session, current_tenancy_id)
-    for compartment in compartments:
-        logger.debug(
-            "Syncing OCI policies for compartment '%s' in account '%s'.", compartment['ocid'], current_tenancy_id,
-        )
-        data = get_policy_list_data(iam, compartment["ocid"])
-        if (data["Policies"]):
-            load_policies(neo4j_session, data["Policies"], current_tenancy_id, oci_update_tag)
-    run_cleanup_job('oci_import_policies_cleanup.json', neo4j_session, common_job_parameters)
-
-
-def load_oci_policy_group_reference(
+    # The tenancy is the root compartment and can hold policies too.
+    compartment_ids = [current_tenancy_id] + [
+        compartment['ocid'] for compartment in utils.get_compartments_in_tenancy(neo4j_session, current_tenancy_id)
+    ]
+    policies: List[Dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        for data in executor.map(get_policy_list_data, repeat(iam), compartment_ids):
+            policies.extend(data['Policies'])
+    load_policies(neo4j_session, policies, current_tenancy_id, oci_update_tag)
+    GraphJob.from_node_schema(OCIPolicySchema(), common_job_parameters).run(neo4j_session)
+
+
+def load_oci_policy_group_references(
     neo4j_session: neo4j.Session,
-    policy_id: str,
-    group_id: str,
-    tenancy_id: str,
+    references: List[Dict[str, str]],
     oci_update_tag: int,
 ) -> None:
+    """
+    :param references: Dicts with the `policy_id` and the `group_id` that the policy references.
+    """
     ingest_policy_group_reference = """
-    MATCH (aa:OCIPolicy{ocid: $POLICY_ID})
-    MATCH (bb:OCIGroup{ocid: $GROUP_ID})
+    UNWIND $DictList AS reference
+    MATCH (aa:OCIPolicy{ocid: reference.policy_id})
+    MATCH (bb:OCIGroup{ocid: reference.group_id})
     MERGE (aa)-[r:OCI_POLICY_REFERENCE]->(bb)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $oci_update_tag
     """
-    neo4j_session.run(
-        ingest_policy_group_reference,
-        POLICY_ID=policy_id,
-        GROUP_ID=group_id,
-        oci_update_tag=oci_update_tag,
-    )
+    load_graph_data(neo4j_session, ingest_policy_group_reference, references, oci_update_tag=oci_update_tag)
 
 
-def load_oci_policy_compartment_reference(
+def load_oci_policy_compartment_references(
     neo4j_session: neo4j.Session,
-    policy_id: str,
-    compartment_id: str,
-    tenancy_id: str,
+    references: List[Dict[str, str]],
     oci_update_tag: int,
 ) -> None:
+    """
+    :param references: Dicts with the `policy_id` and the `compartment_id` that the policy references.
+    """
     ingest_policy_compartment_reference = """
-    MATCH (aa:OCIPolicy{ocid: $POLICY_ID})
-    MATCH (bb:OCICompartment{ocid: $COMPARTMENT_ID})
+    UNWIND $DictList AS reference
+    MATCH (aa:OCIPolicy{ocid: reference.policy_id})
+    MATCH (bb:OCICompartment{ocid: reference.compartment_id})
     MERGE (aa)-[r:OCI_POLICY_REFERENCE]->(bb)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $oci_update_tag
     """
-    neo4j_session.run(
-        ingest_policy_compartment_reference,
-        POLICY_ID=policy_id,
-        COMPARTMENT_ID=compartment_id,
-        oci_update_tag=oci_update_tag,
-    )
+    load_graph_data(neo4j_session, ingest_policy_compartment_reference, references, oci_update_tag=oci_update_tag)
 
 
 # Parse the statements inside OCI Policies and load the corresponding relationships they reference.
@@ -375,6 +386,8 @@ def sync_oci_policy_references(
     groups = list(utils.get_groups_in_tenancy(neo4j_session, tenancy_id))
     compartments = list(utils.get_compartments_in_tenancy(neo4j_session, tenancy_id))
     policies = list(utils.get_policies_in_tenancy(neo4j_session, tenancy_id))
+    group_references = []
+    compartment_references = []
     for policy in policies:
         check_compart = policy["compartmentid"]
         for statement in policy["statements"]:
@@ -382,9 +395,7 @@ def sync_oci_policy_references(
             if m:
                 for group in groups:
                     if group["name"].lower() == m.group(0).lower():
-                        load_oci_policy_group_reference(
-                            neo4j_session, policy["ocid"], group["ocid"], tenancy_id, oci_update_tag,
-                        )
+                        group_references.append({'policy_id': policy["ocid"], 'group_id': group["ocid"]})
             m = re.search('(?<=compartment\\s)[^ ]*(?=$)', statement)
             if m:
                 for compartment in compartments:
@@ -392,9 +403,11 @@ def sync_oci_policy_references(
                     # in which the policy is a member of.
                     if compartment["ocid"] == check_compart or compartment["compartmentid"] == check_compart:
                         if compartment["name"].lower() == m.group(0).lower():
-                            load_oci_policy_compartment_reference(
-                                neo4j_session, policy["ocid"], compartment['ocid'], tenancy_id, oci_update_tag,
+                            compartment_references.append(
+                                {'policy_id': policy["ocid"], 'compartment_id': compartment['ocid']},
                             )
+    load_oci_policy_group_references(neo4j_session, group_references, oci_update_tag)
+    load_oci_policy_compartment_references(neo4j_session, compartment_references, oci_update_tag)
 
 
 def get_region_subscriptions_list_data(
@@ -0,0 +1,54 @@
+import importlib
+import json
+import logging
+
+import neo4j
+
+from cartography.client.core.snapshot import read_manifest
+from cartography.client.core.snapshot import read_records
+from cartography.client.core.snapshot import SnapshotJSONEncoder
+from cartography.client.core.tx import load
+from cartography.config import Config
+from cartography.graph.job import GraphJob
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.util import timeit
+
+logger = logging.getLogger(__name__)
+
+
+def _get_node_schema(qualified_name: str) -> CartographyNodeSchema:
+    module_name, class_name = qualified_name.rsplit('.', 1)
+    schema_class = getattr(importlib.import_module(module_name), class_name)
+    return schema_class()
+
+
+@timeit
+def load_from_snapshot(neo4j_session: neo4j.Session, directory: str) -> None:
+    """
+    Replays a snapshot written with `--extract-to`: each load is written with `load()`, each recorded graph job is
+    run and each recorded query is run with its parameters, in the order in which the extract run produced them. The
+    update tags stored in the snapshot are kept so that the recorded cleanup jobs only remove data that the extract run
+    did not see.
+    """
+    loads = jobs = queries = 0
+    for entry in read_manifest(directory):
+        if entry['type'] == 'load':
+            records = read_records(directory, entry['file'])
+            load(neo4j_session, _get_node_schema(entry['schema']), records, **entry['kwargs'])
+            loads += 1
+        elif entry['type'] == 'job':
+            job_dict = entry['job']
+            GraphJob.from_json(json.dumps(job_dict, cls=SnapshotJSONEncoder), job_dict.get('short_name')).run(
+                neo4j_session,
+            )
+            jobs += 1
+        elif entry['type'] == 'query':
+            neo4j_session.run(entry['query'], entry['parameters']).consume()
+            queries += 1
+        else:
+            raise ValueError(f"Unknown snapshot manifest entry type '{entry['type']}' in '{directory}'.")
+    logger.info(f"Replayed {loads} loads, {jobs} jobs and {queries} queries from snapshot '{directory}'.")
+
+
+def run(neo4j_session: neo4j.Session, config: Config) -> None:
+    load_from_snapshot(neo4j_session, config.load_from)
@@ -0,0 +1,259 @@
+"""
+In-process metrics for a sync run.
+
+When a MetricsCollector is set (`--metrics-report-dir DIR`), cartography records where a sync spends its time without
+needing a statsd server:
+
+- `stage_seconds`: wall time of each sync stage, see cartography.sync.Sync.run().
+- `function_seconds` and `function_calls`: wall time and calls of every function decorated with
+  cartography.util.timeit. Times are inclusive, so a sync function's time contains the time of the functions it calls.
+- `api_calls`: provider API calls, e.g. every boto3 call made during the AWS sync.
+- `rows_loaded` and `transactions`: records written and write transactions run by schema-based loads and graph jobs.
+- Neo4j counters (`nodes_created`, `properties_set`, `relationships_deleted`, ...) from the summary of every write.
+
+Every value is labeled with the labels of the enclosing `metrics_scope()` blocks, e.g. the stage, the AWS account, the
+intel module and function, and the node schema and sub resource of a load, or the graph job that ran a statement. At
+the end of the sync the values are written to DIR as JSON and Markdown, and optionally as OpenMetrics text.
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import neo4j
+
+logger = logging.getLogger(__name__)
+
+JSON_REPORT_FILENAME = 'metrics.json'
+MARKDOWN_REPORT_FILENAME = 'metrics.md'
+OPENMETRICS_REPORT_FILENAME = 'metrics.prom'
+
+# The Neo4j summary counters that are recorded for every write
+NEO4J_COUNTERS = [
+    'nodes_created',
+    'nodes_deleted',
+    'relationships_created',
+    'relationships_deleted',
+    'properties_set',
+    'labels_added',
+    'labels_removed',
+]
+
+# Number of rows shown in the "slowest functions" table of the Markdown report
+MARKDOWN_TOP_FUNCTIONS = 25
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_scope_labels: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar('cartography_metrics_labels', default={})
+
+
+@contextmanager
+def metrics_scope(**labels: Any) -> Iterator[None]:
+    """
+    Adds the given labels to every metric recorded inside the `with` block, including in nested function calls.
+    Labels with a None value are ignored. Inner scopes override the labels of outer scopes with the same name.
+
+    Work submitted to a thread pool only keeps the labels if it is run in a copy of the caller's context, see
+    contextvars.copy_context().
+    """
+    new_labels = {name: str(value) for name, value in labels.items() if value is not None}
+    token = _scope_labels.set({**_scope_labels.get(), **new_labels})
+    try:
+        yield
+    finally:
+        _scope_labels.reset(token)
+
+
+class MetricsCollector:
+    """
+    Thread-safe store of labeled counters for one sync run.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[Tuple[str, Labels], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Adds `value` to the metric `name` with the current scope's labels plus the given labels.
+        """
+        all_labels = {**_scope_labels.get(), **{k: str(v) for k, v in labels.items() if v is not None}}
+        key = (name, tuple(sorted(all_labels.items())))
+        with self._lock:
+            self._values[key] += value
+
+    def add_neo4j_counters(self, counters: neo4j.SummaryCounters) -> None:
+        """
+        Records one write transaction and its Neo4j summary counters with the current scope's labels.
+        """
+        self.incr('transactions')
+        for name in NEO4J_COUNTERS:
+            value = getattr(counters, name)
+            if value:
+                self.incr(name, value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Adds the wall time of the `with` block in seconds to the metric `name`, also if the block raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.incr(name, time.perf_counter() - start)
+
+    @contextmanager
+    def measure_function(self, module: str, function: str) -> Iterator[None]:
+        """
+        Records a call to the given function and its wall time. Metrics recorded during the call are labeled with the
+        function.
+        """
+        with metrics_scope(module=module, function=function):
+            self.incr('function_calls')
+            with self.timer('function_seconds'):
+                yield
+
+    def get_metrics(self) -> List[Dict[str, Any]]:
+        """
+        :return: All recorded values as dicts with `name`, `labels` and `value` keys, sorted by name and labels.
+        """
+        with self._lock:
+            items = sorted(self._values.items())
+        return [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in items]
+
+    def _sum_by(self, metrics: List[Dict[str, Any]], name: str, label_names: List[str]) -> Dict[Tuple[str, ...], float]:
+        totals: Dict[Tuple[str, ...], float] = defaultdict(float)
+        for metric in metrics:
+            if metric['name'] == name:
+                totals[tuple(metric['labels'].get(label, '') for label in label_names)] += metric['value']
+        return totals
+
+    def to_json(self, **metadata: Any) -> str:
+        return json.dumps({**metadata, 'metrics': self.get_metrics()}, indent=2)
+
+    def to_markdown(self, **metadata: Any) -> str:
+        metrics = self.get_metrics()
+        lines = ['# Cartography sync metrics', '']
+        for name, value in metadata.items():
+            lines.append(f'- {name}: {value}')
+        lines.append('')
+
+        lines += ['## Stages', '', '| Stage | Seconds |', '| --- | ---: |']
+        for (stage,), seconds in self._sum_by(metrics, 'stage_seconds', ['stage']).items():
+            lines.append(f'| {stage} | {seconds:.1f} |')
+        lines.append('')
+
+        lines += [
+            f'## Slowest functions (top {MARKDOWN_TOP_FUNCTIONS}, inclusive)', '',
+            '| Stage | Function | Calls | Seconds |', '| --- | --- | ---: | ---: |',
+        ]
+        label_names = ['stage', 'module', 'function']
+        calls = self._sum_by(metrics, 'function_calls', label_names)
+        seconds_by_function = self._sum_by(metrics, 'function_seconds', label_names)
+        slowest = sorted(seconds_by_function.items(), key=lambda item: item[1], reverse=True)
+        for (stage, module, function), seconds in slowest[:MARKDOWN_TOP_FUNCTIONS]:
+            lines.append(
+                f'| {stage} | {module}.{function} | {calls[(stage, module, function)]:.0f} | {seconds:.1f} |',
+            )
+        lines.append('')
+
+        lines += [
+            '## Loads', '',
+            '| Stage | Schema | Rows | Transactions | Nodes created | Properties set | Relationships created |',
+            '| --- | --- | ---: | ---: | ---: | ---: | ---: |',
+        ]
+        label_names = ['stage', 'schema']
+        rows = self._sum_by(metrics, 'rows_loaded', label_names)
+        columns = [
+            self._sum_by(metrics, name, label_names)
+            for name in ['transactions', 'nodes_created', 'properties_set', 'relationships_created']
+        ]
+        for key, count in sorted(rows.items(), key=lambda item: item[1], reverse=True):
+            values = ' | '.join(f'{column[key]:.0f}' for column in columns)
+            lines.append(f'| {key[0]} | {key[1]} | {count:.0f} | {values} |')
+        lines.append('')
+
+        lines += [
+            '## Graph jobs', '',
+            '| Stage | Job | Transactions | Nodes deleted | Relationships deleted | Properties set |',
+            '| --- | --- | ---: | ---: | ---: | ---: |',
+        ]
+        label_names = ['stage', 'job']
+        transactions = {
+            key: value for key, value in self._sum_by(metrics, 'transactions', label_names).items() if key[1]
+        }
+        columns = [
+            self._sum_by(metrics, name, label_names)
+            for name in ['nodes_deleted', 'relationships_deleted', 'properties_set']
+        ]
+        for key, count in sorted(transactions.items(), key=lambda item: item[1], reverse=True):
+            values = ' | '.join(f'{column[key]:.0f}' for column in columns)
+            lines.append(f'| {key[0]} | {key[1]} | {count:.0f} | {values} |')
+        lines.append('')
+
+        lines += ['## API calls', '', '| Stage | Service | Operation | Calls |', '| --- | --- | --- | ---: |']
+        api_calls = self._sum_by(metrics, 'api_calls', ['stage', 'service', 'operation'])
+        for (stage, service, operation), count in sorted(api_calls.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f'| {stage} | {service} | {operation} | {count:.0f} |')
+        lines.append('')
+        return '\n'.join(lines)
+
+    def to_openmetrics(self) -> str:
+        """
+        :return: The recorded values in the OpenMetrics text format, as counters named `cartography_<name>_total`.
+        """
+        lines = []
+        previous_name = None
+        for metric in self.get_metrics():
+            if metric['name'] != previous_name:
+                previous_name = metric['name']
+                lines.append(f"# TYPE cartography_{metric['name']} counter")
+            labels = ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in metric['labels'].items())
+            lines.append(f"cartography_{metric['name']}_total{{{labels}}} {metric['value']}")
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write_reports(self, directory: str, openmetrics: bool = False, **metadata: Any) -> None:
+        """
+        Writes the JSON and Markdown reports, and the OpenMetrics text if `openmetrics` is True, to `directory`.
+        :param metadata: Extra top-level fields for the reports, e.g. the update tag of the sync.
+        """
+        os.makedirs(directory, exist_ok=True)
+        reports = {
+            JSON_REPORT_FILENAME: self.to_json(**metadata),
+            MARKDOWN_REPORT_FILENAME: self.to_markdown(**metadata),
+        }
+        if openmetrics:
+            reports[OPENMETRICS_REPORT_FILENAME] = self.to_openmetrics()
+        for filename, content in reports.items():
+            with open(os.path.join(directory, filename), 'w') as f:
+                f.write(content)
+        logger.info("Wrote sync metrics report to '%s'.", directory)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Set by cartography.sync.Sync.run() when `--metrics-report-dir` is given
+_metrics_collector: Optional[MetricsCollector] = None
+
+
+def get_metrics_collector() -> Optional[MetricsCollector]:
+    return _metrics_collector
+
+
+def set_metrics_collector(metrics_collector: Optional[MetricsCollector]) -> None:
+    global _metrics_collector
+    _metrics_collector = metrics_collector
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.relationships import CartographyRelProperties
+from cartography.models.core.relationships import CartographyRelSchema
+from cartography.models.core.relationships import LinkDirection
+from cartography.models.core.relationships import make_target_node_matcher
+from cartography.models.core.relationships import OtherRelationships
+from cartography.models.core.relationships import TargetNodeMatcher
+
+
+@dataclass(frozen=True)
+class DBSubnetGroupNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('arn')
+    name: PropertyRef = PropertyRef('DBSubnetGroupName')
+    vpc_id: PropertyRef = PropertyRef('VpcId')
+    description: PropertyRef = PropertyRef('DBSubnetGroupDescription')
+    status: PropertyRef = PropertyRef('SubnetGroupStatus')
+    region: PropertyRef = PropertyRef('Region', set_in_kwargs=True)
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class DBSubnetGroupToAWSAccountRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:DBSubnetGroup)<-[:RESOURCE]-(:AWSAccount)
+class DBSubnetGroupToAWSAccount(CartographyRelSchema):
+    target_node_label: str = 'AWSAccount'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('AWS_ID', set_in_kwargs=True)},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "RESOURCE"
+    properties: DBSubnetGroupToAWSAccountRelProperties = DBSubnetGroupToAWSAccountRelProperties()
+
+
+@dataclass(frozen=True)
+class DBSubnetGroupToRDSInstanceRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:DBSubnetGroup)<-[:MEMBER_OF_DB_SUBNET_GROUP]-(:RDSInstance)
+class DBSubnetGroupToRDSInstance(CartographyRelSchema):
+    target_node_label: str = 'RDSInstance'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('instance_arn')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "MEMBER_OF_DB_SUBNET_GROUP"
+    properties: DBSubnetGroupToRDSInstanceRelProperties = DBSubnetGroupToRDSInstanceRelProperties()
+
+
+@dataclass(frozen=True)
+class DBSubnetGroupToEC2SubnetRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:DBSubnetGroup)-[:RESOURCE]->(:EC2Subnet)
+class DBSubnetGroupToEC2Subnet(CartographyRelSchema):
+    # EC2 subnets are written by the ec2:subnet sync keyed on `subnetid` only, so match them on that field. Subnets are
+    # not created here: without an ec2:subnet sync ahead of rds, the relationship is not created.
+    target_node_label: str = 'EC2Subnet'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'subnetid': PropertyRef('SubnetIdentifier')},
+    )
+    direction: LinkDirection = LinkDirection.OUTWARD
+    rel_label: str = "RESOURCE"
+    properties: DBSubnetGroupToEC2SubnetRelProperties = DBSubnetGroupToEC2SubnetRelProperties()
+
+
+@dataclass(frozen=True)
+class DBSubnetGroupSchema(CartographyNodeSchema):
+    """
+    DB subnet groups as known by describe-db-instances. One record per pair of instance in the group and subnet of the
+    group.
+    """
+    label: str = 'DBSubnetGroup'
+    properties: DBSubnetGroupNodeProperties = DBSubnetGroupNodeProperties()
+    sub_resource_relationship: DBSubnetGroupToAWSAccount = DBSubnetGroupToAWSAccount()
+    other_relationships: OtherRelationships = OtherRelationships(
+        [
+            DBSubnetGroupToRDSInstance(),
+            DBSubnetGroupToEC2Subnet(),
+        ],
+    )
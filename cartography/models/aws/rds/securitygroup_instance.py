@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.relationships import CartographyRelProperties
+from cartography.models.core.relationships import CartographyRelSchema
+from cartography.models.core.relationships import LinkDirection
+from cartography.models.core.relationships import make_target_node_matcher
+from cartography.models.core.relationships import OtherRelationships
+from cartography.models.core.relationships import TargetNodeMatcher
+
+
+@dataclass(frozen=True)
+class EC2SecurityGroupRDSInstanceNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('VpcSecurityGroupId')
+    groupid: PropertyRef = PropertyRef('VpcSecurityGroupId', extra_index=True)
+    region: PropertyRef = PropertyRef('Region', set_in_kwargs=True)
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class EC2SecurityGroupToAwsAccountRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class EC2SecurityGroupToAWSAccount(CartographyRelSchema):
+    target_node_label: str = 'AWSAccount'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('AWS_ID', set_in_kwargs=True)},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "RESOURCE"
+    properties: EC2SecurityGroupToAwsAccountRelProperties = EC2SecurityGroupToAwsAccountRelProperties()
+
+
+@dataclass(frozen=True)
+class EC2SecurityGroupToRDSInstanceRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class EC2SecurityGroupToRDSInstance(CartographyRelSchema):
+    target_node_label: str = 'RDSInstance'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('DBInstanceArn')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "MEMBER_OF_EC2_SECURITY_GROUP"
+    properties: EC2SecurityGroupToRDSInstanceRelProperties = EC2SecurityGroupToRDSInstanceRelProperties()
+
+
+@dataclass(frozen=True)
+class EC2SecurityGroupRDSInstanceSchema(CartographyNodeSchema):
+    """
+    Security groups as known by describe-db-instances. One record per RDS instance in the group.
+    """
+    label: str = 'EC2SecurityGroup'
+    properties: EC2SecurityGroupRDSInstanceNodeProperties = EC2SecurityGroupRDSInstanceNodeProperties()
+    sub_resource_relationship: EC2SecurityGroupToAWSAccount = EC2SecurityGroupToAWSAccount()
+    other_relationships: OtherRelationships = OtherRelationships(
+        [
+            EC2SecurityGroupToRDSInstance(),
+        ],
+    )
@@ -40,10 +40,15 @@ class PropertyRef:
             cartography catalog of GitHubUser nodes. Therefore, you would need `ignore_case=True` in the PropertyRef
             that points to the GitHubUser node's name field, otherwise if one of your employees' GitHub usernames
             contains capital letters, you would not be able to map them properly to a GitHubUser node in your graph.
+            The match is an indexed lookup on the lowercase `_lc_<property>` copy of the target node's property, which
+            schema-based loads of the target node maintain. Hand-written Cypher that writes target nodes must set it
+            too, see cartography.graph.querybuilder.get_lowercase_shadow_keys().
         :param fuzzy_and_ignore_case: If True, performs a fuzzy + case-insensitive match when comparing the value of
         this property using the `CONTAINS` operator.
         query. Defaults to False. This only has effect as part of a TargetNodeMatcher and is not supported for the
         sub resource relationship.
+        Like ignore_case, this looks up the lowercase `_lc_<property>` copy of the target node's property, here with a
+        text index, which serves `CONTAINS`.
         """
         self.name = name
         self.set_in_kwargs = set_in_kwargs
@@ -1,8 +1,13 @@
 import abc
+import importlib
+import inspect
+import pkgutil
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Type
 
 from cartography.models.core.common import PropertyRef
 from cartography.models.core.relationships import CartographyRelSchema
@@ -100,3 +105,28 @@ class CartographyNodeSchema(abc.ABC):
         :return: None if not overriden. Else return the ExtraNodeLabels specified on the node.
         """
         return None
+
+
+def _get_subclasses(cls: type) -> Iterator[type]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _get_subclasses(subclass)
+
+
+_models_imported = False
+
+
+def get_node_schema_classes() -> List[Type[CartographyNodeSchema]]:
+    """
+    :return: Every concrete CartographyNodeSchema subclass: those defined under cartography.models, which are all
+    imported on the first call, and those defined elsewhere that have already been imported, such as test models.
+    """
+    global _models_imported
+    if not _models_imported:
+        import cartography.models
+        for module_info in pkgutil.walk_packages(cartography.models.__path__, f'{cartography.models.__name__}.'):
+            importlib.import_module(module_info.name)
+        _models_imported = True
+    return [
+        schema_class for schema_class in _get_subclasses(CartographyNodeSchema) if not inspect.isabstract(schema_class)
+    ]
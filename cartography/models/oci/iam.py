@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.relationships import CartographyRelProperties
+from cartography.models.core.relationships import CartographyRelSchema
+from cartography.models.core.relationships import LinkDirection
+from cartography.models.core.relationships import make_target_node_matcher
+from cartography.models.core.relationships import OtherRelationships
+from cartography.models.core.relationships import TargetNodeMatcher
+
+
+@dataclass(frozen=True)
+class OCIUserNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    ocid: PropertyRef = PropertyRef('id', extra_index=True)
+    name: PropertyRef = PropertyRef('name')
+    compartmentid: PropertyRef = PropertyRef('compartment_id')
+    description: PropertyRef = PropertyRef('description')
+    email: PropertyRef = PropertyRef('email')
+    lifecycle_state: PropertyRef = PropertyRef('lifecycle_state')
+    is_mfa_activated: PropertyRef = PropertyRef('is_mfa_activated')
+    can_use_api_keys: PropertyRef = PropertyRef('can_use_api_keys')
+    can_use_auth_tokens: PropertyRef = PropertyRef('can_use_auth_tokens')
+    can_use_console_password: PropertyRef = PropertyRef('can_use_console_password')
+    can_use_customer_secret_keys: PropertyRef = PropertyRef('can_use_customer_secret_keys')
+    can_use_smtp_credentials: PropertyRef = PropertyRef('can_use_smtp_credentials')
+    createdate: PropertyRef = PropertyRef('time_created')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class OCIGroupNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    ocid: PropertyRef = PropertyRef('id', extra_index=True)
+    name: PropertyRef = PropertyRef('name')
+    compartmentid: PropertyRef = PropertyRef('compartment_id')
+    description: PropertyRef = PropertyRef('description')
+    createdate: PropertyRef = PropertyRef('time_created')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class OCICompartmentNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    ocid: PropertyRef = PropertyRef('id', extra_index=True)
+    name: PropertyRef = PropertyRef('name')
+    compartmentid: PropertyRef = PropertyRef('compartment_id')
+    createdate: PropertyRef = PropertyRef('time_created')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class OCIPolicyNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    ocid: PropertyRef = PropertyRef('id', extra_index=True)
+    name: PropertyRef = PropertyRef('name')
+    compartmentid: PropertyRef = PropertyRef('compartment_id')
+    description: PropertyRef = PropertyRef('description')
+    statements: PropertyRef = PropertyRef('statements')
+    createdate: PropertyRef = PropertyRef('time_created')
+    updatedate: PropertyRef = PropertyRef('version_date')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class OCIUserGroupMembershipNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('user_id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class OCIIAMToTenancyRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:OCIUser|OCIGroup|OCICompartment|OCIPolicy)<-[:RESOURCE]-(:OCITenancy)
+class OCIIAMToTenancy(CartographyRelSchema):
+    target_node_label: str = 'OCITenancy'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'ocid': PropertyRef('OCI_TENANCY_ID', set_in_kwargs=True)},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "RESOURCE"
+    properties: OCIIAMToTenancyRelProperties = OCIIAMToTenancyRelProperties()
+
+
+@dataclass(frozen=True)
+class OCICompartmentToParentRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:OCICompartment)<-[:OCI_COMPARTMENT]-(:OCITenancy)
+class OCICompartmentToParentTenancy(CartographyRelSchema):
+    target_node_label: str = 'OCITenancy'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'ocid': PropertyRef('compartment_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "OCI_COMPARTMENT"
+    properties: OCICompartmentToParentRelProperties = OCICompartmentToParentRelProperties()
+
+
+@dataclass(frozen=True)
+# (:OCICompartment)<-[:OCI_COMPARTMENT]-(:OCICompartment)
+class OCICompartmentToParentCompartment(CartographyRelSchema):
+    target_node_label: str = 'OCICompartment'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'ocid': PropertyRef('compartment_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "OCI_COMPARTMENT"
+    properties: OCICompartmentToParentRelProperties = OCICompartmentToParentRelProperties()
+
+
+@dataclass(frozen=True)
+class OCIPolicyToCompartmentRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:OCIPolicy)<-[:OCI_POLICY]-(:OCITenancy)
+class OCIPolicyToTenancy(CartographyRelSchema):
+    target_node_label: str = 'OCITenancy'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'ocid': PropertyRef('compartment_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "OCI_POLICY"
+    properties: OCIPolicyToCompartmentRelProperties = OCIPolicyToCompartmentRelProperties()
+
+
+@dataclass(frozen=True)
+# (:OCIPolicy)<-[:OCI_POLICY]-(:OCICompartment)
+class OCIPolicyToCompartment(CartographyRelSchema):
+    target_node_label: str = 'OCICompartment'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'ocid': PropertyRef('compartment_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "OCI_POLICY"
+    properties: OCIPolicyToCompartmentRelProperties = OCIPolicyToCompartmentRelProperties()
+
+
+@dataclass(frozen=True)
+class OCIUserToGroupRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:OCIUser)-[:MEMBER_OCID_GROUP]->(:OCIGroup)
+class OCIUserToGroup(CartographyRelSchema):
+    target_node_label: str = 'OCIGroup'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'ocid': PropertyRef('group_id')},
+    )
+    direction: LinkDirection = LinkDirection.OUTWARD
+    rel_label: str = "MEMBER_OCID_GROUP"
+    properties: OCIUserToGroupRelProperties = OCIUserToGroupRelProperties()
+
+
+@dataclass(frozen=True)
+class OCIUserSchema(CartographyNodeSchema):
+    label: str = 'OCIUser'
+    properties: OCIUserNodeProperties = OCIUserNodeProperties()
+    sub_resource_relationship: OCIIAMToTenancy = OCIIAMToTenancy()
+
+
+@dataclass(frozen=True)
+class OCIGroupSchema(CartographyNodeSchema):
+    label: str = 'OCIGroup'
+    properties: OCIGroupNodeProperties = OCIGroupNodeProperties()
+    sub_resource_relationship: OCIIAMToTenancy = OCIIAMToTenancy()
+
+
+@dataclass(frozen=True)
+class OCIUserGroupMembershipSchema(CartographyNodeSchema):
+    """
+    OCI users as known by list-user-group-memberships. One record per membership.
+    """
+    label: str = 'OCIUser'
+    properties: OCIUserGroupMembershipNodeProperties = OCIUserGroupMembershipNodeProperties()
+    sub_resource_relationship: OCIIAMToTenancy = OCIIAMToTenancy()
+    other_relationships: OtherRelationships = OtherRelationships(
+        [
+            OCIUserToGroup(),
+        ],
+    )
+
+
+@dataclass(frozen=True)
+class OCICompartmentSchema(CartographyNodeSchema):
+    label: str = 'OCICompartment'
+    properties: OCICompartmentNodeProperties = OCICompartmentNodeProperties()
+    sub_resource_relationship: OCIIAMToTenancy = OCIIAMToTenancy()
+    other_relationships: OtherRelationships = OtherRelationships(
+        [
+            OCICompartmentToParentTenancy(),
+            OCICompartmentToParentCompartment(),
+        ],
+    )
+
+
+@dataclass(frozen=True)
+class OCIPolicySchema(CartographyNodeSchema):
+    label: str = 'OCIPolicy'
+    properties: OCIPolicyNodeProperties = OCIPolicyNodeProperties()
+    sub_resource_relationship: OCIIAMToTenancy = OCIIAMToTenancy()
+    other_relationships: OtherRelationships = OtherRelationships(
+        [
+            OCIPolicyToTenancy(),
+            OCIPolicyToCompartment(),
+        ],
+    )
@@ -1,9 +1,12 @@
 import argparse
+import importlib
 import logging
 import time
 from collections import OrderedDict
+from typing import Any
 from typing import Callable
 from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Union
 
@@ -11,26 +14,25 @@ import neo4j.exceptions
 from neo4j import GraphDatabase
 from statsd import StatsClient
 
-import cartography.intel.analysis
-import cartography.intel.aws
-import cartography.intel.azure
-import cartography.intel.bigfix
-import cartography.intel.create_indexes
-import cartography.intel.crowdstrike
-import cartography.intel.cve
-import cartography.intel.digitalocean
-import cartography.intel.duo
-import cartography.intel.gcp
-import cartography.intel.github
-import cartography.intel.gsuite
-import cartography.intel.kandji
-import cartography.intel.kubernetes
-import cartography.intel.lastpass
-import cartography.intel.oci
-import cartography.intel.okta
-import cartography.intel.semgrep
-import cartography.intel.snipeit
+from cartography.checkpoint import is_unit_complete
+from cartography.checkpoint import mark_unit_complete
+from cartography.checkpoint import set_checkpoint
+from cartography.checkpoint import start_checkpoint
+from cartography.client.core.indexes import get_index_registry
+from cartography.client.core.session import get_routing_uri
+from cartography.client.core.session import SessionFactory
+from cartography.client.core.session import set_session_factory
+from cartography.client.core.snapshot import ExtractModeReadError
+from cartography.client.core.snapshot import start_extract
+from cartography.client.core.snapshot import stop_extract
+from cartography.client.core.tx import set_skip_unchanged_writes
 from cartography.config import Config
+from cartography.graph.job import set_indexed_cleanup
+from cartography.graph.jobscheduler import MAX_CONCURRENT_JOBS
+from cartography.graph.jobscheduler import set_max_concurrent_jobs
+from cartography.metrics import metrics_scope
+from cartography.metrics import MetricsCollector
+from cartography.metrics import set_metrics_collector
 from cartography.stats import set_stats_client
 from cartography.util import STATUS_FAILURE
 from cartography.util import STATUS_SUCCESS
@@ -38,26 +40,58 @@ from cartography.util import STATUS_SUCCESS
 logger = logging.getLogger(__name__)
 
 
+class LazyStage:
+    """
+    A sync stage callable that imports its intel module the first time it is called.
+
+    Intel modules pull in large SDKs (boto3, googleapiclient, the Azure management SDKs, kubernetes, ...), so importing
+    all of them up front makes `cartography --help` and single-module runs pay for every module. A LazyStage only
+    imports the module that is actually run.
+    """
+
+    def __init__(self, module_name: str, func_name: str):
+        """
+        :type module_name: string
+        :param module_name: The fully qualified name of the module that defines the stage function.
+        :type func_name: string
+        :param func_name: The name of the stage function in that module.
+        """
+        self.module_name = module_name
+        self.func_name = func_name
+
+    def load(self) -> Callable:
+        """
+        Import the module if needed and return the stage function.
+        """
+        return getattr(importlib.import_module(self.module_name), self.func_name)
+
+    def __call__(self, neo4j_session: neo4j.Session, config: Union[Config, argparse.Namespace]) -> Any:
+        return self.load()(neo4j_session, config)
+
+    def __repr__(self) -> str:
+        return f"LazyStage('{self.module_name}', '{self.func_name}')"
+
+
 TOP_LEVEL_MODULES = OrderedDict({  # preserve order so that the default sync always runs `analysis` at the very end
-    'create-indexes': cartography.intel.create_indexes.run,
-    'aws': cartography.intel.aws.start_aws_ingestion,
-    'azure': cartography.intel.azure.start_azure_ingestion,
-    'crowdstrike': cartography.intel.crowdstrike.start_crowdstrike_ingestion,
-    'gcp': cartography.intel.gcp.start_gcp_ingestion,
-    'gsuite': cartography.intel.gsuite.start_gsuite_ingestion,
-    'cve': cartography.intel.cve.start_cve_ingestion,
-    'oci': cartography.intel.oci.start_oci_ingestion,
-    'okta': cartography.intel.okta.start_okta_ingestion,
-    'github': cartography.intel.github.start_github_ingestion,
-    'digitalocean': cartography.intel.digitalocean.start_digitalocean_ingestion,
-    'kandji': cartography.intel.kandji.start_kandji_ingestion,
-    'kubernetes': cartography.intel.kubernetes.start_k8s_ingestion,
-    'lastpass': cartography.intel.lastpass.start_lastpass_ingestion,
-    'bigfix': cartography.intel.bigfix.start_bigfix_ingestion,
-    'duo': cartography.intel.duo.start_duo_ingestion,
-    'semgrep': cartography.intel.semgrep.start_semgrep_ingestion,
-    'snipeit': cartography.intel.snipeit.start_snipeit_ingestion,
-    'analysis': cartography.intel.analysis.run,
+    'create-indexes': LazyStage('cartography.intel.create_indexes', 'run'),
+    'aws': LazyStage('cartography.intel.aws', 'start_aws_ingestion'),
+    'azure': LazyStage('cartography.intel.azure', 'start_azure_ingestion'),
+    'crowdstrike': LazyStage('cartography.intel.crowdstrike', 'start_crowdstrike_ingestion'),
+    'gcp': LazyStage('cartography.intel.gcp', 'start_gcp_ingestion'),
+    'gsuite': LazyStage('cartography.intel.gsuite', 'start_gsuite_ingestion'),
+    'cve': LazyStage('cartography.intel.cve', 'start_cve_ingestion'),
+    'oci': LazyStage('cartography.intel.oci', 'start_oci_ingestion'),
+    'okta': LazyStage('cartography.intel.okta', 'start_okta_ingestion'),
+    'github': LazyStage('cartography.intel.github', 'start_github_ingestion'),
+    'digitalocean': LazyStage('cartography.intel.digitalocean', 'start_digitalocean_ingestion'),
+    'kandji': LazyStage('cartography.intel.kandji', 'start_kandji_ingestion'),
+    'kubernetes': LazyStage('cartography.intel.kubernetes', 'start_k8s_ingestion'),
+    'lastpass': LazyStage('cartography.intel.lastpass', 'start_lastpass_ingestion'),
+    'bigfix': LazyStage('cartography.intel.bigfix', 'start_bigfix_ingestion'),
+    'duo': LazyStage('cartography.intel.duo', 'start_duo_ingestion'),
+    'semgrep': LazyStage('cartography.intel.semgrep', 'start_semgrep_ingestion'),
+    'snipeit': LazyStage('cartography.intel.snipeit', 'start_snipeit_ingestion'),
+    'analysis': LazyStage('cartography.intel.analysis', 'run'),
 })
 
 
@@ -96,28 +130,95 @@ class Sync:
         for name, func in stages:
             self.add_stage(name, func)
 
-    def run(self, neo4j_driver: neo4j.Driver, config: Union[Config, argparse.Namespace]) -> int:
+    def run(self, neo4j_driver: Optional[neo4j.Driver], config: Union[Config, argparse.Namespace]) -> int:
         """
         Execute all stages in the sync task in sequence.
 
         :type neo4j_driver: neo4j.Driver
-        :param neo4j_driver: Neo4j driver object.
+        :param neo4j_driver: Neo4j driver object. None in extract mode, which records the sync to a snapshot without a
+        database.
         :type config: cartography.config.Config
         :param config: Configuration for the sync run.
         """
+        checkpoint = None
+        if config.checkpoint_file:
+            checkpoint = start_checkpoint(config.checkpoint_file, config.update_tag, config.resume)
+            # A resumed sync must write with the update tag of the attempt it continues.
+            config.update_tag = checkpoint.update_tag
         logger.info("Starting sync with update tag '%d'", config.update_tag)
-        with neo4j_driver.session(database=config.neo4j_database) as neo4j_session:
-            for stage_name, stage_func in self._stages.items():
-                logger.info("Starting sync stage '%s'", stage_name)
-                try:
-                    stage_func(neo4j_session, config)
-                except (KeyboardInterrupt, SystemExit):
-                    logger.warning("Sync interrupted during stage '%s'.", stage_name)
-                    raise
-                except Exception:
-                    logger.exception("Unhandled exception during sync stage '%s'", stage_name)
-                    raise  # TODO this should be configurable
-                logger.info("Finishing sync stage '%s'", stage_name)
+        session_factory = SessionFactory(neo4j_driver, config.neo4j_database, config.neo4j_fetch_size)
+        if config.extract_to:
+            # From here on, the session factory hands out sessions that record to the snapshot.
+            start_extract(config.extract_to)
+        with session_factory() as neo4j_session:
+            index_registry = get_index_registry()
+            if not config.extract_to:
+                index_registry.refresh(neo4j_session)
+            set_skip_unchanged_writes(config.skip_unchanged_writes)
+            set_indexed_cleanup(config.indexed_cleanup)
+            set_session_factory(session_factory)
+            set_max_concurrent_jobs(config.analysis_job_concurrency)
+            metrics_collector = MetricsCollector() if config.metrics_report_dir else None
+            set_metrics_collector(metrics_collector)
+            set_checkpoint(checkpoint)
+            # DNS answers are memoized for the duration of one sync. Intel modules are imported lazily, like
+            # the stages of a LazyStage sync.
+            from cartography.intel.dns import DNSResolver
+            from cartography.intel.dns import set_dns_resolver
+            set_dns_resolver(DNSResolver())
+            try:
+                for stage_name, stage_func in self._stages.items():
+                    if is_unit_complete(stage_name):
+                        logger.info("Skipping sync stage '%s', it completed before the sync was resumed.", stage_name)
+                        continue
+                    logger.info("Starting sync stage '%s'", stage_name)
+                    try:
+                        with metrics_scope(stage=stage_name):
+                            if metrics_collector:
+                                with metrics_collector.timer('stage_seconds'):
+                                    stage_func(neo4j_session, config)
+                            else:
+                                stage_func(neo4j_session, config)
+                    except (KeyboardInterrupt, SystemExit):
+                        logger.warning("Sync interrupted during stage '%s'.", stage_name)
+                        raise
+                    except ExtractModeReadError:
+                        logger.exception(
+                            "Sync stage '%s' reads the graph, which is not supported with --extract-to.", stage_name,
+                        )
+                        raise
+                    except Exception:
+                        logger.exception("Unhandled exception during sync stage '%s'", stage_name)
+                        raise  # TODO this should be configurable
+                    mark_unit_complete(stage_name)
+                    logger.info("Finishing sync stage '%s'", stage_name)
+            finally:
+                if config.extract_to:
+                    stop_extract()
+                set_skip_unchanged_writes(False)
+                set_indexed_cleanup(False)
+                set_session_factory(None)
+                set_max_concurrent_jobs(MAX_CONCURRENT_JOBS)
+                set_metrics_collector(None)
+                set_checkpoint(None)
+                set_dns_resolver(None)
+                if metrics_collector:
+                    try:
+                        metrics_collector.write_reports(
+                            config.metrics_report_dir,
+                            openmetrics=config.metrics_report_openmetrics,
+                            update_tag=config.update_tag,
+                        )
+                    except OSError:
+                        logger.exception("Could not write the sync metrics report to '%s'.", config.metrics_report_dir)
+            logger.info(
+                "Index registry created %d and skipped %d index statements.",
+                index_registry.created,
+                index_registry.skipped,
+            )
+        if checkpoint:
+            # The sync completed, so the next `--resume` starts a new one.
+            checkpoint.remove()
         logger.info("Finishing sync with update tag '%d'", config.update_tag)
         return STATUS_SUCCESS
 
@@ -126,8 +227,9 @@ def run_with_config(sync: Sync, config: Union[Config, argparse.Namespace]) -> in
     """
     Execute the cartography.sync.Sync.run method with parameters built from the given configuration object.
 
-    This function will create a Neo4j driver object from the given Neo4j configuration options (URI, auth, etc.) and
-    will choose a sensible update tag if one is not specified in the given configuration.
+    This function will create a Neo4j driver object from the given Neo4j configuration options (URI, auth, etc.), unless
+    the sync runs in extract mode, and will choose a sensible update tag if one is not specified in the given
+    configuration.
 
     :type sync: cartography.sync.Sync
     :param sync: A sync task to run.
@@ -144,14 +246,29 @@ def run_with_config(sync: Sync, config: Union[Config, argparse.Namespace]) -> in
             ),
         )
 
+    default_update_tag = int(time.time())
+    if not config.update_tag:
+        config.update_tag = default_update_tag
+    if config.extract_to:
+        # Extract mode records the sync to a snapshot and does not connect to Neo4j.
+        return sync.run(None, config)
+
     neo4j_auth = None
     if config.neo4j_user or config.neo4j_password:
         neo4j_auth = (config.neo4j_user, config.neo4j_password)
+    # Only override the driver defaults for the pool settings that were given.
+    pool_config = {}
+    if config.neo4j_max_connection_pool_size:
+        pool_config['max_connection_pool_size'] = config.neo4j_max_connection_pool_size
+    if config.neo4j_connection_acquisition_timeout:
+        pool_config['connection_acquisition_timeout'] = config.neo4j_connection_acquisition_timeout
+    neo4j_uri = get_routing_uri(config.neo4j_uri) if config.neo4j_routing else config.neo4j_uri
     try:
         neo4j_driver = GraphDatabase.driver(
-            config.neo4j_uri,
+            neo4j_uri,
             auth=neo4j_auth,
             max_connection_lifetime=config.neo4j_max_connection_lifetime,
+            **pool_config,
         )
     except neo4j.exceptions.ServiceUnavailable as e:
         logger.debug("Error occurred during Neo4j connect.", exc_info=True)
@@ -160,7 +277,7 @@ def run_with_config(sync: Sync, config: Union[Config, argparse.Namespace]) -> in
                 "Unable to connect to Neo4j using the provided URI '%s', an error occurred: '%s'. Make sure the Neo4j "
                 "server is running and accessible from your network."
             ),
-            config.neo4j_uri,
+            neo4j_uri,
             e,
         )
         return STATUS_FAILURE
@@ -185,9 +302,6 @@ def run_with_config(sync: Sync, config: Union[Config, argparse.Namespace]) -> in
                 e,
             )
         return STATUS_FAILURE
-    default_update_tag = int(time.time())
-    if not config.update_tag:
-        config.update_tag = default_update_tag
     return sync.run(neo4j_driver, config)
 
 
@@ -205,6 +319,21 @@ def build_default_sync() -> Sync:
     return sync
 
 
+def build_load_from_snapshot_sync() -> Sync:
+    """
+    Build a sync that replays a snapshot written with `--extract-to` instead of running the intel modules.
+
+    :rtype: cartography.sync.Sync
+    :return: A cartography sync object that creates indexes and then loads the snapshot given by config.load_from.
+    """
+    sync = Sync()
+    sync.add_stages([
+        ('create-indexes', TOP_LEVEL_MODULES['create-indexes']),
+        ('load-from-snapshot', LazyStage('cartography.intel.snapshot', 'run')),
+    ])
+    return sync
+
+
 def parse_and_validate_selected_modules(selected_modules: str) -> List[str]:
     """
     Ensures that user-selected modules passed through the CLI are valid and parses them to a list of str.
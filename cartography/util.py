@@ -21,12 +21,13 @@ from typing import TypeVar
 from typing import Union
 
 import backoff
-import boto3
-import botocore
+import botocore.exceptions
 import neo4j
 
 from cartography.graph.job import GraphJob
+from cartography.graph.jobscheduler import run_graph_jobs
 from cartography.graph.statement import get_job_shortname
+from cartography.metrics import get_metrics_collector
 from cartography.stats import get_stats_client
 from cartography.stats import ScopedStatsClient
 
@@ -65,6 +66,43 @@ def run_analysis_job(
     )
 
 
+def run_analysis_jobs(
+    filenames: List[str],
+    neo4j_session: neo4j.Session,
+    common_job_parameters: Dict,
+    package: str = 'cartography.data.jobs.analysis',
+) -> None:
+    """
+    Runs the given analysis jobs from the given Python `package` directory. Jobs that declare non-conflicting "reads"
+    and "writes" labels run concurrently on separate sessions, see cartography.graph.jobscheduler.run_graph_jobs().
+    """
+    jobs = []
+    for filename in filenames:
+        job = GraphJob.from_json(read_text(package, filename), get_job_shortname(filename))
+        job.merge_parameters(common_job_parameters)
+        jobs.append(job)
+    run_graph_jobs(jobs, neo4j_session)
+
+
+def analysis_dependencies_met(
+        analysis_job_name: str,
+        resource_dependencies: Set[str],
+        requested_syncs: Set[str],
+) -> bool:
+    """
+    :return: True if the given set of resource dependencies was included in the requested_syncs. Otherwise logs why the
+    given analysis job will not run and returns False.
+    """
+    if not resource_dependencies.issubset(requested_syncs):
+        logger.info(
+            f"Did not run {analysis_job_name} because it needs {resource_dependencies} to be included "
+            f"as a requested sync. You specified: {requested_syncs}. If you want this job to run, please change your "
+            f"CLI args/cartography config so that all required resources are included.",
+        )
+        return False
+    return True
+
+
 def run_analysis_and_ensure_deps(
         analysis_job_name: str,
         resource_dependencies: Set[str],
@@ -81,12 +119,7 @@ def run_analysis_and_ensure_deps(
     :param common_job_parameters: The common job params dict used in cartography.
     :param neo4j_session: The neo4j session object.
     """
-    if not resource_dependencies.issubset(requested_syncs):
-        logger.info(
-            f"Did not run {analysis_job_name} because it needs {resource_dependencies} to be included "
-            f"as a requested sync. You specified: {requested_syncs}. If you want this job to run, please change your "
-            f"CLI args/cartography config so that all required resources are included.",
-        )
+    if not analysis_dependencies_met(analysis_job_name, resource_dependencies, requested_syncs):
         return
 
     run_analysis_job(
@@ -177,27 +210,37 @@ def timeit(method: F) -> F:
     """
     This decorator uses statsd to time the execution of the wrapped method and sends it to the statsd server.
     This is only active if config.statsd_enabled is True.
+    If config.metrics_report_dir is set, the call is also recorded by cartography.metrics, and loads and graph jobs run
+    during the call are attributed to the method.
     :param method: The function to measure execution
     """
     # Allow access via `inspect` to the wrapped function. This is used in integration tests to standardize param names.
     @wraps(method)
     def timed(*args, **kwargs):  # type: ignore
-        stats_client = get_stats_client(method.__module__)
-        if stats_client.is_enabled():
-            timer = stats_client.timer(method.__name__)
-            timer.start()
-            result = method(*args, **kwargs)
-            timer.stop()
-            return result
-        else:
-            # statsd is disabled, so don't time anything
-            return method(*args, **kwargs)
+        metrics_collector = get_metrics_collector()
+        if metrics_collector:
+            with metrics_collector.measure_function(method.__module__, method.__name__):
+                return _statsd_timed(method, args, kwargs)
+        return _statsd_timed(method, args, kwargs)
 
     return cast(F, timed)
 
 
+def _statsd_timed(method: Callable, args: Any, kwargs: Any) -> Any:
+    stats_client = get_stats_client(method.__module__)
+    if stats_client.is_enabled():
+        timer = stats_client.timer(method.__name__)
+        timer.start()
+        result = method(*args, **kwargs)
+        timer.stop()
+        return result
+    else:
+        # statsd is disabled, so don't time anything
+        return method(*args, **kwargs)
+
+
 def aws_paginate(
-    client: boto3.client,
+    client: Any,
     method_name: str,
     object_name: str,
     **kwargs: Any,
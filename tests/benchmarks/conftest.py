@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+
+import neo4j
+import pytest
+
+from tests.benchmarks.recorder import BenchmarkRecorder
+from tests.integration import settings
+
+logging.getLogger('neo4j').setLevel(logging.WARNING)
+
+RESULTS_FILENAME = 'benchmark-results.json'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('cartography benchmarks')
+    group.addoption(
+        '--benchmark-scale',
+        type=int,
+        default=10000,
+        help='Number of synthetic records (EC2 instances, IAM policies, GitHub repos) to generate. Default 10000.',
+    )
+    group.addoption(
+        '--benchmark-output-dir',
+        default=None,
+        help=f'Directory to write the JSON benchmark results to, as {RESULTS_FILENAME}. Nothing is written if unset.',
+    )
+    group.addoption(
+        '--benchmark-baseline',
+        default=None,
+        help='Path of a JSON file written by an earlier benchmark run to compare against.',
+    )
+    group.addoption(
+        '--benchmark-threshold',
+        type=float,
+        default=0.2,
+        help='Fail a benchmark that is more than this fraction slower than the baseline. Default 0.2.',
+    )
+
+
+@pytest.fixture(scope='session')
+def benchmark_scale(request):
+    return request.config.getoption('--benchmark-scale')
+
+
+@pytest.fixture(scope='session')
+def benchmark_recorder(request, benchmark_scale):
+    baseline_path = request.config.getoption('--benchmark-baseline')
+    baseline = None
+    if baseline_path and os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    recorder = BenchmarkRecorder(benchmark_scale, request.config.getoption('--benchmark-threshold'), baseline)
+    yield recorder
+    output_dir = request.config.getoption('--benchmark-output-dir')
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        recorder.write(os.path.join(output_dir, RESULTS_FILENAME))
+
+
+@pytest.fixture
+def benchmark(benchmark_recorder):
+    """
+    Returns a function with the signature of BenchmarkRecorder.measure() that fails the test if the measurement
+    regressed against the baseline.
+    """
+    def measure(name, func, rounds=3, setup=None):
+        result = benchmark_recorder.measure(name, func, rounds, setup)
+        regression = benchmark_recorder.get_regression(name)
+        if regression:
+            pytest.fail(regression)
+        return result
+    return measure
+
+
+@pytest.fixture(scope='module')
+def neo4j_session():
+    driver = neo4j.GraphDatabase.driver(settings.get('NEO4J_URL'))
+    try:
+        with driver.session() as session:
+            session.run('RETURN 1').consume()
+    except neo4j.exceptions.ServiceUnavailable:
+        driver.close()
+        pytest.skip(f"Load benchmarks need a Neo4j database at {settings.get('NEO4J_URL')}.")
+    with driver.session() as session:
+        yield session
+        session.run('MATCH (n) DETACH DELETE n;')
+    driver.close()
@@ -0,0 +1,88 @@
+"""
+Synthetic inventory generators for the benchmark suite.
+
+Each generator copies a record from tests/data and varies its identifiers so that the output has the same shape as the
+API responses that the intel modules consume, at any scale. Generators are seeded so that runs are comparable.
+"""
+import copy
+import random
+from typing import Any
+from typing import Dict
+from typing import List
+
+from tests.data.aws.ec2.instances import DESCRIBE_INSTANCES
+from tests.data.aws.iam import INLINE_POLICY_STATEMENTS
+from tests.data.github.repos import GET_REPOS
+
+ACCOUNT_ID = '000000000000'
+REGION = 'us-east-1'
+
+
+def generate_ec2_reservations(count: int, seed: int = 0, instances_per_reservation: int = 1) -> List[Dict[str, Any]]:
+    """
+    :return: `count` EC2 instances in the shape of the `Reservations` list returned by ec2:DescribeInstances.
+    """
+    rng = random.Random(seed)
+    template_reservation: Dict[str, Any] = DESCRIBE_INSTANCES['Reservations'][0]  # type: ignore
+    template_instance = template_reservation['Instances'][0]
+    reservations = []
+    for i in range(0, count, instances_per_reservation):
+        instances = []
+        for j in range(i, min(i + instances_per_reservation, count)):
+            instance = copy.deepcopy(template_instance)
+            instance['InstanceId'] = f'i-{j:017x}'
+            instance['SubnetId'] = f'subnet-{rng.randrange(count // 100 + 1):08x}'
+            instance['KeyName'] = f'key-{rng.randrange(count // 1000 + 1)}'
+            instance['SecurityGroups'] = [
+                {'GroupId': f'sg-{rng.randrange(count // 50 + 1):08x}', 'GroupName': 'benchmark'},
+            ]
+            for nic_index, nic in enumerate(instance['NetworkInterfaces']):
+                nic['NetworkInterfaceId'] = f'eni-{j:012x}{nic_index:02x}'
+                nic['SubnetId'] = instance['SubnetId']
+                nic['Groups'] = instance['SecurityGroups']
+            for device in instance['BlockDeviceMappings']:
+                device['Ebs']['VolumeId'] = f'vol-{j:017x}'
+            instances.append(instance)
+        reservations.append({
+            'Groups': [],
+            'Instances': instances,
+            'OwnerId': ACCOUNT_ID,
+            'RequesterId': 'REQUESTER_ID',
+            'ReservationId': f'r-{i:017x}',
+        })
+    return reservations
+
+
+def generate_iam_policy_map(count: int, seed: int = 0, policies_per_principal: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    :return: `count` inline policies in the principal ARN -> policy name -> statements shape that
+    cartography.intel.aws.iam.transform_policy_data() takes.
+    """
+    rng = random.Random(seed)
+    policy_map: Dict[str, Dict[str, Any]] = {}
+    for i in range(count):
+        principal_arn = f'arn:aws:iam::{ACCOUNT_ID}:role/benchmark-role-{i // policies_per_principal}'
+        statements = copy.deepcopy(INLINE_POLICY_STATEMENTS)
+        for statement in statements:
+            statement['Action'] = [f'service{rng.randrange(50)}:Action{rng.randrange(20)}']
+            statement['Resource'] = f'arn:aws:s3:::bucket-{rng.randrange(count)}/*'
+        policy_map.setdefault(principal_arn, {})[f'policy-{i}'] = statements
+    return policy_map
+
+
+def generate_github_repos(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    :return: `count` repositories in the shape of tests.data.github.repos.GET_REPOS.
+    """
+    rng = random.Random(seed)
+    repos = []
+    for i in range(count):
+        repo = copy.deepcopy(GET_REPOS[i % len(GET_REPOS)])
+        name = f'repo-{i}'
+        repo['name'] = name
+        repo['nameWithOwner'] = f'example_org/{name}'
+        repo['url'] = f'https://github.com/example_org/{name}'
+        repo['sshUrl'] = f'git@github.com:example_org/{name}.git'
+        repo['isPrivate'] = rng.random() < 0.5
+        repos.append(repo)
+    return repos
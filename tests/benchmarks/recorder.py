@@ -0,0 +1,80 @@
+import json
+import platform
+import statistics
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+class BenchmarkRecorder:
+    """
+    Times benchmark functions, collects the results for a JSON report, and compares them against the results of an
+    earlier run.
+    """
+
+    def __init__(self, scale: int, threshold: float, baseline: Optional[Dict[str, Any]] = None):
+        """
+        :param scale: The number of synthetic records that the benchmarks generate.
+        :param threshold: The allowed relative slowdown against the baseline, e.g. 0.2 for 20%.
+        :param baseline: The contents of a JSON report written by an earlier run, if any.
+        """
+        self.scale = scale
+        self.threshold = threshold
+        self.baseline = baseline or {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def measure(self, name: str, func: Callable[[], Any], rounds: int = 3, setup: Optional[Callable] = None) -> Any:
+        """
+        Calls `func` `rounds` times and records the timings under `name`.
+        :param setup: Optional callable run before each round, outside of the timing. E.g. to copy input data that
+        `func` modifies.
+        :return: The return value of the last call to `func`.
+        """
+        timings: List[float] = []
+        result = None
+        for _ in range(rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        self.results[name] = {
+            'scale': self.scale,
+            'rounds': rounds,
+            'min_seconds': min(timings),
+            'median_seconds': statistics.median(timings),
+        }
+        return result
+
+    def get_regression(self, name: str) -> Optional[str]:
+        """
+        :return: A description of the regression if the median time of `name` is more than `threshold` slower than
+        the baseline run at the same scale, else None.
+        """
+        previous = self.baseline.get('results', {}).get(name)
+        current = self.results[name]
+        if not previous or previous['scale'] != current['scale']:
+            return None
+        limit = previous['median_seconds'] * (1 + self.threshold)
+        if current['median_seconds'] > limit:
+            return (
+                f"{name} took {current['median_seconds']:.4f}s at scale {self.scale}, more than {self.threshold:.0%} "
+                f"slower than the baseline of {previous['median_seconds']:.4f}s."
+            )
+        return None
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(
+                {
+                    'python_version': platform.python_version(),
+                    'platform': platform.platform(),
+                    'results': self.results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
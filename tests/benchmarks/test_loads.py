@@ -0,0 +1,64 @@
+import cartography.intel.create_indexes
+from cartography.intel.aws.ec2.instances import cleanup
+from cartography.intel.aws.ec2.instances import load_ec2_instance_data
+from cartography.intel.aws.ec2.instances import transform_ec2_instances
+from cartography.intel.github.repos import load
+from cartography.intel.github.repos import transform
+from cartography.util import run_cleanup_job
+from tests.benchmarks.generators import ACCOUNT_ID
+from tests.benchmarks.generators import generate_ec2_reservations
+from tests.benchmarks.generators import generate_github_repos
+from tests.benchmarks.generators import REGION
+
+# Loads are slow and not repeatable without resetting the graph, so each load is measured once per run.
+ROUNDS = 1
+
+
+def _count(neo4j_session, label):
+    return neo4j_session.run(f"MATCH (n:{label}) RETURN count(n) AS count").single()['count']
+
+
+def test_ec2_instances_load_and_cleanup(neo4j_session, benchmark, benchmark_scale):
+    cartography.intel.create_indexes.run(neo4j_session, None)
+    neo4j_session.run("MERGE (:AWSAccount{id: $account_id})", account_id=ACCOUNT_ID)
+    ec2_data = transform_ec2_instances(generate_ec2_reservations(benchmark_scale), REGION, ACCOUNT_ID)
+
+    benchmark(
+        'load_ec2_instances_initial',
+        lambda: load_ec2_instance_data(neo4j_session, REGION, ACCOUNT_ID, 1, *ec2_data),
+        rounds=ROUNDS,
+    )
+    assert _count(neo4j_session, 'EC2Instance') == benchmark_scale
+
+    # Loading the same data with a new update tag is what every steady-state sync does.
+    benchmark(
+        'load_ec2_instances_steady_state',
+        lambda: load_ec2_instance_data(neo4j_session, REGION, ACCOUNT_ID, 2, *ec2_data),
+        rounds=ROUNDS,
+    )
+
+    benchmark(
+        'cleanup_ec2_instances',
+        lambda: cleanup(neo4j_session, {'UPDATE_TAG': 3, 'AWS_ID': ACCOUNT_ID}),
+        rounds=ROUNDS,
+    )
+    assert _count(neo4j_session, 'EC2Instance') == 0
+
+
+def test_github_repos_load_and_cleanup(neo4j_session, benchmark, benchmark_scale):
+    cartography.intel.create_indexes.run(neo4j_session, None)
+    repo_data = transform(generate_github_repos(benchmark_scale), {}, {})
+
+    benchmark(
+        'load_github_repos_initial',
+        lambda: load(neo4j_session, {'UPDATE_TAG': 1}, repo_data),
+        rounds=ROUNDS,
+    )
+    assert _count(neo4j_session, 'GitHubRepository') == benchmark_scale
+
+    benchmark(
+        'cleanup_github_repos',
+        lambda: run_cleanup_job('github_repos_cleanup.json', neo4j_session, {'UPDATE_TAG': 2}),
+        rounds=ROUNDS,
+    )
+    assert _count(neo4j_session, 'GitHubRepository') == 0
@@ -0,0 +1,30 @@
+from cartography.graph.cleanupbuilder import build_cleanup_queries
+from cartography.graph.querybuilder import build_create_index_queries
+from cartography.graph.querybuilder import build_ingestion_query
+from cartography.intel.create_indexes import get_node_schemas
+
+# Query generation does not depend on the data scale, so every schema is built this many times per round.
+ITERATIONS = 20
+
+
+def test_build_ingestion_queries(benchmark):
+    node_schemas = get_node_schemas()
+
+    def build_all():
+        for _ in range(ITERATIONS):
+            for node_schema in node_schemas:
+                build_ingestion_query(node_schema)
+                build_create_index_queries(node_schema)
+
+    benchmark('build_ingestion_queries', build_all)
+
+
+def test_build_cleanup_queries(benchmark):
+    node_schemas = [node_schema for node_schema in get_node_schemas() if node_schema.sub_resource_relationship]
+
+    def build_all():
+        for _ in range(ITERATIONS):
+            for node_schema in node_schemas:
+                build_cleanup_queries(node_schema)
+
+    benchmark('build_cleanup_queries', build_all)
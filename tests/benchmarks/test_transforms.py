@@ -0,0 +1,50 @@
+import copy
+
+from cartography.intel.aws.ec2.instances import transform_ec2_instances
+from cartography.intel.aws.iam import PolicyType
+from cartography.intel.aws.iam import transform_policy_data
+from cartography.intel.github.repos import transform
+from tests.benchmarks.generators import ACCOUNT_ID
+from tests.benchmarks.generators import generate_ec2_reservations
+from tests.benchmarks.generators import generate_github_repos
+from tests.benchmarks.generators import generate_iam_policy_map
+from tests.benchmarks.generators import REGION
+
+
+def test_transform_ec2_instances(benchmark, benchmark_scale):
+    reservations = generate_ec2_reservations(benchmark_scale)
+
+    ec2_data = benchmark(
+        'transform_ec2_instances',
+        lambda: transform_ec2_instances(reservations, REGION, ACCOUNT_ID),
+    )
+
+    assert len(ec2_data.instance_list) == benchmark_scale
+
+
+def test_transform_iam_policy_data(benchmark, benchmark_scale):
+    policy_map = generate_iam_policy_map(benchmark_scale)
+    # transform_policy_data() modifies its input, so every round gets a fresh copy.
+    inputs = {}
+
+    def setup():
+        inputs['policy_map'] = copy.deepcopy(policy_map)
+
+    benchmark(
+        'transform_iam_policy_data',
+        lambda: transform_policy_data(inputs['policy_map'], PolicyType.inline.value),
+        setup=setup,
+    )
+
+    assert sum(len(policies) for policies in inputs['policy_map'].values()) == benchmark_scale
+
+
+def test_transform_github_repos(benchmark, benchmark_scale):
+    repos = generate_github_repos(benchmark_scale)
+
+    repo_data = benchmark(
+        'transform_github_repos',
+        lambda: transform(repos, {}, {}),
+    )
+
+    assert len(repo_data['repos']) == benchmark_scale
@@ -0,0 +1,83 @@
+import datetime
+
+GET_ACCOUNT_AUTHORIZATION_DETAILS = {
+    "UserDetailList": [
+        {
+            "Path": "/",
+            "UserName": "example-user-0",
+            "UserId": "AIDA00000000000000000",
+            "Arn": "arn:aws:iam::000000000000:user/example-user-0",
+            "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+            "UserPolicyList": [
+                {
+                    "PolicyName": "user-inline",
+                    "PolicyDocument": {
+                        "Version": "2012-10-17",
+                        "Statement": [{"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*"}],
+                    },
+                },
+            ],
+            "GroupList": ["example-group-0"],
+            "AttachedManagedPolicies": [
+                {"PolicyName": "local-policy", "PolicyArn": "arn:aws:iam::000000000000:policy/local-policy"},
+                {"PolicyName": "SecurityAudit", "PolicyArn": "arn:aws:iam::aws:policy/SecurityAudit"},
+            ],
+        },
+        {
+            "Path": "/",
+            "UserName": "example-user-1",
+            "UserId": "AIDA00000000000000001",
+            "Arn": "arn:aws:iam::000000000000:user/example-user-1",
+            "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+            "UserPolicyList": [],
+            "GroupList": ["example-group-0", "example-group-1"],
+            "AttachedManagedPolicies": [],
+        },
+    ],
+    "GroupDetailList": [
+        {
+            "Path": "/",
+            "GroupName": "example-group-0",
+            "GroupId": "AGPA000000000000000000",
+            "Arn": "arn:aws:iam::000000000000:group/example-group-0",
+            "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+            "GroupPolicyList": [],
+            "AttachedManagedPolicies": [],
+        },
+        {
+            "Path": "/",
+            "GroupName": "example-group-1",
+            "GroupId": "AGPA000000000000000001",
+            "Arn": "arn:aws:iam::000000000000:group/example-group-1",
+            "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+            "GroupPolicyList": [],
+            "AttachedManagedPolicies": [],
+        },
+    ],
+    "RoleDetailList": [],
+    "Policies": [
+        {
+            "PolicyName": "local-policy",
+            "Arn": "arn:aws:iam::000000000000:policy/local-policy",
+            "DefaultVersionId": "v2",
+            "PolicyVersionList": [
+                {
+                    "Document": {
+                        "Version": "2012-10-17",
+                        "Statement": [{"Effect": "Allow", "Action": "ec2:*", "Resource": "*"}],
+                    },
+                    "VersionId": "v2",
+                    "IsDefaultVersion": True,
+                },
+                {
+                    "Document": {
+                        "Version": "2012-10-17",
+                        "Statement": [{"Effect": "Allow", "Action": "ec2:Describe*", "Resource": "*"}],
+                    },
+                    "VersionId": "v1",
+                    "IsDefaultVersion": False,
+                },
+            ],
+        },
+    ],
+}
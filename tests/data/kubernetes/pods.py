@@ -47,3 +47,58 @@ GET_PODS_DATA = [
         ],
     },
 ]
+
+# Raw pod objects as returned by the Kubernetes API when the client is called with `_preload_content=False`.
+LIST_PODS_RAW_RESPONSE_PAGES = [
+    {
+        "kind": "PodList",
+        "apiVersion": "v1",
+        "metadata": {"resourceVersion": "1", "continue": "page-2-token"},
+        "items": [
+            {
+                "metadata": {
+                    "name": "my-pod",
+                    "namespace": "my-namespace",
+                    "uid": "raw-pod-uid-1",
+                    "creationTimestamp": "2021-10-07T04:41:06Z",
+                    "labels": {"key1": "val1"},
+                },
+                "spec": {
+                    "nodeName": "my-node",
+                    "containers": [{"name": "my-pod-container", "image": "my-image"}],
+                },
+                "status": {
+                    "phase": "Running",
+                    "containerStatuses": [
+                        {
+                            "name": "my-pod-container",
+                            "imageID": "docker.io/my-image@sha256:abc123",
+                            "ready": True,
+                            "started": True,
+                            "state": {"running": {"startedAt": "2021-10-07T04:41:10Z"}},
+                        },
+                    ],
+                },
+            },
+        ],
+    },
+    {
+        "kind": "PodList",
+        "apiVersion": "v1",
+        "metadata": {"resourceVersion": "1"},
+        "items": [
+            {
+                "metadata": {
+                    "name": "my-pending-pod",
+                    "namespace": "my-namespace",
+                    "uid": "raw-pod-uid-2",
+                    "creationTimestamp": "2021-10-07T04:41:06Z",
+                },
+                "spec": {
+                    "containers": [{"name": "my-pending-container", "image": "my-image"}],
+                },
+                "status": {"phase": "Pending"},
+            },
+        ],
+    },
+]
@@ -0,0 +1,63 @@
+from cartography.client.core.indexes import get_index_registry
+from cartography.client.core.tx import load_graph_data
+from cartography.graph.cleanupbuilder import build_cleanup_index_queries
+from cartography.graph.cleanupbuilder import build_indexed_cleanup_queries
+from cartography.graph.job import GraphJob
+from cartography.graph.querybuilder import build_ingestion_query
+from tests.data.graph.querybuilder.sample_models.simple_node import SimpleNodeWithSubResourceSchema
+from tests.integration.util import check_nodes
+
+NUM_OTHER_ACCOUNT_NODES = 50
+
+
+def _load_simple_nodes(neo4j_session, sub_resource_id, node_ids, update_tag):
+    neo4j_session.run("MERGE (:SubResource{id: $sub_resource_id})", sub_resource_id=sub_resource_id)
+    load_graph_data(
+        neo4j_session,
+        build_ingestion_query(SimpleNodeWithSubResourceSchema(), indexed_cleanup=True),
+        [{'Id': node_id, 'property1': 'a', 'property2': 'b'} for node_id in node_ids],
+        lastupdated=update_tag,
+        sub_resource_id=sub_resource_id,
+    )
+
+
+def _max_rows(plan):
+    return max([plan['rows']] + [_max_rows(child) for child in plan.get('children', [])])
+
+
+def test_indexed_cleanup_only_reads_stale_data_of_synced_sub_resource(neo4j_session):
+    """
+    Test that in a multi-account graph, the indexed cleanup of one account does not read the stale nodes and
+    relationships of another account that has not been synced yet in this run.
+    """
+    # Arrange: both accounts were synced with update tag 1; account-a is now synced with update tag 2 and no longer
+    # has node a-2, while account-b is not synced yet, so all of its nodes are older than update tag 2 too.
+    _load_simple_nodes(neo4j_session, 'account-a', ['a-1', 'a-2'], 1)
+    _load_simple_nodes(neo4j_session, 'account-b', [f'b-{i}' for i in range(NUM_OTHER_ACCOUNT_NODES)], 1)
+    _load_simple_nodes(neo4j_session, 'account-a', ['a-1'], 2)
+    get_index_registry().reset()
+    get_index_registry().ensure(neo4j_session, build_cleanup_index_queries(SimpleNodeWithSubResourceSchema()))
+    neo4j_session.run("CALL db.awaitIndexes(300)")
+
+    # Act: profile the node and sub resource relationship cleanup queries of account-a, without committing them
+    parameters = {'UPDATE_TAG': 2, 'sub_resource_id': 'account-a', 'LIMIT_SIZE': 100}
+    for query in build_indexed_cleanup_queries(SimpleNodeWithSubResourceSchema()):
+        tx = neo4j_session.begin_transaction()
+        try:
+            profile = tx.run(f'PROFILE {query}', parameters).consume().profile
+        finally:
+            tx.rollback()
+
+        # Assert: no operator handles more than the one stale node or relationship of account-a
+        assert _max_rows(profile) <= 1
+
+    # Act: run the cleanup job of account-a
+    GraphJob.from_node_schema(
+        SimpleNodeWithSubResourceSchema(),
+        {'UPDATE_TAG': 2, 'sub_resource_id': 'account-a'},
+        indexed=True,
+    ).run(neo4j_session)
+
+    # Assert: only the stale node of account-a is gone
+    expected = {('a-1',)} | {(f'b-{i}',) for i in range(NUM_OTHER_ACCOUNT_NODES)}
+    assert check_nodes(neo4j_session, 'SimpleNode', ['id']) == expected
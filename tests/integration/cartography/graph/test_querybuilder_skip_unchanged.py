@@ -0,0 +1,42 @@
+import cartography.client.core.tx
+from cartography.client.core.tx import load
+from tests.data.graph.querybuilder.sample_data.helloworld_relationships import MERGE_SUB_RESOURCE_QUERY
+from tests.data.graph.querybuilder.sample_models.simple_node import SimpleNodeWithSubResourceSchema
+
+
+def _load_simple_node(neo4j_session, skip_unchanged, property1, lastupdated):
+    cartography.client.core.tx.set_skip_unchanged_writes(skip_unchanged)
+    try:
+        load(
+            neo4j_session,
+            SimpleNodeWithSubResourceSchema(),
+            [{'Id': 'simple-node-id', 'property1': property1, 'property2': 'b'}],
+            lastupdated=lastupdated,
+            sub_resource_id='sub-resource-id',
+        )
+    finally:
+        cartography.client.core.tx.set_skip_unchanged_writes(False)
+
+
+def test_load_skip_unchanged_after_unflagged_load(neo4j_session):
+    """
+    Test that a skip_unchanged load does not trust a hash written before an unflagged load changed the node: the
+    unflagged load must clear the stale hash so that the node is rewritten.
+    """
+    neo4j_session.run(MERGE_SUB_RESOURCE_QUERY)
+
+    # Flag on: the node and its hash are written.
+    _load_simple_node(neo4j_session, True, 'a', 1)
+    # Flag off: the node changes and the hash is cleared.
+    _load_simple_node(neo4j_session, False, 'changed', 2)
+    result = neo4j_session.run("MATCH (n:SimpleNode{id: 'simple-node-id'}) RETURN n._content_hash AS hash")
+    assert result.single()['hash'] is None
+
+    # Flag on again with the original data: its hash equals the first one, but the node must still be rewritten.
+    _load_simple_node(neo4j_session, True, 'a', 3)
+    result = neo4j_session.run(
+        "MATCH (n:SimpleNode{id: 'simple-node-id'}) RETURN n.property1 AS property1, n.lastupdated AS lastupdated",
+    )
+    record = result.single()
+    assert record['property1'] == 'a'
+    assert record['lastupdated'] == 3
@@ -27,7 +27,7 @@ def test_sync_role_inline_policies(
     neo4j_session.run("MERGE (a:AWSAccount{id:$AccountId})", AccountId=AWS_ACCOUNT_ID)
 
     # Act
-    sync_roles(neo4j_session, boto3_session, AWS_ACCOUNT_ID, AWS_UPDATE_TAG, PARAMS)
+    sync_roles(neo4j_session, boto3_session, AWS_ACCOUNT_ID, AWS_UPDATE_TAG, PARAMS, {})
 
     # Assert that we create policies with expected values for ids.
     result = neo4j_session.run(
@@ -70,7 +70,7 @@ def test_sync_role_managed_policies(
     neo4j_session.run("MERGE (a:AWSAccount{id:$AccountId})", AccountId=AWS_ACCOUNT_ID)
 
     # Act
-    sync_roles(neo4j_session, boto3_session, AWS_ACCOUNT_ID, AWS_UPDATE_TAG, PARAMS)
+    sync_roles(neo4j_session, boto3_session, AWS_ACCOUNT_ID, AWS_UPDATE_TAG, PARAMS, {})
 
     # Assert that we create policies with expected values for ids.
     result = neo4j_session.run(
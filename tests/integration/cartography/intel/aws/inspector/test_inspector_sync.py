@@ -13,7 +13,7 @@ TEST_ACC_ID_1 = '123456789011'
 TEST_ACC_ID_2 = '123456789012'
 
 
-@patch.object(cartography.intel.aws.inspector, 'get_inspector_findings', return_value=LIST_FINDINGS_NETWORK)
+@patch.object(cartography.intel.aws.inspector, 'get_inspector_findings', return_value=[LIST_FINDINGS_NETWORK])
 def test_sync_inspector_network_findings(mock_get, neo4j_session):
     # Arrange
     boto3_session = MagicMock()
@@ -68,7 +68,7 @@ def test_sync_inspector_network_findings(mock_get, neo4j_session):
     }
 
 
-@patch.object(cartography.intel.aws.inspector, 'get_inspector_findings', return_value=LIST_FINDINGS_EC2_PACKAGE)
+@patch.object(cartography.intel.aws.inspector, 'get_inspector_findings', return_value=[LIST_FINDINGS_EC2_PACKAGE])
 def test_sync_inspector_ec2_package_findings(mock_get, neo4j_session):
     # Arrange
     boto3_session = MagicMock()
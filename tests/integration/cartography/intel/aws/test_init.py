@@ -101,6 +101,7 @@ def test_start_aws_ingestion(mock_perform_analysis, mock_sync_multiple, mock_org
         {
             "UPDATE_TAG": test_config.update_tag,
             "permission_relationships_file": test_config.permission_relationships_file,
+            "aws_iam_authorization_details": test_config.aws_iam_authorization_details,
         },
     )
 
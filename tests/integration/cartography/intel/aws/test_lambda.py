@@ -1,5 +1,7 @@
 import cartography.intel.aws.lambda_function
 import tests.data.aws.lambda_function
+from cartography.util import run_analysis_job
+from tests.integration.util import check_rels
 
 TEST_ACCOUNT_ID = '000000000000'
 TEST_REGION = 'us-west-2'
@@ -303,3 +305,42 @@ def test_load_lambda_layers_relationships(neo4j_session):
     }
 
     assert actual == expected_nodes
+
+
+def test_scoped_lambda_ecr_links_images_across_accounts(neo4j_session):
+    """
+    A lambda function in one account gets linked to an ECR image in another account whichever of the two accounts is
+    synced last.
+    """
+    neo4j_session.run(
+        """
+        MERGE (a:AWSAccount{id: 'lambda-account'})
+        MERGE (a)-[:RESOURCE]->(:AWSLambda{id: 'cross-account-lambda', codesha256: 'abc'})
+        MERGE (b:AWSAccount{id: 'image-account'})
+        MERGE (b)-[:RESOURCE]->(:ECRRepository{id: 'repo'})-[:REPO_IMAGE]->(:ECRRepositoryImage{id: 'repo:latest'})
+            -[:IMAGE]->(:ECRImage{id: 'sha256:abc', digest: 'sha256:abc'})
+        """,
+    )
+
+    def sync_account(account_id, update_tag):
+        run_analysis_job(
+            'aws_lambda_ecr.json',
+            neo4j_session,
+            {'UPDATE_TAG': update_tag, 'AWS_ID': account_id},
+            package='cartography.data.jobs.scoped_analysis',
+        )
+
+    def has_link():
+        return check_rels(neo4j_session, 'AWSLambda', 'id', 'ECRImage', 'id', 'HAS') == {
+            ('cross-account-lambda', 'sha256:abc'),
+        }
+
+    # The image account is synced last
+    sync_account('lambda-account', 1)
+    sync_account('image-account', 1)
+    assert has_link()
+
+    # The lambda account is synced last; the link of the previous sync is refreshed, not cleaned up
+    sync_account('image-account', 2)
+    sync_account('lambda-account', 2)
+    assert has_link()
@@ -2,6 +2,7 @@ import cartography.intel.aws.rds
 from tests.data.aws.rds import DESCRIBE_DBCLUSTERS_RESPONSE
 from tests.data.aws.rds import DESCRIBE_DBINSTANCES_RESPONSE
 from tests.data.aws.rds import DESCRIBE_DBSNAPSHOTS_RESPONSE
+from tests.integration.util import check_rels
 TEST_UPDATE_TAG = 123456789
 
 
@@ -134,3 +135,43 @@ def test_load_rds_snapshots_basic(neo4j_session):
         ),
     }
     assert actual_results == expected_results
+
+
+def test_load_rds_instances_subnet_groups_and_security_groups(neo4j_session):
+    """Test that RDS instances are linked to their DB subnet groups, EC2 subnets and EC2 security groups"""
+    neo4j_session.run('MERGE (:AWSAccount{id: $aws_account_id})', aws_account_id='1234')
+    # EC2 subnets as written by the ec2:subnet sync, which keys them on subnetid only
+    subnet_ids = ['subnet-abcd', 'subnet-3421', 'subnet-4567', 'subnet-1234']
+    neo4j_session.run(
+        'UNWIND $subnet_ids AS subnet_id MERGE (:EC2Subnet{subnetid: subnet_id})',
+        subnet_ids=subnet_ids,
+    )
+    cartography.intel.aws.rds.load_rds_instances(
+        neo4j_session,
+        DESCRIBE_DBINSTANCES_RESPONSE['DBInstances'],
+        'us-east-1',
+        '1234',
+        TEST_UPDATE_TAG,
+    )
+    instance_arn = 'arn:aws:rds:us-east-1:some-arn:db:some-prod-db-iad-0'
+    sng_arn = 'arn:aws:rds:us-east-1:1234:subgrp:subnet-group-1'
+
+    assert check_rels(
+        neo4j_session, 'RDSInstance', 'id', 'EC2SecurityGroup', 'id', 'MEMBER_OF_EC2_SECURITY_GROUP',
+    ) == {
+        (instance_arn, 'sg-some-othersg'),
+        (instance_arn, 'sg-some-sg'),
+        (instance_arn, 'sg-secgroup'),
+    }
+    assert check_rels(
+        neo4j_session, 'RDSInstance', 'id', 'DBSubnetGroup', 'id', 'MEMBER_OF_DB_SUBNET_GROUP',
+    ) == {(instance_arn, sng_arn)}
+    assert check_rels(neo4j_session, 'DBSubnetGroup', 'id', 'EC2Subnet', 'subnetid', 'RESOURCE') == {
+        (sng_arn, 'subnet-abcd'),
+        (sng_arn, 'subnet-3421'),
+        (sng_arn, 'subnet-4567'),
+        (sng_arn, 'subnet-1234'),
+    }
+    # The existing subnets are linked, not duplicated
+    assert neo4j_session.run('MATCH (s:EC2Subnet) RETURN count(s)').single()[0] == len(subnet_ids)
+    assert check_rels(neo4j_session, 'AWSAccount', 'id', 'DBSubnetGroup', 'id', 'RESOURCE') == {('1234', sng_arn)}
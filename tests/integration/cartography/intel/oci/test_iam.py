@@ -2,6 +2,7 @@
 import tests.data.oci.iam
 from cartography.intel.oci import iam
 from cartography.intel.oci import utils
+from tests.integration.util import check_rels
 
 
 TEST_TENANCY_ID = "ocid1.user.oc1..nqilyrb1l5t6gnmlcjgeim8q47vccnklev8k2ud9skn78eapu116oyv9wcr0"
@@ -54,14 +55,24 @@ def test_load_compartments(neo4j_session):
 
 
 def test_load_group_memberships(neo4j_session):
-    group_memberships = tests.data.oci.iam.LIST_GROUP_MEMBERSHIPS
+    neo4j_session.run('MERGE (:OCITenancy{ocid: $ocid})', ocid=TEST_TENANCY_ID)
+    iam.load_users(neo4j_session, tests.data.oci.iam.LIST_USERS['Users'], TEST_TENANCY_ID, TEST_UPDATE_TAG)
+    iam.load_groups(neo4j_session, tests.data.oci.iam.LIST_GROUPS['Groups'], TEST_TENANCY_ID, TEST_UPDATE_TAG)
     groups = list(
         utils.get_groups_in_tenancy(neo4j_session, TEST_TENANCY_ID),
     )
-    data = {group["ocid"]: group_memberships for group in groups}
-    iam.load_compartments(
+    data = {group["ocid"]: tests.data.oci.iam.LIST_GROUP_MEMBERSHIPS for group in groups}
+    iam.load_group_memberships(
         neo4j_session,
         data,
         TEST_TENANCY_ID,
         TEST_UPDATE_TAG,
     )
+
+    assert check_rels(neo4j_session, 'OCIUser', 'ocid', 'OCIGroup', 'ocid', 'MEMBER_OCID_GROUP') == {
+        (membership['user-id'], membership['group-id'])
+        for membership in tests.data.oci.iam.LIST_GROUP_MEMBERSHIPS['GroupMemberships']
+    }
+    assert check_rels(neo4j_session, 'OCITenancy', 'ocid', 'OCIUser', 'ocid', 'RESOURCE') == {
+        (TEST_TENANCY_ID, user['id']) for user in tests.data.oci.iam.LIST_USERS['Users']
+    }
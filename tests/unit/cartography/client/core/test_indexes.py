@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock
+
+from cartography.client.core.indexes import IndexRegistry
+from cartography.client.core.indexes import parse_create_index_query
+from cartography.client.core.tx import ensure_indexes
+from cartography.graph.querybuilder import build_create_index_queries
+from tests.data.graph.querybuilder.sample_models.interesting_asset import InterestingAssetSchema
+
+
+def _mock_session(existing=()):
+    session = MagicMock()
+    session.run.return_value = [
+        {'type': 'RANGE', 'entityType': 'NODE', 'labelsOrTypes': [label], 'properties': [prop]}
+        for label, prop in existing
+    ]
+    return session
+
+
+def test_parse_create_index_query():
+    assert parse_create_index_query(
+        'CREATE INDEX IF NOT EXISTS FOR (n:AWSAccount) ON (n.id);',
+    ) == ('AWSAccount', 'id')
+    assert parse_create_index_query(
+        'CREATE INDEX IF NOT EXISTS FOR ()-[r:RESOURCE]-() ON (r.lastupdated);',
+    ) == ('[RESOURCE]', 'lastupdated')
+    assert parse_create_index_query(
+        'CREATE TEXT INDEX IF NOT EXISTS FOR (n:AWSRole) ON (n._lc_arn);',
+    ) == ('TEXT:AWSRole', '_lc_arn')
+    assert parse_create_index_query(
+        'CREATE INDEX IF NOT EXISTS FOR (n:EC2Instance) ON (n._cleanup_scope, n.lastupdated);',
+    ) == ('EC2Instance', '_cleanup_scope,lastupdated')
+    assert parse_create_index_query(
+        'CREATE INDEX IF NOT EXISTS FOR ()-[r:RESOURCE]-() ON (r._cleanup_scope, r.lastupdated);',
+    ) == ('[RESOURCE]', '_cleanup_scope,lastupdated')
+    assert parse_create_index_query('CREATE INDEX IF NOT EXISTS FOR (n:A|B) ON (n.b);') is None
+
+
+def test_registry_skips_existing_and_already_ensured_indexes():
+    registry = IndexRegistry()
+    session = _mock_session(existing=[('InterestingAsset', 'id')])
+    queries = build_create_index_queries(InterestingAssetSchema())
+
+    created = registry.ensure(session, queries)
+
+    # Only SHOW INDEXES is run directly; the missing indexes are created together in one transaction
+    session.run.assert_called_once()
+    session.write_transaction.assert_called_once()
+    assert created == len(set(queries)) - 1
+    assert registry.skipped == len(queries) - created
+
+    # A second call within the same process does not touch the database at all
+    assert registry.ensure(session, queries) == 0
+    session.run.assert_called_once()
+    session.write_transaction.assert_called_once()
+    assert registry.created == created
+    assert registry.skipped == 2 * len(queries) - created
+
+
+def test_ensure_indexes_uses_process_registry():
+    session = _mock_session()
+    ensure_indexes(session, InterestingAssetSchema())
+    ensure_indexes(session, InterestingAssetSchema())
+
+    assert session.write_transaction.call_count <= 1
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+import neo4j
+
+from cartography.client.core.session import get_routing_uri
+from cartography.client.core.session import read_session
+from cartography.client.core.session import SessionFactory
+from cartography.client.core.session import set_session_factory
+
+
+def test_get_routing_uri():
+    assert get_routing_uri('bolt://localhost:7687') == 'neo4j://localhost:7687'
+    assert get_routing_uri('bolt+s://db.example.com') == 'neo4j+s://db.example.com'
+    assert get_routing_uri('neo4j+ssc://db.example.com') == 'neo4j+ssc://db.example.com'
+    assert get_routing_uri('localhost:7687') == 'localhost:7687'
+
+
+def test_session_factory_access_modes():
+    driver = MagicMock()
+    session_factory = SessionFactory(driver, database='graph', fetch_size=5000)
+    main_session = MagicMock()
+    main_session.last_bookmark.return_value = 'FB:bookmark'
+
+    session_factory()
+    driver.session.assert_called_with(database='graph', fetch_size=5000, default_access_mode=neo4j.WRITE_ACCESS)
+
+    session_factory.read_session(after=main_session)
+    driver.session.assert_called_with(
+        database='graph', fetch_size=5000, default_access_mode=neo4j.READ_ACCESS, bookmarks=['FB:bookmark'],
+    )
+
+    SessionFactory(driver).read_session()
+    driver.session.assert_called_with(database=None, default_access_mode=neo4j.READ_ACCESS, bookmarks=None)
+
+
+def test_read_session():
+    main_session = MagicMock()
+    with read_session(main_session) as session:
+        # Without a session factory, reads use the given session.
+        assert session is main_session
+
+    driver = MagicMock()
+    set_session_factory(SessionFactory(driver))
+    try:
+        with read_session(main_session) as session:
+            assert session is driver.session.return_value.__enter__.return_value
+    finally:
+        set_session_factory(None)
@@ -0,0 +1,93 @@
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from cartography.client.core.session import SessionFactory
+from cartography.client.core.snapshot import ExtractModeReadError
+from cartography.client.core.snapshot import read_manifest
+from cartography.client.core.snapshot import start_extract
+from cartography.client.core.snapshot import stop_extract
+from cartography.client.core.tx import load
+from cartography.client.core.tx import read_list_of_values_tx
+from cartography.graph.job import GraphJob
+from cartography.intel.snapshot import load_from_snapshot
+from tests.data.graph.querybuilder.sample_models.interesting_asset import InterestingAssetSchema
+
+
+TEST_UPDATE_TAG = 123456789
+TEST_RECORDS = [
+    {'Id': 'asset-1', 'property1': 'a', 'property2': datetime.datetime(2024, 1, 2, 3, 4, 5)},
+    {'Id': 'asset-2', 'property1': 'b', 'property2': None},
+]
+
+
+def _legacy_write_tx(tx, name):
+    tx.run("MERGE (n:LegacyNode{id: $name})", name=name)
+
+
+def test_extract_then_load_from_snapshot(tmp_path):
+    # Arrange: extract a load, a cleanup job and two hand-written queries, without a database
+    start_extract(str(tmp_path))
+    try:
+        extract_session = SessionFactory(None)()
+        load(
+            extract_session,
+            InterestingAssetSchema(),
+            TEST_RECORDS,
+            lastupdated=TEST_UPDATE_TAG,
+            sub_resource_id='sub',
+        )
+        GraphJob.from_node_schema(
+            InterestingAssetSchema(),
+            {'UPDATE_TAG': TEST_UPDATE_TAG, 'sub_resource_id': 'sub'},
+        ).run(extract_session)
+        extract_session.run("MERGE (n:LegacyNode{id: $id})", id='legacy-1').consume()
+        # Sessions from the session factory, such as those of concurrent intel modules, record as well
+        with SessionFactory(None)() as new_session:
+            new_session.write_transaction(_legacy_write_tx, 'legacy-2')
+    finally:
+        stop_extract()
+
+    # Assert: every write is recorded once, in order
+    entries = list(read_manifest(str(tmp_path)))
+    assert [entry['type'] for entry in entries] == ['load', 'job', 'query', 'query']
+    assert entries[0]['file'].startswith('InterestingAsset/')
+    assert entries[0]['kwargs'] == {'lastupdated': TEST_UPDATE_TAG, 'sub_resource_id': 'sub'}
+    assert entries[2] == {
+        'type': 'query', 'query': "MERGE (n:LegacyNode{id: $id})", 'parameters': {'id': 'legacy-1'},
+    }
+    assert entries[3] == {
+        'type': 'query', 'query': "MERGE (n:LegacyNode{id: $name})", 'parameters': {'name': 'legacy-2'},
+    }
+
+    # Act: replay the snapshot
+    replay_session = MagicMock()
+    # Make iterative cleanup statements stop after one pass
+    replay_session.write_transaction.return_value.consume.return_value.counters.contains_updates = False
+    load_from_snapshot(replay_session, str(tmp_path))
+
+    # Assert: records are loaded with their original types and kwargs, followed by the cleanup statements
+    load_call = next(
+        call for call in replay_session.write_transaction.call_args_list if 'DictList' in call.kwargs
+    )
+    assert load_call.kwargs['DictList'] == TEST_RECORDS
+    assert load_call.kwargs['lastupdated'] == TEST_UPDATE_TAG
+    assert load_call.kwargs['sub_resource_id'] == 'sub'
+    # Iterative cleanup statements run through write_transaction as well
+    assert replay_session.write_transaction.call_count > 1
+    # Hand-written queries are replayed with their parameters
+    replay_session.run.assert_any_call("MERGE (n:LegacyNode{id: $id})", {'id': 'legacy-1'})
+    replay_session.run.assert_any_call("MERGE (n:LegacyNode{id: $name})", {'name': 'legacy-2'})
+
+
+def test_extract_mode_graph_reads_raise(tmp_path):
+    start_extract(str(tmp_path))
+    try:
+        extract_session = SessionFactory(None)()
+        with pytest.raises(ExtractModeReadError):
+            extract_session.run("MATCH (n:EC2Instance) RETURN n.imageid AS image").data()
+        with pytest.raises(ExtractModeReadError):
+            extract_session.read_transaction(read_list_of_values_tx, "MATCH (n:EC2Instance) RETURN n.imageid")
+    finally:
+        stop_extract()
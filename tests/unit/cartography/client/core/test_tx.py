@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+from unittest.mock import MagicMock
+
+from neo4j import SummaryCounters
+
+from cartography.client.core.tx import add_content_hashes
+from cartography.client.core.tx import get_sub_resource_id
+from cartography.client.core.tx import load_graph_data
+from cartography.metrics import metrics_scope
+from cartography.metrics import MetricsCollector
+from cartography.metrics import set_metrics_collector
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import ExtraNodeLabels
+from tests.data.graph.querybuilder.sample_models.interesting_asset import InterestingAssetSchema
+from tests.data.graph.querybuilder.sample_models.simple_node import SimpleNodeProperties
+from tests.data.graph.querybuilder.sample_models.simple_node import SimpleNodeSchema
+
+
+def test_add_content_hashes_is_stable():
+    data = [{'Id': 'a', 'property1': 1, 'property2': 'x'}]
+    reordered = [{'property2': 'x', 'property1': 1, 'Id': 'a'}]
+
+    first = add_content_hashes(SimpleNodeSchema(), data, lastupdated=1)
+    second = add_content_hashes(SimpleNodeSchema(), reordered, lastupdated=2)
+
+    # The hash does not depend on key order or on lastupdated, and the input dicts are not modified.
+    assert first[0]['_content_hash'] == second[0]['_content_hash']
+    assert '_content_hash' not in data[0]
+    assert first[0]['property1'] == 1
+
+
+def test_add_content_hashes_changes_with_properties():
+    data = [
+        {'Id': 'a', 'property1': 1, 'property2': 'x'},
+        {'Id': 'a', 'property1': 2, 'property2': 'x'},
+        {'Id': 'a', 'property1': 1, 'property2': 'x', 'unrelated': 'y'},
+    ]
+
+    result = add_content_hashes(SimpleNodeSchema(), data, lastupdated=1)
+
+    assert result[0]['_content_hash'] != result[1]['_content_hash']
+    # Fields that are not node properties do not affect the hash.
+    assert result[0]['_content_hash'] == result[2]['_content_hash']
+
+
+@dataclass(frozen=True)
+class SimpleNodeWithExtraLabelSchema(SimpleNodeSchema):
+    extra_node_labels: ExtraNodeLabels = ExtraNodeLabels(['AnotherNodeLabel'])
+
+
+@dataclass(frozen=True)
+class SimpleNodeWithProperty3Properties(SimpleNodeProperties):
+    property3: PropertyRef = PropertyRef('property3')
+
+
+@dataclass(frozen=True)
+class SimpleNodeWithProperty3Schema(SimpleNodeSchema):
+    properties: SimpleNodeWithProperty3Properties = SimpleNodeWithProperty3Properties()
+
+
+def test_add_content_hashes_changes_with_schema():
+    # The record is the same, but each schema writes it differently, so each must get its own hash.
+    data = [{'Id': 'a', 'property1': 1, 'property2': 'x'}]
+
+    hashes = {
+        add_content_hashes(schema, data, lastupdated=1)[0]['_content_hash']
+        for schema in [SimpleNodeSchema(), SimpleNodeWithExtraLabelSchema(), SimpleNodeWithProperty3Schema()]
+    }
+
+    assert len(hashes) == 3
+
+
+def test_get_sub_resource_id():
+    assert get_sub_resource_id(InterestingAssetSchema(), sub_resource_id='sub-1', lastupdated=1) == 'SubResource:sub-1'
+    assert get_sub_resource_id(SimpleNodeSchema(), lastupdated=1) is None
+
+
+def test_load_graph_data_records_metrics():
+    neo4j_session = MagicMock()
+    neo4j_session.write_transaction.return_value.counters = SummaryCounters({'nodes-created': 3, 'properties-set': 9})
+    collector = MetricsCollector()
+    set_metrics_collector(collector)
+    try:
+        with metrics_scope(stage='aws', schema='SimpleNode'):
+            load_graph_data(neo4j_session, 'UNWIND $DictList AS item RETURN item', [{'Id': i} for i in range(3)])
+    finally:
+        set_metrics_collector(None)
+
+    values = {(m['name'], m['labels']['schema']): m['value'] for m in collector.get_metrics()}
+    assert values == {
+        ('rows_loaded', 'SimpleNode'): 3,
+        ('transactions', 'SimpleNode'): 1,
+        ('nodes_created', 'SimpleNode'): 3,
+        ('properties_set', 'SimpleNode'): 9,
+    }
@@ -39,3 +39,15 @@ def test_scoped_analysis_jobs_are_valid_json():
             json.loads(blob)
         except Exception as e:
             pytest.fail(f"json.loads failed for scoped analysis job '{job_name}' with exception: {e}")
+
+
+def test_analysis_job_labels_are_lists_of_str():
+    for package in ['cartography.data.jobs.analysis', 'cartography.data.jobs.scoped_analysis']:
+        for job_name in contents(package):
+            if not job_name.endswith('.json'):
+                continue
+            blob = json.loads(read_text(package, job_name))
+            for field in ['reads', 'writes']:
+                if field in blob:
+                    assert isinstance(blob[field], list), f"'{field}' in job '{job_name}' must be a list"
+                    assert all(isinstance(label, str) for label in blob[field]), job_name
@@ -1,4 +1,9 @@
+import json
+from unittest.mock import MagicMock
+
+from cartography.client.core.indexes import get_index_registry
 from cartography.graph.job import GraphJob
+from tests.data.graph.querybuilder.sample_models.interesting_asset import InterestingAssetSchema
 from tests.data.jobs.sample import SAMPLE_CLEANUP_JOB
 
 
@@ -10,3 +15,52 @@ def test_graphjob_from_json():
     assert job.name == "cleanup stale resources"
     assert len(job.statements) == 3
     assert job.short_name is None
+    assert job.reads is None
+    assert job.writes is None
+
+
+def test_graphjob_labels_from_json():
+    blob = '{"name": "test", "reads": ["AWSAccount"], "writes": ["EC2Instance"], "statements": []}'
+
+    job: GraphJob = GraphJob.from_json(blob)
+
+    assert job.reads == {"AWSAccount"}
+    assert job.writes == {"EC2Instance"}
+    # The labels survive a round trip, e.g. through a snapshot.
+    assert job.as_dict()["reads"] == ["AWSAccount"]
+    assert job.as_dict()["writes"] == ["EC2Instance"]
+
+
+def test_graphjob_from_node_schema_indexed():
+    params = {'UPDATE_TAG': 1, 'sub_resource_id': 'sub'}
+    default_job = GraphJob.from_node_schema(InterestingAssetSchema(), params)
+    indexed_job = GraphJob.from_node_schema(InterestingAssetSchema(), params, indexed=True)
+
+    assert default_job.indexes is None
+    assert len(indexed_job.statements) == len(default_job.statements)
+    assert 'USING INDEX n:InterestingAsset(_cleanup_scope, lastupdated)' in indexed_job.statements[0].query
+    # The indexes survive a round trip, e.g. through a snapshot.
+    assert GraphJob.from_json(json.dumps(indexed_job.as_dict())).indexes == indexed_job.indexes
+
+
+def test_graphjob_ensures_indexes_before_statements():
+    job = GraphJob.from_node_schema(InterestingAssetSchema(), {'UPDATE_TAG': 1, 'sub_resource_id': 'sub'}, indexed=True)
+    session = MagicMock()
+    session.run.return_value = []
+    # Each iterative cleanup statement stops after its first pass
+    session.write_transaction.return_value.consume.return_value.counters.contains_updates = False
+    get_index_registry().reset()
+    try:
+        job.run(session)
+        # SHOW INDEXES, then waiting for the newly created indexes
+        assert session.run.call_count == 2
+        assert 'db.awaitIndexes' in session.run.call_args.args[0]
+        indexes_created = session.write_transaction.call_args_list[0].args[1]
+        assert indexes_created == job.indexes
+
+        # Indexes that are already known are neither created nor awaited again
+        session.reset_mock()
+        job.run(session)
+        assert session.run.call_count == 0
+    finally:
+        get_index_registry().reset()
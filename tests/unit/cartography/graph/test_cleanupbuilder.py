@@ -4,8 +4,12 @@ import pytest
 
 from cartography.graph.cleanupbuilder import _build_cleanup_node_and_rel_queries
 from cartography.graph.cleanupbuilder import _build_cleanup_rel_query_no_sub_resource
+from cartography.graph.cleanupbuilder import build_cleanup_index_queries
 from cartography.graph.cleanupbuilder import build_cleanup_queries
+from cartography.graph.cleanupbuilder import build_cleanup_scope_backfill_queries
+from cartography.graph.cleanupbuilder import build_indexed_cleanup_queries
 from cartography.graph.job import get_parameters
+from cartography.models.aws.emr import EMRClusterSchema
 from cartography.models.aws.emr import EMRClusterToAWSAccount
 from cartography.models.github.users import GitHubOrganizationUserSchema
 from tests.data.graph.querybuilder.sample_models.asset_with_non_kwargs_tgm import FakeEC2InstanceSchema
@@ -168,3 +172,112 @@ def test_build_cleanup_rel_query_no_sub_resource_raises_on_sub_resource():
 
     with pytest.raises(ValueError, match="Expected InterestingAsset to not exist"):
         _build_cleanup_rel_query_no_sub_resource(node_schema, rel_schema)
+
+
+def test_build_indexed_cleanup_queries():
+    """
+    Test that the indexed cleanup queries seek on the cleanup scope and `lastupdated` before checking the sub resource,
+    in the same order as build_cleanup_queries().
+    """
+    actual_queries: list[str] = build_indexed_cleanup_queries(InterestingAssetSchema())
+    expected_queries = [
+        """
+        MATCH (n:InterestingAsset)
+        USING INDEX n:InterestingAsset(_cleanup_scope, lastupdated)
+        WHERE n._cleanup_scope = 'InterestingAsset/' + toString($sub_resource_id) AND n.lastupdated < $UPDATE_TAG
+        MATCH (n)<-[s:RELATIONSHIP_LABEL]-(:SubResource{id: $sub_resource_id})
+        WITH n LIMIT $LIMIT_SIZE
+        DETACH DELETE n;
+        """,
+        """
+        MATCH (n:InterestingAsset)<-[s:RELATIONSHIP_LABEL]-(:SubResource{id: $sub_resource_id})
+        USING INDEX s:RELATIONSHIP_LABEL(_cleanup_scope, lastupdated)
+        WHERE s._cleanup_scope = 'InterestingAsset/' + toString($sub_resource_id) AND s.lastupdated < $UPDATE_TAG
+        WITH s LIMIT $LIMIT_SIZE
+        DELETE s;
+        """,
+        """
+        MATCH (n:InterestingAsset)-[r:ASSOCIATED_WITH]->(:HelloAsset)
+        USING INDEX r:ASSOCIATED_WITH(_cleanup_scope, lastupdated)
+        WHERE r._cleanup_scope = 'InterestingAsset/' + toString($sub_resource_id) AND r.lastupdated < $UPDATE_TAG
+        MATCH (n)<-[s:RELATIONSHIP_LABEL]-(:SubResource{id: $sub_resource_id})
+        WITH r LIMIT $LIMIT_SIZE
+        DELETE r;
+        """,
+        """
+        MATCH (n:InterestingAsset)<-[r:CONNECTED]-(:WorldAsset)
+        USING INDEX r:CONNECTED(_cleanup_scope, lastupdated)
+        WHERE r._cleanup_scope = 'InterestingAsset/' + toString($sub_resource_id) AND r.lastupdated < $UPDATE_TAG
+        MATCH (n)<-[s:RELATIONSHIP_LABEL]-(:SubResource{id: $sub_resource_id})
+        WITH r LIMIT $LIMIT_SIZE
+        DELETE r;
+        """,
+    ]
+    assert clean_query_list(actual_queries) == clean_query_list(expected_queries)
+    assert set(get_parameters(actual_queries)) == {'UPDATE_TAG', 'sub_resource_id', 'LIMIT_SIZE'}
+
+
+def test_build_indexed_cleanup_queries_seek_is_scoped_to_sub_resource():
+    """
+    Test that, for a node schema whose relationships share their type with every other AWS resource, each indexed
+    cleanup query only seeks the entries of the synced account and node label, so that the stale data of other accounts
+    is never read.
+    """
+    for query in build_indexed_cleanup_queries(EMRClusterSchema()):
+        seek = query.split('USING INDEX', 1)[1]
+        assert "_cleanup_scope = 'EMRCluster/' + toString($AWS_ID) AND" in seek
+        assert '(lastupdated)' not in seek
+
+
+def test_build_indexed_cleanup_queries_no_sub_resource():
+    """
+    Test that without a sub resource, the cleanup queries are the default ones, as their candidates are not bounded by
+    a cleanup scope.
+    """
+    assert build_indexed_cleanup_queries(GitHubOrganizationUserSchema()) == build_cleanup_queries(
+        GitHubOrganizationUserSchema(),
+    )
+    assert build_indexed_cleanup_queries(SimpleNodeSchema()) == []
+
+
+def test_build_cleanup_index_queries():
+    assert build_cleanup_index_queries(InterestingAssetSchema()) == [
+        'CREATE INDEX IF NOT EXISTS FOR (n:InterestingAsset) ON (n._cleanup_scope, n.lastupdated);',
+        'CREATE INDEX IF NOT EXISTS FOR ()-[r:RELATIONSHIP_LABEL]-() ON (r._cleanup_scope, r.lastupdated);',
+        'CREATE INDEX IF NOT EXISTS FOR ()-[r:ASSOCIATED_WITH]-() ON (r._cleanup_scope, r.lastupdated);',
+        'CREATE INDEX IF NOT EXISTS FOR ()-[r:CONNECTED]-() ON (r._cleanup_scope, r.lastupdated);',
+    ]
+    # Without a sub resource, the cleanups do not seek on an index.
+    assert build_cleanup_index_queries(GitHubOrganizationUserSchema()) == []
+
+
+def test_build_cleanup_scope_backfill_queries():
+    actual_queries: list[str] = build_cleanup_scope_backfill_queries(InterestingAssetSchema())
+    expected_queries = [
+        """
+        MATCH (n:InterestingAsset)<-[s:RELATIONSHIP_LABEL]-(j:SubResource)
+        WHERE n._cleanup_scope IS NULL
+        WITH n, j LIMIT $LIMIT_SIZE
+        SET n._cleanup_scope = 'InterestingAsset/' + toString(j.id);
+        """,
+        """
+        MATCH (n:InterestingAsset)<-[r:RELATIONSHIP_LABEL]-(:SubResource)
+        WHERE r._cleanup_scope IS NULL AND n._cleanup_scope IS NOT NULL
+        WITH n, r LIMIT $LIMIT_SIZE
+        SET r._cleanup_scope = n._cleanup_scope;
+        """,
+        """
+        MATCH (n:InterestingAsset)-[r:ASSOCIATED_WITH]->(:HelloAsset)
+        WHERE r._cleanup_scope IS NULL AND n._cleanup_scope IS NOT NULL
+        WITH n, r LIMIT $LIMIT_SIZE
+        SET r._cleanup_scope = n._cleanup_scope;
+        """,
+        """
+        MATCH (n:InterestingAsset)<-[r:CONNECTED]-(:WorldAsset)
+        WHERE r._cleanup_scope IS NULL AND n._cleanup_scope IS NOT NULL
+        WITH n, r LIMIT $LIMIT_SIZE
+        SET r._cleanup_scope = n._cleanup_scope;
+        """,
+    ]
+    assert clean_query_list(actual_queries) == clean_query_list(expected_queries)
+    assert build_cleanup_scope_backfill_queries(GitHubOrganizationUserSchema()) == []
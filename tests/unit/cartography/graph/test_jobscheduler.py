@@ -0,0 +1,86 @@
+from typing import Optional
+from typing import Set
+from unittest import mock
+
+import pytest
+
+from cartography.graph.job import GraphJob
+from cartography.graph.jobscheduler import jobs_conflict
+from cartography.graph.jobscheduler import plan_job_batches
+from cartography.graph.jobscheduler import run_graph_jobs
+
+
+def _job(name: str, reads: Optional[Set[str]] = None, writes: Optional[Set[str]] = None) -> GraphJob:
+    job = GraphJob(name, [], name, reads, writes)
+    job.run = mock.MagicMock()  # type: ignore
+    return job
+
+
+def test_jobs_conflict():
+    instances = _job('instances', reads={'AWSAccount'}, writes={'EC2Instance'})
+    buckets = _job('buckets', reads={'AWSAccount'}, writes={'S3Bucket'})
+    accounts = _job('accounts', writes={'AWSAccount'})
+    undeclared = _job('undeclared')
+
+    # Both only read AWSAccount
+    assert not jobs_conflict(instances, buckets)
+    # One writes what the other reads
+    assert jobs_conflict(instances, accounts)
+    assert jobs_conflict(accounts, buckets)
+    # Jobs without declarations conflict with everything
+    assert jobs_conflict(undeclared, instances)
+    assert jobs_conflict(instances, undeclared)
+
+
+def test_plan_job_batches_preserves_order_of_conflicting_jobs():
+    a = _job('a', writes={'A'})
+    b = _job('b', writes={'B'})
+    a2 = _job('a2', reads={'B'}, writes={'A'})
+    c = _job('c', writes={'C'})
+    undeclared = _job('undeclared')
+    d = _job('d', writes={'D'})
+
+    batches = plan_job_batches([a, b, a2, c, undeclared, d])
+
+    assert batches == [[a, b, c], [a2], [undeclared], [d]]
+
+
+def test_run_graph_jobs_serial_without_session_factory():
+    neo4j_session = mock.MagicMock()
+    jobs = [_job('a', writes={'A'}), _job('b', writes={'B'})]
+
+    with mock.patch('cartography.graph.jobscheduler.get_session_factory', return_value=None):
+        run_graph_jobs(jobs, neo4j_session)
+
+    for job in jobs:
+        job.run.assert_called_once_with(neo4j_session)
+
+
+def test_run_graph_jobs_concurrent_uses_new_sessions():
+    neo4j_session = mock.MagicMock()
+    session_factory = mock.MagicMock()
+    new_session = session_factory.return_value.__enter__.return_value
+    jobs = [_job('a', writes={'A'}), _job('b', writes={'B'}), _job('undeclared')]
+
+    with mock.patch('cartography.graph.jobscheduler.get_session_factory', return_value=session_factory):
+        run_graph_jobs(jobs, neo4j_session, max_workers=4)
+
+    jobs[0].run.assert_called_once_with(new_session)
+    jobs[1].run.assert_called_once_with(new_session)
+    # A job that runs alone uses the given session.
+    jobs[2].run.assert_called_once_with(neo4j_session)
+    assert session_factory.call_count == 2
+
+
+def test_run_graph_jobs_errors():
+    neo4j_session = mock.MagicMock()
+    failing = _job('failing')
+    failing.run.side_effect = ValueError('boom')
+    other = _job('other')
+
+    with mock.patch('cartography.graph.jobscheduler.get_session_factory', return_value=None):
+        run_graph_jobs([failing, other], neo4j_session, continue_on_error=True)
+        other.run.assert_called_once_with(neo4j_session)
+
+        with pytest.raises(ValueError):
+            run_graph_jobs([failing, other], neo4j_session)
@@ -16,6 +16,7 @@ def test_build_ingestion_query_complex():
                 i.property1 = item.property1,
                 i.property2 = item.property2,
                 i:AnotherNodeLabel:YetAnotherNodeLabel
+            REMOVE i._content_hash
 
             WITH i, item
             CALL {
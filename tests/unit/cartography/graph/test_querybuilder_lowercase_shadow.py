@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from cartography.graph.querybuilder import build_create_index_queries
+from cartography.graph.querybuilder import build_ingestion_query
+from cartography.graph.querybuilder import build_lowercase_shadow_backfill_queries
+from cartography.graph.querybuilder import get_lowercase_shadow_keys
+from cartography.models.aws.identitycenter.awspermissionset import AWSPermissionSetSchema
+from cartography.models.github.users import GitHubOrganizationUserSchema
+from tests.data.graph.querybuilder.sample_models.fake_emps_githubusers import FakeEmpSchema
+from tests.data.graph.querybuilder.sample_models.fake_emps_githubusers_fuzzy import FakeEmp2Schema
+from tests.unit.cartography.graph.helpers import remove_leading_whitespace_and_empty_lines
+
+
+def test_get_lowercase_shadow_keys():
+    shadow_keys = get_lowercase_shadow_keys()
+    # Only the case-insensitive and fuzzy matchers of cartography.models count, not those of imported test models
+    assert 'arn' in shadow_keys['AWSRole']
+    assert 'GitHubUser' not in shadow_keys
+
+
+@patch('cartography.graph.querybuilder.get_lowercase_shadow_keys', return_value={'GitHubUser': {'username'}})
+def test_build_ingestion_query_sets_lowercase_shadow_properties(mock_shadow_keys):
+    # If GitHubUser.username is matched case-insensitively, GitHubUser loads maintain `_lc_username`.
+    query = build_ingestion_query(GitHubOrganizationUserSchema())
+    assert 'i._lc_username = toLower(item.login)' in query
+    assert build_ingestion_query(GitHubOrganizationUserSchema(), skip_unchanged=True).count('_lc_username') == 1
+
+    # Nodes whose properties are not matched case-insensitively get no shadow properties.
+    assert 'i._lc_' not in build_ingestion_query(FakeEmpSchema())
+
+    # Matchers on the shadow property look it up instead of calling toLower() on the target property
+    assert 'n0._lc_username = toLower(item.github_username)' in build_ingestion_query(FakeEmpSchema())
+    assert 'n0._lc_username CONTAINS toLower(item.github_username)' in build_ingestion_query(FakeEmp2Schema())
+
+
+def test_build_create_index_queries_lowercase_shadow():
+    # Test models have no shadow properties, so their matchers only get an index on the target property
+    fake_emp_queries = build_create_index_queries(FakeEmpSchema())
+    assert 'CREATE INDEX IF NOT EXISTS FOR (n:GitHubUser) ON (n.username);' in fake_emp_queries
+    assert not any('_lc_username' in query for query in fake_emp_queries)
+    assert not any('_lc_username' in query for query in build_create_index_queries(FakeEmp2Schema()))
+    assert 'CREATE TEXT INDEX IF NOT EXISTS FOR (n:AWSRole) ON (n._lc_arn);' in build_create_index_queries(
+        AWSPermissionSetSchema(),
+    )
+
+
+def test_build_lowercase_shadow_backfill_queries():
+    queries = [remove_leading_whitespace_and_empty_lines(query) for query in build_lowercase_shadow_backfill_queries()]
+    expected = remove_leading_whitespace_and_empty_lines(
+        """
+        MATCH (n:AWSRole)
+        WHERE n.arn IS NOT NULL AND (n._lc_arn IS NULL OR n._lc_arn <> toLower(n.arn))
+        WITH n LIMIT $LIMIT_SIZE
+        SET n._lc_arn = toLower(n.arn);
+        """,
+    )
+    assert expected in queries
+    assert build_lowercase_shadow_backfill_queries({('AWSRole', 'arn')}) == build_lowercase_shadow_backfill_queries(
+        {('AWSRole', 'arn'), ('GitHubUser', 'username')},
+    )
+    assert build_lowercase_shadow_backfill_queries(set()) == []
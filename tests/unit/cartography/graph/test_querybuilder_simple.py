@@ -1,4 +1,6 @@
 from cartography.graph.querybuilder import build_ingestion_query
+from cartography.graph.querybuilder import get_cleanup_scope
+from tests.data.graph.querybuilder.sample_models.asset_with_non_kwargs_tgm import FakeEC2InstanceSchema
 from tests.data.graph.querybuilder.sample_models.fake_emps_githubusers import FakeEmpSchema
 from tests.data.graph.querybuilder.sample_models.fake_emps_githubusers_fuzzy import FakeEmp2Schema
 from tests.data.graph.querybuilder.sample_models.simple_node import SimpleNodeSchema
@@ -29,10 +31,10 @@ def test_simplenode_with_subresource_sanity_checks():
 
 def test_build_ingestion_query_with_sub_resource():
     """
-    Test creating a simple node schema with a sub resource relationship.
+    Test creating a simple node schema with a sub resource relationship, with the cleanup scope of `--indexed-cleanup`.
     """
     # Act
-    query = build_ingestion_query(SimpleNodeWithSubResourceSchema())
+    query = build_ingestion_query(SimpleNodeWithSubResourceSchema(), indexed_cleanup=True)
 
     expected = """
         UNWIND $DictList AS item
@@ -41,7 +43,9 @@ def test_build_ingestion_query_with_sub_resource():
             SET
                 i.lastupdated = $lastupdated,
                 i.property1 = item.property1,
-                i.property2 = item.property2
+                i.property2 = item.property2,
+                i._cleanup_scope = 'SimpleNode/' + toString($sub_resource_id)
+            REMOVE i._content_hash
 
             WITH i, item
             CALL {
@@ -51,7 +55,8 @@ def test_build_ingestion_query_with_sub_resource():
                 MERGE (i)<-[r:RELATIONSHIP_LABEL]-(j)
                 ON CREATE SET r.firstseen = timestamp()
                 SET
-                    r.lastupdated = $lastupdated
+                    r.lastupdated = $lastupdated,
+                    r._cleanup_scope = 'SimpleNode/' + toString($sub_resource_id)
             }
     """
 
@@ -72,6 +77,7 @@ def test_build_ingestion_query_case_insensitive_match():
                 i.lastupdated = $lastupdated,
                 i.email = item.email,
                 i.github_username = item.github_username
+            REMOVE i._content_hash
 
             WITH i, item
             CALL {
@@ -104,6 +110,7 @@ def test_build_ingestion_query_fuzzy_case_insensitive():
                 i.lastupdated = $lastupdated,
                 i.email = item.email,
                 i.github_username = item.github_username
+            REMOVE i._content_hash
 
         WITH i, item
         CALL {
@@ -123,3 +130,21 @@ def test_build_ingestion_query_fuzzy_case_insensitive():
     actual_query = remove_leading_whitespace_and_empty_lines(query)
     expected_query = remove_leading_whitespace_and_empty_lines(expected)
     assert actual_query == expected_query
+
+
+def test_get_cleanup_scope():
+    sub_resource_rel = SimpleNodeWithSubResourceSchema().sub_resource_relationship
+    assert get_cleanup_scope('SimpleNode', sub_resource_rel) == "'SimpleNode/' + toString($sub_resource_id)"
+    assert get_cleanup_scope('SimpleNode', sub_resource_rel, node_var='j') == "'SimpleNode/' + toString(j.id)"
+    assert get_cleanup_scope('SimpleNode', None) is None
+    # The sub resource is matched on a field of each record, so there is no cleanup job to scope.
+    fake_ec2_sub_resource_rel = FakeEC2InstanceSchema().sub_resource_relationship
+    assert get_cleanup_scope('FakeEC2Instance', fake_ec2_sub_resource_rel) is None
+    assert '_cleanup_scope' not in build_ingestion_query(FakeEC2InstanceSchema(), indexed_cleanup=True)
+
+
+def test_build_ingestion_query_sets_cleanup_scope_only_with_indexed_cleanup():
+    assert '_cleanup_scope' not in build_ingestion_query(SimpleNodeWithSubResourceSchema())
+    query = build_ingestion_query(SimpleNodeWithSubResourceSchema(), indexed_cleanup=True)
+    assert "i._cleanup_scope = 'SimpleNode/' + toString($sub_resource_id)" in query
+    assert "r._cleanup_scope = 'SimpleNode/' + toString($sub_resource_id)" in query
@@ -0,0 +1,60 @@
+from cartography.graph.querybuilder import build_ingestion_query
+from tests.data.graph.querybuilder.sample_models.simple_node import SimpleNodeWithSubResourceSchema
+from tests.unit.cartography.graph.helpers import remove_leading_whitespace_and_empty_lines
+
+
+def test_build_ingestion_query_skip_unchanged():
+    """
+    Test that with skip_unchanged=True, only `lastupdated` and the cleanup scope of `--indexed-cleanup` are set
+    unconditionally and the remaining node properties are only set if the content hash changed.
+    """
+    # Act
+    query = build_ingestion_query(SimpleNodeWithSubResourceSchema(), skip_unchanged=True, indexed_cleanup=True)
+
+    expected = """
+        UNWIND $DictList AS item
+            MERGE (i:SimpleNode{id: item.Id})
+            ON CREATE SET i.firstseen = timestamp()
+            SET i.lastupdated = $lastupdated,
+                i._cleanup_scope = 'SimpleNode/' + toString($sub_resource_id)
+            FOREACH (_ IN CASE WHEN i._content_hash = item._content_hash THEN [] ELSE [1] END |
+                SET
+                    i.property1 = item.property1,
+                    i.property2 = item.property2,
+                    i._content_hash = item._content_hash
+            )
+
+            WITH i, item
+            CALL {
+                WITH i, item
+                OPTIONAL MATCH (j:SubResource{id: $sub_resource_id})
+                WITH i, item, j WHERE j IS NOT NULL
+                MERGE (i)<-[r:RELATIONSHIP_LABEL]-(j)
+                ON CREATE SET r.firstseen = timestamp()
+                SET
+                    r.lastupdated = $lastupdated,
+                    r._cleanup_scope = 'SimpleNode/' + toString($sub_resource_id)
+            }
+    """
+
+    # Assert: compare query outputs while ignoring leading whitespace.
+    actual_query = remove_leading_whitespace_and_empty_lines(query)
+    expected_query = remove_leading_whitespace_and_empty_lines(expected)
+    assert actual_query == expected_query
+
+
+def test_build_ingestion_query_skip_unchanged_default_unchanged():
+    """
+    Test that the default query does not write a content hash and instead clears any hash left by an earlier
+    skip_unchanged load, so that a later skip_unchanged load cannot match a hash of outdated properties.
+    """
+    schema = SimpleNodeWithSubResourceSchema()
+    query = build_ingestion_query(schema)
+    assert query == build_ingestion_query(schema, skip_unchanged=False)
+    assert 'REMOVE i._content_hash' in query
+    assert 'item._content_hash' not in query
+
+
+def test_build_ingestion_query_skip_unchanged_without_indexed_cleanup():
+    query = build_ingestion_query(SimpleNodeWithSubResourceSchema(), skip_unchanged=True)
+    assert '_cleanup_scope' not in query
@@ -1,6 +1,10 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
 from cartography.intel.aws import iam
 from cartography.intel.aws.iam import PolicyType
 from cartography.intel.aws.iam import transform_policy_data
+from tests.data.aws.iam.account_authorization_details import GET_ACCOUNT_AUTHORIZATION_DETAILS
 
 SINGLE_STATEMENT = {
     "Resource": "*",
@@ -116,3 +120,71 @@ def test_transform_policy_data_correctly_creates_lists_of_statements():
 
     # Assert that we correctly converted the statement to a list
     assert isinstance(pol_statement_map['some-arn']['pol-name'], list)
+
+
+def test_transform_policies_from_authorization_details():
+    details = GET_ACCOUNT_AUTHORIZATION_DETAILS
+    local_policy_statements = iam._get_local_policy_statements(details['Policies'])
+    aws_managed_statements = [{"Effect": "Allow", "Action": "iam:Get*", "Resource": "*"}]
+
+    def get_policy_statements(policy_arn):
+        return local_policy_statements.get(policy_arn, aws_managed_statements)
+
+    user_0 = "arn:aws:iam::000000000000:user/example-user-0"
+    user_1 = "arn:aws:iam::000000000000:user/example-user-1"
+    # Same format as get_user_policy_data() and get_user_managed_policy_data()
+    assert iam.transform_inline_policies_from_details(details['UserDetailList'], 'UserPolicyList') == {
+        user_0: {"user-inline": [{"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*"}]},
+        user_1: {},
+    }
+    assert iam.transform_managed_policies_from_details(details['UserDetailList'], get_policy_statements) == {
+        user_0: {
+            "arn:aws:iam::000000000000:policy/local-policy": [{"Effect": "Allow", "Action": "ec2:*", "Resource": "*"}],
+            "arn:aws:iam::aws:policy/SecurityAudit": aws_managed_statements,
+        },
+        user_1: {},
+    }
+
+
+def test_transform_group_memberships_from_authorization_details():
+    details = GET_ACCOUNT_AUTHORIZATION_DETAILS
+
+    memberships = iam.transform_group_memberships_from_details(
+        details['UserDetailList'], details['GroupDetailList'],
+    )
+
+    assert memberships == {
+        "arn:aws:iam::000000000000:group/example-group-0": {
+            "Users": [
+                {"Arn": "arn:aws:iam::000000000000:user/example-user-0"},
+                {"Arn": "arn:aws:iam::000000000000:user/example-user-1"},
+            ],
+        },
+        "arn:aws:iam::000000000000:group/example-group-1": {
+            "Users": [{"Arn": "arn:aws:iam::000000000000:user/example-user-1"}],
+        },
+    }
+
+
+@patch.object(iam, 'merge_module_sync_metadata')
+@patch.object(iam, 'run_cleanup_job')
+@patch.object(iam, 'sync_user_access_keys')
+@patch.object(iam, 'sync_assumerole_relationships')
+@patch.object(iam, 'sync_group_memberships')
+@patch.object(iam, 'get_group_membership_data')
+@patch.object(iam, 'load_policy_data')
+@patch.object(iam, 'load_roles')
+@patch.object(iam, 'load_groups')
+@patch.object(iam, 'load_users')
+@patch.object(iam, 'get_role_list_data', return_value={'Roles': []})
+@patch.object(iam, 'get_group_list_data', return_value={'Groups': []})
+@patch.object(iam, 'get_user_list_data', return_value={'Users': []})
+def test_sync_lists_attached_policies_once(*mocks):
+    boto3_session = MagicMock()
+    paginator = boto3_session.client.return_value.get_paginator.return_value
+    paginator.paginate.return_value = [{'Policies': []}]
+
+    iam.sync(MagicMock(), boto3_session, [], '000000000000', 1, {'UPDATE_TAG': 1, 'AWS_ID': '000000000000'})
+
+    # The group, user and role managed policy getters share one ListPolicies pagination
+    paginator.paginate.assert_called_once_with(Scope='All', OnlyAttached=True)
@@ -19,7 +19,7 @@ def test_sync_user_managed_policies(mock_get_user_pols: MagicMock, mock_load_pol
     neo4j_session = mock.MagicMock()
 
     # Act
-    sync_user_managed_policies(boto3_session, GET_USER_LIST_DATA, neo4j_session, AWS_UPDATE_TAG)
+    sync_user_managed_policies(boto3_session, GET_USER_LIST_DATA, neo4j_session, AWS_UPDATE_TAG, {})
 
     # Assert that we attempt to create policies with expected values for ids.
     mock_load_pol.assert_has_calls(
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+import cartography.intel.aws.ec2.images
+from cartography.intel.aws.ec2.images import clear_public_image_cache
+from cartography.intel.aws.ec2.images import get_images
+
+TEST_REGION = 'us-east-1'
+
+
+@pytest.fixture(autouse=True)
+def public_image_cache():
+    clear_public_image_cache()
+    yield
+    clear_public_image_cache()
+
+
+def _mock_boto3_session(existing_image_ids):
+    def describe_images(ImageIds=None, Owners=None):
+        if Owners:
+            return {'Images': []}
+        missing = [image_id for image_id in ImageIds if image_id not in existing_image_ids]
+        if missing:
+            raise ClientError(
+                {'Error': {'Code': 'InvalidAMIID.NotFound', 'Message': f'{missing} not found'}}, 'DescribeImages',
+            )
+        return {'Images': [{'ImageId': image_id, 'Public': True} for image_id in ImageIds]}
+    client = MagicMock()
+    client.describe_images.side_effect = describe_images
+    boto3_session = MagicMock()
+    boto3_session.client.return_value = client
+    return boto3_session, client
+
+
+@patch.object(cartography.intel.aws.ec2.images, 'DESCRIBE_IMAGES_BATCH_SIZE', 4)
+def test_get_images_batches_and_bisects_failed_batches():
+    image_ids = [f'ami-{i}' for i in range(8)]
+    boto3_session, client = _mock_boto3_session(set(image_ids) - {'ami-2'})
+
+    images = get_images(boto3_session, TEST_REGION, image_ids)
+
+    assert [image['ImageId'] for image in images] == [image_id for image_id in image_ids if image_id != 'ami-2']
+    # Self-owned images, then [0-3] fails, [0-1], [2-3] fails, [2] fails, [3], and [4-7]
+    assert client.describe_images.call_count == 7
+
+
+def test_get_images_caches_public_images_across_accounts():
+    boto3_session, client = _mock_boto3_session({'ami-1', 'ami-2'})
+    get_images(boto3_session, TEST_REGION, ['ami-1', 'ami-2'])
+
+    other_account_session, other_client = _mock_boto3_session({'ami-1', 'ami-2'})
+    images = get_images(other_account_session, TEST_REGION, ['ami-1', 'ami-2'])
+
+    assert [image['ImageId'] for image in images] == ['ami-1', 'ami-2']
+    # Only the self-owned images of the second account are described
+    other_client.describe_images.assert_called_once_with(Owners=['self'])
@@ -1,3 +1,4 @@
+from unittest.mock import ANY
 from unittest.mock import MagicMock
 
 import botocore.exceptions
@@ -28,7 +29,7 @@ def test_get_permission_sets_access_denied():
     assert result == []
 
     # Verify our mocks were called as expected
-    mock_session.client.assert_called_once_with('sso-admin', region_name='us-east-1')
+    mock_session.client.assert_called_once_with('sso-admin', region_name='us-east-1', config=ANY)
     mock_client.get_paginator.assert_called_once_with('list_permission_sets')
     mock_paginator.paginate.assert_called_once_with(InstanceArn="arn:aws:sso:::instance/test")
 
@@ -57,10 +58,50 @@ def test_get_role_assignments_access_denied():
     assert result == []
 
     # Verify our mocks were called as expected
-    mock_session.client.assert_called_once_with('sso-admin', region_name='us-east-1')
+    mock_session.client.assert_called_once_with('sso-admin', region_name='us-east-1', config=ANY)
     mock_client.get_paginator.assert_called_once_with('list_account_assignments_for_principal')
     mock_paginator.paginate.assert_called_once_with(
         InstanceArn="arn:aws:sso:::instance/test",
         PrincipalId="test-user-id",
         PrincipalType="USER",
     )
+
+
+def test_get_permission_sets_describes_each_set():
+    mock_session = MagicMock()
+    mock_client = MagicMock()
+    mock_session.client.return_value = mock_client
+    arns = [f"arn:aws:sso:::permissionSet/ps-{i}" for i in range(10)]
+    mock_client.get_paginator.return_value.paginate.return_value = [
+        {'PermissionSets': arns[:5]},
+        {'PermissionSets': arns[5:]},
+    ]
+    mock_client.describe_permission_set.side_effect = lambda InstanceArn, PermissionSetArn: {
+        'PermissionSet': {
+            'PermissionSetArn': PermissionSetArn, 'Name': PermissionSetArn.split('/')[-1],
+        } if PermissionSetArn != arns[3] else {},
+    }
+
+    result = get_permission_sets(mock_session, "arn:aws:sso:::instance/test", "us-east-1")
+
+    # Permission sets keep their order, and sets without details are skipped
+    assert [permission_set['PermissionSetArn'] for permission_set in result] == arns[:3] + arns[4:]
+    assert result[0]['RoleHint'] == ":role/aws-reserved/sso.amazonaws.com/AWSReservedSSO_ps-0"
+    assert mock_client.describe_permission_set.call_count == 10
+
+
+def test_get_role_assignments_for_all_users():
+    mock_session = MagicMock()
+    mock_client = MagicMock()
+    mock_session.client.return_value = mock_client
+    mock_client.get_paginator.return_value.paginate.side_effect = lambda InstanceArn, PrincipalId, PrincipalType: [
+        {'AccountAssignments': [{'PermissionSetArn': f'ps-{PrincipalId}', 'AccountId': '123456789012'}]},
+    ]
+    users = [{"UserId": f"user-{i}"} for i in range(10)]
+
+    result = get_role_assignments(mock_session, users, "arn:aws:sso:::instance/test", "us-east-1")
+
+    assert result == [
+        {'UserId': f'user-{i}', 'PermissionSetArn': f'ps-user-{i}', 'AccountId': '123456789012'} for i in range(10)
+    ]
+    mock_session.client.assert_called_once()
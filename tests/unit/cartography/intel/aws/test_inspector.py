@@ -1,5 +1,11 @@
+import time
 from datetime import datetime
+from unittest.mock import MagicMock
+from unittest.mock import patch
 
+import cartography.intel.aws.inspector
+from cartography.intel.aws.inspector import get_inspector_findings
+from cartography.intel.aws.inspector import sync
 from cartography.intel.aws.inspector import transform_inspector_findings
 from tests.data.aws.inspector import LIST_FINDINGS_EC2_PACKAGE
 from tests.data.aws.inspector import LIST_FINDINGS_NETWORK
@@ -140,3 +146,64 @@ def test_transform_inspector_findings_package():
             'version': '1.0.2k',
         },
     ]
+
+
+@patch.object(cartography.intel.aws.inspector, 'aws_paginate')
+def test_get_inspector_findings_yields_findings_per_account(mock_paginate):
+    def paginate(client, method_name, object_name, **kwargs):
+        if method_name == 'list_members':
+            return [{'accountId': '123456789012'}]
+        account = kwargs['filterCriteria']['awsAccountId'][0]['value']
+        if account == '123456789011':
+            # The host account finishes last
+            time.sleep(0.1)
+        return [finding for finding in LIST_FINDINGS_EC2_PACKAGE if finding['awsAccountId'] == account]
+    mock_paginate.side_effect = paginate
+    boto3_session = MagicMock()
+
+    chunks = list(get_inspector_findings(boto3_session, 'us-east-1', '123456789011'))
+
+    # One client is shared by the worker threads
+    boto3_session.client.assert_called_once()
+    # Accounts are yielded in submission order, the host account first, whichever finishes first
+    assert [[finding['findingArn'] for finding in chunk] for chunk in chunks] == [
+        ['arn:aws:test789'],
+        ['arn:aws:test456'],
+    ]
+
+
+@patch.object(cartography.intel.aws.inspector, 'MAX_CONCURRENT_ACCOUNTS', 2)
+@patch.object(cartography.intel.aws.inspector, 'get_inspector_member_accounts')
+@patch.object(cartography.intel.aws.inspector, 'get_inspector_findings_for_account')
+def test_get_inspector_findings_bounds_accounts_in_flight(mock_get_for_account, mock_get_members):
+    mock_get_members.return_value = [f'member-{i}' for i in range(5)]
+    mock_get_for_account.side_effect = lambda client, account: [{'awsAccountId': account}]
+
+    findings = get_inspector_findings(MagicMock(), 'us-east-1', 'host')
+    first = next(findings)
+
+    # Only MAX_CONCURRENT_ACCOUNTS accounts are submitted up front; the next one is submitted as one is yielded
+    assert first == [{'awsAccountId': 'host'}]
+    assert [call.args[1] for call in mock_get_for_account.call_args_list] == ['host', 'member-0', 'member-1']
+    assert [chunk[0]['awsAccountId'] for chunk in findings] == [f'member-{i}' for i in range(5)]
+
+
+@patch.object(cartography.intel.aws.inspector, 'cleanup')
+@patch.object(cartography.intel.aws.inspector, 'load_inspector_packages')
+@patch.object(cartography.intel.aws.inspector, 'load_inspector_findings')
+@patch.object(cartography.intel.aws.inspector, 'get_inspector_findings')
+def test_sync_loads_each_package_once_across_chunks(mock_get, mock_load_findings, mock_load_packages, mock_cleanup):
+    # The same findings are returned in two chunks, so their packages are only new in the first one
+    mock_get.return_value = [LIST_FINDINGS_EC2_PACKAGE, LIST_FINDINGS_EC2_PACKAGE]
+
+    sync(MagicMock(), MagicMock(), ['us-east-1'], '123456789011', TEST_UPDATE_TAG, {})
+
+    assert mock_load_findings.call_count == 2
+    loaded_package_ids = [
+        package['id'] for call in mock_load_packages.call_args_list for package in call[0][1]
+    ]
+    assert len(loaded_package_ids) > 0
+    assert len(loaded_package_ids) == len(set(loaded_package_ids))
+    _, expected_packages = transform_inspector_findings(LIST_FINDINGS_EC2_PACKAGE)
+    assert sorted(loaded_package_ids) == sorted(package['id'] for package in expected_packages)
+    mock_cleanup.assert_called_once()
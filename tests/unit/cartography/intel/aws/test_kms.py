@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock
+
+from cartography.intel.aws.kms import get_kms_key_details
+
+
+def test_get_kms_key_details_lists_aliases_once_per_region():
+    pages = {
+        'list_aliases': [{
+            'Aliases': [
+                {'AliasName': 'alias/one', 'TargetKeyId': 'key-1'},
+                {'AliasName': 'alias/two', 'TargetKeyId': 'key-1'},
+                {'AliasName': 'alias/aws/unused'},
+            ],
+        }],
+        'list_grants': [{'Grants': [{'GrantId': 'grant-1'}]}],
+    }
+    client = MagicMock()
+    client.get_paginator.side_effect = lambda operation: MagicMock(
+        paginate=MagicMock(return_value=pages[operation]),
+    )
+    client.get_key_policy.side_effect = lambda KeyId, PolicyName: {'Policy': KeyId}
+    boto3_session = MagicMock()
+    boto3_session.client.return_value = client
+
+    details = get_kms_key_details(boto3_session, [{'KeyId': 'key-1'}, {'KeyId': 'key-2'}], 'us-east-1')
+
+    assert [paginator_call[0][0] for paginator_call in client.get_paginator.call_args_list].count('list_aliases') == 1
+    assert details == [
+        (
+            'key-1',
+            {'Policy': 'key-1'},
+            [{'AliasName': 'alias/one', 'TargetKeyId': 'key-1'}, {'AliasName': 'alias/two', 'TargetKeyId': 'key-1'}],
+            [{'GrantId': 'grant-1'}],
+        ),
+        ('key-2', {'Policy': 'key-2'}, [], [{'GrantId': 'grant-1'}]),
+    ]
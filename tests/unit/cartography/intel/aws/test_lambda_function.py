@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock
+
+from cartography.intel.aws.lambda_function import get_lambda_function_details
+
+
+def test_get_lambda_function_details_keeps_function_order():
+    def paginate(FunctionName):
+        return [{
+            'Aliases': [{'Name': f'{FunctionName}-alias'}],
+            'EventSourceMappings': [{'UUID': f'{FunctionName}-esm'}],
+        }]
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.side_effect = paginate
+    boto3_session = MagicMock()
+    boto3_session.client.return_value = client
+    functions = [
+        {'FunctionName': f'function-{i}', 'FunctionArn': f'arn:function-{i}', 'Layers': [{'Arn': f'layer-{i}'}]}
+        for i in range(20)
+    ]
+
+    details = get_lambda_function_details(boto3_session, functions, 'us-east-1')
+
+    boto3_session.client.assert_called_once()
+    assert details == [
+        (
+            f'arn:function-{i}',
+            [{'Name': f'function-{i}-alias'}],
+            [{'UUID': f'function-{i}-esm'}],
+            [{'Arn': f'layer-{i}'}],
+        )
+        for i in range(20)
+    ]
@@ -0,0 +1,55 @@
+import json
+from unittest.mock import MagicMock
+
+from cartography.intel.aws.util.policy_cache import is_aws_managed_policy
+from cartography.intel.aws.util.policy_cache import ManagedPolicyCache
+
+AWS_MANAGED_ARN = 'arn:aws:iam::aws:policy/SecurityAudit'
+CUSTOMER_MANAGED_ARN = 'arn:aws:iam::123456789012:policy/my-policy'
+
+
+def _mock_client():
+    client = MagicMock()
+    client.get_policy_version.side_effect = lambda PolicyArn, VersionId: {
+        'PolicyVersion': {'Document': {'Statement': [{'Sid': f'{PolicyArn}/{VersionId}'}]}},
+    }
+    return client
+
+
+def test_is_aws_managed_policy():
+    assert is_aws_managed_policy(AWS_MANAGED_ARN)
+    assert is_aws_managed_policy('arn:aws-us-gov:iam::aws:policy/service-role/AWSConfigRole')
+    assert not is_aws_managed_policy(CUSTOMER_MANAGED_ARN)
+
+
+def test_get_statements_caches_by_arn_and_version():
+    cache = ManagedPolicyCache()
+    account_1_client = _mock_client()
+    account_2_client = _mock_client()
+
+    statements = cache.get_statements(account_1_client, AWS_MANAGED_ARN, 'v1')
+    # The caller may modify the statements without changing the cached ones
+    statements[0]['id'] = 'modified'
+    assert cache.get_statements(account_2_client, AWS_MANAGED_ARN, 'v1') == [{'Sid': f'{AWS_MANAGED_ARN}/v1'}]
+    cache.get_statements(account_2_client, AWS_MANAGED_ARN, 'v2')
+
+    account_1_client.get_policy_version.assert_called_once_with(PolicyArn=AWS_MANAGED_ARN, VersionId='v1')
+    account_2_client.get_policy_version.assert_called_once_with(PolicyArn=AWS_MANAGED_ARN, VersionId='v2')
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_rate == 1 / 3
+
+
+def test_save_persists_only_aws_managed_policies(tmp_path):
+    path = str(tmp_path / 'policies.json')
+    cache = ManagedPolicyCache(path)
+    cache.get_statements(_mock_client(), AWS_MANAGED_ARN, 'v1')
+    cache.get_statements(_mock_client(), CUSTOMER_MANAGED_ARN, 'v1')
+    cache.save()
+
+    with open(path) as f:
+        assert [entry['arn'] for entry in json.load(f)] == [AWS_MANAGED_ARN]
+
+    client = _mock_client()
+    next_sync_cache = ManagedPolicyCache(path)
+    assert next_sync_cache.get_statements(client, AWS_MANAGED_ARN, 'v1') == [{'Sid': f'{AWS_MANAGED_ARN}/v1'}]
+    client.get_policy_version.assert_not_called()
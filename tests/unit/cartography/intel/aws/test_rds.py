@@ -0,0 +1,74 @@
+import copy
+
+from cartography.intel.aws import rds
+from tests.data.aws.rds import DESCRIBE_DBINSTANCES_RESPONSE
+
+
+def _instance(identifier, **kwargs):
+    return {
+        'DBInstanceArn': f'arn:aws:rds:us-east-1:1234:db:{identifier}',
+        'DBInstanceIdentifier': identifier,
+        **kwargs,
+    }
+
+
+def test_transform_rds_instances_orders_sources_before_replicas():
+    data = [
+        _instance('replica', ReadReplicaSourceDBInstanceIdentifier='source'),
+        _instance('source'),
+    ]
+
+    instances = rds.transform_rds_instances(data)
+
+    assert [i['DBInstanceIdentifier'] for i in instances] == ['source', 'replica']
+
+
+def test_transform_db_subnet_groups():
+    instances = rds.transform_rds_instances(copy.deepcopy(DESCRIBE_DBINSTANCES_RESPONSE['DBInstances']))
+    # A second instance in the same subnet group
+    instances.append({**instances[0], 'DBInstanceArn': 'arn:aws:rds:us-east-1:some-arn:db:some-prod-db-iad-1'})
+    # A third instance in a subnet group without subnets
+    instances.append({
+        **instances[0],
+        'DBInstanceArn': 'arn:aws:rds:us-east-1:some-arn:db:some-prod-db-iad-2',
+        'DBSubnetGroup': {'DBSubnetGroupName': 'subnet-group-2', 'Subnets': []},
+    })
+    subnet_ids = [
+        subnet['SubnetIdentifier']
+        for subnet in DESCRIBE_DBINSTANCES_RESPONSE['DBInstances'][0]['DBSubnetGroup']['Subnets']
+    ]
+
+    db_subnet_groups = rds.transform_db_subnet_groups(instances, 'us-east-1', '1234')
+
+    # One record per instance and subnet of its group
+    assert [(sng['arn'], sng['instance_arn'], sng['SubnetIdentifier']) for sng in db_subnet_groups] == [
+        (
+            'arn:aws:rds:us-east-1:1234:subgrp:subnet-group-1',
+            'arn:aws:rds:us-east-1:some-arn:db:some-prod-db-iad-0',
+            subnet_id,
+        ) for subnet_id in subnet_ids
+    ] + [
+        (
+            'arn:aws:rds:us-east-1:1234:subgrp:subnet-group-1',
+            'arn:aws:rds:us-east-1:some-arn:db:some-prod-db-iad-1',
+            subnet_id,
+        ) for subnet_id in subnet_ids
+    ] + [
+        (
+            'arn:aws:rds:us-east-1:1234:subgrp:subnet-group-2',
+            'arn:aws:rds:us-east-1:some-arn:db:some-prod-db-iad-2',
+            None,
+        ),
+    ]
+
+
+def test_transform_rds_security_groups():
+    data = [
+        _instance('a', VpcSecurityGroups=[{'VpcSecurityGroupId': 'sg-1'}, {'VpcSecurityGroupId': 'sg-2'}]),
+        _instance('b'),
+    ]
+
+    assert rds.transform_rds_security_groups(data) == [
+        {'DBInstanceArn': 'arn:aws:rds:us-east-1:1234:db:a', 'VpcSecurityGroupId': 'sg-1'},
+        {'DBInstanceArn': 'arn:aws:rds:us-east-1:1234:db:a', 'VpcSecurityGroupId': 'sg-2'},
+    ]
@@ -1,5 +1,6 @@
 import copy
 from unittest.mock import MagicMock
+from unittest.mock import patch
 
 import cartography.intel.aws.resourcegroupstaggingapi as rgta
 import tests.data.aws.resourcegroupstaggingapi as test_data
@@ -70,3 +71,65 @@ def test_load_tags_empty_data():
 
     # Assert
     mock_neo4j_session.write_transaction.assert_not_called()
+
+
+def test_get_resource_type_from_arn():
+    assert rgta.get_resource_type_from_arn('arn:aws:ec2:us-east-1:1234:instance/i-01') == 'ec2:instance'
+    assert rgta.get_resource_type_from_arn('arn:aws:s3:::bucket-1') == 's3'
+    assert rgta.get_resource_type_from_arn('arn:aws:sqs:us-east-1:1234:my-queue') == 'sqs'
+    assert rgta.get_resource_type_from_arn('arn:aws:rds:us-east-1:1234:db:rds-db-1') == 'rds:db'
+    assert rgta.get_resource_type_from_arn(
+        'arn:aws:elasticloadbalancing:us-east-1:1234:loadbalancer/app/foo/ab123',
+    ) == 'elasticloadbalancing:loadbalancer/app'
+    assert rgta.get_resource_type_from_arn(
+        'arn:aws:elasticloadbalancing:us-east-1:1234:loadbalancer/foo',
+    ) == 'elasticloadbalancing:loadbalancer'
+    assert rgta.get_resource_type_from_arn(
+        'arn:aws:autoscaling:us-east-1:1234:autoScalingGroup:uuid:autoScalingGroupName/asg',
+    ) == 'autoscaling:autoScalingGroup'
+    assert rgta.get_resource_type_from_arn('arn:aws:ec2:us-east-1:1234:launch-template/lt-01') is None
+    assert rgta.get_resource_type_from_arn('arn:aws:ec2:us-east-1:1234:instance/i-01', ['s3']) is None
+
+
+def test_group_tags_by_resource_type():
+    get_resources_response = copy.deepcopy(test_data.GET_RESOURCES_RESPONSE)
+
+    grouped = rgta.group_tags_by_resource_type(get_resources_response, ['ec2:instance', 's3'])
+
+    assert {resource_type: [m['ResourceARN'] for m in mappings] for resource_type, mappings in grouped.items()} == {
+        'ec2:instance': ['arn:aws:ec2:us-east-1:1234:instance/i-01'],
+        's3': ['arn:aws:s3:::bucket-1'],
+    }
+
+
+@patch.object(rgta, 'get_role_tags', return_value=[])
+@patch.object(rgta, 'cleanup')
+@patch.object(rgta, 'load_tags')
+def test_sync_scans_each_region_once(mock_load_tags, mock_cleanup, mock_get_role_tags):
+    boto3_session = MagicMock()
+    client = boto3_session.client.return_value
+    client.get_paginator.return_value.paginate.return_value = [
+        {'ResourceTagMappingList': copy.deepcopy(test_data.GET_RESOURCES_RESPONSE)},
+    ]
+
+    rgta.sync(MagicMock(), boto3_session, ['us-east-1', 'us-west-2'], '1234', 1, {'UPDATE_TAG': 1, 'AWS_ID': '1234'})
+
+    # One paginated get_resources scan per region for all resource types, and IAM role tags once per account.
+    assert client.get_paginator.call_count == 2
+    resource_type_filters = client.get_paginator.return_value.paginate.call_args[1]['ResourceTypeFilters']
+    assert 'ec2:instance' in resource_type_filters and 'iam:role' not in resource_type_filters
+    mock_get_role_tags.assert_called_once_with(boto3_session)
+    loaded = sorted(
+        (call[1]['region'], call[1]['resource_type'], len(call[1]['tag_data']))
+        for call in mock_load_tags.call_args_list
+    )
+    assert loaded == [
+        ('us-east-1', 'ec2:instance', 1),
+        ('us-east-1', 'iam:role', 0),
+        ('us-east-1', 'rds:db', 1),
+        ('us-east-1', 's3', 1),
+        ('us-west-2', 'ec2:instance', 1),
+        ('us-west-2', 'rds:db', 1),
+        ('us-west-2', 's3', 1),
+    ]
+    mock_cleanup.assert_called_once()
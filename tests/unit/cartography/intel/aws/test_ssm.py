@@ -0,0 +1,25 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import cartography.intel.aws.ssm
+from cartography.intel.aws.ssm import get_instance_patches
+
+
+@patch.object(cartography.intel.aws.ssm, 'INSTANCE_PATCH_BATCH_SIZE', 2)
+def test_get_instance_patches_yields_batches_of_instances():
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.side_effect = lambda InstanceId: [
+        {'Patches': [{'Title': f'{InstanceId}-patch-1'}, {'Title': f'{InstanceId}-patch-2'}]},
+    ]
+    boto3_session = MagicMock()
+    boto3_session.client.return_value = client
+
+    batches = list(get_instance_patches(boto3_session, 'us-east-1', ['i-01', 'i-02', 'i-03']))
+
+    # One client is shared by the worker threads
+    boto3_session.client.assert_called_once()
+    assert [[patch['Title'] for patch in patches] for patches in batches] == [
+        ['i-01-patch-1', 'i-01-patch-2', 'i-02-patch-1', 'i-02-patch-2'],
+        ['i-03-patch-1', 'i-03-patch-2'],
+    ]
+    assert {patch['_instance_id'] for patch in batches[1]} == {'i-03'}
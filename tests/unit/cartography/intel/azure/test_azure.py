@@ -0,0 +1,112 @@
+from unittest import mock
+
+import pytest
+
+import cartography.intel.azure
+from cartography.client.core.session import SessionFactory
+from cartography.client.core.snapshot import read_manifest
+from cartography.client.core.snapshot import start_extract
+from cartography.client.core.snapshot import stop_extract
+from cartography.intel.azure import storage
+from cartography.intel.azure.util.clients import close_management_clients
+from cartography.intel.azure.util.clients import get_management_client
+
+TEST_UPDATE_TAG = 123456789
+SUBSCRIPTIONS = [{'subscriptionId': 'sub-1'}, {'subscriptionId': 'sub-2'}, {'subscriptionId': 'sub-3'}]
+
+
+def test_get_management_client_is_cached_per_subscription():
+    client_class = mock.MagicMock()
+    credentials = object()
+
+    client_1 = get_management_client(client_class, credentials, 'sub-1')
+    assert get_management_client(client_class, credentials, 'sub-1') is client_1
+    get_management_client(client_class, credentials, 'sub-2')
+    assert client_class.call_args_list == [mock.call(credentials, 'sub-1'), mock.call(credentials, 'sub-2')]
+
+    close_management_clients()
+    assert client_1.close.called
+    get_management_client(client_class, credentials, 'sub-1')
+    assert client_class.call_count == 3
+    close_management_clients()
+
+
+@pytest.mark.parametrize('session_factory', [None, mock.MagicMock()])
+@mock.patch('cartography.intel.azure.subscription.sync')
+@mock.patch('cartography.intel.azure._sync_one_subscription')
+def test_sync_multiple_subscriptions_isolates_job_parameters(mock_sync_one, mock_subscription_sync, session_factory):
+    neo4j_session = mock.MagicMock()
+    common_job_parameters = {'UPDATE_TAG': TEST_UPDATE_TAG}
+
+    with mock.patch('cartography.intel.azure.get_session_factory', return_value=session_factory):
+        cartography.intel.azure._sync_multiple_subscriptions(
+            neo4j_session, mock.MagicMock(), 'tenant', SUBSCRIPTIONS, TEST_UPDATE_TAG, common_job_parameters,
+        )
+
+    assert common_job_parameters == {'UPDATE_TAG': TEST_UPDATE_TAG}
+    synced = {call.args[2]: call.args[4] for call in mock_sync_one.call_args_list}
+    assert synced == {
+        sub['subscriptionId']: {'UPDATE_TAG': TEST_UPDATE_TAG, 'AZURE_SUBSCRIPTION_ID': sub['subscriptionId']}
+        for sub in SUBSCRIPTIONS
+    }
+    sessions = {call.args[0] for call in mock_sync_one.call_args_list}
+    if session_factory:
+        assert session_factory.call_count == len(SUBSCRIPTIONS)
+        assert sessions == {session_factory.return_value.__enter__.return_value}
+    else:
+        assert sessions == {neo4j_session}
+
+
+@mock.patch('cartography.intel.azure.subscription.sync')
+@mock.patch('cartography.intel.azure._sync_one_subscription')
+def test_sync_multiple_subscriptions_raises_after_all_finish(mock_sync_one, mock_subscription_sync):
+    def sync_one(neo4j_session, credentials, subscription_id, update_tag, common_job_parameters):
+        if subscription_id == 'sub-1':
+            raise ValueError('boom')
+
+    mock_sync_one.side_effect = sync_one
+
+    with mock.patch('cartography.intel.azure.get_session_factory', return_value=mock.MagicMock()):
+        with pytest.raises(ValueError):
+            cartography.intel.azure._sync_multiple_subscriptions(
+                mock.MagicMock(), mock.MagicMock(), 'tenant', SUBSCRIPTIONS, TEST_UPDATE_TAG, {},
+            )
+
+    assert mock_sync_one.call_count == len(SUBSCRIPTIONS)
+
+
+@mock.patch('cartography.intel.azure.subscription.sync')
+@mock.patch('cartography.intel.azure._sync_one_subscription')
+def test_sync_multiple_subscriptions_records_concurrent_sessions_in_extract_mode(
+    mock_sync_one, mock_subscription_sync, tmp_path,
+):
+    def sync_one(neo4j_session, credentials, subscription_id, update_tag, common_job_parameters):
+        neo4j_session.run("MERGE (s:AzureSubscription{id: $id})", id=subscription_id)
+
+    mock_sync_one.side_effect = sync_one
+
+    start_extract(str(tmp_path))
+    try:
+        with mock.patch('cartography.intel.azure.get_session_factory', return_value=SessionFactory(None)):
+            cartography.intel.azure._sync_multiple_subscriptions(
+                mock.MagicMock(), mock.MagicMock(), 'tenant', SUBSCRIPTIONS, TEST_UPDATE_TAG, {},
+            )
+    finally:
+        stop_extract()
+
+    recorded = {entry['parameters']['id'] for entry in read_manifest(str(tmp_path)) if entry['type'] == 'query'}
+    assert recorded == {sub['subscriptionId'] for sub in SUBSCRIPTIONS}
+
+
+@mock.patch.object(storage, 'get_blob_services', return_value=[])
+@mock.patch.object(storage, 'get_file_services', return_value=[])
+@mock.patch.object(storage, 'get_table_services', return_value=[])
+@mock.patch.object(storage, 'get_queue_services')
+def test_get_storage_account_details_keeps_order(mock_queues, mock_tables, mock_files, mock_blobs):
+    mock_queues.side_effect = lambda credentials, subscription_id, account: [{'id': f"{account['id']}/queue"}]
+    accounts = [{'id': f'account-{i}', 'name': f'name-{i}', 'resourceGroup': 'rg'} for i in range(20)]
+
+    details = list(storage.get_storage_account_details(mock.MagicMock(), 'sub-1', accounts))
+
+    assert [d[0] for d in details] == [account['id'] for account in accounts]
+    assert details[3] == ('account-3', 'name-3', 'rg', [{'id': 'account-3/queue'}], [], [], [])
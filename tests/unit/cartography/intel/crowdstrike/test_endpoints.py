@@ -0,0 +1,84 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+import cartography.intel.crowdstrike.endpoints
+from cartography.intel.crowdstrike.endpoints import get_host_ids
+from cartography.intel.crowdstrike.spotlight import get_spotlight_vulnerability_ids
+
+
+TEST_UPDATE_TAG = 123456789
+
+
+def _scroll_response(resources, offset=None):
+    return {"body": {"resources": resources, "meta": {"pagination": {"offset": offset}}}}
+
+
+def test_get_host_ids_follows_scroll_offset():
+    client = MagicMock()
+    client.QueryDevicesByFilterScroll.side_effect = [
+        _scroll_response(["a", "b"], offset="token-1"),
+        _scroll_response(["c"], offset="token-2"),
+        _scroll_response([]),
+    ]
+
+    assert list(get_host_ids(client)) == [["a", "b"], ["c"]]
+    assert client.QueryDevicesByFilterScroll.call_count == 3
+    assert client.QueryDevicesByFilterScroll.call_args.kwargs["parameters"]["offset"] == "token-2"
+
+
+def test_get_spotlight_vulnerability_ids_follows_after_token():
+    client = MagicMock()
+    client.queryVulnerabilities.side_effect = [
+        {"body": {"resources": ["v1"], "meta": {"pagination": {"after": "next"}}}},
+        {"body": {"resources": ["v2"], "meta": {"pagination": {}}}},
+    ]
+
+    assert list(get_spotlight_vulnerability_ids(client)) == [["v1"], ["v2"]]
+    assert client.queryVulnerabilities.call_count == 2
+    # queryVulnerabilities rejects pages of more than 400 IDs
+    assert client.queryVulnerabilities.call_args.kwargs["parameters"]["limit"] == 400
+
+
+def test_get_spotlight_vulnerability_ids_fetches_next_page_before_yielding():
+    """
+    Test that the next page is requested before the current page is handed out to be loaded, so that the `after` token
+    cannot expire while a page is being loaded.
+    """
+    client = MagicMock()
+    client.queryVulnerabilities.side_effect = [
+        {"body": {"resources": ["v1"], "meta": {"pagination": {"after": "next"}}}},
+        {"body": {"resources": ["v2"], "meta": {"pagination": {}}}},
+    ]
+
+    pages = get_spotlight_vulnerability_ids(client)
+    assert next(pages) == ["v1"]
+    assert client.queryVulnerabilities.call_count == 2
+
+
+def test_get_spotlight_vulnerability_ids_raises_on_api_error():
+    client = MagicMock()
+    client.queryVulnerabilities.return_value = {"status_code": 400, "body": {"errors": [{"message": "bad limit"}]}}
+
+    with pytest.raises(RuntimeError, match="bad limit"):
+        list(get_spotlight_vulnerability_ids(client))
+
+
+@patch.object(cartography.intel.crowdstrike.endpoints, 'HOST_DETAILS_BATCH_SIZE', 2)
+@patch.object(cartography.intel.crowdstrike.endpoints, 'load_host_data')
+@patch.object(cartography.intel.crowdstrike.endpoints, 'Hosts')
+def test_sync_hosts_loads_each_detail_batch(mock_hosts, mock_load_host_data):
+    client = mock_hosts.return_value
+    client.QueryDevicesByFilterScroll.side_effect = [
+        _scroll_response(["a", "b", "c"], offset="token-1"),
+        _scroll_response([]),
+    ]
+    client.GetDeviceDetails.side_effect = lambda ids: {
+        "body": {"resources": [{"device_id": i} for i in ids.split(",")]},
+    }
+
+    cartography.intel.crowdstrike.endpoints.sync_hosts(MagicMock(), TEST_UPDATE_TAG, MagicMock())
+
+    loaded = [call.args[1] for call in mock_load_host_data.call_args_list]
+    assert loaded == [[{"device_id": "a"}, {"device_id": "b"}], [{"device_id": "c"}]]
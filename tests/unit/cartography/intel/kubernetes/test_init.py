@@ -0,0 +1,41 @@
+import threading
+from unittest import mock
+from unittest.mock import MagicMock
+
+import cartography.intel.kubernetes
+
+
+@mock.patch.object(cartography.intel.kubernetes, 'run_cleanup_job')
+@mock.patch.object(cartography.intel.kubernetes, 'MAX_CONCURRENT_CLUSTERS', 2)
+def test_start_k8s_ingestion_bounds_clusters_in_flight(mock_cleanup):
+    """
+    Test that at most MAX_CONCURRENT_CLUSTERS clusters are fetched or waiting to be loaded at the same time, and that
+    every cluster still gets loaded.
+    """
+    clients = [MagicMock(name=f'cluster-{i}') for i in range(5)]
+    lock = threading.Lock()
+    in_flight = set()
+    max_in_flight = []
+
+    def fake_get_cluster_data(client):
+        with lock:
+            in_flight.add(client)
+            max_in_flight.append(len(in_flight))
+        return {'client': client}
+
+    loaded = []
+
+    def fake_load_cluster_data(session, client, cluster_data, update_tag):
+        with lock:
+            in_flight.remove(cluster_data['client'])
+        loaded.append(cluster_data['client'])
+
+    config = MagicMock(k8s_kubeconfig='kubeconfig', update_tag=1)
+    with mock.patch.object(cartography.intel.kubernetes, 'get_k8s_clients', return_value=clients), \
+            mock.patch.object(cartography.intel.kubernetes, 'get_cluster_data', side_effect=fake_get_cluster_data), \
+            mock.patch.object(cartography.intel.kubernetes, 'load_cluster_data', side_effect=fake_load_cluster_data):
+        cartography.intel.kubernetes.start_k8s_ingestion(MagicMock(), config)
+
+    assert sorted(loaded, key=clients.index) == clients
+    assert max(max_in_flight) <= 2
+    mock_cleanup.assert_called_once()
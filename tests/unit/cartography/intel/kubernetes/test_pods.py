@@ -0,0 +1,89 @@
+import json
+from unittest.mock import MagicMock
+
+from cartography.intel.kubernetes.pods import get_pod_pages
+from cartography.intel.kubernetes.pods import sync_pods
+from cartography.intel.kubernetes.util import k8s_paginate
+from tests.data.kubernetes.pods import LIST_PODS_RAW_RESPONSE_PAGES
+
+
+def _mock_raw_list_func():
+    responses = []
+    for page in LIST_PODS_RAW_RESPONSE_PAGES:
+        response = MagicMock()
+        response.data = json.dumps(page).encode()
+        responses.append(response)
+    return MagicMock(side_effect=responses)
+
+
+def test_k8s_paginate_follows_continue_token():
+    list_func = _mock_raw_list_func()
+
+    pages = list(k8s_paginate(list_func, page_size=1, raw=True))
+
+    assert [[pod["metadata"]["uid"] for pod in page] for page in pages] == [["raw-pod-uid-1"], ["raw-pod-uid-2"]]
+    assert list_func.call_count == 2
+    list_func.assert_any_call(limit=1, _continue=None, _preload_content=False)
+    list_func.assert_any_call(limit=1, _continue="page-2-token", _preload_content=False)
+
+
+def test_k8s_paginate_models():
+    first_page = MagicMock(items=["a", "b"])
+    first_page.metadata._continue = "next"
+    last_page = MagicMock(items=["c"])
+    last_page.metadata._continue = None
+    list_func = MagicMock(side_effect=[first_page, last_page])
+
+    assert list(k8s_paginate(list_func, page_size=2)) == [["a", "b"], ["c"]]
+    list_func.assert_called_with(limit=2, _continue="next")
+
+
+def test_get_pods_from_raw_response():
+    client = MagicMock()
+    client.core.list_pod_for_all_namespaces = _mock_raw_list_func()
+
+    pods = [pod for page in get_pod_pages(client, {"uid": "cluster-uid"}) for pod in page]
+
+    assert [pod["uid"] for pod in pods] == ["raw-pod-uid-1", "raw-pod-uid-2"]
+    assert pods[0]["name"] == "my-pod"
+    assert pods[0]["status_phase"] == "Running"
+    assert pods[0]["node"] == "my-node"
+    assert pods[0]["cluster_uid"] == "cluster-uid"
+    assert pods[0]["labels"] == {"key1": "val1"}
+    assert pods[0]["deletion_timestamp"] is None
+    assert isinstance(pods[0]["creation_timestamp"], int)
+    assert pods[0]["containers"] == [
+        {
+            "name": "my-pod-container",
+            "image": "my-image",
+            "uid": "raw-pod-uid-1-my-pod-container",
+            "status": {
+                "image_id": "docker.io/my-image@sha256:abc123",
+                "image_sha": "sha256:abc123",
+                "ready": True,
+                "started": True,
+                "state": "running",
+            },
+        },
+    ]
+    # Containers without a reported status are still ingested
+    assert pods[1]["containers"] == [
+        {
+            "name": "my-pending-container",
+            "image": "my-image",
+            "uid": "raw-pod-uid-2-my-pending-container",
+        },
+    ]
+
+
+def test_sync_pods_loads_each_page_and_keeps_only_labels():
+    client = MagicMock()
+    client.core.list_pod_for_all_namespaces = _mock_raw_list_func()
+    session = MagicMock()
+
+    pod_labels = sync_pods(session, client, {"uid": "cluster-uid"}, 123)
+
+    # One load per page, so only one page of pods is held in memory at a time
+    assert [call.kwargs["pods"][0]["uid"] for call in session.run.call_args_list] == ["raw-pod-uid-1", "raw-pod-uid-2"]
+    # Only pods with labels are kept, and only what services need to select them
+    assert pod_labels == [{"uid": "raw-pod-uid-1", "labels": {"key1": "val1"}}]
@@ -0,0 +1,18 @@
+from cartography.intel.kubernetes.services import add_service_pods
+
+
+def test_add_service_pods_matches_selector_against_labels():
+    pods = [
+        {"uid": "pod-1", "labels": {"app": "web", "tier": "frontend"}},
+        {"uid": "pod-2", "labels": {"app": "web"}},
+        {"uid": "pod-3", "labels": {"app": "db"}},
+    ]
+    services = [
+        {"uid": "service-1", "selector": {"app": "web"}},
+        {"uid": "service-2", "selector": {"app": "web", "tier": "frontend"}},
+        {"uid": "service-3", "selector": None},
+    ]
+
+    add_service_pods(services, pods)
+
+    assert [[pod["uid"] for pod in service["pods"]] for service in services] == [["pod-1", "pod-2"], ["pod-1"], []]
@@ -1,6 +1,8 @@
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import tests.data.oci.iam
+from cartography.graph.job import GraphJob
 from cartography.intel.oci import iam
 
 
@@ -21,6 +23,16 @@ USER_OCI_OBJECT = """[{
   "name": "none@none.com"
 }]"""
 
+COMPARTMENT_OCI_OBJECT = """[{
+  "compartment_id": "ocid1.compartment.oc1..1",
+  "id": "ocid1.compartment.oc1..child",
+  "name": "child"
+}, {
+  "compartment_id": "ocid1.tenancy.oc1..123",
+  "id": "ocid1.compartment.oc1..1",
+  "name": "parent"
+}]"""
+
 GROUP_OCI_OBJECT = """[{
   "lifecycle_state": "ACTIVE",
   "name": "Administrators"
@@ -47,26 +59,78 @@ REGION_OCI_OBJECT = """[{
 }]"""
 
 
-def test_get_compartment_list_data_recurse():
-    list_call_get_all_results = MagicMock()
-    list_call_get_all_results.data = None
+def test_get_compartment_list_data():
     iam_obj = MagicMock()
-    iam_obj.list_compartments.return_value = []
-    with patch('oci.pagination.list_call_get_all_results', return_value=list_call_get_all_results) as page_results:
-        compartment_list = {'Compartments': ''}
-        compartment_id = "ocid1.compartment.oc1..aaaaaaaakl52gpiymzh46mx5gjrtqgdnzpbhwflj2il5h5r7awj5qlpo2vra"
-        iam.get_compartment_list_data_recurse(iam_obj, compartment_list, compartment_id)
-        page_results.assert_called_once()
+    resp_obj = MagicMock()
+    resp_obj.data = COMPARTMENT_OCI_OBJECT
+    with patch('oci.pagination.list_call_get_all_results', return_value=resp_obj) as page_results:
+        output = iam.get_compartment_list_data(iam_obj, "ocid1.tenancy.oc1..123")
+        page_results.assert_called_once_with(
+            iam_obj.list_compartments, "ocid1.tenancy.oc1..123", compartment_id_in_subtree=True, access_level='ANY',
+        )
+        assert [c['id'] for c in output['Compartments']] == ["ocid1.compartment.oc1..child", "ocid1.compartment.oc1..1"]
 
 
-def test_get_compartment_list_data():
-    iam_obj = MagicMock()
-    iam_obj.list_compartments.return_value = []
-    patch_func = 'cartography.intel.oci.iam.get_compartment_list_data_recurse'
-    with patch(patch_func, return_value=JSON_OCI_OBJECT) as page_results:
-        output = iam.get_compartment_list_data(iam_obj, None)
-        page_results.assert_called_once()
-        assert output == {"Compartments": ""}
+def test_transform_compartments_orders_parents_first():
+    compartments = [
+        {'id': 'c3', 'compartment-id': 'c2', 'name': 'grandchild', 'time-created': None},
+        {'id': 'c2', 'compartment-id': 'c1', 'name': 'child', 'time-created': None},
+        {'id': 'c1', 'compartment-id': 'tenancy', 'name': 'root', 'time-created': None},
+    ]
+    result = iam.transform_compartments(compartments, 'tenancy')
+    assert [c['id'] for c in result] == ['c1', 'c2', 'c3']
+    assert result[0] == {'id': 'c1', 'name': 'root', 'compartment_id': 'tenancy', 'time_created': None}
+
+
+def test_transform_users():
+    users = iam.transform_users(tests.data.oci.iam.LIST_USERS['Users'])
+    assert users[0]['compartment_id'] == tests.data.oci.iam.LIST_USERS['Users'][0]['compartment-id']
+    assert users[0]['can_use_api_keys'] is True
+    assert users[0]['time_created'] == '2019-01-01 00:00:01'
+    assert all('-' not in key for user in users for key in user)
+
+
+@patch('cartography.intel.oci.iam.load_group_memberships')
+@patch('cartography.intel.oci.iam.GraphJob')
+@patch('cartography.intel.oci.iam.get_group_membership_data')
+def test_sync_group_memberships_fetches_all_groups(mock_get, mock_job, mock_load):
+    neo4j_session = MagicMock()
+    neo4j_session.run.return_value = [{'name': f'group-{i}', 'ocid': f'ocid1.group.oc1..{i}'} for i in range(10)]
+    mock_get.side_effect = lambda iam_client, group_id, tenancy_id: {'GroupMemberships': [{'group-id': group_id}]}
+
+    iam.sync_group_memberships(neo4j_session, MagicMock(), 'tenancy', 1, {})
+
+    memberships = mock_load.call_args[0][1]
+    assert list(memberships) == [f'ocid1.group.oc1..{i}' for i in range(10)]
+    assert memberships['ocid1.group.oc1..3'] == {'GroupMemberships': [{'group-id': 'ocid1.group.oc1..3'}]}
+
+
+@patch('cartography.intel.oci.iam.load_group_memberships')
+@patch('cartography.intel.oci.iam.get_group_membership_data')
+@patch.object(GraphJob, 'run', autospec=True)
+def test_sync_group_memberships_cleans_up_only_memberships(mock_run, mock_get, mock_load):
+    neo4j_session = MagicMock()
+    neo4j_session.run.return_value = []
+
+    iam.sync_group_memberships(
+        neo4j_session, MagicMock(), 'tenancy', 1, {'UPDATE_TAG': 1, 'OCI_TENANCY_ID': 'tenancy'},
+    )
+
+    # Stale OCIUser nodes are left to the cleanup of sync_users()
+    cleanup_job = mock_run.call_args[0][0]
+    assert len(cleanup_job.statements) == 1
+    assert 'MEMBER_OCID_GROUP' in cleanup_job.statements[0].query
+    assert 'DETACH DELETE n' not in cleanup_job.statements[0].query
+
+
+def test_get_id_backfill_queries():
+    created = ['CREATE INDEX IF NOT EXISTS FOR (n:OCIUser) ON (n.id);']
+
+    queries = iam.get_id_backfill_queries(created)
+
+    assert len(queries) == 1
+    assert 'MATCH (n:OCIUser)' in queries[0]
+    assert iam.get_id_backfill_queries(['CREATE INDEX IF NOT EXISTS FOR (n:OCIUser) ON (n.ocid);']) == []
 
 
 def test_get_user_list_data():
@@ -0,0 +1,102 @@
+from unittest.mock import MagicMock
+
+from cartography.client.core.indexes import get_index_registry
+from cartography.client.core.indexes import parse_create_index_query
+from cartography.config import Config
+from cartography.graph.cleanupbuilder import build_cleanup_index_queries
+from cartography.graph.cleanupbuilder import build_cleanup_scope_backfill_queries
+from cartography.graph.querybuilder import build_lowercase_shadow_backfill_queries
+from cartography.intel import create_indexes
+from cartography.models.aws.ec2.images import EC2ImageSchema
+from cartography.models.aws.emr import EMRClusterSchema
+
+
+def _mock_session(existing_statements):
+    session = MagicMock()
+    session.run.return_value = [
+        {'type': 'RANGE', 'entityType': 'NODE', 'labelsOrTypes': [label], 'properties': [prop]}
+        for label, prop in map(parse_create_index_query, existing_statements)
+    ]
+    # Each iterative backfill statement stops after its first pass
+    session.write_transaction.return_value.consume.return_value.counters.contains_updates = False
+    return session
+
+
+def test_get_desired_index_statements():
+    statements = create_indexes.get_desired_index_statements()
+
+    # Static statements and schema-derived statements are both present, without duplicates
+    assert 'CREATE INDEX IF NOT EXISTS FOR (n:AWSAccount) ON (n.id);' in statements
+    assert 'CREATE TEXT INDEX IF NOT EXISTS FOR (n:AWSRole) ON (n._lc_arn);' in statements
+    assert 'CREATE INDEX IF NOT EXISTS FOR (n:EMRCluster) ON (n.lastupdated);' in statements
+    assert len(statements) == len(set(statements))
+    assert all(parse_create_index_query(statement) for statement in statements)
+    assert any(isinstance(schema, EMRClusterSchema) for schema in create_indexes.get_node_schemas())
+
+    # The relationship indexes of --indexed-cleanup are only wanted when it is enabled
+    rel_statement = 'CREATE INDEX IF NOT EXISTS FOR ()-[r:RESOURCE]-() ON (r._cleanup_scope, r.lastupdated);'
+    assert rel_statement not in statements
+    assert rel_statement in create_indexes.get_desired_index_statements(indexed_cleanup=True)
+
+
+def test_run_creates_only_missing_indexes():
+    statements = create_indexes.get_desired_index_statements()
+    session = _mock_session(statements[1:])
+    get_index_registry().reset()
+
+    create_indexes.run(session, Config('bolt://localhost:7687', create_indexes_await_timeout=30))
+
+    tx_func, created = session.write_transaction.call_args_list[0].args
+    assert created == statements[:1]
+    session.run.assert_called_with("CALL db.awaitIndexes($timeout)", timeout=30)
+    # The shadow property indexes already exist, so there is nothing to backfill
+    assert session.write_transaction.call_count == 1
+
+
+def test_run_backfills_lowercase_shadow_properties_only_for_new_shadow_indexes():
+    shadow_statement = 'CREATE TEXT INDEX IF NOT EXISTS FOR (n:AWSRole) ON (n._lc_arn);'
+    statements = create_indexes.get_desired_index_statements()
+    session = _mock_session([statement for statement in statements if statement != shadow_statement])
+    get_index_registry().reset()
+
+    create_indexes.run(session, Config('bolt://localhost:7687'))
+
+    tx_func, created = session.write_transaction.call_args_list[0].args
+    assert created == [shadow_statement]
+    # The shadow property is backfilled once its index exists
+    backfill_queries = [c.args[0].__self__.query for c in session.write_transaction.call_args_list[1:]]
+    assert backfill_queries == build_lowercase_shadow_backfill_queries({('AWSRole', 'arn')})
+
+
+def test_run_backfills_cleanup_scopes_only_for_new_scope_indexes():
+    # The node index on (_cleanup_scope, lastupdated); relationship indexes are shared by the schemas of a rel label
+    emr_scope_statement = build_cleanup_index_queries(EMRClusterSchema())[0]
+    statements = create_indexes.get_desired_index_statements(indexed_cleanup=True)
+    session = _mock_session([statement for statement in statements if statement != emr_scope_statement])
+    get_index_registry().reset()
+
+    create_indexes.run(session, Config('bolt://localhost:7687', indexed_cleanup=True))
+
+    # Only the node schema whose cleanup scope indexes were just created is backfilled
+    backfill_queries = [c.args[0].__self__.query for c in session.write_transaction.call_args_list[1:]]
+    emr_backfill_queries = build_cleanup_scope_backfill_queries(EMRClusterSchema())
+    assert backfill_queries[-len(emr_backfill_queries):] == emr_backfill_queries
+    assert not any(query in backfill_queries for query in build_cleanup_scope_backfill_queries(EC2ImageSchema()))
+
+    # Once the indexes exist, later syncs do not backfill again
+    session = _mock_session(statements)
+    get_index_registry().reset()
+
+    create_indexes.run(session, Config('bolt://localhost:7687', indexed_cleanup=True))
+
+    backfill_queries = [c.args[0].__self__.query for c in session.write_transaction.call_args_list]
+    assert not any(query in backfill_queries for query in emr_backfill_queries)
+
+
+def test_run_dry_run_does_not_write():
+    session = _mock_session([])
+    get_index_registry().reset()
+
+    create_indexes.run(session, Config('bolt://localhost:7687', create_indexes_dry_run=True))
+
+    session.write_transaction.assert_not_called()
@@ -0,0 +1,128 @@
+import socket
+import threading
+from collections import Counter
+from typing import Dict
+from typing import List
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import dns.message
+import dns.rcode
+import dns.resolver
+import dns.rrset
+import pytest
+
+import cartography.intel.dns
+from cartography.intel.dns import DNSResolver
+from cartography.intel.dns import ingest_dns_records_by_fqdn
+
+RECORDS = {
+    'es.example.com.': ['10.0.0.1', '10.0.0.2'],
+    'other.example.com.': ['10.0.0.3'],
+}
+
+
+class StubNameserver:
+    """
+    Answers A queries on a local UDP port from a dict, NXDOMAIN for other names, and counts the queries per name.
+    """
+
+    def __init__(self, records: Dict[str, List[str]]):
+        self.records = records
+        self.queries: Counter = Counter()
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(('127.0.0.1', 0))
+        self.port = self.socket.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def _serve(self):
+        while True:
+            try:
+                data, address = self.socket.recvfrom(4096)
+            except OSError:
+                return
+            query = dns.message.from_wire(data)
+            name = query.question[0].name.to_text()
+            self.queries[name] += 1
+            response = dns.message.make_response(query)
+            if name in self.records:
+                response.answer.append(dns.rrset.from_text_list(name, 60, 'IN', 'A', self.records[name]))
+            else:
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            self.socket.sendto(response.to_wire(), address)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.socket.close()
+
+    def resolver(self) -> dns.resolver.Resolver:
+        resolver = dns.resolver.Resolver(configure=False)
+        resolver.nameservers = ['127.0.0.1']
+        resolver.port = self.port
+        return resolver
+
+
+@pytest.fixture
+def nameserver():
+    with StubNameserver(RECORDS) as server:
+        yield server
+
+
+def test_resolve_many(nameserver):
+    resolver = DNSResolver(nameserver.resolver(), timeout=2)
+
+    answers = resolver.resolve_many(['es.example.com', 'other.example.com', 'missing.example.com'])
+
+    assert answers == {
+        'es.example.com': ['10.0.0.1', '10.0.0.2'],
+        'other.example.com': ['10.0.0.3'],
+        'missing.example.com': None,
+    }
+
+
+def test_resolve_memoizes_answers_and_failures(nameserver):
+    resolver = DNSResolver(nameserver.resolver(), timeout=2)
+
+    for _ in range(3):
+        assert resolver.resolve('es.example.com') == ['10.0.0.1', '10.0.0.2']
+        assert resolver.resolve('missing.example.com') is None
+
+    assert nameserver.queries == {'es.example.com.': 1, 'missing.example.com.': 1}
+
+
+def test_resolve_times_out():
+    # Nothing answers on this socket, so the lookup can only time out
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as silent:
+        silent.bind(('127.0.0.1', 0))
+        stub = dns.resolver.Resolver(configure=False)
+        stub.nameservers = ['127.0.0.1']
+        stub.port = silent.getsockname()[1]
+
+        assert DNSResolver(stub, timeout=0.2).resolve('es.example.com') is None
+
+
+@patch.object(cartography.intel.dns, 'load_graph_data')
+def test_ingest_dns_records_by_fqdn_loads_in_batches(mock_load, nameserver):
+    with patch.object(cartography.intel.dns, '_dns_resolver', DNSResolver(nameserver.resolver(), timeout=2)):
+        record_ids = ingest_dns_records_by_fqdn(
+            MagicMock(), 1, {'es.example.com': 'domain-1', 'missing.example.com': 'domain-2'}, 'ESDomain',
+            dns_node_additional_label='AWSDNSRecord',
+        )
+
+    assert record_ids == ['es.example.com+A']
+    records_call, ips_call = mock_load.call_args_list
+    assert 'DNSRecord:AWSDNSRecord' in records_call[0][1]
+    assert records_call[0][2] == [{
+        'id': 'es.example.com+A',
+        'name': 'es.example.com',
+        'type': 'A',
+        'value': '10.0.0.1,10.0.0.2',
+        'points_to': 'domain-1',
+    }]
+    assert ips_call[0][2] == [
+        {'record_id': 'es.example.com+A', 'ip': '10.0.0.1'},
+        {'record_id': 'es.example.com+A', 'ip': '10.0.0.2'},
+    ]
@@ -0,0 +1,52 @@
+from cartography.checkpoint import Checkpoint
+from cartography.checkpoint import is_unit_complete
+from cartography.checkpoint import mark_unit_complete
+from cartography.checkpoint import set_checkpoint
+from cartography.checkpoint import start_checkpoint
+
+
+def test_checkpoint_is_persisted(tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    checkpoint = start_checkpoint(path, 1234, resume=False)
+    checkpoint.mark_complete('aws', '000000000000', 'ec2:instance')
+    checkpoint.mark_complete('aws', '000000000000', 'ec2:instance')
+    checkpoint.mark_complete('aws', '000000000000')
+
+    loaded = Checkpoint.load(path)
+    assert loaded.update_tag == 1234
+    assert loaded.completed == [('aws', '000000000000', 'ec2:instance'), ('aws', '000000000000')]
+    assert loaded.is_complete('aws', '000000000000')
+    assert not loaded.is_complete('aws', '111111111111')
+
+
+def test_start_checkpoint_resume(tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+    start_checkpoint(path, 1234, resume=False).mark_complete('gsuite')
+
+    # Resuming continues the recorded sync.
+    resumed = start_checkpoint(path, 5678, resume=True)
+    assert resumed.update_tag == 1234
+    assert resumed.is_complete('gsuite')
+
+    # Without --resume, a new sync overwrites the checkpoint.
+    new = start_checkpoint(path, 5678, resume=False)
+    assert new.update_tag == 5678
+    assert Checkpoint.load(path).completed == []
+
+    # Resuming without a checkpoint file starts a new sync.
+    missing = start_checkpoint(str(tmp_path / 'missing.json'), 5678, resume=True)
+    assert missing.update_tag == 5678
+    assert missing.completed == []
+
+
+def test_unit_helpers_without_checkpoint(tmp_path):
+    mark_unit_complete('aws')
+    assert not is_unit_complete('aws')
+
+    set_checkpoint(Checkpoint(str(tmp_path / 'checkpoint.json'), 1234))
+    try:
+        mark_unit_complete('gcp', 'my-project', 'Compute')
+        assert is_unit_complete('gcp', 'my-project', 'Compute')
+        assert not is_unit_complete('gcp', 'my-project', 'IAM')
+    finally:
+        set_checkpoint(None)
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from typing import Dict
+
+# Third-party SDKs that only the intel modules that use them should import.
+HEAVY_PACKAGES = [
+    'boto3',
+    'googleapiclient',
+    'azure',
+    'kubernetes',
+    'falconpy',
+    'okta',
+    'pdpyras',
+    'oci',
+    'digitalocean',
+]
+
+# Generous upper bound for the cumulative import time of cartography.cli. Importing every intel module up front took
+# several seconds.
+MAX_CLI_IMPORT_SECONDS = 2.0
+
+
+def _get_import_times(module: str) -> Dict[str, int]:
+    """
+    Runs `python -X importtime -c "import <module>"` in a fresh interpreter.
+    :return: Mapping of every imported module name to its cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        # Lines look like `import time:       123 |       456 |   package.module`
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+def test_cli_import_does_not_import_intel_sdks():
+    import_times = _get_import_times('cartography.cli')
+
+    imported_heavy_packages = [
+        name for name in import_times if name.split('.')[0] in HEAVY_PACKAGES
+    ]
+    assert imported_heavy_packages == []
+    assert not any(name.startswith('cartography.intel.') for name in import_times)
+
+
+def test_cli_import_time():
+    import_times = _get_import_times('cartography.cli')
+
+    assert import_times['cartography.cli'] / 1_000_000 < MAX_CLI_IMPORT_SECONDS
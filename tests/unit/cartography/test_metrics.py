@@ -0,0 +1,107 @@
+import json
+import threading
+
+from cartography.metrics import JSON_REPORT_FILENAME
+from cartography.metrics import MARKDOWN_REPORT_FILENAME
+from cartography.metrics import metrics_scope
+from cartography.metrics import MetricsCollector
+from cartography.metrics import OPENMETRICS_REPORT_FILENAME
+from cartography.metrics import set_metrics_collector
+from cartography.util import timeit
+
+
+def test_incr_uses_scope_labels():
+    collector = MetricsCollector()
+    with metrics_scope(stage='aws', account='1234'):
+        collector.incr('api_calls', service='ec2')
+        with metrics_scope(account='5678', region=None):
+            collector.incr('api_calls', service='ec2', operation=None)
+            collector.incr('api_calls', 2, service='ec2')
+    collector.incr('api_calls')
+
+    assert collector.get_metrics() == [
+        {'name': 'api_calls', 'labels': {}, 'value': 1},
+        {'name': 'api_calls', 'labels': {'account': '1234', 'service': 'ec2', 'stage': 'aws'}, 'value': 1},
+        {'name': 'api_calls', 'labels': {'account': '5678', 'service': 'ec2', 'stage': 'aws'}, 'value': 3},
+    ]
+
+
+def test_scope_labels_are_not_shared_with_other_threads():
+    collector = MetricsCollector()
+    with metrics_scope(stage='aws'):
+        thread = threading.Thread(target=collector.incr, args=('api_calls',))
+        thread.start()
+        thread.join()
+
+    assert collector.get_metrics() == [{'name': 'api_calls', 'labels': {}, 'value': 1}]
+
+
+@timeit
+def _sync_things(collector):
+    collector.incr('rows_loaded', 5)
+
+
+def test_timeit_records_function_calls():
+    collector = MetricsCollector()
+    set_metrics_collector(collector)
+    try:
+        with metrics_scope(stage='test'):
+            _sync_things(collector)
+            _sync_things(collector)
+    finally:
+        set_metrics_collector(None)
+
+    labels = {'stage': 'test', 'module': __name__, 'function': '_sync_things'}
+    metrics = {m['name']: m for m in collector.get_metrics()}
+    assert metrics['function_calls'] == {'name': 'function_calls', 'labels': labels, 'value': 2}
+    assert metrics['rows_loaded'] == {'name': 'rows_loaded', 'labels': labels, 'value': 10}
+    assert metrics['function_seconds']['value'] >= 0
+
+
+def test_timeit_without_collector():
+    collector = MetricsCollector()
+    _sync_things(collector)
+
+    assert collector.get_metrics() == [{'name': 'rows_loaded', 'labels': {}, 'value': 5}]
+
+
+def test_to_openmetrics():
+    collector = MetricsCollector()
+    collector.incr('rows_loaded', 3, schema='EC2Instance', sub_resource='AWSAccount:1234')
+    collector.incr('rows_loaded', 1, schema='Say "hi"')
+    collector.incr('transactions')
+
+    assert collector.to_openmetrics() == (
+        '# TYPE cartography_rows_loaded counter\n'
+        'cartography_rows_loaded_total{schema="EC2Instance",sub_resource="AWSAccount:1234"} 3.0\n'
+        'cartography_rows_loaded_total{schema="Say \\"hi\\""} 1.0\n'
+        '# TYPE cartography_transactions counter\n'
+        'cartography_transactions_total{} 1.0\n'
+        '# EOF\n'
+    )
+
+
+def test_write_reports(tmp_path):
+    collector = MetricsCollector()
+    with metrics_scope(stage='aws'):
+        collector.incr('stage_seconds', 12.5)
+        collector.incr('rows_loaded', 3, schema='EC2Instance')
+        collector.incr('transactions', 1, schema='EC2Instance')
+        collector.incr('transactions', 2, job='aws_import_ec2_instances_cleanup')
+        collector.incr('nodes_deleted', 4, job='aws_import_ec2_instances_cleanup')
+        collector.incr('api_calls', 7, service='ec2', operation='DescribeInstances', region='us-east-1')
+
+    collector.write_reports(str(tmp_path), update_tag=1234)
+
+    report = json.loads((tmp_path / JSON_REPORT_FILENAME).read_text())
+    assert report['update_tag'] == 1234
+    assert len(report['metrics']) == 6
+    markdown = (tmp_path / MARKDOWN_REPORT_FILENAME).read_text()
+    assert '| aws | 12.5 |' in markdown
+    assert '| aws | EC2Instance | 3 | 1 | 0 | 0 | 0 |' in markdown
+    assert '| aws | aws_import_ec2_instances_cleanup | 2 | 4 | 0 | 0 |' in markdown
+    assert '| aws | ec2 | DescribeInstances | 7 |' in markdown
+    assert not (tmp_path / OPENMETRICS_REPORT_FILENAME).exists()
+
+    collector.write_reports(str(tmp_path), openmetrics=True)
+    assert (tmp_path / OPENMETRICS_REPORT_FILENAME).read_text().endswith('# EOF\n')
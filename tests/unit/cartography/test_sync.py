@@ -1,8 +1,15 @@
+import os
+from unittest import mock
+
 import pytest
 
+from cartography.checkpoint import Checkpoint
+from cartography.config import Config
 from cartography.sync import build_default_sync
 from cartography.sync import build_sync
+from cartography.sync import LazyStage
 from cartography.sync import parse_and_validate_selected_modules
+from cartography.sync import Sync
 from cartography.sync import TOP_LEVEL_MODULES
 
 
@@ -37,3 +44,45 @@ def test_parse_and_validate_selected_modules():
     absolute_garbage = '#@$@#RDFFHKjsdfkjsd,KDFJHW#@,'
     with pytest.raises(ValueError):
         parse_and_validate_selected_modules(absolute_garbage)
+
+
+def test_top_level_modules_are_lazy():
+    # Every stage resolves to a function in its intel module.
+    for stage_name, stage in TOP_LEVEL_MODULES.items():
+        assert isinstance(stage, LazyStage)
+        assert callable(stage.load()), stage_name
+
+
+def test_lazy_stage_calls_stage_function():
+    with mock.patch('cartography.intel.okta.start_okta_ingestion') as mock_start:
+        neo4j_session = mock.MagicMock()
+        config = mock.MagicMock()
+
+        TOP_LEVEL_MODULES['okta'](neo4j_session, config)
+
+        mock_start.assert_called_once_with(neo4j_session, config)
+
+
+@mock.patch('cartography.sync.get_index_registry')
+def test_sync_resumes_from_checkpoint(mock_get_index_registry, tmp_path):
+    checkpoint_file = str(tmp_path / 'checkpoint.json')
+    first_stage = mock.MagicMock()
+    second_stage = mock.MagicMock(side_effect=[Exception('Neo4j leader changed'), None])
+    sync = Sync()
+    sync.add_stages([('first', first_stage), ('second', second_stage)])
+
+    config = Config(neo4j_uri='bolt://localhost:7687', update_tag=1, checkpoint_file=checkpoint_file)
+    with pytest.raises(Exception):
+        sync.run(mock.MagicMock(), config)
+    assert Checkpoint.load(checkpoint_file).completed == [('first',)]
+
+    resumed_config = Config(
+        neo4j_uri='bolt://localhost:7687', update_tag=2, checkpoint_file=checkpoint_file, resume=True,
+    )
+    sync.run(mock.MagicMock(), resumed_config)
+
+    # The first stage is not run again, and the second stage writes with the update tag of the failed attempt.
+    assert first_stage.call_count == 1
+    assert second_stage.call_count == 2
+    assert resumed_config.update_tag == 1
+    assert not os.path.exists(checkpoint_file)